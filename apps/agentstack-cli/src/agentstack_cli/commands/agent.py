@@ -1511,6 +1511,7 @@ async def list_feedback(
             provider_id=provider_id,
             limit=limit,
             after_cursor=after_cursor,
+            total_count="exact",
         )
 
     if not response.items:
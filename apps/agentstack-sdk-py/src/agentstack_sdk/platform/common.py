@@ -12,7 +12,7 @@ T = TypeVar("T", bound=BaseModel)
 
 class PaginatedResult(BaseModel, Generic[T]):
     items: list[T]
-    total_count: int
+    total_count: int | None = None
     has_more: bool = False
     next_page_token: str | None = None
 
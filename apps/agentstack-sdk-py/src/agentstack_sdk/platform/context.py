@@ -10,7 +10,7 @@ from typing import Literal
 from uuid import UUID, uuid4
 
 import pydantic
-from a2a.types import Artifact, Message
+from a2a.types import Artifact, Message, Role
 from pydantic import AwareDatetime, BaseModel, Field, SerializeAsAny, computed_field
 
 from agentstack_sdk.platform.client import PlatformClient, get_platform_client
@@ -32,6 +32,12 @@ class ContextHistoryItem(BaseModel):
         return getattr(self.data, "kind", "artifact")
 
 
+HISTORY_BATCH_SIZE = 100
+
+_history_page_adapter = pydantic.TypeAdapter(PaginatedResult[ContextHistoryItem])
+_history_items_adapter = pydantic.TypeAdapter(list[ContextHistoryItem])
+
+
 class ContextToken(pydantic.BaseModel):
     context_id: str
     token: pydantic.Secret[str]
@@ -93,6 +99,7 @@ class Context(pydantic.BaseModel):
         client: PlatformClient | None = None,
         page_token: str | None = None,
         limit: int | None = None,
+        total_count: Literal["none", "exact", "estimate"] | None = None,
         order: Literal["asc"] | Literal["desc"] | None = None,
         order_by: Literal["created_at"] | Literal["updated_at"] | None = None,
         include_empty: bool = True,
@@ -108,6 +115,7 @@ class Context(pydantic.BaseModel):
                             {
                                 "page_token": page_token,
                                 "limit": limit,
+                                "total_count": total_count,
                                 "order": order,
                                 "order_by": order_by,
                                 "include_empty": include_empty,
@@ -231,15 +239,41 @@ class Context(pydantic.BaseModel):
         *,
         data: Message | Artifact,
         client: PlatformClient | None = None,
-    ) -> None:
+    ) -> ContextHistoryItem:
         """Add a Message or Artifact to the context history (append-only)"""
         target_context_id = self if isinstance(self, str) else self.id
         async with client or get_platform_client() as platform_client:
-            _ = (
-                await platform_client.post(
-                    url=f"/api/v1/contexts/{target_context_id}/history", json=data.model_dump(mode="json")
+            return pydantic.TypeAdapter(ContextHistoryItem).validate_python(
+                (
+                    await platform_client.post(
+                        url=f"/api/v1/contexts/{target_context_id}/history", json=data.model_dump(mode="json")
+                    )
                 )
-            ).raise_for_status()
+                .raise_for_status()
+                .json()
+            )
+
+    async def add_history_items(
+        self: "Context" | str,
+        *,
+        data: builtins.list[Message | Artifact],
+        client: PlatformClient | None = None,
+    ) -> builtins.list[ContextHistoryItem]:
+        """
+        Add multiple Messages or Artifacts to the context history in order, using one request per 100 items
+
+        Every request is committed separately, when a request fails the items of the previous ones are already stored.
+        """
+        target_context_id = self if isinstance(self, str) else self.id
+        history_items: builtins.list[ContextHistoryItem] = []
+        async with client or get_platform_client() as platform_client:
+            for i in range(0, len(data), HISTORY_BATCH_SIZE):
+                response = await platform_client.post(
+                    url=f"/api/v1/contexts/{target_context_id}/history:batch",
+                    json={"items": [item.model_dump(mode="json") for item in data[i : i + HISTORY_BATCH_SIZE]]},
+                )
+                history_items.extend(_history_items_adapter.validate_python(response.raise_for_status().json()))
+        return history_items
 
     async def delete_history_from_id(
         self: "Context" | str,
@@ -261,19 +295,39 @@ class Context(pydantic.BaseModel):
         *,
         page_token: str | None = None,
         limit: int | None = None,
+        total_count: Literal["none", "exact", "estimate"] | None = None,
         order: Literal["asc"] | Literal["desc"] | None = "asc",
         order_by: Literal["created_at"] | Literal["updated_at"] | None = None,
+        kind: Literal["message", "artifact"] | None = None,
+        roles: builtins.list[Role] | None = None,
+        since_id: UUID | str | None = None,
+        strip_binary: bool | None = None,
         client: PlatformClient | None = None,
     ) -> PaginatedResult[ContextHistoryItem]:
-        """List all history items for this context in chronological order"""
+        """
+        List all history items for this context in chronological order
+
+        The history can be filtered by item kind and message roles, `since_id` only returns items added after the
+        given item. With `strip_binary`, large inline file parts are replaced by a URI to download their content.
+        """
         target_context_id = self if isinstance(self, str) else self.id
         async with client or get_platform_client() as platform_client:
-            return pydantic.TypeAdapter(PaginatedResult[ContextHistoryItem]).validate_python(
+            return _history_page_adapter.validate_python(
                 (
                     await platform_client.get(
                         url=f"/api/v1/contexts/{target_context_id}/history",
                         params=filter_dict(
-                            {"page_token": page_token, "limit": limit, "order": order, "order_by": order_by}
+                            {
+                                "page_token": page_token,
+                                "limit": limit,
+                                "total_count": total_count,
+                                "order": order,
+                                "order_by": order_by,
+                                "kind": kind,
+                                "roles": [role.value for role in roles] if roles else None,
+                                "since_id": str(since_id) if since_id else None,
+                                "strip_binary": strip_binary,
+                            }
                         ),
                     )
                 )
@@ -282,12 +336,28 @@ class Context(pydantic.BaseModel):
             )
 
     async def list_all_history(
-        self: "Context" | str, client: PlatformClient | None = None
+        self: "Context" | str,
+        client: PlatformClient | None = None,
+        *,
+        kind: Literal["message", "artifact"] | None = None,
+        roles: builtins.list[Role] | None = None,
+        since_id: UUID | str | None = None,
+        strip_binary: bool | None = None,
     ) -> AsyncIterator[ContextHistoryItem]:
-        result = await Context.list_history(self, client=client)
-        for item in result.items:
-            yield item
-        while result.has_more:
-            result = await Context.list_history(self, page_token=result.next_page_token, client=client)
+        page_token = None
+        while True:
+            result = await Context.list_history(
+                self,
+                page_token=page_token,
+                limit=100,
+                kind=kind,
+                roles=roles,
+                since_id=since_id,
+                strip_binary=strip_binary,
+                client=client,
+            )
             for item in result.items:
                 yield item
+            if not result.has_more:
+                break
+            page_token = result.next_page_token
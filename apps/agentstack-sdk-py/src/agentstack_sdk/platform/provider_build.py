@@ -164,6 +164,7 @@ class ProviderBuild(pydantic.BaseModel):
         *,
         page_token: str | None = None,
         limit: int | None = None,
+        total_count: Literal["none", "exact", "estimate"] | None = None,
         order: Literal["asc"] | Literal["desc"] | None = "asc",
         order_by: Literal["created_at"] | Literal["updated_at"] | None = None,
         user_owned: bool | None = None,
@@ -179,6 +180,7 @@ class ProviderBuild(pydantic.BaseModel):
                             {
                                 "page_token": page_token,
                                 "limit": limit,
+                                "total_count": total_count,
                                 "order": order,
                                 "order_by": order_by,
                                 "user_owned": user_owned,
@@ -5,6 +5,7 @@
 from __future__ import annotations
 
 from enum import StrEnum
+from typing import Literal
 
 import pydantic
 
@@ -42,6 +43,7 @@ class User(pydantic.BaseModel):
         email: str | None = None,
         limit: int = 40,
         page_token: str | None = None,
+        total_count: Literal["none", "exact", "estimate"] | None = None,
         client: PlatformClient | None = None,
     ) -> PaginatedResult["User"]:
         async with client or get_platform_client() as client:
@@ -50,6 +52,8 @@ class User(pydantic.BaseModel):
                 params["email"] = email
             if page_token:
                 params["page_token"] = page_token
+            if total_count:
+                params["total_count"] = total_count
 
             return pydantic.TypeAdapter(PaginatedResult[User]).validate_python(
                 (await client.get(url="/api/v1/users", params=params)).raise_for_status().json()
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import builtins
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
 import pydantic
@@ -32,10 +33,13 @@ class UserFeedback(pydantic.BaseModel):
         provider_id: str | None = None,
         limit: int = 50,
         after_cursor: str | None = None,
+        total_count: Literal["none", "exact", "estimate"] | None = None,
         client: PlatformClient | None = None,
     ) -> "ListUserFeedbackResponse":
         async with client or get_platform_client() as client:
-            params = filter_dict({"provider_id": provider_id, "limit": limit, "after_cursor": after_cursor})
+            params = filter_dict(
+                {"provider_id": provider_id, "limit": limit, "after_cursor": after_cursor, "total_count": total_count}
+            )
             return pydantic.TypeAdapter(ListUserFeedbackResponse).validate_python(
                 (await client.get(url="/api/v1/user_feedback", params=params)).raise_for_status().json()
             )
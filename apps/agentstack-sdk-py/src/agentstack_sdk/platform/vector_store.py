@@ -4,9 +4,12 @@
 
 from __future__ import annotations
 
+import base64
+import struct
 import typing
 import uuid
-from typing import Literal, Self
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Sequence
+from typing import Annotated, Any, Literal, Self
 
 import pydantic
 
@@ -27,13 +30,32 @@ class VectorStoreDocument(pydantic.BaseModel):
     created_at: pydantic.AwareDatetime
 
 
+def encode_embedding(embedding: Sequence[float]) -> str:
+    """Encode an embedding as base64 of little-endian float16 values, the precision used by the vector store."""
+    return base64.b64encode(struct.pack(f"<{len(embedding)}e", *embedding)).decode("ascii")
+
+
+def decode_embedding(value: str) -> list[float]:
+    """
+    Decode a base64 embedding returned by the vector store.
+
+    To get a NumPy array without a list of floats, use `numpy.frombuffer(base64.b64decode(value), dtype="<f2")`.
+    """
+    data = base64.b64decode(value)
+    return list(struct.unpack(f"<{len(data) // 2}e", data))
+
+
+def _decode_embedding_input(value: Any) -> Any:
+    return decode_embedding(value) if isinstance(value, str) else value
+
+
 class VectorStoreItem(pydantic.BaseModel):
     id: str = pydantic.Field(default_factory=lambda: uuid.uuid4().hex)
     document_id: str
     document_type: typing.Literal["platform_file", "external"] | None = "platform_file"
     model_id: str | typing.Literal["platform"] = "platform"
     text: str
-    embedding: list[float]
+    embedding: Annotated[list[float], pydantic.BeforeValidator(_decode_embedding_input)]
     metadata: Metadata | None = None
 
     @pydantic.model_validator(mode="after")
@@ -54,11 +76,67 @@ class VectorStoreSearchResult(pydantic.BaseModel):
     score: float
 
 
+class VectorStoreSearchQuery(pydantic.BaseModel):
+    vector_store_id: str
+    query_vector: list[float]
+    limit: int = 5
+    metadata_filter: dict[str, str] | None = None
+
+
+VectorDistanceMetric = Literal["cosine", "l2", "inner_product"]
+VectorItemsWireFormat = Literal["ndjson", "float16"]
+
+_WIRE_FORMAT_MEDIA_TYPES: dict[VectorItemsWireFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "float16": "application/vnd.agentstack.vector-items+float16",
+}
+
+
+def _encode_item(item: VectorStoreItem, wire_format: VectorItemsWireFormat) -> bytes:
+    match wire_format:
+        case "ndjson":
+            return item.model_dump_json().encode("utf-8") + b"\n"
+        case "float16":
+            # uint32 header length | JSON header | uint32 dimension | float16 embedding, all little-endian
+            header = item.model_dump_json(exclude={"embedding"}).encode("utf-8")
+            dimension = len(item.embedding)
+            return (
+                struct.pack("<I", len(header))
+                + header
+                + struct.pack("<I", dimension)
+                + struct.pack(f"<{dimension}e", *item.embedding)
+            )
+
+
+async def _encode_chunks(
+    items: Iterable[VectorStoreItem] | AsyncIterable[VectorStoreItem],
+    wire_format: VectorItemsWireFormat,
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    async def iterate() -> AsyncIterator[VectorStoreItem]:
+        if isinstance(items, AsyncIterable):
+            async for item in items:
+                yield item
+        else:
+            for item in items:
+                yield item
+
+    chunk: list[bytes] = []
+    async for item in iterate():
+        chunk.append(_encode_item(item, wire_format))
+        if len(chunk) >= chunk_size:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
+
+
 class VectorStore(pydantic.BaseModel):
     id: str
     name: str | None = None
     model_id: str
     dimension: int
+    distance_metric: VectorDistanceMetric = "cosine"
     created_at: pydantic.AwareDatetime
     last_active_at: pydantic.AwareDatetime
     created_by: str
@@ -70,6 +148,7 @@ class VectorStore(pydantic.BaseModel):
         name: str,
         dimension: int,
         model_id: str,
+        distance_metric: VectorDistanceMetric = "cosine",
         client: PlatformClient | None = None,
         context_id: str | None | Literal["auto"] = "auto",
     ) -> "VectorStore":
@@ -79,7 +158,12 @@ class VectorStore(pydantic.BaseModel):
                 (
                     await platform_client.post(
                         url="/api/v1/vector_stores",
-                        json={"name": name, "dimension": dimension, "model_id": model_id},
+                        json={
+                            "name": name,
+                            "dimension": dimension,
+                            "model_id": model_id,
+                            "distance_metric": distance_metric,
+                        },
                         params=context_id and {"context_id": context_id},
                     )
                 )
@@ -134,19 +218,28 @@ class VectorStore(pydantic.BaseModel):
     async def add_documents(
         self: "VectorStore" | str,
         /,
-        items: list[VectorStoreItem],
+        items: Iterable[VectorStoreItem] | AsyncIterable[VectorStoreItem],
         *,
+        wire_format: VectorItemsWireFormat = "float16",
+        chunk_size: int = 1000,
         client: PlatformClient | None = None,
         context_id: str | None | Literal["auto"] = "auto",
     ) -> None:
+        """
+        Stream items to the vector store in a single request, encoded in chunks of `chunk_size` items.
+
+        Embeddings are stored as float16 on the server, so the float16 wire format loses no precision
+        while being several times smaller than JSON.
+        """
         # `self` has a weird type so that you can call both `instance.add_documents()` or `VectorStore.add_documents("123", items)`
         vector_store_id = self if isinstance(self, str) else self.id
         async with client or get_platform_client() as platform_client:
             context_id = platform_client.context_id if context_id == "auto" else context_id
             _ = (
                 await platform_client.put(
-                    url=f"/api/v1/vector_stores/{vector_store_id}",
-                    json=[item.model_dump(mode="json") for item in items],
+                    url=f"/api/v1/vector_stores/{vector_store_id}/items",
+                    content=_encode_chunks(items, wire_format, chunk_size),
+                    headers={"Content-Type": _WIRE_FORMAT_MEDIA_TYPES[wire_format]},
                     params=context_id and {"context_id": context_id},
                 )
             ).raise_for_status()
@@ -157,9 +250,19 @@ class VectorStore(pydantic.BaseModel):
         query_vector: list[float],
         *,
         limit: int = 10,
+        metadata_filter: dict[str, str] | None = None,
+        query_text: str | None = None,
+        encoding_format: Literal["float", "base64"] = "base64",
         client: PlatformClient | None = None,
         context_id: str | None | Literal["auto"] = "auto",
     ) -> list[VectorStoreSearchResult]:
+        """
+        Search the vector store for the nearest items to the query vector.
+
+        `metadata_filter` restricts the results to items whose metadata contains all the given key-value pairs.
+        `query_text` enables hybrid search, full-text matches are fused with the vector results by reciprocal rank
+        fusion and the score is the fusion score rather than similarity.
+        """
         # `self` has a weird type so that you can call both `instance.search()` to search within an instance, or `VectorStore.search("123", query_vector)`
         vector_store_id = self if isinstance(self, str) else self.id
         async with client or get_platform_client() as platform_client:
@@ -168,7 +271,14 @@ class VectorStore(pydantic.BaseModel):
                 (
                     await platform_client.post(
                         url=f"/api/v1/vector_stores/{vector_store_id}/search",
-                        json={"query_vector": query_vector, "limit": limit},
+                        # The vector store compares float16 vectors, base64 float16 is lossless and much smaller
+                        json={
+                            "query_vector": encode_embedding(query_vector),
+                            "limit": limit,
+                            "metadata_filter": metadata_filter,
+                            "query_text": query_text,
+                            "encoding_format": encoding_format,
+                        },
                         params=context_id and {"context_id": context_id},
                     )
                 )
@@ -176,6 +286,42 @@ class VectorStore(pydantic.BaseModel):
                 .json()["items"]
             )
 
+    @staticmethod
+    async def search_batch(
+        queries: list[VectorStoreSearchQuery],
+        *,
+        merge: bool = False,
+        encoding_format: Literal["float", "base64"] = "base64",
+        client: PlatformClient | None = None,
+        context_id: str | None | Literal["auto"] = "auto",
+    ) -> list[list[VectorStoreSearchResult]]:
+        """
+        Run multiple searches, possibly across several vector stores, in a single request.
+
+        Returns the results of each query in order, or a single list of unique items if `merge` is set. Merged results
+        are ranked by reciprocal rank fusion, because scores of different queries are not comparable.
+        """
+        async with client or get_platform_client() as platform_client:
+            context_id = platform_client.context_id if context_id == "auto" else context_id
+            return pydantic.TypeAdapter(list[list[VectorStoreSearchResult]]).validate_python(
+                (
+                    await platform_client.post(
+                        url="/api/v1/vector_stores/search",
+                        json={
+                            "queries": [
+                                query.model_dump(mode="json") | {"query_vector": encode_embedding(query.query_vector)}
+                                for query in queries
+                            ],
+                            "merge": merge,
+                            "encoding_format": encoding_format,
+                        },
+                        params=context_id and {"context_id": context_id},
+                    )
+                )
+                .raise_for_status()
+                .json()["results"]
+            )
+
     async def list_documents(
         self: "VectorStore" | str,
         /,
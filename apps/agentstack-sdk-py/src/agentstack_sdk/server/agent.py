@@ -375,6 +375,18 @@ class AgentRun:
             deep=True, update={"context_id": self.task_updater.context_id, "task_id": self.task_updater.task_id}
         )
 
+    async def _flush_history(self) -> None:
+        # Items stored by the agent must be persisted before the client is told that the turn is over
+        if self._run_context and self._run_context._store:
+            await self._run_context._store.flush()
+
+    async def _flush_history_on_exit(self) -> None:
+        # The run can end by failure or cancellation, the stored items are persisted even then
+        try:
+            await asyncio.shield(self._flush_history())
+        except Exception as ex:
+            logger.error("Failed to store context history", exc_info=ex)
+
     async def _run_agent_function(self, initial_message: Message) -> None:
         yield_queue = self.run_context._yield_queue
         yield_resume_queue = self.run_context._yield_resume_queue
@@ -440,6 +452,7 @@ class AgentRun:
                                 message=message,
                                 timestamp=timestamp,
                             ):
+                                await self._flush_history()
                                 await self.task_updater.update_status(
                                     state=state, message=self._with_context(message), final=True, timestamp=timestamp
                                 )
@@ -455,6 +468,8 @@ class AgentRun:
                                 final=final,
                                 metadata=metadata,
                             ):
+                                if final:
+                                    await self._flush_history()
                                 await self.task_updater.update_status(
                                     state=state,
                                     message=self._with_context(message),
@@ -492,14 +507,19 @@ class AgentRun:
 
                         await yield_resume_queue.async_q.put(resume_value)
 
+                    await self._flush_history()
                     await self.task_updater.complete()
 
                 except (janus.AsyncQueueShutDown, GeneratorExit):
+                    await self._flush_history()
                     await self.task_updater.complete()
                 except Exception as ex:
                     logger.error("Error when executing agent", exc_info=ex)
+                    await self._flush_history_on_exit()
                     await self.task_updater.failed(get_error_extension_context().server.message(ex))
                     await cancel_task(task)
+                finally:
+                    await self._flush_history_on_exit()
         except Exception as ex:
             logger.error("Error when executing agent", exc_info=ex)
             await self.task_updater.failed(get_error_extension_context().server.message(ex))
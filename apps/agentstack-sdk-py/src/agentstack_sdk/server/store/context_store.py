@@ -28,6 +28,9 @@ class ContextStoreInstance(Protocol):
     ) -> AsyncIterator[ContextHistoryItem | Message | Artifact]: ...
     async def store(self, data: Message | Artifact) -> None: ...
     async def delete_history_from_id(self, from_id: UUID) -> None: ...
+    async def flush(self) -> None:
+        """Persist stored items that are still buffered, called before the agent finishes a turn"""
+        return
 
 
 class ContextStore(abc.ABC):
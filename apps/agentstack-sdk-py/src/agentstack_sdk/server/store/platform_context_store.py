@@ -3,22 +3,92 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import AsyncIterator
+from datetime import timedelta
 from uuid import UUID
 
+import httpx
 from a2a.types import Artifact, Message
+from cachetools import TTLCache
 
 from agentstack_sdk.a2a.extensions.services.platform import (
     PlatformApiExtensionServer,
     PlatformApiExtensionSpec,
 )
-from agentstack_sdk.platform.context import Context, ContextHistoryItem
+from agentstack_sdk.platform.context import HISTORY_BATCH_SIZE, Context, ContextHistoryItem
 from agentstack_sdk.server.constants import _IMPLICIT_DEPENDENCY_PREFIX
 from agentstack_sdk.server.dependencies import Dependency, Depends
 from agentstack_sdk.server.store.context_store import ContextStore, ContextStoreInstance
 
 
+class ContextHistoryCache:
+    """
+    Local copy of a context history, kept in sync with the platform incrementally.
+
+    Only items added after the last synced item are fetched, items stored by the agent are appended optimistically
+    until a sync confirms them.
+    """
+
+    def __init__(self, context_id: str):
+        self.context_id = context_id
+        self._items: list[ContextHistoryItem] = []
+        self._pending: list[ContextHistoryItem] = []
+        self._lock = asyncio.Lock()
+
+    @property
+    def items(self) -> list[ContextHistoryItem]:
+        return [*self._items, *self._pending]
+
+    async def sync(self) -> None:
+        async with self._lock:
+            since_id = self._items[-1].id if self._items else None
+            try:
+                new_items = [item async for item in Context.list_all_history(self.context_id, since_id=since_id)]
+            except httpx.HTTPStatusError as ex:
+                if since_id is None or ex.response.status_code != 404:
+                    raise
+                # The last synced item was deleted elsewhere, start over
+                self.invalidate()
+                new_items = [item async for item in Context.list_all_history(self.context_id)]
+            self._items.extend(new_items)
+            synced_ids = {item.id for item in new_items}
+            self._pending = [item for item in self._pending if item.id not in synced_ids]
+
+    def append(self, item: ContextHistoryItem) -> None:
+        self._pending.append(item)
+
+    def truncate(self, from_id: UUID) -> None:
+        if (index := next((i for i, item in enumerate(self._items) if item.id == from_id), None)) is not None:
+            self._items = self._items[:index]
+            self._pending.clear()
+        elif (index := next((i for i, item in enumerate(self._pending) if item.id == from_id), None)) is not None:
+            self._pending = self._pending[:index]
+        else:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        self._items.clear()
+        self._pending.clear()
+
+
 class PlatformContextStore(ContextStore):
+    def __init__(
+        self, max_contexts: int = 1000, context_ttl: timedelta = timedelta(hours=1), flush_threshold: int = 20
+    ):
+        """
+        Initialize platform context store with a TTL cache of context histories.
+
+        Args:
+            max_contexts: Maximum number of context histories to keep in memory
+            context_ttl: Time-to-live for cached context histories (default: 1 hour)
+            flush_threshold: Number of stored items buffered before they are sent to the platform
+        """
+        self._flush_threshold = flush_threshold
+        self._histories: TTLCache[str, ContextHistoryCache] = TTLCache(
+            maxsize=max_contexts, ttl=context_ttl.total_seconds()
+        )
+
     def modify_dependencies(self, dependencies: dict[str, Depends]) -> None:
         for dependency in dependencies.values():
             if dependency.extension is None:
@@ -33,28 +103,78 @@ class PlatformContextStore(ContextStore):
 
     async def create(self, context_id: str, initialized_dependencies: list[Dependency]) -> ContextStoreInstance:
         [platform_ext] = [d for d in initialized_dependencies if isinstance(d, PlatformApiExtensionServer)]
-        return PlatformContextStoreInstance(context_id=context_id, platform_extension=platform_ext)
+        if context_id not in self._histories:
+            self._histories[context_id] = ContextHistoryCache(context_id)
+        instance = PlatformContextStoreInstance(
+            context_id=context_id,
+            platform_extension=platform_ext,
+            history=self._histories[context_id],
+            flush_threshold=self._flush_threshold,
+        )
+        instance.prefetch()
+        return instance
 
 
 class PlatformContextStoreInstance(ContextStoreInstance):
-    def __init__(self, context_id: str, platform_extension: PlatformApiExtensionServer):
+    def __init__(
+        self,
+        context_id: str,
+        platform_extension: PlatformApiExtensionServer,
+        history: ContextHistoryCache | None = None,
+        flush_threshold: int = 20,
+    ):
         self._context_id = context_id
         self._platform_extension = platform_extension
+        self._history = history or ContextHistoryCache(context_id)
+        self._prefetch: asyncio.Task[None] | None = None
+        self._flush_threshold = flush_threshold
+        self._buffer: list[Message | Artifact] = []
+        self._flush_lock = asyncio.Lock()
+
+    def prefetch(self) -> None:
+        """Start syncing the history in the background so that it is ready when the agent loads it"""
+        if self._prefetch is None:
+            self._prefetch = asyncio.create_task(self._sync())
+            # The error is raised again when the history is loaded
+            self._prefetch.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def _sync(self) -> None:
+        async with self._platform_extension.use_client():
+            await self._history.sync()
 
     async def load_history(
         self, load_history_items: bool = False
     ) -> AsyncIterator[ContextHistoryItem | Message | Artifact]:
-        async with self._platform_extension.use_client():
-            async for history_item in Context.list_all_history(self._context_id):
-                if load_history_items:
-                    yield history_item
-                else:
-                    yield history_item.data
+        await self.flush()
+        # Every load is checked against the platform with this request's credentials, a prefetch counts only once
+        prefetch, self._prefetch = self._prefetch, None
+        await (prefetch or self._sync())
+        for history_item in self._history.items:
+            if load_history_items:
+                yield history_item.model_copy(deep=True)
+            else:
+                yield history_item.data.model_copy(deep=True)
 
     async def store(self, data: Message | Artifact) -> None:
-        async with self._platform_extension.use_client():
-            await Context.add_history_item(self._context_id, data=data)
+        """Buffer the item, it is sent with others once the buffer is full, the history is loaded or on flush"""
+        self._buffer.append(data)
+        if len(self._buffer) >= self._flush_threshold:
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            async with self._platform_extension.use_client():
+                # Each batch is committed on its own, only the items that were not sent stay in the buffer
+                while batch := self._buffer[:HISTORY_BATCH_SIZE]:
+                    history_items = await Context.add_history_items(self._context_id, data=batch)
+                    del self._buffer[: len(batch)]
+                    for history_item in history_items:
+                        self._history.append(history_item)
 
     async def delete_history_from_id(self, from_id: UUID) -> None:
+        await self.flush()
         async with self._platform_extension.use_client():
             await Context.delete_history_from_id(self._context_id, from_id=from_id)
+        self._history.truncate(from_id)
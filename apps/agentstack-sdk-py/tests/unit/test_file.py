@@ -0,0 +1,63 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import re
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from agentstack_sdk.platform import File
+from agentstack_sdk.platform.client import PlatformClient
+
+pytestmark = pytest.mark.unit
+
+CONTENT = bytes(range(256)) * 40
+
+FILE = File(
+    id="file_1",
+    filename="data.bin",
+    content_type="application/octet-stream",
+    file_size_bytes=len(CONTENT),
+    created_at=datetime(2026, 1, 1, tzinfo=UTC),
+    created_by="user_1",
+    file_type="user_upload",
+)
+
+
+def _range_response(request: httpx.Request) -> httpx.Response:
+    match = re.fullmatch(r"bytes=(\d+)-(\d+)", request.headers["Range"])
+    assert match
+    start, end = int(match[1]), int(match[2])
+    return httpx.Response(
+        status_code=206,
+        content=CONTENT[start : end + 1],
+        headers={"Content-Range": f"bytes {start}-{end}/{len(CONTENT)}"},
+    )
+
+
+async def test_load_content_in_parallel_ranges(httpx_mock: HTTPXMock):
+    httpx_mock.add_callback(_range_response, url="http://test/api/v1/files/file_1/content", is_reusable=True)
+
+    async with (
+        PlatformClient(base_url="http://test") as client,
+        FILE.load_content(range_size=1000, client=client, context_id=None) as loaded_file,
+    ):
+        assert loaded_file.content == CONTENT
+
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 11
+    assert sorted(request.headers["Range"] for request in requests)[0] == "bytes=0-999"
+
+
+async def test_load_content_falls_back_to_full_response(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="http://test/api/v1/files/file_1/content", content=CONTENT, is_reusable=True)
+
+    async with (
+        PlatformClient(base_url="http://test") as client,
+        FILE.load_content(range_size=4000, client=client, context_id=None) as loaded_file,
+    ):
+        assert loaded_file.content == CONTENT
@@ -0,0 +1,140 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import httpx
+import pytest
+from a2a.types import Message, Part, Role, TextPart
+from pytest_httpx import HTTPXMock
+
+from agentstack_sdk.platform import use_platform_client
+from agentstack_sdk.platform.context import HISTORY_BATCH_SIZE, ContextHistoryItem
+from agentstack_sdk.server.store.platform_context_store import ContextHistoryCache, PlatformContextStoreInstance
+
+pytestmark = pytest.mark.unit
+
+CONTEXT_ID = str(uuid4())
+
+
+def _message(text: str, role: Role = Role.user) -> Message:
+    return Message(message_id=str(uuid4()), role=role, parts=[Part(root=TextPart(text=text))])
+
+
+class FakePlatformExtension:
+    @asynccontextmanager
+    async def use_client(self):
+        async with use_platform_client(base_url="http://test") as client:
+            yield client
+
+
+class FakePlatform:
+    def __init__(self, httpx_mock: HTTPXMock, history: list[Message]):
+        self.items = [ContextHistoryItem(context_id=CONTEXT_ID, data=message) for message in history]
+        self.requests: list[httpx.Request] = []
+        # Batches accepted before the platform starts failing
+        self.max_batches: int | None = None
+        httpx_mock.add_callback(self._handle, is_reusable=True)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method == "POST":
+            assert request.url.path.endswith("/history:batch")
+            if self.max_batches is not None and sum(r.method == "POST" for r in self.requests) > self.max_batches:
+                return httpx.Response(503)
+            items = [
+                ContextHistoryItem(context_id=CONTEXT_ID, data=Message.model_validate(data))
+                for data in json.loads(request.content)["items"]
+            ]
+            self.items.extend(items)
+            return httpx.Response(201, json=[item.model_dump(mode="json") for item in items])
+        start = 0
+        if since_id := request.url.params.get("since_id"):
+            index = next((i for i, item in enumerate(self.items) if str(item.id) == since_id), None)
+            if index is None:
+                return httpx.Response(404, json={"detail": "Context history item not found"})
+            start = index + 1
+        items = [item.model_dump(mode="json") for item in self.items[start:]]
+        return httpx.Response(200, json={"items": items, "has_more": False})
+
+
+def _instance(history: ContextHistoryCache, flush_threshold: int = 20) -> PlatformContextStoreInstance:
+    return PlatformContextStoreInstance(
+        CONTEXT_ID,
+        platform_extension=FakePlatformExtension(),  # pyright: ignore[reportArgumentType]
+        history=history,
+        flush_threshold=flush_threshold,
+    )
+
+
+async def test_history_is_synced_incrementally(httpx_mock: HTTPXMock):
+    platform = FakePlatform(httpx_mock, [_message("hi"), _message("hello", role=Role.agent)])
+    history = ContextHistoryCache(CONTEXT_ID)
+
+    first_turn = _instance(history)
+    first_turn.prefetch()
+    assert len([message async for message in first_turn.load_history()]) == 2
+    await first_turn.store(_message("how are you?", role=Role.agent))
+    await first_turn.flush()
+
+    # An item added by the client between the turns
+    platform.items.append(ContextHistoryItem(context_id=CONTEXT_ID, data=_message("fine")))
+    second_turn = _instance(history)
+    loaded = [item async for item in second_turn.load_history(load_history_items=True)]
+    assert [item.id for item in loaded] == [item.id for item in platform.items]
+
+    [first_sync, _store, second_sync] = platform.requests
+    assert "since_id" not in first_sync.url.params
+    assert second_sync.url.params["since_id"] == str(platform.items[1].id)
+
+
+async def test_deleted_history_is_reloaded(httpx_mock: HTTPXMock):
+    platform = FakePlatform(httpx_mock, [_message("hi"), _message("hello", role=Role.agent)])
+    history = ContextHistoryCache(CONTEXT_ID)
+    assert len([message async for message in _instance(history).load_history()]) == 2
+
+    # The history was edited elsewhere, the synced cursor is gone
+    platform.items = [ContextHistoryItem(context_id=CONTEXT_ID, data=_message("edited"))]
+    loaded = [message async for message in _instance(history).load_history()]
+    assert loaded == [platform.items[0].data]
+
+
+async def test_stored_items_are_sent_in_batches(httpx_mock: HTTPXMock):
+    platform = FakePlatform(httpx_mock, [])
+    instance = _instance(ContextHistoryCache(CONTEXT_ID), flush_threshold=2)
+    messages = [_message(str(i), role=Role.agent) for i in range(3)]
+
+    for message in messages:
+        await instance.store(message)
+    assert len(platform.requests) == 1
+    assert len(platform.items) == 2
+
+    # Loading the history sends the rest of the buffer first
+    loaded = [message async for message in instance.load_history()]
+    assert loaded == messages
+    assert [request.method for request in platform.requests] == ["POST", "POST", "GET"]
+    await instance.flush()
+    assert len(platform.requests) == 3
+
+
+async def test_failed_flush_keeps_only_unsent_items(httpx_mock: HTTPXMock):
+    platform = FakePlatform(httpx_mock, [])
+    history = ContextHistoryCache(CONTEXT_ID)
+    instance = _instance(history, flush_threshold=1000)
+    messages = [_message(str(i), role=Role.agent) for i in range(HISTORY_BATCH_SIZE + 10)]
+    for message in messages:
+        await instance.store(message)
+
+    platform.max_batches = 1
+    with pytest.raises(httpx.HTTPStatusError):
+        await instance.flush()
+    assert [item.data for item in history.items] == messages[:HISTORY_BATCH_SIZE]
+
+    platform.max_batches = None
+    await instance.flush()
+    assert [item.data for item in platform.items] == messages
+    assert [item.data for item in history.items] == messages
@@ -0,0 +1,107 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import json
+import struct
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from agentstack_sdk.platform import VectorStore, VectorStoreItem, VectorStoreSearchQuery
+from agentstack_sdk.platform.client import PlatformClient
+from agentstack_sdk.platform.vector_store import decode_embedding, encode_embedding
+
+pytestmark = pytest.mark.unit
+
+ITEMS = [
+    VectorStoreItem(document_id="doc_1", document_type="external", text="first", embedding=[0.5, -1.0]),
+    VectorStoreItem(document_id="doc_2", document_type="external", text="second", embedding=[0.25, 2.0]),
+    VectorStoreItem(document_id="doc_3", document_type="external", text="third", embedding=[0.0, 1.0]),
+]
+
+
+async def test_add_documents_streams_ndjson(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(method="PUT", url="http://test/api/v1/vector_stores/vs_1/items")
+
+    async with PlatformClient(base_url="http://test") as client:
+        await VectorStore.add_documents(
+            "vs_1", ITEMS, wire_format="ndjson", chunk_size=2, client=client, context_id=None
+        )
+
+    request = httpx_mock.get_request()
+    assert request is not None
+    assert request.headers["Content-Type"] == "application/x-ndjson"
+    lines = request.content.decode().splitlines()
+    assert [json.loads(line)["document_id"] for line in lines] == ["doc_1", "doc_2", "doc_3"]
+
+
+async def test_add_documents_streams_float16_frames(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(method="PUT", url="http://test/api/v1/vector_stores/vs_1/items")
+
+    async def items():
+        for item in ITEMS:
+            yield item
+
+    async with PlatformClient(base_url="http://test") as client:
+        await VectorStore.add_documents("vs_1", items(), client=client, context_id=None)
+
+    request = httpx_mock.get_request()
+    assert request is not None
+    assert request.headers["Content-Type"] == "application/vnd.agentstack.vector-items+float16"
+    body, offset, decoded = request.content, 0, []
+    while offset < len(body):
+        (header_length,) = struct.unpack_from("<I", body, offset)
+        header = json.loads(body[offset + 4 : offset + 4 + header_length])
+        offset += 4 + header_length
+        (dimension,) = struct.unpack_from("<I", body, offset)
+        embedding = list(struct.unpack_from(f"<{dimension}e", body, offset + 4))
+        offset += 4 + dimension * 2
+        decoded.append((header["document_id"], embedding))
+    assert decoded == [(item.document_id, item.embedding) for item in ITEMS]
+
+
+async def test_search_decodes_base64_embeddings(httpx_mock: HTTPXMock):
+    item = ITEMS[0].model_dump(mode="json") | {"embedding": encode_embedding(ITEMS[0].embedding)}
+    httpx_mock.add_response(
+        method="POST",
+        url="http://test/api/v1/vector_stores/vs_1/search",
+        json={"items": [{"item": item, "score": 0.5}], "total_count": 1},
+    )
+
+    async with PlatformClient(base_url="http://test") as client:
+        results = await VectorStore.search("vs_1", [0.5, -1.0], client=client, context_id=None)
+
+    request = httpx_mock.get_request()
+    assert request is not None
+    body = json.loads(request.content)
+    assert body["encoding_format"] == "base64"
+    assert decode_embedding(body["query_vector"]) == [0.5, -1.0]
+    assert results[0].item.embedding == ITEMS[0].embedding
+
+
+async def test_search_batch(httpx_mock: HTTPXMock):
+    item = ITEMS[0].model_dump(mode="json")
+    httpx_mock.add_response(
+        method="POST",
+        url="http://test/api/v1/vector_stores/search",
+        json={"results": [[{"item": item, "score": 0.5}], []]},
+    )
+
+    async with PlatformClient(base_url="http://test") as client:
+        results = await VectorStore.search_batch(
+            [
+                VectorStoreSearchQuery(vector_store_id="vs_1", query_vector=[0.5, -1.0]),
+                VectorStoreSearchQuery(vector_store_id="vs_2", query_vector=[0.5, 2.0], metadata_filter={"a": "b"}),
+            ],
+            client=client,
+            context_id=None,
+        )
+
+    request = httpx_mock.get_request()
+    assert request is not None
+    queries = json.loads(request.content)["queries"]
+    assert [query["vector_store_id"] for query in queries] == ["vs_1", "vs_2"]
+    assert decode_embedding(queries[1]["query_vector"]) == [0.5, 2.0]
+    assert [len(query_results) for query_results in results] == [1, 0]
@@ -6,6 +6,7 @@
 import type { CallApi } from '../core/types';
 import { ApiMethod } from '../core/types';
 import {
+  createContextHistoryBatchResponseSchema,
   createContextHistoryResponseSchema,
   createContextResponseSchema,
   createContextTokenResponseSchema,
@@ -17,6 +18,7 @@ import {
   updateContextResponseSchema,
 } from './schemas';
 import type {
+  CreateContextHistoryBatchRequest,
   CreateContextHistoryRequest,
   CreateContextRequest,
   CreateContextTokenRequest,
@@ -83,6 +85,14 @@ export function createContextsApi(callApi: CallApi) {
       body,
     });
 
+  const createContextHistoryBatch = ({ context_id, ...body }: CreateContextHistoryBatchRequest) =>
+    callApi({
+      method: ApiMethod.Post,
+      path: `/api/v1/contexts/${context_id}/history:batch`,
+      schema: createContextHistoryBatchResponseSchema,
+      body,
+    });
+
   const patchContextMetadata = ({ context_id, ...body }: PatchContextMetadataRequest) =>
     callApi({
       method: ApiMethod.Patch,
@@ -107,6 +117,7 @@ export function createContextsApi(callApi: CallApi) {
     deleteContext,
     listContextHistory,
     createContextHistory,
+    createContextHistoryBatch,
     patchContextMetadata,
     createContextToken,
   };
@@ -70,7 +70,14 @@ export const contextHistorySchema = z.object({
 
 export const listContextHistoryRequestSchema = z.object({
   context_id: z.string(),
-  query: paginationQuerySchema.optional(),
+  query: paginationQuerySchema
+    .extend({
+      kind: contextHistoryKind.optional(),
+      roles: z.array(z.literal(['agent', 'user'])).optional(),
+      since_id: z.string().optional(),
+      strip_binary: z.boolean().optional(),
+    })
+    .optional(),
 });
 
 export const listContextHistoryResponseSchema = paginatedResponseSchema.extend({
@@ -82,7 +89,14 @@ export const createContextHistoryRequestSchema = z.object({
   data: z.union([artifactSchema, messageSchema]),
 });
 
-export const createContextHistoryResponseSchema = z.null();
+export const createContextHistoryResponseSchema = contextHistorySchema;
+
+export const createContextHistoryBatchRequestSchema = z.object({
+  context_id: z.string(),
+  items: z.array(z.union([artifactSchema, messageSchema])).min(1).max(100),
+});
+
+export const createContextHistoryBatchResponseSchema = z.array(contextHistorySchema);
 
 export const patchContextMetadataRequestSchema = z.object({
   context_id: z.string(),
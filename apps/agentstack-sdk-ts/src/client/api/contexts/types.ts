@@ -10,6 +10,8 @@ import type {
   contextPermissionsGrantSchema,
   contextSchema,
   contextTokenSchema,
+  createContextHistoryBatchRequestSchema,
+  createContextHistoryBatchResponseSchema,
   createContextHistoryRequestSchema,
   createContextHistoryResponseSchema,
   createContextRequestSchema,
@@ -61,6 +63,9 @@ export type ListContextHistoryResponse = z.infer<typeof listContextHistoryRespon
 export type CreateContextHistoryRequest = z.infer<typeof createContextHistoryRequestSchema>;
 export type CreateContextHistoryResponse = z.infer<typeof createContextHistoryResponseSchema>;
 
+export type CreateContextHistoryBatchRequest = z.infer<typeof createContextHistoryBatchRequestSchema>;
+export type CreateContextHistoryBatchResponse = z.infer<typeof createContextHistoryBatchResponseSchema>;
+
 export type PatchContextMetadataRequest = z.infer<typeof patchContextMetadataRequestSchema>;
 export type PatchContextMetadataResponse = z.infer<typeof patchContextMetadataResponseSchema>;
 
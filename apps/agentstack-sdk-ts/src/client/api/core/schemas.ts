@@ -10,11 +10,12 @@ export const paginationQuerySchema = z.object({
   order: z.string().optional(),
   order_by: z.string().optional(),
   page_token: z.string().nullish(),
+  total_count: z.enum(['none', 'exact', 'estimate']).optional(),
 });
 
 export const paginatedResponseSchema = z.object({
   items: z.array(z.unknown()),
-  total_count: z.number(),
+  total_count: z.number().nullable(),
   has_more: z.boolean(),
   next_page_token: z.string().nullable(),
 });
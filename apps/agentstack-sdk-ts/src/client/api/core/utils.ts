@@ -12,7 +12,9 @@ export function buildRequestUrl({ baseUrl, path, query }: { baseUrl: string; pat
     const searchParams = new URLSearchParams();
 
     Object.entries(query).forEach(([key, value]) => {
-      if (value != null) {
+      if (Array.isArray(value)) {
+        value.forEach((item) => searchParams.append(key, String(item)));
+      } else if (value != null) {
         searchParams.append(key, String(value));
       }
     });
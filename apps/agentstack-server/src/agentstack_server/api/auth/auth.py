@@ -3,15 +3,19 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
+import time
 from collections.abc import Iterable
 from datetime import UTC, datetime, timedelta
-from typing import Any, cast
+from typing import Any, Final, cast
 from uuid import UUID
 
+import cachetools
 import httpx
 from async_lru import alru_cache
-from authlib.jose import JWTClaims, jwt
+from authlib.jose import JWTClaims, Key, jwt
 from authlib.jose.errors import DecodeError, KeyMismatchError
 from authlib.jose.rfc7517 import JsonWebKey, KeySet
 from authlib.oauth2.rfc7662 import IntrospectTokenValidator
@@ -95,6 +99,34 @@ class ParsedToken(BaseModel):
     raw: dict[str, Any]
 
 
+# Internal tokens are verified on every request and exchanged on every proxied agent call, the results are cached
+# until the token expires
+INTERNAL_TOKEN_CACHE_SIZE: Final = 10_000
+
+_verified_tokens: cachetools.TLRUCache[tuple[str, str], ParsedToken] = cachetools.TLRUCache(
+    maxsize=INTERNAL_TOKEN_CACHE_SIZE,
+    ttu=lambda _key, parsed_token, _now: parsed_token.raw["exp"],
+    timer=time.time,
+)
+_exchanged_tokens: cachetools.TLRUCache[tuple[str, tuple[str, ...], str], tuple[str, AwareDatetime]] = (
+    cachetools.TLRUCache(
+        maxsize=INTERNAL_TOKEN_CACHE_SIZE,
+        ttu=lambda _key, exchanged_token, _now: exchanged_token[1].timestamp(),
+        timer=time.time,
+    )
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _import_key(pem: str) -> Key:
+    # Loading a PEM key validates it, which costs far more than the signature itself (hundreds of ms for RSA)
+    return JsonWebKey.import_key(pem)
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def issue_internal_jwt(
     user_id: UUID,
     context_id: UUID,
@@ -105,11 +137,11 @@ def issue_internal_jwt(
     expires_at: AwareDatetime | None = None,
 ) -> tuple[str, AwareDatetime]:
     assert configuration.auth.jwt_private_key
-    secret_key = configuration.auth.jwt_private_key.get_secret_value()
+    secret_key = _import_key(configuration.auth.jwt_private_key.get_secret_value())
     now = utc_now()
     if expires_at is None:
         expires_at = now + timedelta(minutes=20)
-    header = {"alg": "RS256"}
+    header = {"alg": configuration.auth.jwt_algorithm}
 
     payload = {
         "context_id": str(context_id),
@@ -130,9 +162,13 @@ def issue_internal_jwt(
 def verify_internal_jwt(token: str, configuration: Configuration) -> ParsedToken:
     assert configuration.auth.jwt_public_key
     public_key = configuration.auth.jwt_public_key.get_secret_value()
+    cache_key = (_token_digest(token), public_key)
+    if parsed_token := _verified_tokens.get(cache_key):
+        return parsed_token
+
     claims: JWTClaims = jwt.decode(
         token,
-        key=public_key,
+        key=_import_key(public_key),
         claims_options={
             "sub": {"essential": True},
             "exp": {"essential": True},
@@ -142,7 +178,7 @@ def verify_internal_jwt(token: str, configuration: Configuration) -> ParsedToken
     )
     claims.validate()
     context_id = UUID(claims["resource"][0].replace("context:", ""))
-    return ParsedToken(
+    parsed_token = ParsedToken(
         global_permissions=Permissions.model_validate(claims["scope"]["global"]),
         context_permissions=Permissions.model_validate(claims["scope"]["context"]),
         context_id=context_id,
@@ -150,14 +186,21 @@ def verify_internal_jwt(token: str, configuration: Configuration) -> ParsedToken
         iat=claims["iat"],
         raw=claims,
     )
+    _verified_tokens[cache_key] = parsed_token
+    return parsed_token
 
 
 def exchange_internal_jwt(
     token: str, configuration: Configuration, audience: list[str] | None = None
 ) -> tuple[str, AwareDatetime]:
     parsed_token = verify_internal_jwt(token, configuration)
+    # The exchanged token expires together with the original one, so it can be reused for its whole lifetime
+    cache_key = (_token_digest(token), tuple(audience or ()), configuration.auth.jwt_private_key.get_secret_value())
+    if exchanged_token := _exchanged_tokens.get(cache_key):
+        return exchanged_token
+
     expires_at = datetime.fromtimestamp(parsed_token.raw["exp"], UTC)
-    return issue_internal_jwt(
+    exchanged_token = issue_internal_jwt(
         user_id=parsed_token.user_id,
         context_id=parsed_token.context_id,
         global_permissions=parsed_token.global_permissions,
@@ -166,6 +209,8 @@ def exchange_internal_jwt(
         audience=audience,
         expires_at=expires_at,
     )
+    _exchanged_tokens[cache_key] = exchanged_token
+    return exchanged_token
 
 
 @alru_cache(ttl=timedelta(minutes=60).seconds)
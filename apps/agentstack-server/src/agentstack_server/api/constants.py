@@ -4,3 +4,10 @@
 from __future__ import annotations
 
 AGENTSTACK_PROXY_VERSION = 1
+
+# Media types of the streaming vector store ingestion endpoint
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+FLOAT16_VECTOR_ITEMS_MEDIA_TYPE = "application/vnd.agentstack.vector-items+float16"
+
+# Upper bound on a single streamed vector store item, the request body itself is not limited
+MAX_STREAMED_VECTOR_ITEM_BYTES = 16 * 1024 * 1024
@@ -57,8 +57,54 @@ class UserRateLimiter:
                 amount = configured_limit.amount
                 raise RateLimitExceededError(key=self._key, amount=amount, remaining=remaining, reset_time=reset_time)
 
+    def lease(self, limit: RateLimit, size: int, max_cost: int | None = None) -> RateLimitLease:
+        """Lease a budget of the limit reserved in blocks as it is consumed, see RateLimitLease."""
+        size = min([size, *(configured_limit.amount for configured_limit in self._get_limits(limit))])
+        return RateLimitLease(rate_limiter=self, limit=limit, size=size, max_cost=max_cost)
+
     @asynccontextmanager
     async def limit(self, limit: RateLimit, cost: int = 1):
         if self._enabled:
             await self.hit(limit, cost)
         yield
+
+
+class RateLimitLease:
+    """
+    Budget reserved from a rate limit and accounted locally
+
+    Used for frequent small hits (e.g. tokens of streamed chunks), which would otherwise each need a round-trip to the
+    rate limit storage. A block is reserved only when the budget runs out. Blocks start at the first hit and double up
+    to the lease size, so the number of round-trips stays logarithmic while the unused part of the last block, which
+    can't be returned to the storage, stays below both the actual usage and the lease size. Blocks never reserve past
+    the known maximum cost (e.g. max_tokens of the request).
+    """
+
+    def __init__(self, rate_limiter: UserRateLimiter, limit: RateLimit, size: int, max_cost: int | None = None):
+        self._rate_limiter: Final[UserRateLimiter] = rate_limiter
+        self._limit: Final[RateLimit] = limit
+        self._size: Final[int] = size
+        self._max_cost: Final[int | None] = max_cost
+        self.reserved: int = 0
+        self.used: int = 0
+
+    def _next_block(self) -> int:
+        block = min(self.reserved, self._size)
+        if self._max_cost is not None:
+            block = min(block, self._max_cost - self.reserved)
+        return block
+
+    async def reserve(self, cost: int) -> None:
+        await self._rate_limiter.hit(self._limit, cost=cost)
+        self.reserved += cost
+
+    async def consume(self, cost: int) -> None:
+        self.used += cost
+        if self.used > self.reserved:
+            await self.reserve(max(self.used - self.reserved, self._next_block()))
+
+    async def settle(self, used: int) -> None:
+        """Account the actual usage once it is known, reserving only what is missing."""
+        if used > self.reserved:
+            await self.reserve(used - self.reserved)
+        self.used = max(self.used, used)
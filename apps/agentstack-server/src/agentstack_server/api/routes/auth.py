@@ -31,6 +31,6 @@ def jwks():
     key = JsonWebKey.import_key(
         # pyrefly: ignore [bad-argument-type] -- typeshed issue
         config.auth.jwt_public_key.get_secret_value(),
-        {"use": "sig", "alg": "RS256"},
+        {"use": "sig", "alg": config.auth.jwt_algorithm},
     )
     return {"keys": [key.as_dict()]}
@@ -8,7 +8,7 @@ from typing import Annotated
 from uuid import UUID
 
 import fastapi
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 
 from agentstack_server.api.auth.auth import issue_internal_jwt
 from agentstack_server.api.dependencies import (
@@ -17,10 +17,12 @@ from agentstack_server.api.dependencies import (
     RequiresContextPermissionsPath,
     RequiresPermissions,
 )
-from agentstack_server.api.schema.common import EntityModel, PaginationQuery
+from agentstack_server.api.schema.common import EntityModel
 from agentstack_server.api.schema.contexts import (
     ContextCreateRequest,
+    ContextHistoryBatchCreateRequest,
     ContextHistoryItemCreateRequest,
+    ContextHistoryQuery,
     ContextListQuery,
     ContextPatchMetadataRequest,
     ContextTokenCreateRequest,
@@ -144,8 +146,18 @@ async def add_context_history_item(
     history_item_data: ContextHistoryItemCreateRequest,
     context_service: ContextServiceDependency,
     user: Annotated[AuthorizedUser, Depends(RequiresContextPermissionsPath(context_data={"write"}))],
-) -> None:
-    await context_service.add_history_item(context_id=context_id, data=history_item_data.root, user=user.user)
+) -> ContextHistoryItem:
+    return await context_service.add_history_item(context_id=context_id, data=history_item_data.root, user=user.user)
+
+
+@router.post("/{context_id}/history:batch", status_code=status.HTTP_201_CREATED)
+async def add_context_history_items(
+    context_id: UUID,
+    request: ContextHistoryBatchCreateRequest,
+    context_service: ContextServiceDependency,
+    user: Annotated[AuthorizedUser, Depends(RequiresContextPermissionsPath(context_data={"write"}))],
+) -> list[ContextHistoryItem]:
+    return await context_service.add_history_items(context_id=context_id, data=request.items, user=user.user)
 
 
 @router.get("/{context_id}/history")
@@ -153,9 +165,36 @@ async def list_context_history(
     context_id: UUID,
     context_service: ContextServiceDependency,
     user: Annotated[AuthorizedUser, Depends(RequiresContextPermissionsPath(context_data={"read"}))],
-    pagination: Annotated[PaginationQuery, Query()],
+    query: Annotated[ContextHistoryQuery, Query()],
+    request: fastapi.Request,
 ) -> PaginatedResult[ContextHistoryItem]:
-    return await context_service.list_history(context_id=context_id, user=user.user, pagination=pagination)
+    def part_content_url(item_id: UUID, part_index: int) -> str:
+        return str(
+            request.url_for(
+                get_context_history_part_content.__name__,
+                context_id=context_id,
+                item_id=item_id,
+                part_index=part_index,
+            )
+        )
+
+    return await context_service.list_history(
+        context_id=context_id, user=user.user, query=query, part_content_url=part_content_url
+    )
+
+
+@router.get("/{context_id}/history/{item_id}/parts/{part_index}/content")
+async def get_context_history_part_content(
+    context_id: UUID,
+    item_id: UUID,
+    part_index: int,
+    context_service: ContextServiceDependency,
+    user: Annotated[AuthorizedUser, Depends(RequiresContextPermissionsPath(context_data={"read"}))],
+) -> Response:
+    content, mime_type = await context_service.get_history_part_content(
+        context_id=context_id, item_id=item_id, part_index=part_index, user=user.user
+    )
+    return Response(content=content, media_type=mime_type or "application/octet-stream")
 
 
 @router.delete("/{context_id}/history", status_code=status.HTTP_204_NO_CONTENT)
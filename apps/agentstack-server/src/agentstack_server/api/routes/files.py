@@ -9,15 +9,17 @@ from typing import Annotated
 from uuid import UUID
 
 import fastapi
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import RedirectResponse, StreamingResponse
 
 from agentstack_server.api.dependencies import (
+    ConfigurationDependency,
     FileServiceDependency,
     RequiresContextPermissions,
 )
 from agentstack_server.api.schema.common import EntityModel
 from agentstack_server.api.schema.files import FileListQuery, TextExtractionRequest
+from agentstack_server.api.utils import parse_range_header
 from agentstack_server.domain.models.common import PaginatedResult
 from agentstack_server.domain.models.file import (
     AsyncFile,
@@ -72,10 +74,18 @@ async def get_file(
     return EntityModel(await file_service.get(file_id=file_id, user=user.user, context_id=user.context_id))
 
 
-async def _stream_file(*, file_service: FileService, user: AuthorizedUser, file_id: UUID) -> StreamingResponse:
+async def _stream_file(
+    *, file_service: FileService, user: AuthorizedUser, file_id: UUID, range_header: str | None = None
+) -> StreamingResponse:
+    byte_range = file_size = None
+    if range_header:
+        db_file = await file_service.get(file_id=file_id, user=user.user, context_id=user.context_id)
+        file_size = db_file.file_size_bytes
+        byte_range = parse_range_header(range_header, file_size)
+
     exit_stack = AsyncExitStack()
     file = await exit_stack.enter_async_context(
-        file_service.get_content(file_id=file_id, user=user.user, context_id=user.context_id)
+        file_service.get_content(file_id=file_id, user=user.user, context_id=user.context_id, byte_range=byte_range)
     )
 
     async def iter_file(chunk_size=8192):
@@ -85,16 +95,34 @@ async def _stream_file(*, file_service: FileService, user: AuthorizedUser, file_
         finally:
             await exit_stack.aclose()
 
-    return StreamingResponse(content=iter_file(), media_type=file.content_type)
+    headers = {"Accept-Ranges": "bytes"}
+    if file.size is not None:
+        headers["Content-Length"] = str(file.size)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {byte_range.start}-{byte_range.end}/{file_size}"
+        return StreamingResponse(
+            content=iter_file(),
+            media_type=file.content_type,
+            headers=headers,
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+        )
+    return StreamingResponse(content=iter_file(), media_type=file.content_type, headers=headers)
 
 
 @router.get("/{file_id}/content")
 async def get_file_content(
     file_id: UUID,
     file_service: FileServiceDependency,
+    configuration: ConfigurationDependency,
     user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(files={"read"}))],
-) -> StreamingResponse:
-    return await _stream_file(file_service=file_service, user=user, file_id=file_id)
+    range_header: Annotated[str | None, Header(alias="range")] = None,
+    redirect: bool = False,
+) -> Response:
+    if redirect and configuration.object_storage.download_redirect_enabled:
+        # Large downloads go directly to the object storage instead of being proxied by the API
+        url = await file_service.get_content_url(file_id=file_id, user=user.user, context_id=user.context_id)
+        return RedirectResponse(url=str(url), status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    return await _stream_file(file_service=file_service, user=user, file_id=file_id, range_header=range_header)
 
 
 @router.get("/{file_id}/text_content")
@@ -102,6 +130,7 @@ async def get_text_file_content(
     file_id: UUID,
     file_service: FileServiceDependency,
     user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(files={"read"}))],
+    range_header: Annotated[str | None, Header(alias="range")] = None,
 ) -> StreamingResponse:
     extraction = await file_service.get_extraction(file_id=file_id, user=user.user, context_id=user.context_id)
     if not extraction.status == ExtractionStatus.COMPLETED or not extraction.extracted_files:
@@ -129,7 +158,9 @@ async def get_text_file_content(
             )
         file_to_stream_id = markdown_file_id
 
-    return await _stream_file(file_service=file_service, user=user, file_id=file_to_stream_id)
+    return await _stream_file(
+        file_service=file_service, user=user, file_id=file_to_stream_id, range_header=range_header
+    )
 
 
 @router.delete("/{file_id}", status_code=fastapi.status.HTTP_204_NO_CONTENT)
@@ -12,6 +12,7 @@ from fastapi import Depends
 
 from agentstack_server.api.constants import AGENTSTACK_PROXY_VERSION
 from agentstack_server.api.dependencies import (
+    ConfigurationDependency,
     ModelProviderServiceDependency,
     RequiresPermissions,
     UserRateLimiterDependency,
@@ -22,7 +23,7 @@ from agentstack_server.api.schema.openai import (
     EmbeddingsRequest,
     OpenAIPage,
 )
-from agentstack_server.api.utils import estimate_llm_cost, format_openai_error
+from agentstack_server.api.utils import StreamedLLMCostEstimator, estimate_llm_cost, format_openai_error
 from agentstack_server.domain.models.model_provider import Model
 from agentstack_server.domain.models.permissions import AuthorizedUser
 from agentstack_server.utils.fastapi import streaming_response
@@ -35,6 +36,7 @@ async def create_chat_completion(
     model_provider_service: ModelProviderServiceDependency,
     request: ChatCompletionRequest,
     user_rate_limiter: UserRateLimiterDependency,
+    configuration: ConfigurationDependency,
     _: Annotated[AuthorizedUser, Depends(RequiresPermissions(llm={"*"}))],
 ):
     request_cost = estimate_llm_cost(request)
@@ -44,23 +46,21 @@ async def create_chat_completion(
     if request.stream:
         request.stream_options = request.stream_options or openai.types.chat.ChatCompletionStreamOptionsParam()
         request.stream_options["include_usage"] = True
+        lease = user_rate_limiter.lease(
+            RateLimit.OPENAI_CHAT_COMPLETION_TOKENS,
+            size=configuration.rate_limit.streaming_lease_tokens,
+            max_cost=request.max_completion_tokens or request.max_tokens,
+        )
 
         async def _stream():
             chunk = None
-            total_estimated_cost = request_cost
+            estimator = StreamedLLMCostEstimator()
             async for chunk in model_provider_service.create_chat_completion_stream(request=request):
-                estimated_cost = estimate_llm_cost(chunk)
-                total_estimated_cost += estimated_cost
-                await user_rate_limiter.hit(RateLimit.OPENAI_CHAT_COMPLETION_TOKENS, cost=estimated_cost)
+                await lease.consume(estimator.add(chunk))
                 yield json.dumps(chunk.model_dump(mode="json") | {"agentstack_proxy_version": AGENTSTACK_PROXY_VERSION})
 
-            if chunk and chunk.usage and (total_cost := chunk.usage.total_tokens) and total_estimated_cost < total_cost:
-                await user_rate_limiter.hit(
-                    RateLimit.OPENAI_CHAT_COMPLETION_TOKENS, cost=total_cost - total_estimated_cost
-                )
-            # TODO: We might have overestimated the actual cost, can be resolved by clearing the limit
-            # and hitting again with correct cost (careful about atomicity) or maybe using negative cost, but that is
-            # not documented in the backend library. For simplicity, we ignore this case, because on average we have good estimates
+            if chunk and chunk.usage and chunk.usage.total_tokens:
+                await lease.settle(used=chunk.usage.total_tokens - request_cost)
 
         return streaming_response(_stream(), encode_exception=lambda e: json.dumps(format_openai_error(e)))
 
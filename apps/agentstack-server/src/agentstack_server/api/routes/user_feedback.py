@@ -18,6 +18,7 @@ from agentstack_server.api.schema.user_feedback import (
     ListUserFeedbackResponse,
     UserFeedbackResponse,
 )
+from agentstack_server.domain.models.common import TotalCount
 from agentstack_server.domain.models.permissions import AuthorizedUser
 
 router = fastapi.APIRouter()
@@ -49,16 +50,19 @@ async def list_user_feedback(
     user: Annotated[AuthorizedUser, Depends(RequiresPermissions(feedback={"read"}))],
     provider_id: Annotated[UUID | None, Query()] = None,
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
-    after_cursor: Annotated[UUID | None, Query()] = None,
+    after_cursor: Annotated[str | None, Query()] = None,
+    total_count: Annotated[TotalCount, Query()] = TotalCount.NONE,
 ) -> ListUserFeedbackResponse:
-    feedback_list, total, has_more = await user_feedback_service.list_user_feedback(
+    result = await user_feedback_service.list_user_feedback(
         user=user.user,
         provider_id=provider_id,
         limit=limit,
         after_cursor=after_cursor,
+        total_count=total_count,
     )
     return ListUserFeedbackResponse(
-        items=[UserFeedbackResponse.model_validate(dict(feedback)) for feedback in feedback_list],
-        total_count=total,
-        has_more=has_more,
+        items=[UserFeedbackResponse.model_validate(dict(feedback)) for feedback in result.items],
+        total_count=result.total_count,
+        has_more=result.has_more,
+        next_page_token=result.next_page_token,
     )
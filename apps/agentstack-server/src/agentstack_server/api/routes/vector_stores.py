@@ -7,17 +7,22 @@ import logging
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
 
+from agentstack_server.api.constants import FLOAT16_VECTOR_ITEMS_MEDIA_TYPE, NDJSON_MEDIA_TYPE
 from agentstack_server.api.dependencies import (
     RequiresContextPermissions,
     VectorStoreServiceDependency,
 )
 from agentstack_server.api.schema.common import EntityModel
 from agentstack_server.api.schema.vector_stores import (
+    BatchSearchRequest,
+    BatchSearchResponse,
     CreateVectorStoreRequest,
     SearchRequest,
 )
+from agentstack_server.api.utils import parse_float16_vector_items, parse_ndjson_vector_items
 from agentstack_server.domain.models.common import PaginatedResult
 from agentstack_server.domain.models.permissions import AuthorizedUser
 from agentstack_server.domain.models.vector_store import (
@@ -46,10 +51,27 @@ async def create_vector_store(
             user=user.user,
             model_id=request.model_id,
             context_id=user.context_id,
+            distance_metric=request.distance_metric,
         )
     )
 
 
+@router.post("/search", response_model=BatchSearchResponse)
+async def search_batch(
+    request: BatchSearchRequest,
+    vector_store_service: VectorStoreServiceDependency,
+    user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(vector_stores={"read"}))],
+) -> BatchSearchResponse | JSONResponse:
+    """Run multiple vector searches, possibly across several vector stores, in a single request."""
+    results = await vector_store_service.search_batch(
+        queries=request.queries, merge=request.merge, user=user.user, context_id=user.context_id
+    )
+    response = BatchSearchResponse(results=results)
+    if request.encoding_format == "base64":
+        return JSONResponse(response.model_dump(mode="json", context={"embedding_encoding": "base64"}))
+    return response
+
+
 @router.get("/{vector_store_id}")
 async def get_vector_store(
     vector_store_id: UUID,
@@ -84,22 +106,66 @@ async def add_items(
     )
 
 
-@router.post("/{vector_store_id}/search")
+@router.put(
+    "/{vector_store_id}/items",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                NDJSON_MEDIA_TYPE: {"schema": {"$ref": "#/components/schemas/VectorStoreItem"}},
+                FLOAT16_VECTOR_ITEMS_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+async def add_items_stream(
+    vector_store_id: UUID,
+    request: Request,
+    vector_store_service: VectorStoreServiceDependency,
+    user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(vector_stores={"write"}))],
+) -> None:
+    """
+    Stream items into a vector store.
+
+    The body is either newline-delimited JSON items or binary frames with float16 embeddings, items are written
+    in batches as the body arrives.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type == NDJSON_MEDIA_TYPE:
+        items = parse_ndjson_vector_items(request.stream())
+    elif media_type == FLOAT16_VECTOR_ITEMS_MEDIA_TYPE:
+        items = parse_float16_vector_items(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content type {media_type!r}, use {NDJSON_MEDIA_TYPE} or {FLOAT16_VECTOR_ITEMS_MEDIA_TYPE}",
+        )
+    await vector_store_service.add_items_stream(
+        vector_store_id=vector_store_id, items=items, user=user.user, context_id=user.context_id
+    )
+
+
+@router.post("/{vector_store_id}/search", response_model=PaginatedResult[VectorStoreSearchResult])
 async def search_with_vector(
     vector_store_id: UUID,
     request: SearchRequest,
     vector_store_service: VectorStoreServiceDependency,
     user: Annotated[AuthorizedUser, Depends(RequiresContextPermissions(vector_stores={"read"}))],
-) -> PaginatedResult[VectorStoreSearchResult]:
+) -> PaginatedResult[VectorStoreSearchResult] | JSONResponse:
     """Search a vector store using either text or a vector."""
     response = await vector_store_service.search(
         vector_store_id=vector_store_id,
         query_vector=request.query_vector,
         limit=request.limit,
+        metadata_filter=request.metadata_filter,
+        query_text=request.query_text,
         user=user.user,
         context_id=user.context_id,
     )
-    return PaginatedResult(items=response, total_count=len(response))
+    result = PaginatedResult(items=response, total_count=len(response))
+    if request.encoding_format == "base64":
+        return JSONResponse(result.model_dump(mode="json", context={"embedding_encoding": "base64"}))
+    return result
 
 
 @router.get("/{vector_store_id}/documents")
@@ -7,10 +7,13 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from agentstack_server.domain.models.common import TotalCount
+
 
 class PaginationQuery(BaseModel):
     limit: int = Field(default_factory=lambda: 40, ge=1, le=100)
-    page_token: UUID | None = None
+    page_token: str | None = None
+    total_count: TotalCount = TotalCount.NONE
     order: str = Field(default_factory=lambda: "desc", pattern="^(asc|desc)$")
     order_by: str = Field(default_factory=lambda: "created_at", pattern="^created_at|updated_at$")
 
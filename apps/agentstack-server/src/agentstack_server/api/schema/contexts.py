@@ -5,11 +5,12 @@ from __future__ import annotations
 from typing import Literal
 from uuid import UUID
 
+from a2a.types import Role
 from pydantic import AwareDatetime, BaseModel, Field, RootModel, field_validator
 
 from agentstack_server.api.schema.common import PaginationQuery
 from agentstack_server.domain.models.common import Metadata, MetadataPatch
-from agentstack_server.domain.models.context import ContextHistoryItemData
+from agentstack_server.domain.models.context import ContextHistoryItemData, ContextHistoryItemKind
 
 
 class ContextCreateRequest(BaseModel):
@@ -36,6 +37,15 @@ class ContextListQuery(PaginationQuery):
     provider_id: UUID | None = None
 
 
+class ContextHistoryQuery(PaginationQuery):
+    kind: ContextHistoryItemKind | None = None
+    roles: list[Role] | None = Field(default=None, description="Only return messages with one of the roles")
+    since_id: UUID | None = Field(default=None, description="Only return items added after this item")
+    strip_binary: bool = Field(
+        default=False, description="Replace large inline file content with a URI the content can be downloaded from"
+    )
+
+
 class ContextPermissionsGrant(BaseModel):
     files: list[Literal["read", "write", "extract", "*"]] = Field(default_factory=list)
     vector_stores: list[Literal["read", "write", "*"]] = Field(default_factory=list)
@@ -93,3 +103,9 @@ class ContextTokenResponse(BaseModel):
 
 class ContextHistoryItemCreateRequest(RootModel[ContextHistoryItemData]):
     root: ContextHistoryItemData
+
+
+class ContextHistoryBatchCreateRequest(BaseModel):
+    """Request schema for appending multiple items to the context history at once."""
+
+    items: list[ContextHistoryItemData] = Field(min_length=1, max_length=100)
@@ -7,12 +7,14 @@ from uuid import UUID
 
 from pydantic import AwareDatetime, BaseModel, EmailStr, Field
 
+from agentstack_server.domain.models.common import TotalCount
 from agentstack_server.domain.models.user import UserRole
 
 
 class UserListQuery(BaseModel):
     limit: int = Field(default=40, ge=1, le=100)
-    page_token: UUID | None = None
+    page_token: str | None = None
+    total_count: TotalCount = TotalCount.NONE
     email: str | None = Field(default=None, description="Filter by email (case-insensitive partial match)")
 
 
@@ -6,6 +6,14 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field
 
+from agentstack_server.domain.models.vector_store import (
+    Embedding,
+    EmbeddingEncoding,
+    VectorDistanceMetric,
+    VectorStoreSearchQuery,
+    VectorStoreSearchResult,
+)
+
 
 class CreateVectorStoreRequest(BaseModel):
     """Request to create a new vector store."""
@@ -13,10 +21,48 @@ class CreateVectorStoreRequest(BaseModel):
     name: str = Field(..., description="Name of the vector store")
     dimension: int = Field(..., description="Dimension of the vectors to be stored")
     model_id: str
+    distance_metric: VectorDistanceMetric = Field(
+        VectorDistanceMetric.COSINE, description="Distance function used to rank search results"
+    )
 
 
 class SearchRequest(BaseModel):
     """Request to search a vector store."""
 
-    query_vector: list[float] = Field(description="Vector to search for")
+    query_vector: Embedding = Field(
+        description="Vector to search for, a list of floats or base64 encoded little-endian float16 values"
+    )
     limit: int = Field(5, description="Maximum number of results to return", le=10)
+    metadata_filter: dict[str, str] | None = Field(
+        None, description="Only match items whose metadata contains all of these key-value pairs"
+    )
+    query_text: str | None = Field(
+        None,
+        description="Enables hybrid search, full-text matches of this text are fused with the vector search results "
+        "by reciprocal rank fusion, the score is then the fusion score rather than similarity",
+    )
+    encoding_format: EmbeddingEncoding = Field(
+        "float", description="Encoding of the item embeddings in the results, base64 uses little-endian float16"
+    )
+
+
+class BatchSearchRequest(BaseModel):
+    """Request to run multiple searches, possibly across several vector stores, at once."""
+
+    queries: list[VectorStoreSearchQuery] = Field(min_length=1, max_length=32, description="Queries to run")
+    merge: bool = Field(
+        False,
+        description=(
+            "Merge the results of all queries into a single list of unique items ranked by reciprocal rank fusion, "
+            "the score of merged results is the fused score"
+        ),
+    )
+    encoding_format: EmbeddingEncoding = Field(
+        "float", description="Encoding of the item embeddings in the results, base64 uses little-endian float16"
+    )
+
+
+class BatchSearchResponse(BaseModel):
+    results: list[list[VectorStoreSearchResult]] = Field(
+        description="Results of each query in the order of the request, or a single list if merged"
+    )
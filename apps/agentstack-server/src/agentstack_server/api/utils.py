@@ -4,12 +4,18 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Iterable
+import struct
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 
 import openai.types.chat
+import orjson
+from fastapi import HTTPException, status
+from pydantic import ValidationError
 
-from agentstack_server.api.constants import AGENTSTACK_PROXY_VERSION
+from agentstack_server.api.constants import AGENTSTACK_PROXY_VERSION, MAX_STREAMED_VECTOR_ITEM_BYTES
 from agentstack_server.api.schema.openai import ChatCompletionRequest
+from agentstack_server.domain.models.file import ByteRange
+from agentstack_server.domain.models.vector_store import VectorStoreItem
 from agentstack_server.types import JsonValue
 from agentstack_server.utils.utils import filter_json_recursively
 
@@ -84,3 +90,148 @@ def estimate_llm_cost(
     if 0 < len(serialized_chars) < 20:
         return 1  # probably a single token
     return len(serialized_chars) // 5
+
+
+class StreamedLLMCostEstimator:
+    """
+    Incremental variant of estimate_llm_cost for streamed completions
+
+    Only the lengths of the generated strings are summed up as chunks arrive, the chunks are not serialized. The same
+    rule of thumb is applied to the running total: 1 token ≈ 5 characters.
+    """
+
+    def __init__(self) -> None:
+        self._chars: int = 0
+        self.cost: int = 0
+
+    def add(self, chunk: openai.types.chat.ChatCompletionChunk) -> int:
+        """Account a chunk and return the increase of the estimated cost."""
+        for choice in chunk.choices:
+            delta = choice.delta
+            self._chars += len(delta.content or "") + len(delta.refusal or "")
+            for tool_call in delta.tool_calls or ():
+                if tool_call.function:
+                    self._chars += len(tool_call.function.name or "") + len(tool_call.function.arguments or "")
+            if delta.function_call:
+                self._chars += len(delta.function_call.name or "") + len(delta.function_call.arguments or "")
+
+        cost = max(self._chars // 5, 1) if self._chars else 0
+        increase, self.cost = cost - self.cost, cost
+        return increase
+
+
+def _invalid_vector_item(index: int, error: Exception) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=f"Invalid vector store item #{index}: {error}"
+    )
+
+
+def _check_vector_item_size(size: int) -> None:
+    if size > MAX_STREAMED_VECTOR_ITEM_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Vector store item exceeds the limit of {MAX_STREAMED_VECTOR_ITEM_BYTES} bytes",
+        )
+
+
+async def parse_ndjson_vector_items(stream: AsyncIterable[bytes]) -> AsyncIterator[VectorStoreItem]:
+    """Parse a stream of newline-delimited JSON vector store items as they arrive."""
+    buffer = b""
+    index = 0
+    async for chunk in stream:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        _check_vector_item_size(len(buffer))
+        for line in (line for line in lines if line.strip()):
+            try:
+                yield VectorStoreItem.model_validate_json(line)
+            except ValidationError as ex:
+                raise _invalid_vector_item(index, ex) from ex
+            index += 1
+    if buffer.strip():
+        try:
+            yield VectorStoreItem.model_validate_json(buffer)
+        except ValidationError as ex:
+            raise _invalid_vector_item(index, ex) from ex
+
+
+def _read_float16_vector_item(buffer: bytearray, offset: int, index: int) -> tuple[VectorStoreItem, int] | None:
+    """
+    Read a single frame starting at the offset, return the item and the offset of the next frame.
+
+    Frame layout (little-endian):
+    - uint32 header length
+    - JSON header with all item fields except the embedding
+    - uint32 dimension
+    - dimension * float16 embedding
+    """
+    if len(buffer) - offset < 4:
+        return None
+    (header_length,) = struct.unpack_from("<I", buffer, offset)
+    _check_vector_item_size(header_length)
+    dimension_offset = offset + 4 + header_length
+    if len(buffer) < dimension_offset + 4:
+        return None
+    (dimension,) = struct.unpack_from("<I", buffer, dimension_offset)
+    _check_vector_item_size(4 + header_length + 4 + dimension * 2)
+    end = dimension_offset + 4 + dimension * 2
+    if len(buffer) < end:
+        return None
+    try:
+        header = orjson.loads(memoryview(buffer)[offset + 4 : dimension_offset])
+        embedding = struct.unpack_from(f"<{dimension}e", buffer, dimension_offset + 4)
+        return VectorStoreItem.model_validate({**header, "embedding": embedding}), end
+    except (orjson.JSONDecodeError, TypeError, ValidationError) as ex:
+        raise _invalid_vector_item(index, ex) from ex
+
+
+async def parse_float16_vector_items(stream: AsyncIterable[bytes]) -> AsyncIterator[VectorStoreItem]:
+    """Parse a stream of binary vector store item frames with float16 embeddings as they arrive."""
+    buffer = bytearray()
+    index = 0
+    async for chunk in stream:
+        buffer += chunk
+        offset = 0
+        while frame := _read_float16_vector_item(buffer, offset, index):
+            item, offset = frame
+            yield item
+            index += 1
+        del buffer[:offset]
+    if buffer:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Request body ends with an incomplete frame"
+        )
+
+
+def parse_range_header(range_header: str, size: int) -> ByteRange | None:
+    """
+    Resolve a single-range HTTP Range header against the size of the file.
+
+    Returns None if the header should be ignored and the whole file served (RFC 9110 allows ignoring
+    malformed and multi-range requests).
+    """
+    unit, _, byte_range = range_header.partition("=")
+    first, separator, last = byte_range.strip().partition("-")
+    if unit.strip().lower() != "bytes" or "," in byte_range or not separator:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else max(start, size - 1)
+            if end < start:
+                return None
+        else:
+            # Suffix range, the last N bytes of the file
+            suffix_length = int(last)
+            start, end = max(size - suffix_length, 0), size - 1
+            if suffix_length == 0:
+                start = size
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail=f"Range {range_header} is not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return ByteRange(start=start, end=min(end, size - 1))
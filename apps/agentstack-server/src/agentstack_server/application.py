@@ -43,6 +43,8 @@ from agentstack_server.api.routes.vector_stores import router as vector_stores_r
 from agentstack_server.api.utils import format_openai_error
 from agentstack_server.bootstrap import bootstrap_dependencies_sync
 from agentstack_server.configuration import Configuration
+from agentstack_server.domain.repositories.file import IObjectStorageRepository
+from agentstack_server.domain.repositories.openai_proxy import IOpenAIProxy
 from agentstack_server.exceptions import (
     PlatformError,
     RateLimitExceededError,
@@ -50,8 +52,12 @@ from agentstack_server.exceptions import (
 from agentstack_server.jobs.crons.model_provider import check_model_provider_registry, update_model_state_and_cache
 from agentstack_server.jobs.crons.provider import check_registry
 from agentstack_server.run_workers import run_workers
+from agentstack_server.service_layer.deployment_manager import IProviderDeploymentManager
+from agentstack_server.service_layer.services.a2a import A2AProxyService
+from agentstack_server.service_layer.services.activity import ActivityService
+from agentstack_server.service_layer.services.provider_health import ProviderHealthService
 from agentstack_server.service_layer.services.user_feedback import UserFeedbackService
-from agentstack_server.service_layer.webhook import webhook_client_lifespan
+from agentstack_server.service_layer.webhook import webhook_lifespan
 from agentstack_server.telemetry import INSTRUMENTATION_NAME, shutdown_telemetry
 
 logger = logging.getLogger(__name__)
@@ -209,21 +215,34 @@ def app(*, dependency_overrides: Container | None = None, enable_workers: bool =
     async def lifespan(_: FastAPI):
         procrastinate_app = di[procrastinate.App]
         user_feedback = di[UserFeedbackService]
+        activity = di[ActivityService]
+        provider_health = di[ProviderHealthService]
+        object_storage = di[IObjectStorageRepository]
+        a2a_proxy = di[A2AProxyService]
+        openai_proxy = di[IOpenAIProxy]
+        deployment_manager = di[IProviderDeploymentManager]
         try:
             register_telemetry()
             async with (
-                webhook_client_lifespan(),
                 procrastinate_app.open_async(),
+                # Exits before the job queue closes so that undelivered events can be handed over to it
+                webhook_lifespan(),
+                activity,
+                provider_health,
                 user_feedback,
+                object_storage,
+                deployment_manager,
+                a2a_proxy,
+                openai_proxy,
                 run_workers(app=procrastinate_app) if enable_workers else nullcontext(),
             ):
                 # Force initial synchronization job
                 with suppress(AlreadyEnqueued):
-                    await check_registry.defer_async(timestamp=int(time.time()))
+                    await check_registry.defer_async(timestamp=int(time.time()), jitter=False)
                 with suppress(AlreadyEnqueued):
-                    await check_model_provider_registry.defer_async(timestamp=int(time.time()))
+                    await check_model_provider_registry.defer_async(timestamp=int(time.time()), jitter=False)
                 with suppress(AlreadyEnqueued):
-                    await update_model_state_and_cache.defer_async(timestamp=int(time.time()))
+                    await update_model_state_and_cache.defer_async(timestamp=int(time.time()), jitter=False)
                 try:
                     yield
                 finally:
@@ -19,6 +19,8 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from agentstack_server.configuration import Configuration, get_configuration
 from agentstack_server.domain.repositories.file import IObjectStorageRepository, ITextExtractionBackend
 from agentstack_server.domain.repositories.openai_proxy import IOpenAIProxy
+from agentstack_server.infrastructure.activity.memory_activity_buffer import MemoryActivityBuffer
+from agentstack_server.infrastructure.activity.redis_activity_buffer import RedisActivityBuffer
 from agentstack_server.infrastructure.cache.memory_cache import MemoryCacheFactory
 from agentstack_server.infrastructure.cache.redis_cache import RedisCacheFactory
 from agentstack_server.infrastructure.kubernetes.provider_build_manager import KubernetesProviderBuildManager
@@ -28,6 +30,7 @@ from agentstack_server.infrastructure.openai_proxy.openai_proxy import CustomOpe
 from agentstack_server.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWorkFactory
 from agentstack_server.infrastructure.text_extraction.docling import DoclingTextExtractionBackend
 from agentstack_server.jobs.procrastinate import create_app
+from agentstack_server.service_layer.activity import IActivityBuffer
 from agentstack_server.service_layer.build_manager import IProviderBuildManager
 from agentstack_server.service_layer.cache import ICacheFactory
 from agentstack_server.service_layer.deployment_manager import IProviderDeploymentManager
@@ -79,6 +82,12 @@ def setup_cache_factory(config: Configuration) -> ICacheFactory:
     return RedisCacheFactory(config.redis.cache_db_url.get_secret_value())
 
 
+def setup_activity_buffer(config: Configuration) -> IActivityBuffer:
+    if not (config.redis.enabled and config.activity_tracking.use_redis):
+        return MemoryActivityBuffer()
+    return RedisActivityBuffer(config.redis.cache_db_url.get_secret_value())
+
+
 async def bootstrap_dependencies(dependency_overrides: Container | None = None):
     dependency_overrides = dependency_overrides or Container()
 
@@ -131,8 +140,9 @@ async def bootstrap_dependencies(dependency_overrides: Container | None = None):
 
     # Setup rate limiter storage
     _set_di(Storage, setup_rate_limiter_storage(di[Configuration]))
-    _set_di(IOpenAIProxy, CustomOpenAIProxy())
+    _set_di(IOpenAIProxy, CustomOpenAIProxy(di[Configuration].model_provider))
     _set_di(ICacheFactory, setup_cache_factory(di[Configuration]))
+    _set_di(IActivityBuffer, setup_activity_buffer(di[Configuration]))
 
 
 bootstrap_dependencies_sync = async_to_sync_isolated(bootstrap_dependencies)
@@ -83,6 +83,18 @@ class ModelProviderConfiguration(BaseModel):
     default_llm_model: str | None = None
     default_embedding_model: str | None = None
 
+    # Upstream API clients are reused across requests, connections are pooled per provider
+    max_connections_per_provider: int = 100
+    max_keepalive_connections_per_provider: int = 20
+    keepalive_expiry_sec: int = 30
+    # Requests waiting this long for a pooled connection of a saturated provider fail
+    pool_timeout_sec: float = 30
+    max_cached_clients: int = 1000
+    # Cached clients (and credentials derived from the API keys) are recreated after this long
+    client_ttl_sec: int = int(timedelta(hours=1).total_seconds())
+    # Negotiated with providers served over TLS, requires the optional h2 package
+    http2: bool = True
+
 
 class AgentRegistryConfiguration(BaseModel):
     locations: dict[str, RegistryLocation] = Field(default_factory=dict)
@@ -149,7 +161,11 @@ class BasicAuthConfiguration(BaseModel):
 class AuthConfiguration(BaseModel):
     jwt_private_key: Secret[str] = Secret("dummy")
     jwt_public_key: Secret[str] = Secret("dummy")
+    # Signing algorithm of internal tokens, ES256 (P-256) and EdDSA (Ed25519) keys sign much faster than RSA
+    jwt_algorithm: Literal["RS256", "ES256", "EdDSA"] = "RS256"
     disable_auth: bool = False
+    # Users are cached for a short time to avoid a database lookup on every authenticated request
+    user_cache_ttl_sec: int = 30
     oidc: OidcConfiguration = Field(default_factory=OidcConfiguration)
     basic: BasicAuthConfiguration = Field(default_factory=BasicAuthConfiguration)
 
@@ -159,13 +175,21 @@ class AuthConfiguration(BaseModel):
             logger.warning("JWT private and public keys are not set. Generating default keys.")
             from authlib.jose import JsonWebKey
 
-            key = JsonWebKey.generate_key("RSA", 4096, is_private=True)
+            match self.jwt_algorithm:
+                case "ES256":
+                    key = JsonWebKey.generate_key("EC", "P-256", is_private=True)
+                case "EdDSA":
+                    key = JsonWebKey.generate_key("OKP", "Ed25519", is_private=True)
+                case _:
+                    key = JsonWebKey.generate_key("RSA", 4096, is_private=True)
             self.jwt_private_key = Secret(key.as_pem(is_private=True).decode("utf-8"))
             self.jwt_public_key = Secret(key.as_pem(is_private=False).decode("utf-8"))
         else:
             try:
                 # Verify that the keys are matching
-                token = jwt.encode({"alg": "RS256"}, {"test": "payload"}, self.jwt_private_key.get_secret_value())
+                token = jwt.encode(
+                    {"alg": self.jwt_algorithm}, {"test": "payload"}, self.jwt_private_key.get_secret_value()
+                )
                 jwt.decode(token, self.jwt_public_key.get_secret_value())
             except Exception as e:
                 raise ValueError(f"JWT private and public keys do not match or are invalid: {e}") from e
@@ -182,6 +206,25 @@ class ObjectStorageConfiguration(BaseModel):
     storage_limit_per_user_bytes: int = 1 * (1024 * 1024 * 1024)  # 1GiB
     max_single_file_size: int = 100 * (1024 * 1024)  # 100 MiB
 
+    # The S3 client is shared by all requests, these settings apply to its connection pool
+    max_pool_connections: int = 50
+    tcp_keepalive: bool = True
+    keepalive_timeout_sec: int = 60
+    connect_timeout_sec: int = 10
+    read_timeout_sec: int = 60
+    retry_mode: Literal["legacy", "standard", "adaptive"] = "standard"
+    max_retry_attempts: int = 3
+
+    # Uploads larger than one part are sent as a multipart upload, S3 requires parts of at least 5 MiB
+    multipart_part_size_bytes: int = Field(default=16 * (1024 * 1024), ge=5 * (1024 * 1024))  # 16 MiB
+    multipart_max_concurrency: int = Field(default=4, ge=1)
+
+    # Allow clients to download file content directly from the object storage using a presigned URL
+    download_redirect_enabled: bool = False
+    # Endpoint reachable by the clients, the presigned URLs are signed for this host (defaults to endpoint_url)
+    public_endpoint_url: AnyUrl | None = None
+    presigned_url_expiration_sec: int = int(timedelta(hours=1).total_seconds())
+
 
 class RedisConfiguration(BaseModel):
     enabled: bool = False
@@ -238,6 +281,19 @@ class PersistenceConfiguration(BaseModel):
 class VectorStoresConfiguration(BaseModel):
     storage_limit_per_user_bytes: int = 1 * (1024 * 1024 * 1024)  # 1GiB
 
+    # HNSW query options, see https://github.com/pgvector/pgvector#query-options
+    hnsw_ef_search: int = Field(default=100, ge=1, le=1000)
+    # Keep scanning the index until enough rows match the query filters (requires pgvector >= 0.8.0)
+    hnsw_iterative_scan: Literal["off", "relaxed_order", "strict_order"] = "relaxed_order"
+    hnsw_max_scan_tuples: int = Field(default=20_000, ge=1)
+
+    # Hybrid search fuses this many top candidates of the vector and the full-text ranking, RRF score is 1 / (k + rank)
+    hybrid_search_candidates: int = Field(default=50, ge=1)
+    hybrid_search_rrf_k: int = Field(default=60, ge=1)
+
+    # Streamed items are validated, accounted and written with COPY in batches of this size, each in its own transaction
+    ingestion_batch_size: int = Field(default=1000, ge=1)
+
 
 class TelemetryConfiguration(BaseModel):
     collector_url: AnyUrl = AnyUrl("http://otel-collector-svc:4318")
@@ -316,10 +372,20 @@ class WebhookEndpoint(BaseModel):
     url: HttpUrl
     headers: dict[str, Secret[str]] = Field(default_factory=dict)
     events: list[str] = Field(default_factory=lambda: ["*"])  # e.g. ["provider.*", "context.created"] or ["*"]
+    max_concurrency: int = Field(default=4, ge=1)  # parallel requests to the endpoint
+    # Events queued for the endpoint are sent together as {"events": [...]}, 1 sends every event in its own request
+    batch_size: int = Field(default=1, ge=1)
 
 
 class WebhookConfiguration(BaseModel):
     endpoints: list[WebhookEndpoint] = Field(default_factory=list)
+    queue_size: int = 10_000  # events waiting for delivery per endpoint, further events are dropped
+    max_retries: int = 3
+    retry_backoff_sec: float = 1  # doubles with every retry
+    # Repeated *.updated events for the same resource are delayed by the window and delivered once
+    coalesce_window_sec: float = 1
+    # Events still queued after the timeout on shutdown (or failing all retries) are delivered by a background job
+    shutdown_timeout_sec: float = 10
 
 
 class DoclingExtractionConfiguration(BaseModel):
@@ -333,10 +399,26 @@ class ContextConfiguration(BaseModel):
     resources_expire_after_days: int = 0  # Expires files and vector_stores attached to a context
 
 
+class ActivityTrackingConfiguration(BaseModel):
+    # Last activity timestamps (providers, contexts, vector stores, a2a requests) are buffered and written in bulk
+    flush_interval_sec: int = 30
+    # Share the buffer between server replicas, requires redis to be enabled
+    use_redis: bool = False
+
+
 class A2AProxyConfiguration(BaseModel):
     # Expires a2a_request_tasks and a2a_request_contexts (WARNING: has security implications!)
     requests_expire_after_days: int = 14
 
+    # Upstream connections to agents are pooled per provider
+    max_connections_per_provider: int = 100
+    max_keepalive_connections_per_provider: int = 20
+    keepalive_expiry_sec: int = 30
+    # Connection pools of providers that were not called for this long are closed
+    idle_client_expiry_sec: int = int(timedelta(minutes=10).total_seconds())
+    # Negotiated with agents served over TLS, requires the optional h2 package
+    http2: bool = True
+
 
 class ProviderBuildConfiguration(BaseModel):
     enabled: bool = True
@@ -434,6 +516,10 @@ class RateLimitConfiguration(BaseModel, arbitrary_types_allowed=True):
         description="List of rate limit strings (e.g., '20/second', '100/minute')",
     )
     role_based_limits: RoleBasedRateLimitConfiguration = Field(default_factory=RoleBasedRateLimitConfiguration)
+    streaming_lease_tokens: int = Field(
+        default=500,
+        description="Maximum tokens reserved at once for streamed chat completions, accounted locally until exhausted",
+    )
 
     @field_validator("global_limits", mode="before")
     @classmethod
@@ -499,6 +585,7 @@ class Configuration(BaseSettings):
     text_extraction: DoclingExtractionConfiguration = Field(default_factory=DoclingExtractionConfiguration)
     context: ContextConfiguration = Field(default_factory=ContextConfiguration)
     a2a_proxy: A2AProxyConfiguration = Field(default_factory=A2AProxyConfiguration)
+    activity_tracking: ActivityTrackingConfiguration = Field(default_factory=ActivityTrackingConfiguration)
     connector: ConnectorConfiguration = Field(default_factory=ConnectorConfiguration)
     webhook: WebhookConfiguration = Field(default_factory=WebhookConfiguration)
     k8s_namespace: str | None = None
@@ -3,11 +3,11 @@
 
 from __future__ import annotations
 
+from enum import StrEnum
 from textwrap import dedent
-from typing import Annotated
-from uuid import UUID
+from typing import Annotated, Self
 
-from pydantic import AfterValidator, BaseModel, Field, computed_field
+from pydantic import AfterValidator, BaseModel, Field, model_validator
 
 
 def validate_metadata(metadata: dict[str, str | None]) -> dict[str, str | None]:
@@ -45,12 +45,23 @@ MetadataPatch = Annotated[
 ]
 
 
+class TotalCount(StrEnum):
+    """How the total count of a paginated listing is computed"""
+
+    NONE = "none"
+    EXACT = "exact"  # count(*) over all matching rows, expensive for large listings
+    ESTIMATE = "estimate"  # row estimate of the query planner
+
+
 class PaginatedResult[T](BaseModel):
     items: list[T]
-    total_count: int
+    total_count: int | None = None
     has_more: bool = False
+    next_page_token: str | None = None
 
-    @computed_field
-    @property
-    def next_page_token(self) -> UUID | None:
-        return getattr(self.items[-1], "id", None) if self.items else None
+    @model_validator(mode="after")
+    def _default_next_page_token(self) -> Self:
+        # Listings that are not paginated by a cursor continue after the last item ID
+        if self.next_page_token is None and self.items and (item_id := getattr(self.items[-1], "id", None)):
+            self.next_page_token = str(item_id)
+        return self
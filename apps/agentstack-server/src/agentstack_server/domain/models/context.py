@@ -13,6 +13,7 @@ from agentstack_server.domain.models.common import Metadata
 from agentstack_server.utils.utils import utc_now
 
 type ContextHistoryItemData = Artifact | Message
+type ContextHistoryItemKind = Literal["message", "artifact"]
 
 
 class ContextHistoryItem(BaseModel):
@@ -23,7 +24,7 @@ class ContextHistoryItem(BaseModel):
 
     @computed_field
     @property
-    def kind(self) -> Literal["message", "artifact"]:
+    def kind(self) -> ContextHistoryItemKind:
         return getattr(self.data, "kind", "artifact")
 
 
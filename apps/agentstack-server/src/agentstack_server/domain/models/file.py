@@ -46,10 +46,15 @@ class ExtractionMetadata(BaseModel, extra="allow"):
     settings: TextExtractionSettings | None = None
 
 
-class FileMetadata(BaseModel, extra="allow"):
-    content_type: str
-    filename: str
-    content_length: int
+class ByteRange(BaseModel):
+    """Inclusive range of bytes, as in the HTTP Range header."""
+
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
 
 
 class AsyncFile(BaseModel):
@@ -3,21 +3,77 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import struct
+from collections.abc import Sequence
 from enum import StrEnum
-from typing import Literal, Self
+from typing import Annotated, Any, Literal, Self
 from uuid import UUID, uuid4
 
-from pydantic import AwareDatetime, BaseModel, Field, model_validator
+from pydantic import (
+    AwareDatetime,
+    BaseModel,
+    BeforeValidator,
+    Field,
+    PlainSerializer,
+    SerializationInfo,
+    model_validator,
+)
 
 from agentstack_server.domain.models.common import Metadata
 from agentstack_server.utils.utils import utc_now
 
+type EmbeddingEncoding = Literal["float", "base64"]
+
+
+def encode_embedding(embedding: Sequence[float]) -> str:
+    """Encode an embedding as base64 of little-endian float16 values, the precision of the vector database."""
+    return base64.b64encode(struct.pack(f"<{len(embedding)}e", *embedding)).decode("ascii")
+
+
+def decode_embedding(value: str) -> list[float]:
+    """Decode an embedding encoded by `encode_embedding`."""
+    try:
+        data = base64.b64decode(value, validate=True)
+    except binascii.Error as ex:
+        raise ValueError(f"Embedding must be a list of floats or base64 encoded float16 values: {ex}") from ex
+    if len(data) % 2:
+        raise ValueError("Base64 encoded embedding must contain float16 values (2 bytes each)")
+    return list(struct.unpack(f"<{len(data) // 2}e", data))
+
+
+def _decode_embedding_input(value: Any) -> Any:
+    return decode_embedding(value) if isinstance(value, str) else value
+
+
+def _serialize_embedding(value: list[float], info: SerializationInfo) -> list[float] | str:
+    if (info.context or {}).get("embedding_encoding") == "base64":
+        return encode_embedding(value)
+    return value
+
+
+# Accepts both encodings, serialized as base64 if requested with context={"embedding_encoding": "base64"}
+Embedding = Annotated[
+    list[float],
+    BeforeValidator(_decode_embedding_input),
+    PlainSerializer(_serialize_embedding, return_type=list[float] | str),
+]
+
 
 class VectorStoreStats(BaseModel):
     usage_bytes: int
     num_documents: int
 
 
+class VectorDistanceMetric(StrEnum):
+    """Distance function used to rank items of a vector store."""
+
+    COSINE = "cosine"
+    L2 = "l2"
+    INNER_PRODUCT = "inner_product"
+
+
 class VectorStore(BaseModel):
     """A vector store containing embeddings for text content."""
 
@@ -25,6 +81,7 @@ class VectorStore(BaseModel):
     name: str | None = None
     model_id: str
     dimension: int = Field(gt=0, lt=10_000)
+    distance_metric: VectorDistanceMetric = VectorDistanceMetric.COSINE
     created_at: AwareDatetime = Field(default_factory=utc_now)
     last_active_at: AwareDatetime = Field(default_factory=utc_now)
     created_by: UUID
@@ -66,7 +123,7 @@ class VectorStoreItem(BaseModel):
     document_type: DocumentType = DocumentType.PLATFORM_FILE
     model_id: str | Literal["platform"] = "platform"
     text: str
-    embedding: list[float]
+    embedding: Embedding
     metadata: Metadata | None = None
 
     @model_validator(mode="after")
@@ -82,6 +139,17 @@ class VectorStoreItem(BaseModel):
         return self
 
 
+class VectorStoreSearchQuery(BaseModel):
+    """A single nearest-neighbour query of a batch search."""
+
+    vector_store_id: UUID
+    query_vector: Embedding
+    limit: int = Field(5, ge=1, le=10)
+    metadata_filter: dict[str, str] | None = Field(
+        None, description="Only match items whose metadata contains all of these key-value pairs"
+    )
+
+
 class VectorStoreSearchResult(BaseModel):
     """Result of a vector store search operation containing full item data and similarity score."""
 
@@ -2,7 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
-from datetime import timedelta
+from collections.abc import Mapping
+from datetime import datetime, timedelta
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
@@ -21,6 +22,9 @@ class IA2ARequestRepository(Protocol):
         allow_task_creation: bool = False,
     ) -> None: ...
 
+    async def update_tasks_last_accessed(self, *, timestamps: Mapping[str, datetime]) -> None: ...
+    async def update_contexts_last_accessed(self, *, timestamps: Mapping[str, datetime]) -> None: ...
+
     async def get_task(self, *, task_id: str, user_id: UUID) -> A2ARequestTask: ...
 
     async def delete_tasks(self, *, older_than: timedelta) -> int: ...
@@ -3,13 +3,18 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Mapping, Sequence
 from datetime import datetime
 from typing import Protocol
 from uuid import UUID
 
-from agentstack_server.domain.models.common import PaginatedResult
-from agentstack_server.domain.models.context import Context, ContextHistoryItem, TitleGenerationState
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
+from agentstack_server.domain.models.context import (
+    Context,
+    ContextHistoryItem,
+    ContextHistoryItemKind,
+    TitleGenerationState,
+)
 
 
 class IContextRepository(Protocol):
@@ -22,7 +27,8 @@ class IContextRepository(Protocol):
         user_id: UUID | None = None,
         provider_id: UUID | None = None,
         limit: int = 20,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         order: str = "desc",
         order_by: str = "created_at",
         include_empty: bool = True,
@@ -32,18 +38,24 @@ class IContextRepository(Protocol):
     async def get(self, *, context_id: UUID, user_id: UUID | None = None) -> Context: ...
     async def update(self, *, context: Context) -> None: ...
     async def delete(self, *, context_id: UUID, user_id: UUID | None = None) -> int: ...
-    async def update_last_active(self, *, context_id: UUID) -> None: ...
+    async def update_last_active(self, *, timestamps: Mapping[UUID, datetime]) -> None: ...
     async def update_title(
         self, *, context_id: UUID, title: str | None = None, generation_state: TitleGenerationState
     ) -> None: ...
     async def add_history_item(self, *, context_id: UUID, history_item: ContextHistoryItem) -> None: ...
+    async def add_history_items(self, *, context_id: UUID, history_items: Sequence[ContextHistoryItem]) -> None: ...
     async def list_history(
         self,
         *,
         context_id: UUID,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         limit: int = 20,
         order_by: str = "created_at",
         order="desc",
+        kind: ContextHistoryItemKind | None = None,
+        roles: Sequence[str] | None = None,
+        since_id: UUID | None = None,
     ) -> PaginatedResult[ContextHistoryItem]: ...
+    async def get_history_item(self, *, context_id: UUID, item_id: UUID) -> ContextHistoryItem: ...
     async def delete_history_from_id(self, *, context_id: UUID, from_id: UUID) -> int: ...
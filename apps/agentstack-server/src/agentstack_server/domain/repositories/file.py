@@ -6,17 +6,17 @@ from __future__ import annotations
 import typing
 from collections.abc import AsyncIterator
 from datetime import timedelta
-from typing import Protocol, runtime_checkable
+from typing import Protocol, Self, runtime_checkable
 from uuid import UUID
 
 from pydantic import AnyUrl, HttpUrl
 
-from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.file import (
     AsyncFile,
+    ByteRange,
     ExtractionFormat,
     File,
-    FileMetadata,
     FileType,
     TextExtraction,
     TextExtractionSettings,
@@ -33,7 +33,8 @@ class IFileRepository(Protocol):
         context_id: UUID | None = None,
         content_type: str | None = None,
         filename_search: str | None = None,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         order: str = "desc",
         order_by: str = "created_at",
         user_id: UUID | None = None,
@@ -65,11 +66,16 @@ class IFileRepository(Protocol):
 
 @runtime_checkable
 class IObjectStorageRepository(Protocol):
+    """Object storage backed by a long-lived client, entering the context manager opens it and exiting closes it."""
+
+    async def __aenter__(self) -> Self: ...
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
     async def upload_file(self, *, file_id: UUID, file: AsyncFile) -> int: ...
-    def get_file(self, *, file_id: UUID) -> typing.AsyncContextManager[AsyncFile]: ...
+    def get_file(
+        self, *, file_id: UUID, byte_range: ByteRange | None = None
+    ) -> typing.AsyncContextManager[AsyncFile]: ...
     async def delete_files(self, *, file_ids: list[UUID]) -> None: ...
-    async def get_file_url(self, *, file_id: UUID) -> HttpUrl: ...
-    async def get_file_metadata(self, *, file_id: UUID) -> FileMetadata: ...
+    async def get_file_url(self, *, file_id: UUID, public: bool = False, check_exists: bool = False) -> HttpUrl: ...
 
 
 @runtime_checkable
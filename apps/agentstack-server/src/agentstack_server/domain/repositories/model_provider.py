@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Mapping
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
@@ -16,5 +16,5 @@ class IModelProviderRepository(Protocol):
     async def get(self, *, model_provider_id: UUID) -> ModelProvider: ...
     def list(self, *, capability: ModelCapability | None = None) -> AsyncIterator[ModelProvider]: ...
     async def update(self, *, model_provider: ModelProvider) -> None: ...
-    async def update_state(self, *, model_provider_id: UUID, state: ModelProviderState) -> None: ...
+    async def update_states(self, *, states: Mapping[UUID, ModelProviderState]) -> None: ...
     async def delete(self, *, model_provider_id: UUID) -> int: ...
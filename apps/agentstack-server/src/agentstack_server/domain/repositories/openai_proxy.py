@@ -6,6 +6,7 @@ from __future__ import annotations
 
 from collections.abc import AsyncIterator
 from typing import Protocol
+from uuid import UUID
 
 import openai.types.chat
 
@@ -43,6 +44,9 @@ class IOpenAIEmbeddingProxyAdapter(Protocol):
 
 
 class IOpenAIProxy(Protocol):
+    async def __aenter__(self) -> IOpenAIProxy: ...
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
+    async def invalidate_clients(self, *, model_provider_id: UUID) -> None: ...
     async def list_models(self, *, provider: ModelProvider, api_key: str) -> list[Model]: ...
     def get_chat_completion_proxy(self, *, provider: ModelProvider) -> IOpenAIChatCompletionProxyAdapter: ...
     def get_embedding_proxy(self, *, provider: ModelProvider) -> IOpenAIEmbeddingProxyAdapter: ...
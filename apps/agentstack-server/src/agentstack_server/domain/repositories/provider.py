@@ -3,11 +3,14 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
-from agentstack_server.domain.models.provider import Provider, ProviderType, UnmanagedState
+from a2a.types import AgentCard
+
+from agentstack_server.domain.models.provider import Provider, ProviderLocation, ProviderType, UnmanagedState
 
 
 @runtime_checkable
@@ -25,6 +28,10 @@ class IProviderRepository(Protocol):
     async def update(self, *, provider: Provider) -> None: ...
 
     async def get(self, *, provider_id: UUID, user_id: UUID | None = None) -> Provider: ...
+    async def get_by_location(self, *, location: ProviderLocation) -> Provider: ...
     async def delete(self, *, provider_id: UUID, user_id: UUID | None = None) -> int: ...
-    async def update_unmanaged_state(self, provider_id: UUID, state: UnmanagedState) -> None: ...
-    async def update_last_accessed(self, *, provider_id: UUID) -> None: ...
+    async def update_unmanaged_states(self, *, states: Mapping[UUID, UnmanagedState]) -> None: ...
+    async def update_agent_card(
+        self, *, provider_id: UUID, agent_card: AgentCard, unmanaged_state: UnmanagedState, updated_at: datetime
+    ) -> None: ...
+    async def update_last_accessed(self, *, timestamps: Mapping[UUID, datetime]) -> None: ...
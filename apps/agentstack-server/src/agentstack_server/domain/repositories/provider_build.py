@@ -7,7 +7,7 @@ from collections.abc import AsyncIterator
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
-from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.provider_build import BuildState, ProviderBuild
 
 
@@ -21,7 +21,8 @@ class IProviderBuildRepository(Protocol):
         self,
         *,
         limit: int = 20,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         order: str = "desc",
         order_by: str = "created_at",
         status: BuildState | None = None,
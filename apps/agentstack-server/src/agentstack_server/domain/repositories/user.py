@@ -6,7 +6,7 @@ from __future__ import annotations
 from typing import Protocol
 from uuid import UUID
 
-from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.user import User
 
 
@@ -15,7 +15,8 @@ class IUserRepository(Protocol):
         self,
         *,
         limit: int,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         email: str | None = None,
     ) -> PaginatedResult[User]: ...
 
@@ -6,6 +6,7 @@ from __future__ import annotations
 from typing import Protocol, runtime_checkable
 from uuid import UUID
 
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.user_feedback import UserFeedback
 
 
@@ -19,5 +20,6 @@ class IUserFeedbackRepository(Protocol):
         provider_created_by: UUID | None = None,
         provider_id: UUID | None = None,
         limit: int = 50,
-        after_cursor: UUID | None = None,
-    ) -> tuple[list[UserFeedback], int, bool]: ...
+        after_cursor: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
+    ) -> PaginatedResult[UserFeedback]: ...
@@ -3,15 +3,18 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator, Iterable, Sequence
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from datetime import datetime
 from typing import Protocol
 from uuid import UUID
 
 from agentstack_server.domain.models.vector_store import (
+    VectorDistanceMetric,
     VectorStore,
     VectorStoreDocument,
     VectorStoreDocumentInfo,
     VectorStoreItem,
+    VectorStoreSearchQuery,
     VectorStoreSearchResult,
 )
 
@@ -19,7 +22,13 @@ from agentstack_server.domain.models.vector_store import (
 class IVectorStoreRepository(Protocol):
     """Interface for vector store repository operations."""
 
-    def list(self, *, user_id: UUID | None = None, context_id: UUID | None = None) -> AsyncIterator[VectorStore]: ...
+    def list(
+        self,
+        *,
+        user_id: UUID | None = None,
+        context_id: UUID | None = None,
+        vector_store_ids: Iterable[UUID] | None = None,
+    ) -> AsyncIterator[VectorStore]: ...
 
     async def create(self, *, vector_store: VectorStore) -> None: ...
     async def get(
@@ -28,7 +37,7 @@ class IVectorStoreRepository(Protocol):
     async def delete(
         self, *, vector_store_id: UUID | None = None, user_id: UUID | None = None, context_id: UUID | None = None
     ) -> int: ...
-    async def update_last_accessed(self, *, vector_store_ids: Iterable[UUID]) -> None: ...
+    async def update_last_accessed(self, *, timestamps: Mapping[UUID, datetime]) -> None: ...
     async def upsert_documents(self, *, documents: Iterable[VectorStoreDocument]) -> None: ...
     async def total_usage(self, *, user_id: UUID | None = None) -> int: ...
 
@@ -38,11 +47,35 @@ class IVectorStoreRepository(Protocol):
 
 
 class IVectorDatabaseRepository(Protocol):
-    async def create_collection(self, collection_id: UUID, dimension: int): ...
+    async def create_collection(
+        self, collection_id: UUID, dimension: int, distance_metric: VectorDistanceMetric = VectorDistanceMetric.COSINE
+    ): ...
+    async def detach_collection(self, collection_id: UUID, dimension: int) -> None: ...
+    async def attach_collection(self, collection_id: UUID, dimension: int) -> None: ...
     async def delete_collection(self, collection_id: UUID, dimension: int): ...
+    async def delete_orphaned_collections(self) -> int: ...
     async def add_items(self, collection_id: UUID, items: Sequence[VectorStoreItem]) -> None: ...
     def estimate_size(self, items: Sequence[VectorStoreItem]) -> list[VectorStoreDocumentInfo]: ...
     async def delete_documents(self, collection_id: UUID, dimension: int, document_ids: Iterable[str]) -> int: ...
     async def similarity_search(
-        self, collection_id: UUID, query_vector: Sequence[float], limit: int = 10
+        self,
+        collection_id: UUID,
+        query_vector: Sequence[float],
+        limit: int = 10,
+        distance_metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+        metadata_filter: Mapping[str, str] | None = None,
     ) -> Iterable[VectorStoreSearchResult]: ...
+    async def hybrid_search(
+        self,
+        collection_id: UUID,
+        query_vector: Sequence[float],
+        query_text: str,
+        limit: int = 10,
+        distance_metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+        metadata_filter: Mapping[str, str] | None = None,
+    ) -> Iterable[VectorStoreSearchResult]: ...
+    async def similarity_search_batch(
+        self,
+        queries: Sequence[VectorStoreSearchQuery],
+        distance_metrics: Mapping[UUID, VectorDistanceMetric],
+    ) -> list[list[VectorStoreSearchResult]]: ...
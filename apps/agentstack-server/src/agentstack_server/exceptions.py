@@ -16,6 +16,7 @@ __all__ = [
     "EntityNotFoundError",
     "ForbiddenUpdateError",
     "GatewayError",
+    "InvalidPageTokenError",
     "InvalidProviderCallError",
     "InvalidProviderUpgradeError",
     "InvalidVectorDimensionError",
@@ -99,6 +100,11 @@ class InvalidProviderCallError(PlatformError):
         super().__init__(message, status_code)
 
 
+class InvalidPageTokenError(PlatformError):
+    def __init__(self, page_token: str, status_code: int = status.HTTP_400_BAD_REQUEST):
+        super().__init__(f"Invalid page token: {page_token}", status_code)
+
+
 class InvalidVectorDimensionError(PlatformError): ...
 
 
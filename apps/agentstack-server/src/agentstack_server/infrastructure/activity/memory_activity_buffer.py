@@ -0,0 +1,28 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Mapping
+from datetime import datetime
+from typing import override
+
+from agentstack_server.service_layer.activity import ActivityKind, IActivityBuffer
+
+
+class MemoryActivityBuffer(IActivityBuffer):
+    def __init__(self):
+        self._timestamps: defaultdict[ActivityKind, dict[str, datetime]] = defaultdict(dict)
+
+    @override
+    async def touch(self, kind: ActivityKind, timestamps: Mapping[str, datetime]) -> None:
+        buffered = self._timestamps[kind]
+        for entity_id, timestamp in timestamps.items():
+            if entity_id not in buffered or buffered[entity_id] < timestamp:
+                buffered[entity_id] = timestamp
+
+    @override
+    async def drain(self) -> dict[ActivityKind, dict[str, datetime]]:
+        timestamps, self._timestamps = self._timestamps, defaultdict(dict)
+        return {kind: kind_timestamps for kind, kind_timestamps in timestamps.items() if kind_timestamps}
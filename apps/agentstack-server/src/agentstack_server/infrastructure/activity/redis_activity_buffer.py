@@ -0,0 +1,59 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from typing import override
+
+import coredis
+from coredis.exceptions import ResponseError
+from coredis.tokens import PureToken
+
+from agentstack_server.service_layer.activity import ActivityKind, IActivityBuffer
+
+
+class RedisActivityBuffer(IActivityBuffer):
+    """
+    Activity buffer shared by all server replicas. Timestamps are kept in a sorted set per entity kind, the score is
+    the unix timestamp so that concurrent touches keep the latest value.
+    """
+
+    def __init__(self, redis_url: str, namespace: str = "activity", timeout_sec: float = 5.0):
+        self.redis: coredis.Redis[str] = coredis.Redis.from_url(
+            redis_url,
+            decode_responses=True,
+            stream_timeout=timeout_sec,
+            connect_timeout=timeout_sec,
+        )
+        self.namespace: str = namespace
+
+    def _key(self, kind: ActivityKind) -> str:
+        return f"{self.namespace}:{kind}"
+
+    @override
+    async def touch(self, kind: ActivityKind, timestamps: Mapping[str, datetime]) -> None:
+        if not timestamps:
+            return
+        await self.redis.zadd(
+            self._key(kind),
+            {entity_id: timestamp.timestamp() for entity_id, timestamp in timestamps.items()},
+            comparison=PureToken.GT,
+        )
+
+    @override
+    async def drain(self) -> dict[ActivityKind, dict[str, datetime]]:
+        drained = {}
+        for kind in ActivityKind:
+            # Rename is atomic, touches arriving during the drain go to a new set
+            draining_key = f"{self._key(kind)}:draining:{uuid.uuid4().hex}"
+            try:
+                await self.redis.rename(self._key(kind), draining_key)
+            except ResponseError:
+                continue  # no activity buffered
+            members = await self.redis.zrange(draining_key, 0, -1, withscores=True)
+            await self.redis.delete([draining_key])
+            drained[kind] = {member: datetime.fromtimestamp(score, UTC) for member, score in members}
+        return drained
@@ -12,7 +12,7 @@ import re
 from asyncio import TaskGroup
 from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager, suppress
-from datetime import timedelta
+from datetime import datetime, timedelta
 from enum import StrEnum
 from pathlib import Path
 from typing import Any, Final, cast
@@ -31,7 +31,7 @@ from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_delay, w
 from agentstack_server.domain.models.provider import Provider, ProviderDeploymentState
 from agentstack_server.service_layer.deployment_manager import IProviderDeploymentManager, global_provider_variables
 from agentstack_server.utils.logs_container import LogsContainer, ProcessLogMessage, ProcessLogType
-from agentstack_server.utils.utils import extract_messages
+from agentstack_server.utils.utils import cancel_task, extract_messages
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +50,10 @@ TEMPLATE_KIND_TO_FILE_NAME: Final = {
 
 DEFAULT_TEMPLATE_DIR: Final = Path(__file__).parent / "default_templates"
 
+# The cached deployments are relisted periodically to recover from missed watch events
+DEPLOYMENT_RESYNC_PERIOD: Final = timedelta(minutes=5)
+DEPLOYMENT_WATCH_RETRY_DELAY: Final = timedelta(seconds=5)
+
 
 class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
     def __init__(
@@ -62,11 +66,70 @@ class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
         self._template_dir = anyio.Path(manifest_template_dir or DEFAULT_TEMPLATE_DIR)
         self._templates: dict[TemplateKind, str] = {}
 
+        # Deployment cache kept up to date by watching the Kubernetes API while the manager is entered
+        self._deployments: dict[UUID, APIObject] = {}
+        self._deployments_synced = False
+        self._watch_task: asyncio.Task | None = None
+        # Deployment hash rendered by create_or_replace for each provider version (updated_at)
+        self._applied_hashes: dict[UUID, tuple[datetime, str]] = {}
+
+    async def __aenter__(self):
+        self._watch_task = asyncio.create_task(self._watch_deployments())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._watch_task:
+            await cancel_task(self._watch_task)
+        self._watch_task = None
+        self._deployments_synced = False
+
     @asynccontextmanager
     async def api(self) -> AsyncIterator[kr8s.asyncio.Api]:
         client = await self._api_factory()
         yield client
 
+    async def _list_deployments(self, api: kr8s.asyncio.Api) -> dict[UUID, APIObject]:
+        return {
+            self._get_provider_id_from_name(
+                cast(kr8s.APIObject, deployment).metadata.name,
+                TemplateKind.DEPLOY,
+            ): cast(kr8s.APIObject, deployment)
+            async for deployment in kr8s.asyncio.get(
+                kind="deployment",
+                label_selector={"managedBy": "agentstack"},
+                api=api,
+            )
+        }
+
+    async def _watch_deployments(self) -> None:
+        while True:
+            try:
+                async with self.api() as api:
+                    self._deployments = await self._list_deployments(api)
+                    self._deployments_synced = True
+                    with suppress(TimeoutError):
+                        async with asyncio.timeout(DEPLOYMENT_RESYNC_PERIOD.total_seconds()):
+                            async for event_type, deployment in api.watch(
+                                kind="deployment", label_selector={"managedBy": "agentstack"}
+                            ):
+                                provider_id = self._get_provider_id_from_name(
+                                    deployment.metadata.name, TemplateKind.DEPLOY
+                                )
+                                if event_type == "DELETED":
+                                    self._deployments.pop(provider_id, None)
+                                else:
+                                    self._deployments[provider_id] = deployment
+            except Exception as ex:
+                self._deployments_synced = False
+                logger.warning(f"Watching provider deployments failed, retrying: {ex!r}")
+                await asyncio.sleep(DEPLOYMENT_WATCH_RETRY_DELAY.total_seconds())
+
+    async def _get_deployments(self) -> dict[UUID, APIObject]:
+        if self._deployments_synced:
+            return self._deployments
+        async with self.api() as api:
+            return await self._list_deployments(api)
+
     async def _render_template(self, kind: TemplateKind, **variables) -> dict[str, Any]:
         if kind not in self._templates:
             self._templates[kind] = await (self._template_dir / TEMPLATE_KIND_TO_FILE_NAME[kind]).read_text()
@@ -125,13 +188,17 @@ class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
             deployment_manifest["metadata"]["labels"]["deployment-hash"] = deployment_hash
 
             deployment = Deployment(deployment_manifest, api=api)
+            # The hash is recorded only once the deployment has the spec, a failed apply must not look up to date
+            applied_hash = (provider.updated_at, deployment_hash)
             async with self._create_lock:
                 try:
                     existing_deployment = await Deployment.get(deployment.metadata.name, api=api)
                     if existing_deployment.metadata.labels["deployment-hash"] == deployment_hash:
                         if existing_deployment.replicas == 0:
                             await deployment.scale(1)
+                            self._applied_hashes[provider.id] = applied_hash
                             return True
+                        self._applied_hashes[provider.id] = applied_hash
                         return False  # Deployment was not modified
                     logger.info(f"Recreating deployment {deployment.metadata.name} due to configuration change")
                     await self.delete(provider_id=provider.id)
@@ -153,9 +220,21 @@ class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
                     with suppress(Exception):
                         await deployment.delete()
                     raise
+                self._applied_hashes[provider.id] = applied_hash
                 return True
 
+    async def is_up_to_date(self, *, provider: Provider) -> bool:
+        """
+        Check from the cache, without calling the Kubernetes API, that the deployment has the spec rendered for the
+        current version of the provider. Returns False if the spec was not rendered by this manager yet.
+        """
+        if not self._deployments_synced or not (deployment := self._deployments.get(provider.id)):
+            return False
+        applied_hash = self._applied_hashes.get(provider.id)
+        return applied_hash == (provider.updated_at, deployment.metadata.labels.get("deployment-hash"))
+
     async def delete(self, *, provider_id: UUID) -> None:
+        self._applied_hashes.pop(provider_id, None)
         with suppress(kr8s.NotFoundError):
             async with self.api() as api:
                 deploy = await Deployment.get(name=self._get_k8s_name(provider_id, TemplateKind.DEPLOY), api=api)
@@ -219,33 +298,20 @@ class KubernetesProviderDeploymentManager(IProviderDeploymentManager):
                         resp.raise_for_status()
 
     async def state(self, *, provider_ids: list[UUID]) -> list[ProviderDeploymentState]:
-        async with self.api() as api:
-            deployments = {
-                self._get_provider_id_from_name(
-                    cast(kr8s.APIObject, deployment).metadata.name,
-                    TemplateKind.DEPLOY,
-                ): cast(kr8s.APIObject, deployment)
-                async for deployment in kr8s.asyncio.get(
-                    kind="deployment",
-                    label_selector={"managedBy": "agentstack"},
-                    api=api,
-                )
-            }
-            provider_ids_set = set(provider_ids)
-            deployments = {provider_id: d for provider_id, d in deployments.items() if provider_id in provider_ids_set}
-            states = []
-            for provider_id in provider_ids:
-                deployment = cast(kr8s.APIObject, deployments.get(provider_id))
-                if not deployment:
-                    state = ProviderDeploymentState.MISSING
-                elif deployment.status.get("availableReplicas", 0) > 0:
-                    state = ProviderDeploymentState.RUNNING
-                elif deployment.status.get("replicas", 0) == 0:
-                    state = ProviderDeploymentState.READY
-                else:
-                    state = ProviderDeploymentState.STARTING
-                states.append(state)
-            return states
+        deployments = await self._get_deployments()
+        states = []
+        for provider_id in provider_ids:
+            deployment = deployments.get(provider_id)
+            if not deployment:
+                state = ProviderDeploymentState.MISSING
+            elif deployment.status.get("availableReplicas", 0) > 0:
+                state = ProviderDeploymentState.RUNNING
+            elif deployment.status.get("replicas", 0) == 0:
+                state = ProviderDeploymentState.READY
+            else:
+                state = ProviderDeploymentState.STARTING
+            states.append(state)
+        return states
 
     async def get_provider_url(self, *, provider_id: UUID) -> HttpUrl:
         return HttpUrl(f"http://{self._get_k8s_name(provider_id, TemplateKind.SVC)}:8000")
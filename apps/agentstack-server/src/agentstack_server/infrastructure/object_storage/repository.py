@@ -3,25 +3,38 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import typing
-from contextlib import AbstractAsyncContextManager, asynccontextmanager
-from typing import Any
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from typing import Any, Self
 from uuid import UUID
 
 import aioboto3
-import aioboto3.s3.inject
+from aiobotocore.config import AioConfig
 from botocore.exceptions import ClientError
 from kink import inject
+from opentelemetry.metrics import get_meter
 from pydantic import HttpUrl
 
 from agentstack_server.configuration import Configuration
-from agentstack_server.domain.models.file import AsyncFile, FileMetadata
+from agentstack_server.domain.models.file import AsyncFile, ByteRange
 from agentstack_server.domain.repositories.file import IObjectStorageRepository
 from agentstack_server.exceptions import EntityNotFoundError
+from agentstack_server.telemetry import INSTRUMENTATION_NAME
 
 logger = logging.getLogger(__name__)
 
+_meter = get_meter(INSTRUMENTATION_NAME)
+_requests_in_flight = _meter.create_up_down_counter(
+    "object_storage_requests_in_flight",
+    description="Object storage operations currently holding a connection of the shared S3 client",
+)
+_pool_saturated = _meter.create_counter(
+    "object_storage_pool_saturated",
+    description="Object storage operations started while all pooled connections were in use",
+)
+
 
 @inject
 class S3ObjectStorageRepository(IObjectStorageRepository):
@@ -29,52 +42,163 @@ class S3ObjectStorageRepository(IObjectStorageRepository):
 
     def __init__(self, configuration: Configuration):
         self.config = configuration.object_storage
-
-    def _get_client(self) -> AbstractAsyncContextManager[Any]:
-        session = aioboto3.Session()
-        return session.client(
+        self._clients: dict[str, Any] = {}
+        self._client_exit_stack = AsyncExitStack()
+        self._client_lock = asyncio.Lock()
+        self._requests_in_flight = 0
+
+    async def __aenter__(self) -> Self:
+        await self._get_shared_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        async with self._client_lock:
+            self._clients.clear()
+            await self._client_exit_stack.aclose()
+
+    def _create_client(self, endpoint_url: str) -> typing.AsyncContextManager[Any]:
+        return aioboto3.Session().client(
             "s3",
-            endpoint_url=str(self.config.endpoint_url),
+            endpoint_url=endpoint_url,
             aws_access_key_id=self.config.access_key_id.get_secret_value(),
             aws_secret_access_key=self.config.access_key_secret.get_secret_value(),
             region_name=self.config.region,
             use_ssl=self.config.use_ssl,
+            config=AioConfig(
+                max_pool_connections=self.config.max_pool_connections,
+                tcp_keepalive=self.config.tcp_keepalive,
+                connect_timeout=self.config.connect_timeout_sec,
+                read_timeout=self.config.read_timeout_sec,
+                retries={"mode": self.config.retry_mode, "max_attempts": self.config.max_retry_attempts},
+                connector_args={"keepalive_timeout": self.config.keepalive_timeout_sec},
+            ),
         )
 
+    async def _get_shared_client(self, endpoint_url: str | None = None) -> Any:
+        """Return the long-lived S3 client for the endpoint, creating it on first use."""
+        endpoint_url = endpoint_url or str(self.config.endpoint_url)
+        if endpoint_url not in self._clients:
+            async with self._client_lock:
+                if endpoint_url not in self._clients:
+                    self._clients[endpoint_url] = await self._client_exit_stack.enter_async_context(
+                        self._create_client(endpoint_url)
+                    )
+        return self._clients[endpoint_url]
+
+    @asynccontextmanager
+    async def _get_client(self) -> typing.AsyncGenerator[Any]:
+        client = await self._get_shared_client()
+        attributes = {"max_pool_connections": self.config.max_pool_connections}
+        if self._requests_in_flight >= self.config.max_pool_connections:
+            _pool_saturated.add(1, attributes)
+        self._requests_in_flight += 1
+        _requests_in_flight.add(1, attributes)
+        try:
+            yield client
+        finally:
+            self._requests_in_flight -= 1
+            _requests_in_flight.add(-1, attributes)
+
     def _get_object_key(self, file_id: UUID) -> str:
         return f"files/{file_id}"
 
+    async def _read_part(self, file: AsyncFile) -> bytes:
+        part_size = self.config.multipart_part_size_bytes
+        chunks = []
+        length = 0
+        while length < part_size and (chunk := await file.read(part_size - length)):
+            chunks.append(chunk)
+            length += len(chunk)
+        return b"".join(chunks)
+
+    async def _upload_parts(
+        self, client: Any, *, object_key: str, upload_id: str, file: AsyncFile, first_part: bytes
+    ) -> tuple[list[dict[str, Any]], int]:
+        # At most multipart_max_concurrency parts are uploaded (and held in memory) at the same time
+        semaphore = asyncio.Semaphore(self.config.multipart_max_concurrency)
+
+        async def upload_part(part_number: int, body: bytes) -> dict[str, Any]:
+            try:
+                response = await client.upload_part(
+                    Bucket=self.config.bucket_name,
+                    Key=object_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+            finally:
+                semaphore.release()
+
+        tasks: list[asyncio.Task[dict[str, Any]]] = []
+        total_size = 0
+        try:
+            part = first_part
+            while part:
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(upload_part(len(tasks) + 1, part)))
+                total_size += len(part)
+                part = await self._read_part(file)
+            return await asyncio.gather(*tasks), total_size
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
     async def upload_file(self, *, file_id: UUID, file: AsyncFile) -> int:
         object_key = self._get_object_key(file_id)
+        extra_args = {"ContentType": file.content_type, "Metadata": {"filename": file.filename}}
         async with self._get_client() as client:
-            await client.upload_fileobj(
-                file,
-                self.config.bucket_name,
-                object_key,
-                ExtraArgs={"ContentType": file.content_type, "Metadata": {"filename": file.filename}},
-            )
-            result = await client.head_object(Bucket=self.config.bucket_name, Key=object_key)
-            return result["ContentLength"]
+            first_part = await self._read_part(file)
+            if len(first_part) < self.config.multipart_part_size_bytes:
+                await client.put_object(Bucket=self.config.bucket_name, Key=object_key, Body=first_part, **extra_args)
+                return len(first_part)
+
+            upload = await client.create_multipart_upload(Bucket=self.config.bucket_name, Key=object_key, **extra_args)
+            try:
+                parts, total_size = await self._upload_parts(
+                    client, object_key=object_key, upload_id=upload["UploadId"], file=file, first_part=first_part
+                )
+                await client.complete_multipart_upload(
+                    Bucket=self.config.bucket_name,
+                    Key=object_key,
+                    UploadId=upload["UploadId"],
+                    MultipartUpload={"Parts": parts},
+                )
+                return total_size
+            except BaseException:
+                with suppress(ClientError):
+                    await client.abort_multipart_upload(
+                        Bucket=self.config.bucket_name, Key=object_key, UploadId=upload["UploadId"]
+                    )
+                raise
 
     @asynccontextmanager
-    async def get_file(self, *, file_id: UUID) -> typing.AsyncGenerator[AsyncFile]:
+    async def get_file(self, *, file_id: UUID, byte_range: ByteRange | None = None) -> typing.AsyncGenerator[AsyncFile]:
         object_key = self._get_object_key(file_id)
+        range_args = {"Range": f"bytes={byte_range.start}-{byte_range.end}"} if byte_range else {}
         async with self._get_client() as client:
             try:
-                response = await client.get_object(Bucket=self.config.bucket_name, Key=object_key)
+                response = await client.get_object(Bucket=self.config.bucket_name, Key=object_key, **range_args)
+            except ClientError as e:
+                if e.response["Error"]["Code"] == "NoSuchKey":
+                    raise EntityNotFoundError(entity="file", id=file_id) from e
+                raise
+
+            # Release the connection back to the shared pool even if the body is not fully read
+            async with response["Body"] as body:
 
                 async def read(amount: int = 8192) -> bytes:
-                    return await response["Body"].read(amount)
+                    return await body.read(amount)
 
                 yield AsyncFile(
-                    filename=response["Metadata"]["filename"], content_type=response["ContentType"], read=read
+                    filename=response["Metadata"]["filename"],
+                    content_type=response["ContentType"],
+                    read=read,
+                    size=response["ContentLength"],
                 )
 
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "NoSuchKey":
-                    raise EntityNotFoundError(entity="file", id=file_id) from e
-                raise
-
     async def delete_files(self, *, file_ids: list[UUID]) -> None:
         if not file_ids:
             return
@@ -100,34 +224,23 @@ class S3ObjectStorageRepository(IObjectStorageRepository):
                     logger.error(f"Error bulk deleting files: {e}")
                     raise
 
-    async def get_file_url(self, *, file_id: UUID) -> HttpUrl:
-        object_key = self._get_object_key(file_id)
-        async with self._get_client() as client:
-            try:
-                await client.head_object(Bucket=self.config.bucket_name, Key=object_key)
-                url = await client.generate_presigned_url(
-                    "get_object",
-                    Params={"Bucket": self.config.bucket_name, "Key": object_key},
-                    ExpiresIn=3600,  # 1 hour
-                )
-                return HttpUrl(url)
-
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "NoSuchKey" or e.response["Error"]["Code"] == "404":
-                    raise EntityNotFoundError(entity="file", id=file_id) from e
-                raise
-
-    async def get_file_metadata(self, *, file_id: UUID) -> FileMetadata:
-        object_key = self._get_object_key(file_id)
-        async with self._get_client() as client:
-            try:
-                response = await client.head_object(Bucket=self.config.bucket_name, Key=object_key)
-                return FileMetadata(
-                    content_type=response.get("ContentType", ""),
-                    filename=response.get("Metadata", {}).get("filename", ""),
-                    content_length=response.get("ContentLength", 0),
-                )
-            except ClientError as e:
-                if e.response["Error"]["Code"] == "NoSuchKey" or e.response["Error"]["Code"] == "404":
-                    raise EntityNotFoundError(entity="file", id=file_id) from e
-                raise
+    async def get_file_url(self, *, file_id: UUID, public: bool = False, check_exists: bool = False) -> HttpUrl:
+        # Presigning is local and does not check that the object exists, the files table is the source of truth
+        # once the upload is finalized. Otherwise check_exists makes sure the upload has completed.
+        if check_exists:
+            async with self._get_client() as client:
+                try:
+                    await client.head_object(Bucket=self.config.bucket_name, Key=self._get_object_key(file_id))
+                except ClientError as e:
+                    if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                        raise EntityNotFoundError(entity="file", id=file_id) from e
+                    raise
+        # The URL is signed for the host the client will connect to
+        endpoint_url = str(self.config.public_endpoint_url) if public and self.config.public_endpoint_url else None
+        client = await self._get_shared_client(endpoint_url)
+        url = await client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.config.bucket_name, "Key": self._get_object_key(file_id)},
+            ExpiresIn=self.config.presigned_url_expiration_sec,
+        )
+        return HttpUrl(url)
@@ -15,7 +15,7 @@ import openai.types.chat
 from aws_bedrock_token_generator import provide_token
 
 from agentstack_server.api.schema.openai import ChatCompletionRequest
-from agentstack_server.domain.models.model_provider import Model, ModelProvider
+from agentstack_server.domain.models.model_provider import Model
 from agentstack_server.infrastructure.openai_proxy.adapters.openai import OpenAIOpenAIProxyAdapter
 
 logger = logging.getLogger(__name__)
@@ -117,8 +117,9 @@ class StaticCredentialsProvider(botocore.credentials.CredentialProvider):
 
 
 class BedrockOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
-    def __init__(self, provider: ModelProvider) -> None:
-        super().__init__(provider)
+    def _get_session(self, api_key: str) -> aioboto3.Session:
+        # Sessions keep the loaded service models and resolved credentials between calls
+        return self._clients.get(provider=self.provider, api_key=api_key, kind="aioboto3", factory=aioboto3.Session)
 
     @override
     async def list_models(self, *, api_key: str) -> list[Model]:
@@ -134,7 +135,7 @@ class BedrockOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
             try:
                 access_key, secret_key, session_token, region = _parse_credentials(api_key)
 
-                session = aioboto3.Session()
+                session = self._get_session(api_key)
                 async with session.client(
                     "bedrock",
                     region_name=region,
@@ -167,7 +168,7 @@ class BedrockOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
         ]
 
     @override
-    def _get_client(self, api_key: str) -> openai.AsyncOpenAI:
+    def _create_client(self, api_key: str) -> openai.AsyncOpenAI:
         if ":" in api_key:
             try:
                 access_key, secret_key, session_token, region = _parse_credentials(api_key)
@@ -178,11 +179,15 @@ class BedrockOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
                         access_key=access_key, secret_key=secret_key, token=session_token
                     ),
                 )
-                return openai.AsyncOpenAI(api_key=token, base_url=str(self.provider.base_url))
+                return openai.AsyncOpenAI(
+                    api_key=token,
+                    base_url=str(self.provider.base_url),
+                    http_client=self._clients.http_client(self.provider.id),
+                )
             except Exception as e:
                 logger.error(f"Failed to generate Bedrock token: {e}")
 
-        return super()._get_client(api_key)
+        return super()._create_client(api_key)
 
     @override
     async def create_chat_completion(
@@ -221,7 +226,7 @@ class BedrockOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
         access_key, secret_key, session_token, region = _parse_credentials(api_key)
         kwargs = _build_converse_kwargs(raw_model_id, request)
 
-        session = aioboto3.Session()
+        session = self._get_session(api_key)
         async with session.client(
             "bedrock-runtime",
             region_name=region,
@@ -271,7 +276,7 @@ class BedrockOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
         created = int(datetime.now().timestamp())
         model_id = str(request.model)
 
-        session = aioboto3.Session()
+        session = self._get_session(api_key)
         async with session.client(
             "bedrock-runtime",
             region_name=region,
@@ -299,9 +304,7 @@ class BedrockOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
                             }
                         )
                 elif "messageStop" in event:
-                    stop_reason = _bedrock_stop_reason_to_openai(
-                        event["messageStop"].get("stopReason", "end_turn")
-                    )
+                    stop_reason = _bedrock_stop_reason_to_openai(event["messageStop"].get("stopReason", "end_turn"))
                     yield openai.types.chat.ChatCompletionChunk.model_validate(
                         {
                             "id": completion_id,
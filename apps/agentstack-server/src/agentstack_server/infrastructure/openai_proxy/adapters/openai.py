@@ -8,7 +8,6 @@ from datetime import datetime
 from typing import Final, override
 
 import openai.types.chat
-from httpx import AsyncClient
 
 from agentstack_server.api.schema.openai import ChatCompletionRequest, EmbeddingsRequest
 from agentstack_server.domain.models.model_provider import Model, ModelProvider
@@ -20,23 +19,34 @@ from agentstack_server.infrastructure.openai_proxy.adapters.utils import (
     convert_embedding_output,
     parse_openai_compatible_model,
 )
+from agentstack_server.infrastructure.openai_proxy.clients import LIST_MODELS_TIMEOUT_SEC, ProviderClientCache
 from agentstack_server.utils.utils import omit
 
 
 class OpenAIOpenAIProxyAdapter(IOpenAIChatCompletionProxyAdapter, IOpenAIEmbeddingProxyAdapter):
-    def __init__(self, provider: ModelProvider) -> None:
+    def __init__(self, provider: ModelProvider, clients: ProviderClientCache) -> None:
         super().__init__()
         self.provider: Final[ModelProvider] = provider
+        self._clients: Final[ProviderClientCache] = clients
+
+    def _create_client(self, api_key: str) -> openai.AsyncOpenAI:
+        return openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=str(self.provider.base_url),
+            http_client=self._clients.http_client(self.provider.id),
+        )
 
     def _get_client(self, api_key: str) -> openai.AsyncOpenAI:
-        return openai.AsyncOpenAI(api_key=api_key, base_url=str(self.provider.base_url))
+        return self._clients.get(
+            provider=self.provider, api_key=api_key, kind="openai", factory=lambda: self._create_client(api_key)
+        )
 
     @override
     async def list_models(self, *, api_key: str) -> list[Model]:
         client = self._get_client(api_key)
         return [
             parse_openai_compatible_model(self.provider, model.model_dump())
-            async for model in (await client.models.list())
+            async for model in (await client.models.list(timeout=LIST_MODELS_TIMEOUT_SEC))
         ]
 
     @override
@@ -92,59 +102,74 @@ class OpenAIOpenAIProxyAdapter(IOpenAIChatCompletionProxyAdapter, IOpenAIEmbeddi
 
 class RitsOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
     @override
-    def _get_client(self, api_key: str) -> openai.AsyncOpenAI:
+    def _create_client(self, api_key: str) -> openai.AsyncOpenAI:
         return openai.AsyncOpenAI(
-            api_key=api_key, base_url=str(self.provider.base_url), default_headers=({"RITS_API_KEY": api_key})
+            api_key=api_key,
+            base_url=str(self.provider.base_url),
+            default_headers=({"RITS_API_KEY": api_key}),
+            http_client=self._clients.http_client(self.provider.id),
         )
 
 
 class AnthropicOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
     @override
     async def list_models(self, *, api_key: str) -> list[Model]:
-        async with AsyncClient() as client:
-            response = await client.get(
-                f"{self.provider.base_url}/models", headers={"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+        response = await self._clients.http_client(self.provider.id).get(
+            f"{self.provider.base_url}/models",
+            headers={"x-api-key": api_key, "anthropic-version": "2023-06-01"},
+            timeout=LIST_MODELS_TIMEOUT_SEC,
+        )
+        models = response.raise_for_status().json()["data"]
+        return [
+            Model(
+                id=f"{self.provider.type}:{model['id']}",
+                created=int(datetime.fromisoformat(model["created_at"]).timestamp()),
+                owned_by="Anthropic",
+                object="model",
+                display_name=model["display_name"],
+                provider=self.provider.model_provider_info,
             )
-            models = response.raise_for_status().json()["data"]
-            return [
-                Model(
-                    id=f"{self.provider.type}:{model['id']}",
-                    created=int(datetime.fromisoformat(model["created_at"]).timestamp()),
-                    owned_by="Anthropic",
-                    object="model",
-                    display_name=model["display_name"],
-                    provider=self.provider.model_provider_info,
-                )
-                for model in models
-            ]
+            for model in models
+        ]
 
 
 class GithubOpenAIProxyAdapter(OpenAIOpenAIProxyAdapter):
     @override
     async def list_models(self, *, api_key: str) -> list[Model]:
-        async with AsyncClient() as client:
-            model_url = f"{self.provider.base_url.scheme}://{self.provider.base_url.host}/catalog/models"
-            response = await client.get(model_url, headers={"Authorization": f"Bearer {api_key}"})
-            models = response.raise_for_status().json()
-            return [
-                Model(
-                    id=f"{self.provider.type}:{model['id']}",
-                    display_name=model["name"],
-                    owned_by=model["publisher"],
-                    provider=self.provider.model_provider_info,
-                    **omit(model, {"id", "name", "publisher"}),
-                )
-                for model in models
-            ]
+        model_url = f"{self.provider.base_url.scheme}://{self.provider.base_url.host}/catalog/models"
+        response = await self._clients.http_client(self.provider.id).get(
+            model_url, headers={"Authorization": f"Bearer {api_key}"}, timeout=LIST_MODELS_TIMEOUT_SEC
+        )
+        models = response.raise_for_status().json()
+        return [
+            Model(
+                id=f"{self.provider.type}:{model['id']}",
+                display_name=model["name"],
+                owned_by=model["publisher"],
+                provider=self.provider.model_provider_info,
+                **omit(model, {"id", "name", "publisher"}),
+            )
+            for model in models
+        ]
 
 
 class VoyageOpenAIProxyAdapter(IOpenAIEmbeddingProxyAdapter):
-    def __init__(self, provider: ModelProvider) -> None:
+    def __init__(self, provider: ModelProvider, clients: ProviderClientCache) -> None:
         super().__init__()
         self.provider: Final[ModelProvider] = provider
+        self._clients: Final[ProviderClientCache] = clients
+
+    def _create_client(self, api_key: str) -> openai.AsyncOpenAI:
+        return openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=str(self.provider.base_url),
+            http_client=self._clients.http_client(self.provider.id),
+        )
 
     def _get_client(self, api_key: str) -> openai.AsyncOpenAI:
-        return openai.AsyncOpenAI(api_key=api_key, base_url=str(self.provider.base_url))
+        return self._clients.get(
+            provider=self.provider, api_key=api_key, kind="openai", factory=lambda: self._create_client(api_key)
+        )
 
     @override
     async def list_models(self, *, api_key: str) -> list[Model]:
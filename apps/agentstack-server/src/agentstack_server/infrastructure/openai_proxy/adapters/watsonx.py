@@ -20,7 +20,6 @@ except ImportError:
 
 import ibm_watsonx_ai.foundation_models.embeddings
 import openai.types.chat
-from httpx import AsyncClient
 
 from agentstack_server.api.schema.openai import ChatCompletionRequest, EmbeddingsRequest, MultiformatEmbedding
 from agentstack_server.domain.models.model_provider import Model, ModelProvider
@@ -29,12 +28,27 @@ from agentstack_server.domain.repositories.openai_proxy import (
     IOpenAIEmbeddingProxyAdapter,
 )
 from agentstack_server.infrastructure.openai_proxy.adapters.utils import float_list_to_base64, iterate_in_threadpool
+from agentstack_server.infrastructure.openai_proxy.clients import LIST_MODELS_TIMEOUT_SEC, ProviderClientCache
 
 
 class WatsonXOpenAIProxyAdapter(IOpenAIChatCompletionProxyAdapter, IOpenAIEmbeddingProxyAdapter):
-    def __init__(self, provider: ModelProvider) -> None:
+    def __init__(self, provider: ModelProvider, clients: ProviderClientCache) -> None:
         super().__init__()
         self.provider: Final[ModelProvider] = provider
+        self._clients: Final[ProviderClientCache] = clients
+
+    def _get_api_client(self, api_key: str) -> ibm_watsonx_ai.APIClient:
+        # The API client holds the IAM token and the HTTP session, creating it authenticates against the cloud
+        return self._clients.get(
+            provider=self.provider,
+            api_key=api_key,
+            kind="watsonx",
+            factory=lambda: ibm_watsonx_ai.APIClient(
+                credentials=ibm_watsonx_ai.Credentials(url=str(self.provider.base_url), api_key=api_key),
+                project_id=self.provider.watsonx_project_id,
+                space_id=self.provider.watsonx_space_id,
+            ),
+        )
 
     def _get_watsonx_model(
         self, request: ChatCompletionRequest, api_key: str
@@ -42,7 +56,7 @@ class WatsonXOpenAIProxyAdapter(IOpenAIChatCompletionProxyAdapter, IOpenAIEmbedd
         model_id = self.provider.get_raw_model_id(request.model)
         return ibm_watsonx_ai.foundation_models.ModelInference(
             model_id=model_id,
-            credentials=ibm_watsonx_ai.Credentials(url=str(self.provider.base_url), api_key=api_key),
+            api_client=self._get_api_client(api_key),
             project_id=self.provider.watsonx_project_id,
             space_id=self.provider.watsonx_space_id,
             params=ibm_watsonx_ai.foundation_models.model.TextChatParameters(
@@ -64,33 +78,34 @@ class WatsonXOpenAIProxyAdapter(IOpenAIChatCompletionProxyAdapter, IOpenAIEmbedd
 
     @override
     async def list_models(self, *, api_key: str) -> list[Model]:
-        async with AsyncClient() as client:
-            response = await client.get(f"{self.provider.base_url}/ml/v1/foundation_model_specs?version=2025-08-27")
-            response_models = response.raise_for_status().json()["resources"]
-            available_models = []
-            for model in response_models:
-                if not model.get("lifecycle"):  # models without lifecycle might be embedding models
-                    available_models.append((model, 0))
-                    continue
-                events = {e["id"]: e for e in model["lifecycle"]}
-                if "withdrawn" in events:
-                    continue
-                if "available" in events:
-                    created = int(datetime.fromisoformat(events["available"]["start_date"]).timestamp())
-                    available_models.append((model, created))
-            return [
-                Model.model_validate(
-                    {
-                        **model,
-                        "id": f"{self.provider.type}:{model['model_id']}",
-                        "created": created,
-                        "object": "model",
-                        "owned_by": model["provider"],
-                        "provider": self.provider.model_provider_info,
-                    }
-                )
-                for model, created in available_models
-            ]
+        response = await self._clients.http_client(self.provider.id).get(
+            f"{self.provider.base_url}/ml/v1/foundation_model_specs?version=2025-08-27", timeout=LIST_MODELS_TIMEOUT_SEC
+        )
+        response_models = response.raise_for_status().json()["resources"]
+        available_models = []
+        for model in response_models:
+            if not model.get("lifecycle"):  # models without lifecycle might be embedding models
+                available_models.append((model, 0))
+                continue
+            events = {e["id"]: e for e in model["lifecycle"]}
+            if "withdrawn" in events:
+                continue
+            if "available" in events:
+                created = int(datetime.fromisoformat(events["available"]["start_date"]).timestamp())
+                available_models.append((model, created))
+        return [
+            Model.model_validate(
+                {
+                    **model,
+                    "id": f"{self.provider.type}:{model['model_id']}",
+                    "created": created,
+                    "object": "model",
+                    "owned_by": model["provider"],
+                    "provider": self.provider.model_provider_info,
+                }
+            )
+            for model, created in available_models
+        ]
 
     @override
     async def create_chat_completion(
@@ -216,7 +231,7 @@ class WatsonXOpenAIProxyAdapter(IOpenAIChatCompletionProxyAdapter, IOpenAIEmbedd
         watsonx_response = await asyncio.to_thread(
             ibm_watsonx_ai.foundation_models.embeddings.Embeddings(
                 model_id=self.provider.get_raw_model_id(request.model),
-                credentials=ibm_watsonx_ai.Credentials(url=str(self.provider.base_url), api_key=api_key),
+                api_client=self._get_api_client(api_key),
                 project_id=self.provider.watsonx_project_id,
                 space_id=self.provider.watsonx_space_id,
             ).generate,
@@ -0,0 +1,81 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+from collections.abc import Callable
+from typing import Final, cast
+from uuid import UUID
+
+import httpx
+from cachetools import TTLCache
+
+from agentstack_server.configuration import ModelProviderConfiguration
+from agentstack_server.domain.models.model_provider import ModelProvider
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Listing models is a quick metadata call, an unresponsive provider must not hold the caller for the timeout of the
+# pooled clients (sized for long completions). Matches the default timeout of httpx.
+LIST_MODELS_TIMEOUT_SEC: Final = 5.0
+
+
+def api_key_fingerprint(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class ProviderClientCache:
+    """
+    Upstream API clients reused across requests to model providers
+
+    Clients are cached per provider and API key fingerprint, so a request only checks out a pooled connection instead
+    of doing a new handshake. Each provider gets its own bounded connection pool, a slow provider cannot take the
+    connections of the others. Entries expire after a while to pick up changes made on other replicas and to renew
+    short-lived credentials derived from the API key.
+    """
+
+    def __init__(self, configuration: ModelProviderConfiguration):
+        self._config: Final = configuration
+        self._http_clients: Final[dict[UUID, httpx.AsyncClient]] = {}
+        self._clients: Final[TTLCache[tuple[UUID, str, str, str], object]] = TTLCache(
+            maxsize=configuration.max_cached_clients, ttl=configuration.client_ttl_sec
+        )
+
+    def http_client(self, provider_id: UUID) -> httpx.AsyncClient:
+        if (client := self._http_clients.get(provider_id)) is None:
+            client = self._http_clients[provider_id] = httpx.AsyncClient(
+                follow_redirects=True,
+                http2=self._config.http2 and _HTTP2_AVAILABLE,
+                # The timeouts of the openai SDK (also used by the SDK clients sharing this client), except that a
+                # request waiting for a connection of a saturated pool fails early
+                timeout=httpx.Timeout(600, connect=5.0, pool=self._config.pool_timeout_sec),
+                limits=httpx.Limits(
+                    max_connections=self._config.max_connections_per_provider,
+                    max_keepalive_connections=self._config.max_keepalive_connections_per_provider,
+                    keepalive_expiry=self._config.keepalive_expiry_sec,
+                ),
+            )
+        return client
+
+    def get[T](self, *, provider: ModelProvider, api_key: str, kind: str, factory: Callable[[], T]) -> T:
+        key = (provider.id, kind, str(provider.base_url), api_key_fingerprint(api_key))
+        if (client := self._clients.get(key)) is None:
+            client = self._clients[key] = factory()
+        return cast(T, client)
+
+    async def invalidate(self, *, provider_id: UUID) -> None:
+        for key in [key for key in self._clients if key[0] == provider_id]:
+            self._clients.pop(key, None)
+        # The provider was changed or deleted, its connection pool is not reused
+        if (http_client := self._http_clients.pop(provider_id, None)) is not None:
+            await http_client.aclose()
+
+    async def aclose(self) -> None:
+        # Cached clients either use the connection pools of their providers or do not need to be closed
+        self._clients.clear()
+        http_clients = list(self._http_clients.values())
+        self._http_clients.clear()
+        for client in http_clients:
+            await client.aclose()
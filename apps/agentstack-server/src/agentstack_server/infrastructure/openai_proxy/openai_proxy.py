@@ -3,8 +3,10 @@
 
 from __future__ import annotations
 
-from typing import override
+from typing import Final, Self, override
+from uuid import UUID
 
+from agentstack_server.configuration import ModelProviderConfiguration
 from agentstack_server.domain.models.model_provider import Model, ModelProvider, ModelProviderType
 from agentstack_server.domain.repositories.openai_proxy import (
     IOpenAIChatCompletionProxyAdapter,
@@ -20,9 +22,25 @@ from agentstack_server.infrastructure.openai_proxy.adapters.openai import (
     VoyageOpenAIProxyAdapter,
 )
 from agentstack_server.infrastructure.openai_proxy.adapters.watsonx import WatsonXOpenAIProxyAdapter
+from agentstack_server.infrastructure.openai_proxy.clients import ProviderClientCache
 
 
 class CustomOpenAIProxy(IOpenAIProxy):
+    def __init__(self, configuration: ModelProviderConfiguration) -> None:
+        self._clients: Final[ProviderClientCache] = ProviderClientCache(configuration)
+
+    @override
+    async def __aenter__(self) -> Self:
+        return self
+
+    @override
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._clients.aclose()
+
+    @override
+    async def invalidate_clients(self, *, model_provider_id: UUID) -> None:
+        await self._clients.invalidate(provider_id=model_provider_id)
+
     @override
     async def list_models(self, *, provider: ModelProvider, api_key: str) -> list[Model]:
         if provider.supports_llm:
@@ -36,17 +54,17 @@ class CustomOpenAIProxy(IOpenAIProxy):
             raise ValueError("Provider does not support chat completions")
         match provider.type:
             case ModelProviderType.WATSONX:
-                return WatsonXOpenAIProxyAdapter(provider)
+                return WatsonXOpenAIProxyAdapter(provider, self._clients)
             case ModelProviderType.BEDROCK:
-                return BedrockOpenAIProxyAdapter(provider)
+                return BedrockOpenAIProxyAdapter(provider, self._clients)
             case ModelProviderType.RITS:
-                return RitsOpenAIProxyAdapter(provider)
+                return RitsOpenAIProxyAdapter(provider, self._clients)
             case ModelProviderType.ANTHROPIC:
-                return AnthropicOpenAIProxyAdapter(provider)
+                return AnthropicOpenAIProxyAdapter(provider, self._clients)
             case ModelProviderType.GITHUB:
-                return GithubOpenAIProxyAdapter(provider)
+                return GithubOpenAIProxyAdapter(provider, self._clients)
             case _:
-                return OpenAIOpenAIProxyAdapter(provider)
+                return OpenAIOpenAIProxyAdapter(provider, self._clients)
 
     @override
     def get_embedding_proxy(self, *, provider: ModelProvider) -> IOpenAIEmbeddingProxyAdapter:
@@ -54,16 +72,16 @@ class CustomOpenAIProxy(IOpenAIProxy):
             raise ValueError("Provider does not support embeddings")
         match provider.type:
             case ModelProviderType.WATSONX:
-                return WatsonXOpenAIProxyAdapter(provider)
+                return WatsonXOpenAIProxyAdapter(provider, self._clients)
             case ModelProviderType.BEDROCK:
-                return BedrockOpenAIProxyAdapter(provider)
+                return BedrockOpenAIProxyAdapter(provider, self._clients)
             case ModelProviderType.RITS:
-                return RitsOpenAIProxyAdapter(provider)
+                return RitsOpenAIProxyAdapter(provider, self._clients)
             case ModelProviderType.ANTHROPIC:
-                return AnthropicOpenAIProxyAdapter(provider)
+                return AnthropicOpenAIProxyAdapter(provider, self._clients)
             case ModelProviderType.GITHUB:
-                return GithubOpenAIProxyAdapter(provider)
+                return GithubOpenAIProxyAdapter(provider, self._clients)
             case ModelProviderType.VOYAGE:
-                return VoyageOpenAIProxyAdapter(provider)
+                return VoyageOpenAIProxyAdapter(provider, self._clients)
             case _:
-                return OpenAIOpenAIProxyAdapter(provider)
+                return OpenAIOpenAIProxyAdapter(provider, self._clients)
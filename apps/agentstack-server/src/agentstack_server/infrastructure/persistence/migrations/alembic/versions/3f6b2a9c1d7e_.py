@@ -0,0 +1,69 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+"""add distance metric to vector stores and per-metric HNSW indexes
+
+Revision ID: 3f6b2a9c1d7e
+Revises: 764ca0fd6a5b
+Create Date: 2026-10-16 10:12:44.318276
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from agentstack_server import get_configuration
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6b2a9c1d7e"
+down_revision: str | None = "764ca0fd6a5b"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+vectordistancemetric_enum = sa.Enum("cosine", "l2", "inner_product", name="vectordistancemetric")
+
+
+def _collection_tables(schema: str) -> list[str]:
+    result = op.get_bind().execute(
+        sa.text("SELECT tablename FROM pg_tables WHERE schemaname = :schema AND tablename LIKE 'collections_dim_%'"),
+        {"schema": schema},
+    )
+    return list(result.scalars())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    vectordistancemetric_enum.create(op.get_bind())
+    op.add_column(
+        "vector_stores",
+        sa.Column("distance_metric", vectordistancemetric_enum, nullable=False, server_default="cosine"),
+    )
+
+    # Existing stores were always searched by cosine distance, the l2 index was never used by any query
+    schema = get_configuration().persistence.vector_db_schema
+    for table in _collection_tables(schema):
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_vector_cosine_index ON {schema}.{table} "
+            "USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)"
+        )
+        op.execute(f"DROP INDEX IF EXISTS {schema}.{table}_vector_index")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    schema = get_configuration().persistence.vector_db_schema
+    for table in _collection_tables(schema):
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_vector_index ON {schema}.{table} "
+            "USING hnsw (embedding halfvec_l2_ops) WITH (m = 16, ef_construction = 64)"
+        )
+        for metric in ("cosine", "l2", "inner_product"):
+            op.execute(f"DROP INDEX IF EXISTS {schema}.{table}_vector_{metric}_index")
+
+    op.drop_column("vector_stores", "distance_metric")
+    vectordistancemetric_enum.drop(op.get_bind())
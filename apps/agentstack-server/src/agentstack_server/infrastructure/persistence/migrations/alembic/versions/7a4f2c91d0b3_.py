@@ -0,0 +1,54 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+"""store context history as jsonb with kind and role projections
+
+Revision ID: 7a4f2c91d0b3
+Revises: e3c91f5a7d24
+Create Date: 2026-10-17 13:41:08.552190
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision: str = "7a4f2c91d0b3"
+down_revision: str | None = "e3c91f5a7d24"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each of the changes rewrites the table, a single statement rewrites it only once. jsonb cannot store NUL
+    # characters, escaped NULs (not preceded by an escaped backslash) are removed from the payload.
+    op.execute(
+        r"""
+        ALTER TABLE context_history
+            ALTER COLUMN data TYPE JSONB USING regexp_replace(data::text, '(?<!\\)((\\\\)*)\\u0000', '\1', 'g')::jsonb,
+            ADD COLUMN kind VARCHAR GENERATED ALWAYS AS (COALESCE(data ->> 'kind', 'artifact')) STORED NOT NULL,
+            ADD COLUMN role VARCHAR GENERATED ALWAYS AS (data ->> 'role') STORED
+        """
+    )
+    op.drop_index("idx_context_history_context_id", table_name="context_history")
+    op.create_index(
+        "idx_context_history_context_id_created_at",
+        "context_history",
+        ["context_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_context_history_context_id_created_at", table_name="context_history")
+    op.create_index("idx_context_history_context_id", "context_history", ["context_id"], unique=False)
+    op.drop_column("context_history", "role")
+    op.drop_column("context_history", "kind")
+    op.alter_column("context_history", "data", type_=sa.JSON(), existing_type=JSONB(), postgresql_using="data::json")
@@ -0,0 +1,138 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+"""partition vector database collections by vector store
+
+Revision ID: 8d41c7e05a93
+Revises: 3f6b2a9c1d7e
+Create Date: 2026-10-16 14:03:51.902417
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from agentstack_server import get_configuration
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41c7e05a93"
+down_revision: str | None = "3f6b2a9c1d7e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Snapshot of vector_db.SUPPORTED_DIMENSIONS at the time of this migration
+SUPPORTED_DIMENSIONS = [64, 128, 256, 312, 384, 512, 768, 896, 1024, 1536, 1792, 2048, 2304, 2560, 3072, 3584, 4000]
+OPERATOR_CLASSES = {"cosine": "halfvec_cosine_ops", "l2": "halfvec_l2_ops", "inner_product": "halfvec_ip_ops"}
+HNSW_PARAMETERS = "m = 16, ef_construction = 64"
+
+
+def _supported_dimension(dimension: int) -> int:
+    return max([d for d in SUPPORTED_DIMENSIONS if d <= dimension], default=SUPPORTED_DIMENSIONS[0])
+
+
+def _collection_tables(schema: str) -> list[str]:
+    result = op.get_bind().execute(
+        sa.text("SELECT tablename FROM pg_tables WHERE schemaname = :schema AND tablename LIKE 'collections_dim_%'"),
+        {"schema": schema},
+    )
+    return list(result.scalars())
+
+
+def _table_indexes(schema: str, table: str) -> list[str]:
+    result = op.get_bind().execute(
+        sa.text("SELECT indexname FROM pg_indexes WHERE schemaname = :schema AND tablename = :table"),
+        {"schema": schema, "table": table},
+    )
+    return list(result.scalars())
+
+
+def _create_collection_table(schema: str, table: str, dimension: int, partitioned: bool) -> None:
+    op.execute(
+        f"""
+        CREATE TABLE {schema}.{table} (
+            id UUID NOT NULL,
+            vector_store_id UUID NOT NULL,
+            vector_store_document_id VARCHAR(256) NOT NULL,
+            text TEXT NOT NULL,
+            embedding HALFVEC({dimension}) NOT NULL,
+            metadata JSONB,
+            PRIMARY KEY (id, vector_store_id),
+            CONSTRAINT fk_collections_to_documents FOREIGN KEY (vector_store_document_id, vector_store_id)
+                REFERENCES public.vector_store_documents (id, vector_store_id)
+                ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED
+        ) {"PARTITION BY LIST (vector_store_id)" if partitioned else ""}
+        """
+    )
+    op.execute(
+        f"CREATE INDEX {table}_vector_store_id_index ON {schema}.{table} (vector_store_id, vector_store_document_id)"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    schema = get_configuration().persistence.vector_db_schema
+
+    # Move the shared tables out of the way, index names are unique per schema
+    legacy_tables = {}
+    for table in _collection_tables(schema):
+        for index in _table_indexes(schema, table):
+            op.execute(f"ALTER INDEX {schema}.{index} RENAME TO {index}_legacy")
+        op.execute(f"ALTER TABLE {schema}.{table} RENAME TO {table}_legacy")
+        legacy_tables[table] = f"{table}_legacy"
+
+    vector_stores = op.get_bind().execute(sa.text("SELECT id, dimension, distance_metric FROM public.vector_stores"))
+    created_tables = set()
+    for vector_store_id, dimension, distance_metric in vector_stores.fetchall():
+        supported_dimension = _supported_dimension(dimension)
+        table = f"collections_dim_{supported_dimension}"
+        if table not in created_tables:
+            _create_collection_table(schema, table, supported_dimension, partitioned=True)
+            created_tables.add(table)
+
+        partition = f"{table}_{vector_store_id.hex}"
+        op.execute(
+            f"CREATE TABLE {schema}.{partition} PARTITION OF {schema}.{table} FOR VALUES IN ('{vector_store_id}')"
+        )
+        if table in legacy_tables:
+            op.execute(
+                f"INSERT INTO {schema}.{partition} "
+                f"SELECT * FROM {schema}.{legacy_tables[table]} WHERE vector_store_id = '{vector_store_id}'"
+            )
+        # Build the graph after the data is copied, which is much faster than inserting into an existing index
+        op.execute(
+            f"CREATE INDEX {partition}_hnsw ON {schema}.{partition} "
+            f"USING hnsw (embedding {OPERATOR_CLASSES[distance_metric]}) WITH ({HNSW_PARAMETERS})"
+        )
+
+    for legacy_table in legacy_tables.values():
+        op.execute(f"DROP TABLE {schema}.{legacy_table}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    schema = get_configuration().persistence.vector_db_schema
+    vector_stores = op.get_bind().execute(sa.text("SELECT dimension, distance_metric FROM public.vector_stores"))
+    distance_metrics: dict[str, set[str]] = {}
+    for dimension, distance_metric in vector_stores.fetchall():
+        distance_metrics.setdefault(f"collections_dim_{_supported_dimension(dimension)}", set()).add(distance_metric)
+
+    for table in _collection_tables(schema):
+        if table.count("_") != 2:
+            continue  # partitions are dropped together with the parent table
+        dimension = int(table.rsplit("_", 1)[1])
+        for index in _table_indexes(schema, table):
+            op.execute(f"ALTER INDEX {schema}.{index} RENAME TO {index}_partitioned")
+        op.execute(f"ALTER TABLE {schema}.{table} RENAME TO {table}_partitioned")
+
+        _create_collection_table(schema, table, dimension, partitioned=False)
+        op.execute(f"INSERT INTO {schema}.{table} SELECT * FROM {schema}.{table}_partitioned")
+        op.execute(f"DROP TABLE {schema}.{table}_partitioned CASCADE")
+        for distance_metric in distance_metrics.get(table, set()):
+            op.execute(
+                f"CREATE INDEX {table}_vector_{distance_metric}_index ON {schema}.{table} "
+                f"USING hnsw (embedding {OPERATOR_CLASSES[distance_metric]}) WITH ({HNSW_PARAMETERS})"
+            )
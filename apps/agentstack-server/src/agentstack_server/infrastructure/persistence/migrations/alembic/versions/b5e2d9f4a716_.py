@@ -0,0 +1,60 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+"""add metadata and full-text indexes to vector database collections
+
+Revision ID: b5e2d9f4a716
+Revises: 8d41c7e05a93
+Create Date: 2026-10-16 17:21:08.553190
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from agentstack_server import get_configuration
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e2d9f4a716"
+down_revision: str | None = "8d41c7e05a93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _partitioned_collection_tables(schema: str) -> list[str]:
+    result = op.get_bind().execute(
+        sa.text(
+            "SELECT pg_class.relname FROM pg_partitioned_table "
+            "JOIN pg_class ON pg_partitioned_table.partrelid = pg_class.oid "
+            "JOIN pg_namespace ON pg_class.relnamespace = pg_namespace.oid "
+            "WHERE pg_namespace.nspname = :schema AND pg_class.relname LIKE 'collections\\_dim\\_%'"
+        ),
+        {"schema": schema},
+    )
+    return list(result.scalars())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    schema = get_configuration().persistence.vector_db_schema
+    # Indexes created on the partitioned table are built on all of its partitions
+    for table in _partitioned_collection_tables(schema):
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_metadata_index ON {schema}.{table} USING gin (metadata jsonb_path_ops)"
+        )
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_text_search_index ON {schema}.{table} "
+            "USING gin (to_tsvector('simple'::regconfig, text))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    schema = get_configuration().persistence.vector_db_schema
+    for table in _partitioned_collection_tables(schema):
+        op.execute(f"DROP INDEX IF EXISTS {schema}.{table}_metadata_index")
+        op.execute(f"DROP INDEX IF EXISTS {schema}.{table}_text_search_index")
@@ -0,0 +1,32 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+"""add providers origin index
+
+Revision ID: e3c91f5a7d24
+Revises: b5e2d9f4a716
+Create Date: 2026-10-17 09:12:44.318025
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3c91f5a7d24"
+down_revision: str | None = "b5e2d9f4a716"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("idx_providers_origin", "providers", ["origin"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_providers_origin", table_name="providers")
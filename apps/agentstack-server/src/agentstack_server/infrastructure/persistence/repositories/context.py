@@ -3,34 +3,45 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Mapping, Sequence
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from kink import inject
 from pydantic import TypeAdapter
 from sqlalchemy import (
     JSON,
     Column,
+    Computed,
     DateTime,
     ForeignKey,
     Index,
     Row,
+    String,
     Table,
     delete,
     select,
-    update,
+    tuple_,
 )
 from sqlalchemy import UUID as SQL_UUID
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from agentstack_server.domain.models.common import Metadata, PaginatedResult
-from agentstack_server.domain.models.context import Context, ContextHistoryItem, TitleGenerationState
+from agentstack_server.domain.models.common import Metadata, PaginatedResult, TotalCount
+from agentstack_server.domain.models.context import (
+    Context,
+    ContextHistoryItem,
+    ContextHistoryItemKind,
+    TitleGenerationState,
+)
 from agentstack_server.domain.repositories.context import IContextRepository
 from agentstack_server.exceptions import EntityNotFoundError
 from agentstack_server.infrastructure.persistence.repositories.db_metadata import metadata
-from agentstack_server.infrastructure.persistence.repositories.utils import cursor_paginate
-from agentstack_server.utils.utils import utc_now
+from agentstack_server.infrastructure.persistence.repositories.utils import (
+    bulk_update_timestamps,
+    cursor_paginate,
+    strip_null_characters,
+)
 
 contexts_table = Table(
     "contexts",
@@ -50,8 +61,12 @@ context_history_table = Table(
     Column("id", SQL_UUID, primary_key=True),
     Column("context_id", ForeignKey("contexts.id", ondelete="CASCADE"), nullable=False),
     Column("created_at", DateTime(timezone=True), nullable=False),
-    Column("data", JSON, nullable=False),
-    Index("idx_context_history_context_id", "context_id"),
+    Column("data", JSONB, nullable=False),
+    # Projections of the payload, the history can be filtered without reading it
+    Column("kind", String, Computed("COALESCE(data ->> 'kind', 'artifact')", persisted=True), nullable=False),
+    Column("role", String, Computed("data ->> 'role'", persisted=True), nullable=True),
+    # Serves both pages of the history and its tail (ORDER BY created_at DESC, id DESC LIMIT n)
+    Index("idx_context_history_context_id_created_at", "context_id", "created_at", "id"),
 )
 
 
@@ -79,7 +94,8 @@ class SqlAlchemyContextRepository(IContextRepository):
         user_id: UUID | None = None,
         provider_id: UUID | None = None,
         limit: int = 20,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         order: str = "desc",
         order_by: str = "created_at",
         include_empty: bool = True,
@@ -105,6 +121,7 @@ class SqlAlchemyContextRepository(IContextRepository):
             id_column=contexts_table.c.id,
             limit=limit,
             after_cursor=page_token,
+            total_count=total_count,
             order=order,
             order_column=getattr(contexts_table.c, order_by),
         )
@@ -113,6 +130,7 @@ class SqlAlchemyContextRepository(IContextRepository):
             items=[self._row_to_context(row) for row in result.items],
             total_count=result.total_count,
             has_more=result.has_more,
+            next_page_token=result.next_cursor,
         )
 
     async def create(self, *, context: Context) -> None:
@@ -159,8 +177,10 @@ class SqlAlchemyContextRepository(IContextRepository):
             raise EntityNotFoundError("context", context_id)
         return result.rowcount
 
-    async def update_last_active(self, *, context_id: UUID) -> None:
-        query = update(contexts_table).where(contexts_table.c.id == context_id).values(last_active_at=utc_now())
+    async def update_last_active(self, *, timestamps: Mapping[UUID, datetime]) -> None:
+        if not timestamps:
+            return
+        query = bulk_update_timestamps(contexts_table, contexts_table.c.id, contexts_table.c.last_active_at, timestamps)
         await self._connection.execute(query)
 
     async def update_title(
@@ -182,11 +202,21 @@ class SqlAlchemyContextRepository(IContextRepository):
         await self._connection.execute(query)
 
     async def add_history_item(self, *, context_id: UUID, history_item: ContextHistoryItem) -> None:
+        await self.add_history_items(context_id=context_id, history_items=[history_item])
+
+    async def add_history_items(self, *, context_id: UUID, history_items: Sequence[ContextHistoryItem]) -> None:
+        if not history_items:
+            return
         query = context_history_table.insert().values(
-            id=uuid4(),
-            context_id=history_item.context_id,
-            created_at=history_item.created_at,
-            data=history_item.data.model_dump(),
+            [
+                {
+                    "id": history_item.id,
+                    "context_id": history_item.context_id,
+                    "created_at": history_item.created_at,
+                    "data": strip_null_characters(history_item.data.model_dump()),
+                }
+                for history_item in history_items
+            ]
         )
         await self._connection.execute(query)
 
@@ -194,16 +224,28 @@ class SqlAlchemyContextRepository(IContextRepository):
         self,
         *,
         context_id: UUID,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         limit: int = 20,
         order_by: str = "created_at",
         order="desc",
+        kind: ContextHistoryItemKind | None = None,
+        roles: Sequence[str] | None = None,
+        since_id: UUID | None = None,
     ) -> PaginatedResult[ContextHistoryItem]:
         query = context_history_table.select().where(context_history_table.c.context_id == context_id)
+        if kind is not None:
+            query = query.where(context_history_table.c.kind == kind)
+        if roles is not None:
+            query = query.where(context_history_table.c.role.in_(roles))
+        if since_id is not None:
+            since = await self._get_history_position(context_id=context_id, item_id=since_id)
+            query = query.where(tuple_(context_history_table.c.created_at, context_history_table.c.id) > tuple_(*since))
         result = await cursor_paginate(
             connection=self._connection,
             query=query,
             after_cursor=page_token,
+            total_count=total_count,
             id_column=context_history_table.c.id,
             order_column=getattr(context_history_table.c, order_by),
             order=order,
@@ -213,7 +255,24 @@ class SqlAlchemyContextRepository(IContextRepository):
             items=[self._row_to_context_history_item(item) for item in result.items],
             total_count=result.total_count,
             has_more=result.has_more,
+            next_page_token=result.next_cursor,
+        )
+
+    async def get_history_item(self, *, context_id: UUID, item_id: UUID) -> ContextHistoryItem:
+        query = context_history_table.select().where(
+            context_history_table.c.context_id == context_id, context_history_table.c.id == item_id
+        )
+        if not (row := (await self._connection.execute(query)).first()):
+            raise EntityNotFoundError("context_history_item", item_id)
+        return self._row_to_context_history_item(row)
+
+    async def _get_history_position(self, *, context_id: UUID, item_id: UUID) -> tuple[datetime, UUID]:
+        query = select(context_history_table.c.created_at, context_history_table.c.id).where(
+            context_history_table.c.context_id == context_id, context_history_table.c.id == item_id
         )
+        if not (row := (await self._connection.execute(query)).first()):
+            raise EntityNotFoundError("context_history_item", item_id)
+        return row.created_at, row.id
 
     async def delete_history_from_id(self, *, context_id: UUID, from_id: UUID) -> int:
         """Delete all history items from a specific item onwards (inclusive) in given context"""
@@ -27,7 +27,7 @@ from sqlalchemy import (
 from sqlalchemy import UUID as SQL_UUID
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.file import (
     ExtractedFileInfo,
     ExtractionFormat,
@@ -188,7 +188,8 @@ class SqlAlchemyFileRepository(IFileRepository):
         content_type: str | None = None,
         filename_search: str | None = None,
         limit: int = 20,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         order: str = "desc",
         order_by: str = "created_at",
         user_id: UUID | None = None,
@@ -212,6 +213,7 @@ class SqlAlchemyFileRepository(IFileRepository):
             id_column=files_table.c.id,
             limit=limit,
             after_cursor=page_token,
+            total_count=total_count,
             order=order,
             order_column=getattr(files_table.c, order_by),
         )
@@ -220,6 +222,7 @@ class SqlAlchemyFileRepository(IFileRepository):
             items=[self._to_file(row) for row in result.items],
             total_count=result.total_count,
             has_more=result.has_more,
+            next_page_token=result.next_cursor,
         )
 
     def _to_text_extraction(
@@ -3,7 +3,8 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
+from collections import defaultdict
+from collections.abc import AsyncIterator, Mapping
 from typing import Any
 from uuid import UUID
 
@@ -92,11 +93,18 @@ class SqlAlchemyModelProviderRepository(IModelProviderRepository):
                 entity="model_provider", field="base_url", value=str(model_provider.base_url)
             ) from ex
 
-    async def update_state(self, *, model_provider_id: UUID, state: ModelProviderState) -> None:
-        query = (
-            model_providers_table.update().where(model_providers_table.c.id == model_provider_id).values(state=state)
-        )
-        await self.connection.execute(query)
+    async def update_states(self, *, states: Mapping[UUID, ModelProviderState]) -> None:
+        # One statement per state instead of one per provider
+        ids_by_state: defaultdict[ModelProviderState, list[UUID]] = defaultdict(list)
+        for model_provider_id, state in states.items():
+            ids_by_state[state].append(model_provider_id)
+        for state, model_provider_ids in ids_by_state.items():
+            query = (
+                model_providers_table.update()
+                .where(model_providers_table.c.id.in_(model_provider_ids))
+                .values(state=state)
+            )
+            await self.connection.execute(query)
 
     async def delete(self, *, model_provider_id: UUID) -> int:
         query = delete(model_providers_table).where(model_providers_table.c.id == model_provider_id)
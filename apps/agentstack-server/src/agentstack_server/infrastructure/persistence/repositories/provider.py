@@ -3,23 +3,24 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator
-from datetime import timedelta
+from collections import defaultdict
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime, timedelta
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, Row, String, Table
+from a2a.types import AgentCard
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, Row, String, Table
 from sqlalchemy import UUID as SQL_UUID
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import delete, select
 
-from agentstack_server.domain.models.provider import Provider, ProviderType, UnmanagedState
+from agentstack_server.domain.models.provider import Provider, ProviderLocation, ProviderType, UnmanagedState
 from agentstack_server.domain.repositories.provider import IProviderRepository
 from agentstack_server.exceptions import DuplicateEntityError, EntityNotFoundError
 from agentstack_server.infrastructure.persistence.repositories.db_metadata import metadata
-from agentstack_server.infrastructure.persistence.repositories.utils import sql_enum
-from agentstack_server.utils.utils import utc_now
+from agentstack_server.infrastructure.persistence.repositories.utils import bulk_update_timestamps, sql_enum
 
 providers_table = Table(
     "providers",
@@ -37,6 +38,7 @@ providers_table = Table(
     Column("last_active_at", DateTime(timezone=True), nullable=False),
     Column("agent_card", JSON, nullable=False),
     Column("unmanaged_state", sql_enum(UnmanagedState), nullable=True),
+    Index("idx_providers_origin", "origin"),
 )
 
 
@@ -52,8 +54,28 @@ class SqlAlchemyProviderRepository(IProviderRepository):
         except IntegrityError as e:
             raise DuplicateEntityError(entity="provider", field="source", value=str(provider.source.root)) from e
 
-    async def update_unmanaged_state(self, provider_id: UUID, state: UnmanagedState) -> None:
-        query = providers_table.update().where(providers_table.c.id == provider_id).values(unmanaged_state=state)
+    async def update_unmanaged_states(self, *, states: Mapping[UUID, UnmanagedState]) -> None:
+        # One statement per state instead of one per provider
+        ids_by_state: defaultdict[UnmanagedState, list[UUID]] = defaultdict(list)
+        for provider_id, state in states.items():
+            ids_by_state[state].append(provider_id)
+        for state, provider_ids in ids_by_state.items():
+            query = providers_table.update().where(providers_table.c.id.in_(provider_ids)).values(unmanaged_state=state)
+            await self.connection.execute(query)
+
+    async def update_agent_card(
+        self, *, provider_id: UUID, agent_card: AgentCard, unmanaged_state: UnmanagedState, updated_at: datetime
+    ) -> None:
+        # Only the probed columns are written so that concurrent changes to the rest of the provider are kept
+        query = (
+            providers_table.update()
+            .where(providers_table.c.id == provider_id)
+            .values(
+                agent_card=agent_card.model_dump(mode="json"),
+                unmanaged_state=unmanaged_state,
+                updated_at=updated_at,
+            )
+        )
         await self.connection.execute(query)
 
     async def update(self, *, provider: Provider) -> None:
@@ -106,8 +128,19 @@ class SqlAlchemyProviderRepository(IProviderRepository):
 
         return self._to_provider(row)
 
-    async def update_last_accessed(self, *, provider_id: UUID) -> None:
-        query = providers_table.update().where(providers_table.c.id == provider_id).values(last_active_at=utc_now())
+    async def get_by_location(self, *, location: ProviderLocation) -> Provider:
+        query = select(providers_table).where(providers_table.c.source == str(location.root))
+        result = await self.connection.execute(query)
+        if not (row := result.fetchone()):
+            raise EntityNotFoundError(entity="provider", id=str(location.root), attribute="source")
+        return self._to_provider(row)
+
+    async def update_last_accessed(self, *, timestamps: Mapping[UUID, datetime]) -> None:
+        if not timestamps:
+            return
+        query = bulk_update_timestamps(
+            providers_table, providers_table.c.id, providers_table.c.last_active_at, timestamps
+        )
         await self.connection.execute(query)
 
     async def delete(self, *, provider_id: UUID, user_id: UUID | None = None) -> int:
@@ -12,7 +12,7 @@ from sqlalchemy import UUID as SQL_UUID
 from sqlalchemy.ext.asyncio import AsyncConnection
 from sqlalchemy.sql import select
 
-from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.provider_build import BuildState, ProviderBuild
 from agentstack_server.domain.repositories.provider_build import IProviderBuildRepository
 from agentstack_server.exceptions import EntityNotFoundError
@@ -119,7 +119,8 @@ class SqlAlchemyProviderBuildRepository(IProviderBuildRepository):
         self,
         *,
         limit: int = 20,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         order: str = "desc",
         order_by: str = "created_at",
         status: BuildState | None = None,
@@ -140,6 +141,7 @@ class SqlAlchemyProviderBuildRepository(IProviderBuildRepository):
             id_column=provider_builds_table.c.id,
             limit=limit,
             after_cursor=page_token,
+            total_count=total_count,
             order=order,
             order_column=getattr(provider_builds_table.c, order_by),
         )
@@ -148,4 +150,5 @@ class SqlAlchemyProviderBuildRepository(IProviderBuildRepository):
             items=[self._to_provider_build(row) for row in result.items],
             total_count=result.total_count,
             has_more=result.has_more,
+            next_page_token=result.next_cursor,
         )
@@ -3,7 +3,8 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+from collections.abc import Mapping
+from datetime import datetime, timedelta
 from uuid import UUID
 
 from kink import inject
@@ -15,6 +16,7 @@ from agentstack_server.domain.models.a2a_request import A2ARequestTask
 from agentstack_server.domain.repositories.a2a_request import IA2ARequestRepository
 from agentstack_server.exceptions import EntityNotFoundError, ForbiddenUpdateError
 from agentstack_server.infrastructure.persistence.repositories.db_metadata import metadata
+from agentstack_server.infrastructure.persistence.repositories.utils import bulk_update_timestamps
 from agentstack_server.utils.utils import utc_now
 
 a2a_request_tasks_table = Table(
@@ -75,7 +77,7 @@ class SqlAlchemyA2ARequestRepository(IA2ARequestRepository):
 
         # This handles all cases:
         # - New task_id/context_id: Creates ownership record (if allowed)
-        # - Existing owned: Updates last_accessed_at and returns true
+        # - Existing owned: Returns true (last_accessed_at is updated in bulk by the activity tracking)
         # - Existing owned by OTHER user: ON CONFLICT WHERE clause prevents update, returns false
 
         now = utc_now()
@@ -87,32 +89,28 @@ class SqlAlchemyA2ARequestRepository(IA2ARequestRepository):
                                   WHERE :task_id IS NOT NULL AND :allow_task_creation = true
                                   ON CONFLICT (task_id) DO NOTHING
                                   RETURNING true as inserted),
-                          task_update AS (
-                              UPDATE a2a_request_tasks
-                                  SET last_accessed_at = :now
-                                  WHERE task_id = :task_id AND created_by = :user_id
-                                  RETURNING true as updated),
+                          task_owned AS (
+                              SELECT true as owned FROM a2a_request_tasks
+                                  WHERE task_id = :task_id AND created_by = :user_id),
                           context_insert AS (
                               INSERT INTO a2a_request_contexts (context_id, created_by, provider_id, created_at, last_accessed_at)
                                   SELECT :context_id, :user_id, :provider_id, :now, :now
                                   WHERE :context_id IS NOT NULL
                                   ON CONFLICT (context_id) DO NOTHING
                                   RETURNING true as inserted),
-                          context_update AS (
-                              UPDATE a2a_request_contexts
-                                  SET last_accessed_at = :now
-                                  WHERE context_id = :context_id AND created_by = :user_id
-                                  RETURNING true as updated)
+                          context_owned AS (
+                              SELECT true as owned FROM a2a_request_contexts
+                                  WHERE context_id = :context_id AND created_by = :user_id)
                      SELECT CASE
                                 WHEN :task_id IS NULL THEN true
                                 WHEN EXISTS (SELECT 1 FROM task_insert) THEN true
-                                WHEN EXISTS (SELECT 1 FROM task_update) THEN true
+                                WHEN EXISTS (SELECT 1 FROM task_owned) THEN true
                                 ELSE false
                                 END as task_authorized,
                             CASE
                                 WHEN :context_id IS NULL THEN true
                                 WHEN EXISTS (SELECT 1 FROM context_insert) THEN true
-                                WHEN EXISTS (SELECT 1 FROM context_update) THEN true
+                                WHEN EXISTS (SELECT 1 FROM context_owned) THEN true
                                 ELSE false
                                 END as context_authorized
                      """).bindparams(
@@ -148,6 +146,28 @@ class SqlAlchemyA2ARequestRepository(IA2ARequestRepository):
             assert context_id
             raise ForbiddenUpdateError(entity="a2a_request_context", id=context_id)
 
+    async def update_tasks_last_accessed(self, *, timestamps: Mapping[str, datetime]) -> None:
+        if not timestamps:
+            return
+        query = bulk_update_timestamps(
+            a2a_request_tasks_table,
+            a2a_request_tasks_table.c.task_id,
+            a2a_request_tasks_table.c.last_accessed_at,
+            timestamps,
+        )
+        await self._connection.execute(query)
+
+    async def update_contexts_last_accessed(self, *, timestamps: Mapping[str, datetime]) -> None:
+        if not timestamps:
+            return
+        query = bulk_update_timestamps(
+            a2a_request_contexts_table,
+            a2a_request_contexts_table.c.context_id,
+            a2a_request_contexts_table.c.last_accessed_at,
+            timestamps,
+        )
+        await self._connection.execute(query)
+
     async def get_task(self, *, task_id: str, user_id: UUID) -> A2ARequestTask:
         """Get a task by task_id if owned by the user."""
         query = a2a_request_tasks_table.select().where(
@@ -10,7 +10,7 @@ from sqlalchemy import UUID as SQL_UUID
 from sqlalchemy import Column, DateTime, Row, String, Table
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.user import User
 from agentstack_server.domain.repositories.user import IUserRepository
 from agentstack_server.exceptions import EntityNotFoundError
@@ -73,7 +73,8 @@ class SqlAlchemyUserRepository(IUserRepository):
         self,
         *,
         limit: int,
-        page_token: UUID | None = None,
+        page_token: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
         email: str | None = None,
     ) -> PaginatedResult[User]:
         query = users_table.select()
@@ -88,8 +89,14 @@ class SqlAlchemyUserRepository(IUserRepository):
             id_column=users_table.c.id,
             limit=limit,
             after_cursor=page_token,
+            total_count=total_count,
             order="desc",
         )
 
         users = [self._to_user(row) for row in result.items]
-        return PaginatedResult(items=users, total_count=result.total_count, has_more=result.has_more)
+        return PaginatedResult(
+            items=users,
+            total_count=result.total_count,
+            has_more=result.has_more,
+            next_page_token=result.next_cursor,
+        )
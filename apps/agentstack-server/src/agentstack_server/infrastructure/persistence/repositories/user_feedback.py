@@ -10,6 +10,7 @@ from sqlalchemy import ARRAY, CheckConstraint, Column, DateTime, ForeignKey, Int
 from sqlalchemy import UUID as SQL_UUID
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.user_feedback import UserFeedback
 from agentstack_server.domain.repositories.user_feedback import IUserFeedbackRepository
 from agentstack_server.infrastructure.persistence.repositories.db_metadata import metadata
@@ -61,8 +62,9 @@ class SqlAlchemyUserFeedbackRepository(IUserFeedbackRepository):
         provider_created_by: UUID | None = None,
         provider_id: UUID | None = None,
         limit: int = 50,
-        after_cursor: UUID | None = None,
-    ) -> tuple[list[UserFeedback], int, bool]:
+        after_cursor: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
+    ) -> PaginatedResult[UserFeedback]:
         query = select(
             user_feedback_table,
             providers_table.c.agent_card["name"].label("agent_name"),
@@ -81,9 +83,13 @@ class SqlAlchemyUserFeedbackRepository(IUserFeedbackRepository):
             id_column=user_feedback_table.c.id,
             limit=limit,
             after_cursor=after_cursor,
+            total_count=total_count,
             order="desc",
         )
 
-        feedback_list = [UserFeedback.model_validate(dict(row._mapping)) for row in result.items]
-
-        return feedback_list, result.total_count, result.has_more
+        return PaginatedResult(
+            items=[UserFeedback.model_validate(dict(row._mapping)) for row in result.items],
+            total_count=result.total_count,
+            has_more=result.has_more,
+            next_page_token=result.next_cursor,
+        )
@@ -3,23 +3,87 @@
 
 from __future__ import annotations
 
-from collections.abc import Sequence
+import base64
+import json
+from collections.abc import Mapping, Sequence
+from datetime import datetime
 from enum import StrEnum
-from typing import NamedTuple
+from typing import Any, NamedTuple
 from uuid import UUID
 
-from sqlalchemy import Column, Enum, Row, Select, func, select
+from sqlalchemy import Column, DateTime, Enum, Row, Select, Table, Update, column, func, select, update, values
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from agentstack_server.domain.models.common import TotalCount
+from agentstack_server.exceptions import InvalidPageTokenError
+
 
 def sql_enum(enum: type[StrEnum], **kwargs) -> Enum:
     return Enum(enum, values_callable=lambda x: [e.value for e in x], **kwargs)
 
 
+def strip_null_characters(obj: Any) -> Any:
+    """Remove NUL characters from the strings of a JSON document, jsonb cannot store them."""
+    if isinstance(obj, str):
+        return obj.replace("\x00", "")
+    if isinstance(obj, Mapping):
+        return {strip_null_characters(key): strip_null_characters(value) for key, value in obj.items()}
+    if isinstance(obj, list | tuple):
+        return [strip_null_characters(value) for value in obj]
+    return obj
+
+
+def bulk_update_timestamps(
+    table: Table, id_column: Column, timestamp_column: Column, timestamps: Mapping[Any, datetime]
+) -> Update:
+    """
+    Set a timestamp column of many rows in a single UPDATE ... FROM (VALUES ...) statement.
+    Timestamps never move backwards, so batches flushed out of order do not overwrite newer values.
+    """
+    rows = values(
+        column("id", id_column.type),
+        column("timestamp", DateTime(timezone=True)),
+        name="timestamps",
+    ).data(list(timestamps.items()))
+    return (
+        update(table)
+        .where(id_column == rows.c.id)
+        .values({timestamp_column.name: func.greatest(timestamp_column, rows.c.timestamp)})
+    )
+
+
 class CursorPaginationResult(NamedTuple):
     items: Sequence[Row]
-    total_count: int
+    total_count: int | None
     has_more: bool
+    next_cursor: str | None
+
+
+def encode_cursor(order_value: Any, id: UUID) -> str:
+    """Opaque page token carrying the position of the last returned row"""
+    if isinstance(order_value, datetime):
+        order_value = order_value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([order_value, str(id)]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_column: Column) -> tuple[Any, UUID]:
+    try:
+        order_value, id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if isinstance(order_column.type, DateTime):
+            order_value = datetime.fromisoformat(order_value)
+        return order_value, UUID(id)
+    except (ValueError, TypeError) as ex:
+        raise InvalidPageTokenError(cursor) from ex
+
+
+async def estimate_count(connection: AsyncConnection, query: Select) -> int:
+    """Number of rows the query planner expects the query to return, without executing it"""
+    compiled = query.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
 
 
 async def cursor_paginate(
@@ -28,11 +92,12 @@ async def cursor_paginate(
     order_column: Column,
     id_column: Column,
     limit: int,
-    after_cursor: UUID | None = None,
+    after_cursor: UUID | str | None = None,
     order: str = "desc",
+    total_count: TotalCount = TotalCount.NONE,
 ) -> CursorPaginationResult:
     """
-    Implements cursor-based pagination for non-unique columns.
+    Implements keyset pagination for non-unique columns.
 
     For non-unique columns, we use a composite cursor approach:
     - Primary cursor: the order column value
@@ -40,33 +105,40 @@ async def cursor_paginate(
 
     This ensures stable, consistent pagination even when multiple rows
     have the same value in the order column.
-    """
 
-    # Apply cursor filtering if after_cursor is provided
-    if after_cursor:
+    The returned cursor encodes both values, so the next page is a single index range scan. IDs of the last item are
+    still accepted as a cursor and resolved with an extra lookup. Counting all matching rows is skipped unless
+    requested, as it would dominate the listing of large tables.
+    """
+    count_query_base = query
+
+    cursor_position: tuple[Any, UUID] | None = None
+    if isinstance(after_cursor, str):
+        try:
+            after_cursor = UUID(after_cursor)
+        except ValueError:
+            cursor_position = decode_cursor(after_cursor, order_column)
+    if isinstance(after_cursor, UUID):
         # Get the cursor row's order column value and ID
         cursor_query = select(order_column, id_column).where(id_column == after_cursor)
         cursor_result = await connection.execute(cursor_query)
-        cursor_row = cursor_result.fetchone()
-
-        if cursor_row:
-            cursor_order_value = cursor_row[0]  # order column value
-            cursor_id = cursor_row[1]  # ID value
-
-            if order == "desc":
-                # For descending: include rows where order_col < cursor_value
-                # OR (order_col = cursor_value AND id < cursor_id)
-                query = query.where(
-                    (order_column < cursor_order_value)
-                    | ((order_column == cursor_order_value) & (id_column < cursor_id))
-                )
-            else:
-                # For ascending: include rows where order_col > cursor_value
-                # OR (order_col = cursor_value AND id > cursor_id)
-                query = query.where(
-                    (order_column > cursor_order_value)
-                    | ((order_column == cursor_order_value) & (id_column > cursor_id))
-                )
+        if cursor_row := cursor_result.fetchone():
+            cursor_position = (cursor_row[0], cursor_row[1])
+
+    if cursor_position:
+        cursor_order_value, cursor_id = cursor_position
+        if order == "desc":
+            # For descending: include rows where order_col < cursor_value
+            # OR (order_col = cursor_value AND id < cursor_id)
+            query = query.where(
+                (order_column < cursor_order_value) | ((order_column == cursor_order_value) & (id_column < cursor_id))
+            )
+        else:
+            # For ascending: include rows where order_col > cursor_value
+            # OR (order_col = cursor_value AND id > cursor_id)
+            query = query.where(
+                (order_column > cursor_order_value) | ((order_column == cursor_order_value) & (id_column > cursor_id))
+            )
 
     # Apply ordering with tie-breaking by ID
     if order == "desc":
@@ -75,7 +147,6 @@ async def cursor_paginate(
         query = query.order_by(order_column.asc(), id_column.asc())
 
     # Fetch one more than limit to determine if there are more results
-    count_query_base = query.order_by(None)
     query = query.limit(limit + 1)
 
     # Execute query
@@ -83,11 +154,18 @@ async def cursor_paginate(
     rows = result.fetchall()
 
     has_more = len(rows) > limit
-
-    # Reset the limit and order for count query
-    count_query = select(func.count()).select_from(count_query_base.subquery())
-
-    count_result = await connection.execute(count_query)
-    total_count = count_result.scalar() or 0
-
-    return CursorPaginationResult(items=rows[:limit], total_count=total_count, has_more=has_more)
+    rows = rows[:limit]
+    next_cursor = None
+    if rows:
+        last_row = rows[-1]._mapping
+        next_cursor = encode_cursor(last_row[order_column], last_row[id_column])
+
+    count = None
+    match total_count:
+        case TotalCount.EXACT:
+            count_query = select(func.count()).select_from(count_query_base.order_by(None).subquery())
+            count = (await connection.execute(count_query)).scalar() or 0
+        case TotalCount.ESTIMATE:
+            count = await estimate_count(connection, count_query_base.order_by(None))
+
+    return CursorPaginationResult(items=rows, total_count=count, has_more=has_more, next_cursor=next_cursor)
@@ -3,7 +3,8 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator, Iterable
+from collections.abc import AsyncIterator, Iterable, Mapping
+from datetime import datetime
 from typing import cast
 from uuid import UUID
 
@@ -27,10 +28,11 @@ from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from agentstack_server.domain.models.vector_store import VectorStore, VectorStoreDocument
+from agentstack_server.domain.models.vector_store import VectorDistanceMetric, VectorStore, VectorStoreDocument
 from agentstack_server.domain.repositories.vector_store import IVectorStoreRepository
 from agentstack_server.exceptions import DuplicateEntityError, EntityNotFoundError
 from agentstack_server.infrastructure.persistence.repositories.db_metadata import metadata
+from agentstack_server.infrastructure.persistence.repositories.utils import bulk_update_timestamps, sql_enum
 from agentstack_server.utils.utils import utc_now
 
 # Main table for vector stores
@@ -41,6 +43,7 @@ vector_stores_table = Table(
     Column("name", String(256), nullable=True),
     Column("model_id", String(256), nullable=False),
     Column("dimension", Integer, nullable=False),
+    Column("distance_metric", sql_enum(VectorDistanceMetric), nullable=False),
     Column("created_at", DateTime(timezone=True), nullable=False),
     Column("last_active_at", DateTime(timezone=True), nullable=False),
     Column("created_by", ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
@@ -70,6 +73,7 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
             "name": row.name,
             "model_id": row.model_id,
             "dimension": row.dimension,
+            "distance_metric": row.distance_metric,
             "created_at": row.created_at,
             "last_active_at": row.last_active_at,
             "created_by": row.created_by,
@@ -98,6 +102,7 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
             model_id=vector_store.model_id,
             name=vector_store.name,
             dimension=vector_store.dimension,
+            distance_metric=vector_store.distance_metric,
             created_at=vector_store.created_at,
             last_active_at=vector_store.last_active_at,
             created_by=vector_store.created_by,
@@ -105,7 +110,13 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
         )
         await self.connection.execute(query)
 
-    async def list(self, *, user_id: UUID | None = None, context_id: UUID | None = None) -> AsyncIterator[VectorStore]:
+    async def list(
+        self,
+        *,
+        user_id: UUID | None = None,
+        context_id: UUID | None = None,
+        vector_store_ids: Iterable[UUID] | None = None,
+    ) -> AsyncIterator[VectorStore]:
         query = select(
             vector_stores_table,
             func.coalesce(func.sum(vector_store_documents_table.c.usage_bytes), 0).label("total_usage_bytes"),
@@ -119,6 +130,8 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
             query = query.where(vector_stores_table.c.created_by == user_id)
         if context_id:
             query = query.where(vector_stores_table.c.context_id == context_id)
+        if vector_store_ids is not None:
+            query = query.where(vector_stores_table.c.id.in_(vector_store_ids))
 
         # Group by all columns of the vector_stores_table to collapse the joined rows
         query = query.group_by(*vector_stores_table.c)
@@ -180,11 +193,11 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
             raise EntityNotFoundError("vector_store", vector_store_id or "vector_store to delete")
         return result.rowcount
 
-    async def update_last_accessed(self, *, vector_store_ids: Iterable[UUID]) -> None:
-        query = (
-            vector_stores_table.update()
-            .where(vector_stores_table.c.id.in_(vector_store_ids))
-            .values(last_active_at=utc_now())
+    async def update_last_accessed(self, *, timestamps: Mapping[UUID, datetime]) -> None:
+        if not timestamps:
+            return
+        query = bulk_update_timestamps(
+            vector_stores_table, vector_stores_table.c.id, vector_stores_table.c.last_active_at, timestamps
         )
         await self.connection.execute(query)
 
@@ -221,7 +234,8 @@ class SqlAlchemyVectorStoreRepository(IVectorStoreRepository):
             raise DuplicateEntityError(
                 entity="vector_store_document", field="id", value=str({d.id for d in documents})
             ) from e
-        await self.update_last_accessed(vector_store_ids={d.vector_store_id for d in documents})
+        now = utc_now()
+        await self.update_last_accessed(timestamps={d.vector_store_id: now for d in documents})
 
     async def total_usage(self, *, user_id: UUID | None = None) -> int:
         query = select(func.coalesce(func.sum(vector_store_documents_table.c.usage_bytes), 0))
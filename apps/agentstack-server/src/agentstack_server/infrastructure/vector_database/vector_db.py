@@ -3,16 +3,23 @@
 
 from __future__ import annotations
 
+import csv
+import io
 import json
+import logging
+import typing
 from collections import defaultdict
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
 from uuid import UUID
 
+import asyncpg
 from pgvector.sqlalchemy import HALFVEC
 from sqlalchemy import (
     Column,
+    ColumnElement,
     ForeignKeyConstraint,
     Index,
+    Integer,
     MetaData,
     PrimaryKeyConstraint,
     Row,
@@ -20,36 +27,71 @@ from sqlalchemy import (
     Table,
     Text,
     case,
+    cast,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    text,
+    union_all,
+    values,
 )
-from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as SQL_UUID
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncConnection
 
+from agentstack_server.configuration import VectorStoresConfiguration
 from agentstack_server.domain.models.vector_store import (
     DocumentType,
+    VectorDistanceMetric,
     VectorStoreDocumentInfo,
     VectorStoreItem,
+    VectorStoreSearchQuery,
     VectorStoreSearchResult,
 )
 from agentstack_server.domain.repositories.vector_store import IVectorDatabaseRepository
 from agentstack_server.infrastructure.persistence.repositories.vector_store import (
     vector_store_documents_table,
+    vector_stores_table,
 )
 
+logger = logging.getLogger(__name__)
+
 # Common dimensions that we'll support
 # From MTEB leaderboard sorted unique dimensions up to 4000:
 # https://huggingface.co/spaces/mteb/leaderboard
 # len(SUPPORTED_DIMENSIONS) is the upper limit on the number of tables we'll create in the database
 SUPPORTED_DIMENSIONS = [64, 128, 256, 312, 384, 512, 768, 896, 1024, 1536, 1792, 2048, 2304, 2560, 3072, 3584, 4000]
 
+# pgvector can only use an HNSW index for ORDER BY if the index was built with the operator class of the same
+# distance function, each vector store partition gets a single index for the metric of the store
+HNSW_OPERATOR_CLASSES = {
+    VectorDistanceMetric.COSINE: "halfvec_cosine_ops",
+    VectorDistanceMetric.L2: "halfvec_l2_ops",
+    VectorDistanceMetric.INNER_PRODUCT: "halfvec_ip_ops",
+}
+HNSW_INDEX_PARAMETERS = {"m": 16, "ef_construction": 64}
+
+# Language-agnostic full-text configuration of the hybrid search. Queries must use the exact expression of the text
+# search index, so the configuration is rendered as a constant rather than a query parameter.
+TEXT_SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
 
 metadata = MetaData()
 
 
 class VectorDatabaseRepository(IVectorDatabaseRepository):
-    def __init__(self, connection: AsyncConnection, schema_name: str):
+    def __init__(
+        self,
+        connection: AsyncConnection,
+        schema_name: str,
+        configuration: VectorStoresConfiguration | None = None,
+    ):
         self.connection = connection
         self.schema_name = schema_name
+        self.configuration = configuration or VectorStoresConfiguration()
 
     def _get_table(self, dimension: int) -> Table:
         table_name = f"collections_dim_{dimension}"
@@ -74,17 +116,41 @@ class VectorDatabaseRepository(IVectorDatabaseRepository):
             Column("text", Text, nullable=False),
             Column("embedding", HALFVEC(dimension), nullable=False),
             Column("metadata", JSONB, nullable=True),
+            Index(f"{table_name}_vector_store_id_index", "vector_store_id", "vector_store_document_id"),
             Index(
-                f"{table_name}_vector_index",
-                "embedding",
-                postgresql_using="hnsw",
-                postgresql_with={"m": 16, "ef_construction": 64},
-                postgresql_ops={"embedding": "halfvec_l2_ops"},
+                f"{table_name}_metadata_index",
+                "metadata",
+                postgresql_using="gin",
+                postgresql_ops={"metadata": "jsonb_path_ops"},
+            ),
+            Index(
+                f"{table_name}_text_search_index",
+                text(f"to_tsvector({TEXT_SEARCH_CONFIG.text}, text)"),
+                postgresql_using="gin",
             ),
-            Index(f"{table_name}_vector_store_id_index", "vector_store_id", "vector_store_document_id"),
             schema=self.schema_name,
+            # Each vector store lives in its own partition with its own HNSW graph, indexes of the partitioned
+            # table are created on every partition when it is attached
+            postgresql_partition_by="LIST (vector_store_id)",
         )
 
+    def _get_tsvector(self, table: Table) -> ColumnElement:
+        return func.to_tsvector(TEXT_SEARCH_CONFIG, table.c.text)
+
+    def _get_metadata_filter(
+        self, table: Table, metadata_filter: Mapping[str, str] | None
+    ) -> list[ColumnElement[bool]]:
+        return [table.c.metadata.contains(metadata_filter)] if metadata_filter else []
+
+    def _get_document_type(self) -> ColumnElement[str]:
+        return case(
+            (vector_store_documents_table.c.file_id.is_not(None), DocumentType.PLATFORM_FILE),
+            else_=DocumentType.EXTERNAL,
+        ).label("document_type")
+
+    def _get_partition_name(self, table: Table, collection_id: UUID) -> str:
+        return f"{table.name}_{collection_id.hex}"
+
     def _get_supported_dimension(self, dimension: int) -> int:
         new_dimension = SUPPORTED_DIMENSIONS[0]
         for supported_dim in SUPPORTED_DIMENSIONS:
@@ -93,15 +159,165 @@ class VectorDatabaseRepository(IVectorDatabaseRepository):
             new_dimension = supported_dim
         return new_dimension
 
-    async def create_collection(self, collection_id: UUID, dimension: int):
+    async def _create_vector_index(self, partition_name: str, distance_metric: VectorDistanceMetric) -> None:
+        index_parameters = ", ".join(f"{key} = {value}" for key, value in HNSW_INDEX_PARAMETERS.items())
+        await self.connection.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS {partition_name}_hnsw ON {self.schema_name}.{partition_name} "
+                f"USING hnsw (embedding {HNSW_OPERATOR_CLASSES[distance_metric]}) WITH ({index_parameters})"
+            )
+        )
+
+    async def create_collection(
+        self,
+        collection_id: UUID,
+        dimension: int,
+        distance_metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+    ):
         supported_dimension = self._get_supported_dimension(dimension)
         table = self._get_table(supported_dimension)
         await self.connection.run_sync(table.create, checkfirst=True)
 
+        # Attaching a new table takes only a SHARE UPDATE EXCLUSIVE lock on the parent table, unlike
+        # CREATE TABLE ... PARTITION OF, so searches in other vector stores are not blocked
+        partition_name = self._get_partition_name(table, collection_id)
+        await self.connection.execute(
+            text(
+                f"CREATE TABLE {self.schema_name}.{partition_name} "
+                f"(LIKE {self.schema_name}.{table.name} INCLUDING DEFAULTS)"
+            )
+        )
+        await self.connection.execute(
+            text(
+                f"ALTER TABLE {self.schema_name}.{table.name} ATTACH PARTITION {self.schema_name}.{partition_name} "
+                f"FOR VALUES IN ('{collection_id}')"
+            )
+        )
+        await self._create_vector_index(partition_name, distance_metric)
+
+    async def detach_collection(self, collection_id: UUID, dimension: int) -> None:
+        """
+        Detach the partition of a collection without blocking the other collections of the same dimension.
+
+        Dropping an attached partition takes an ACCESS EXCLUSIVE lock on the parent table. Detaching it concurrently
+        only takes a SHARE UPDATE EXCLUSIVE lock, after which the partition can be dropped on its own. The detach
+        cannot run in a transaction block, so it uses a separate connection in autocommit mode and only sees
+        committed partitions. It is not undone by a rollback, use attach_collection if the delete fails.
+        """
+        table = self._get_table(self._get_supported_dimension(dimension))
+        await self._detach_partitions(table.name, [self._get_partition_name(table, collection_id)])
+
+    async def attach_collection(self, collection_id: UUID, dimension: int) -> None:
+        """Attach the partition of a collection again after a detach, e.g. when deleting the vector store failed."""
+        table = self._get_table(self._get_supported_dimension(dimension))
+        await self._attach_partitions(table.name, {collection_id: self._get_partition_name(table, collection_id)})
+
+    async def _attach_partitions(self, table_name: str, partition_names: Mapping[UUID, str]) -> None:
+        async with self.connection.engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            result = await connection.execute(
+                text(
+                    "SELECT pg_class.relname, pg_inherits.inhdetachpending FROM pg_class "
+                    "JOIN pg_namespace ON pg_class.relnamespace = pg_namespace.oid "
+                    "LEFT JOIN pg_inherits ON pg_inherits.inhrelid = pg_class.oid "
+                    "WHERE pg_namespace.nspname = :schema_name AND pg_class.relname = ANY(:partition_names)"
+                ),
+                {"schema_name": self.schema_name, "partition_names": list(partition_names.values())},
+            )
+            detached = {name: detach_pending for name, detach_pending in result.all() if detach_pending is not False}
+            for collection_id, partition_name in partition_names.items():
+                if partition_name not in detached:
+                    continue
+                if detached[partition_name]:
+                    await connection.execute(
+                        text(
+                            f"ALTER TABLE {self.schema_name}.{table_name} "
+                            f"DETACH PARTITION {self.schema_name}.{partition_name} FINALIZE"
+                        )
+                    )
+                # Attaching takes only a SHARE UPDATE EXCLUSIVE lock on the parent table, like in create_collection
+                await connection.execute(
+                    text(
+                        f"ALTER TABLE {self.schema_name}.{table_name} "
+                        f"ATTACH PARTITION {self.schema_name}.{partition_name} FOR VALUES IN ('{collection_id}')"
+                    )
+                )
+
+    async def _detach_partitions(self, table_name: str, partition_names: Sequence[str]) -> None:
+        async with self.connection.engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            result = await connection.execute(
+                text(
+                    "SELECT child.relname, pg_inherits.inhdetachpending FROM pg_inherits "
+                    "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                    "JOIN pg_namespace ON child.relnamespace = pg_namespace.oid "
+                    "WHERE pg_namespace.nspname = :schema_name AND child.relname = ANY(:partition_names)"
+                ),
+                {"schema_name": self.schema_name, "partition_names": list(partition_names)},
+            )
+            for partition_name, detach_pending in result.all():
+                # An interrupted concurrent detach leaves the partition pending and must be finalized instead
+                mode = "FINALIZE" if detach_pending else "CONCURRENTLY"
+                await connection.execute(
+                    text(
+                        f"ALTER TABLE {self.schema_name}.{table_name} "
+                        f"DETACH PARTITION {self.schema_name}.{partition_name} {mode}"
+                    )
+                )
+
     async def delete_collection(self, collection_id: UUID, dimension: int) -> None:
         supported_dimension = self._get_supported_dimension(dimension)
         table = self._get_table(supported_dimension)
-        await self.connection.run_sync(table.drop, checkfirst=True)
+        partition_name = self._get_partition_name(table, collection_id)
+        await self.connection.execute(text(f"DROP TABLE IF EXISTS {self.schema_name}.{partition_name}"))
+
+    async def delete_orphaned_collections(self) -> int:
+        """
+        Drop partitions of vector stores that were removed by a cascade delete (e.g. with a context or user).
+
+        Orphaned partitions are detached concurrently first and detached partitions are dropped as well. Partitions
+        left detached by a failed delete of a vector store that still exists are attached again.
+        """
+        # Partitions are plain tables named after the parent table and the collection id, attached or not
+        result = await self.connection.execute(
+            text(
+                "SELECT pg_class.relname, pg_class.relispartition FROM pg_class "
+                "JOIN pg_namespace ON pg_class.relnamespace = pg_namespace.oid "
+                "WHERE pg_namespace.nspname = :schema_name AND pg_class.relkind = 'r' "
+                "AND pg_class.relname LIKE 'collections\\_dim\\_%\\_%'"
+            ),
+            {"schema_name": self.schema_name},
+        )
+        rows = result.all()
+        partitions = {UUID(partition_name.rsplit("_", 1)[1]): partition_name for partition_name, _ in rows}
+        detached_partitions = {partition_name for partition_name, is_partition in rows if not is_partition}
+        if not partitions:
+            return 0
+
+        existing_ids = set(
+            (
+                await self.connection.execute(
+                    select(vector_stores_table.c.id).where(vector_stores_table.c.id.in_(partitions.keys()))
+                )
+            ).scalars()
+        )
+        orphaned_partitions = [name for collection_id, name in partitions.items() if collection_id not in existing_ids]
+        for collection_id, partition_name in partitions.items():
+            if collection_id not in existing_ids or partition_name not in detached_partitions:
+                continue
+            try:
+                await self._attach_partitions(partition_name.rsplit("_", 1)[0], {collection_id: partition_name})
+            except DBAPIError as ex:
+                # The vector store may be being deleted right now, its partition is dropped together with it
+                logger.warning(f"Failed to attach detached partition {partition_name}: {ex!r}")
+        partitions_by_table: defaultdict[str, list[str]] = defaultdict(list)
+        for partition_name in orphaned_partitions:
+            partitions_by_table[partition_name.rsplit("_", 1)[0]].append(partition_name)
+        for table_name, partition_names in partitions_by_table.items():
+            await self._detach_partitions(table_name, partition_names)
+        for partition_name in orphaned_partitions:
+            await self.connection.execute(text(f"DROP TABLE IF EXISTS {self.schema_name}.{partition_name}"))
+        return len(orphaned_partitions)
 
     def _get_item_size(self, item: VectorStoreItem) -> int:
         """Approximate size of a single item in bytes."""
@@ -128,20 +344,29 @@ class VectorDatabaseRepository(IVectorDatabaseRepository):
         supported_dimension = self._get_supported_dimension(dimension)
         table = self._get_table(supported_dimension)
 
-        query = insert(table).values(
+        # COPY avoids building, parsing and planning a huge multi-row INSERT. The rows are written directly to the
+        # partition of the collection, NULL is the only unquoted value in the CSV (QUOTE_NOTNULL)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+        writer.writerows(
             [
-                {
-                    "id": item.id,
-                    "vector_store_id": collection_id,
-                    "vector_store_document_id": item.document_id,
-                    "embedding": item.embedding,
-                    "text": item.text,
-                    "metadata": item.metadata,
-                }
-                for item in items
+                item.id,
+                collection_id,
+                item.document_id,
+                item.text,
+                f"[{','.join(map(str, item.embedding))}]",
+                json.dumps(item.metadata) if item.metadata is not None else None,
             ]
+            for item in items
+        )
+        raw_connection = await self.connection.get_raw_connection()
+        await typing.cast(asyncpg.Connection, raw_connection.driver_connection).copy_to_table(
+            self._get_partition_name(table, collection_id),
+            source=io.BytesIO(buffer.getvalue().encode("utf-8")),
+            columns=["id", "vector_store_id", "vector_store_document_id", "text", "embedding", "metadata"],
+            schema_name=self.schema_name,
+            format="csv",
         )
-        await self.connection.execute(query)
 
     async def delete_documents(self, collection_id: UUID, dimension: int, document_ids: Iterable[str]) -> int:
         supported_dimension = self._get_supported_dimension(dimension)
@@ -162,43 +387,227 @@ class VectorDatabaseRepository(IVectorDatabaseRepository):
             metadata=row.metadata,
         )
 
-    def _to_search_result(self, row: Row) -> VectorStoreSearchResult:
+    def _get_distance(
+        self, table: Table, distance_metric: VectorDistanceMetric, query_vector: Sequence[float] | ColumnElement
+    ) -> ColumnElement[float]:
+        match distance_metric:
+            case VectorDistanceMetric.COSINE:
+                return table.c.embedding.cosine_distance(query_vector)
+            case VectorDistanceMetric.L2:
+                return table.c.embedding.l2_distance(query_vector)
+            case VectorDistanceMetric.INNER_PRODUCT:
+                return table.c.embedding.max_inner_product(query_vector)
+
+    def _get_score(self, distance: float, distance_metric: VectorDistanceMetric) -> float:
+        match distance_metric:
+            case VectorDistanceMetric.COSINE:
+                # Convert cosine distance to similarity score (1 - distance)
+                return 1.0 - distance
+            case VectorDistanceMetric.L2:
+                return 1.0 / (1.0 + distance)
+            case VectorDistanceMetric.INNER_PRODUCT:
+                # pgvector returns the negative inner product so that ascending order yields the best match first
+                return -distance
+
+    def _to_search_result(self, row: Row, distance_metric: VectorDistanceMetric) -> VectorStoreSearchResult:
         """Convert a database row to a VectorStoreSearchResult with score."""
         item = self._to_item(row)
-        # Convert cosine distance to similarity score (1 - distance)
-        score = 1.0 - row.distance
-        return VectorStoreSearchResult(item=item, score=score)
+        return VectorStoreSearchResult(item=item, score=self._get_score(row.distance, distance_metric))
+
+    async def _configure_index_scan(self) -> None:
+        """
+        Set HNSW query options for the current transaction.
+
+        Without iterative scans, the index returns only ef_search nearest candidates and any filter in the query
+        is applied afterwards, which can yield fewer than `limit` rows.
+        """
+        settings = {"hnsw.ef_search": str(self.configuration.hnsw_ef_search)}
+        if self.configuration.hnsw_iterative_scan != "off":
+            settings["hnsw.iterative_scan"] = self.configuration.hnsw_iterative_scan
+            settings["hnsw.max_scan_tuples"] = str(self.configuration.hnsw_max_scan_tuples)
+        await self.connection.execute(select(*(func.set_config(name, value, True) for name, value in settings.items())))
 
     async def similarity_search(
         self,
         collection_id: UUID,
         query_vector: Sequence[float],
         limit: int = 10,
+        distance_metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+        metadata_filter: Mapping[str, str] | None = None,
     ) -> Iterable[VectorStoreSearchResult]:
         dimension = len(query_vector)
         supported_dimension = self._get_supported_dimension(dimension)
         table = self._get_table(supported_dimension)
 
-        # Select all columns plus the distance as a named column
+        await self._configure_index_scan()
+
+        # The ANN lookup must be a plain "ORDER BY <distance> LIMIT n" over the collection table to be answered from
+        # the HNSW index, the join with documents is applied only to the top-k rows. The CTE is materialized so that
+        # the planner cannot inline it and break the index scan, the outer ORDER BY restores the exact order
+        # which the relaxed_order iterative scan does not guarantee.
+        distance = self._get_distance(table, distance_metric, query_vector).label("distance")
+        nearest = (
+            select(table, distance)
+            .where(table.c.vector_store_id == collection_id, *self._get_metadata_filter(table, metadata_filter))
+            .order_by(distance)
+            .limit(limit)
+            .cte("nearest")
+            .prefix_with("MATERIALIZED")
+        )
         query = (
-            table.select()
-            .add_columns(
-                table.c.embedding.cosine_distance(query_vector).label("distance"),
-                case(
-                    (vector_store_documents_table.c.file_id.is_not(None), DocumentType.PLATFORM_FILE),
-                    else_=DocumentType.EXTERNAL,
-                ).label("document_type"),
+            select(nearest, self._get_document_type())
+            .join(
+                vector_store_documents_table,
+                (nearest.c.vector_store_document_id == vector_store_documents_table.c.id)
+                & (nearest.c.vector_store_id == vector_store_documents_table.c.vector_store_id),
+                isouter=True,
             )
+            .order_by(nearest.c.distance)
+        )
+
+        rows = await self.connection.execute(query)
+        return [self._to_search_result(row, distance_metric) for row in rows.fetchall()]
+
+    async def hybrid_search(
+        self,
+        collection_id: UUID,
+        query_vector: Sequence[float],
+        query_text: str,
+        limit: int = 10,
+        distance_metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
+        metadata_filter: Mapping[str, str] | None = None,
+    ) -> Iterable[VectorStoreSearchResult]:
+        """
+        Search by both vector distance and full-text match, fused by reciprocal rank fusion (RRF).
+
+        The score of a result is the sum of 1 / (k + rank) over the vector and the text rankings it appears in.
+        """
+        supported_dimension = self._get_supported_dimension(len(query_vector))
+        table = self._get_table(supported_dimension)
+        candidates = max(limit, self.configuration.hybrid_search_candidates)
+        rrf_k = self.configuration.hybrid_search_rrf_k
+        filters = [table.c.vector_store_id == collection_id, *self._get_metadata_filter(table, metadata_filter)]
+
+        await self._configure_index_scan()
+
+        # Top candidates of each ranking, the vector one is materialized to keep the HNSW index scan
+        distance = self._get_distance(table, distance_metric, query_vector).label("distance")
+        vector_nearest = (
+            select(table.c.id, distance)
+            .where(*filters)
+            .order_by(distance)
+            .limit(candidates)
+            .cte("vector_nearest")
+            .prefix_with("MATERIALIZED")
+        )
+        vector_ranked = select(
+            vector_nearest.c.id, func.row_number().over(order_by=vector_nearest.c.distance).label("rank")
+        ).cte("vector_ranked")
+
+        tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query_text)
+        text_rank = func.ts_rank_cd(self._get_tsvector(table), tsquery)
+        text_ranked = (
+            select(table.c.id, func.row_number().over(order_by=text_rank.desc()).label("rank"))
+            .where(*filters, self._get_tsvector(table).bool_op("@@")(tsquery))
+            .order_by(text_rank.desc())
+            .limit(candidates)
+            .cte("text_ranked")
+        )
+
+        score = func.coalesce(1.0 / (rrf_k + vector_ranked.c.rank), 0.0) + func.coalesce(
+            1.0 / (rrf_k + text_ranked.c.rank), 0.0
+        )
+        fused = (
+            select(func.coalesce(vector_ranked.c.id, text_ranked.c.id).label("id"), score.label("score"))
+            .select_from(vector_ranked.join(text_ranked, vector_ranked.c.id == text_ranked.c.id, full=True))
+            .order_by(score.desc())
+            .limit(limit)
+            .cte("fused")
+        )
+        query = (
+            select(table, fused.c.score, self._get_document_type())
+            .join(fused, (table.c.id == fused.c.id) & (table.c.vector_store_id == collection_id))
             .join(
                 vector_store_documents_table,
                 (table.c.vector_store_document_id == vector_store_documents_table.c.id)
                 & (table.c.vector_store_id == vector_store_documents_table.c.vector_store_id),
                 isouter=True,
             )
-            .where(table.c.vector_store_id == collection_id)
-            .order_by(table.c.embedding.cosine_distance(query_vector))
-            .limit(limit)
+            .order_by(fused.c.score.desc())
         )
 
         rows = await self.connection.execute(query)
-        return [self._to_search_result(row) for row in rows.fetchall()]
+        return [VectorStoreSearchResult(item=self._to_item(row), score=float(row.score)) for row in rows.fetchall()]
+
+    async def similarity_search_batch(
+        self,
+        queries: Sequence[VectorStoreSearchQuery],
+        distance_metrics: Mapping[UUID, VectorDistanceMetric],
+    ) -> list[list[VectorStoreSearchResult]]:
+        """Run multiple nearest-neighbour queries in a single statement, return the results of each query in order."""
+        if not queries:
+            return []
+
+        await self._configure_index_scan()
+
+        # Queries against the same table with the same distance metric share a VALUES list joined LATERALly with
+        # the top-k lookup, so each row of the list is answered by the index of its partition. Groups with a
+        # different table or metric are combined with UNION ALL.
+        groups: dict[tuple[int, VectorDistanceMetric], list[int]] = defaultdict(list)
+        for query_index, query in enumerate(queries):
+            supported_dimension = self._get_supported_dimension(len(query.query_vector))
+            groups[supported_dimension, distance_metrics[query.vector_store_id]].append(query_index)
+
+        nearest_per_group = []
+        for (supported_dimension, distance_metric), query_indexes in groups.items():
+            table = self._get_table(supported_dimension)
+            batch = values(
+                column("query_index", Integer),
+                column("vector_store_id", SQL_UUID),
+                column("query_vector", HALFVEC(supported_dimension)),
+                column("max_results", Integer),
+                column("metadata_filter", JSONB(none_as_null=True)),
+                name="queries",
+            ).data(
+                [
+                    (
+                        query_index,
+                        queries[query_index].vector_store_id,
+                        queries[query_index].query_vector,
+                        queries[query_index].limit,
+                        queries[query_index].metadata_filter,
+                    )
+                    for query_index in query_indexes
+                ]
+            )
+            # Parameters in VALUES are untyped, the casts make the operators resolve to halfvec and jsonb
+            query_vector = cast(batch.c.query_vector, HALFVEC(supported_dimension))
+            metadata_filter = cast(batch.c.metadata_filter, JSONB)
+            distance = self._get_distance(table, distance_metric, query_vector).label("distance")
+            top_k = (
+                select(table, distance)
+                .where(table.c.vector_store_id == batch.c.vector_store_id)
+                .where(or_(metadata_filter.is_(None), table.c.metadata.contains(metadata_filter)))
+                .order_by(distance)
+                .limit(batch.c.max_results)
+                .lateral("top_k")
+            )
+            nearest_per_group.append(select(batch.c.query_index, top_k))
+
+        combined = union_all(*nearest_per_group) if len(nearest_per_group) > 1 else nearest_per_group[0]
+        nearest = combined.subquery("nearest")
+        query = (
+            select(nearest, self._get_document_type())
+            .join(
+                vector_store_documents_table,
+                (nearest.c.vector_store_document_id == vector_store_documents_table.c.id)
+                & (nearest.c.vector_store_id == vector_store_documents_table.c.vector_store_id),
+                isouter=True,
+            )
+            .order_by(nearest.c.query_index, nearest.c.distance)
+        )
+
+        results: list[list[VectorStoreSearchResult]] = [[] for _ in queries]
+        for row in (await self.connection.execute(query)).fetchall():
+            results[row.query_index].append(self._to_search_result(row, distance_metrics[row.vector_store_id]))
+        return results
@@ -11,6 +11,7 @@ from agentstack_server.jobs.queues import Queues
 from agentstack_server.service_layer.services.a2a import A2AProxyService
 from agentstack_server.service_layer.services.contexts import ContextService
 from agentstack_server.service_layer.services.provider_discovery import ProviderDiscoveryService
+from agentstack_server.service_layer.services.vector_stores import VectorStoreService
 
 blueprint = Blueprint()
 
@@ -44,6 +45,15 @@ async def cleanup_expired_provider_discoveries(timestamp: int, service: Provider
     logger.info(f"Deleted {deleted_count} expired provider discoveries")
 
 
+@blueprint.periodic(cron="20 * * * *")  # pyrefly: ignore [bad-argument-type] -- bad typing in blueprint library
+@blueprint.task(queueing_lock="cleanup_orphaned_vector_store_collections", queue=str(Queues.CRON_CLEANUP))
+@inject
+async def cleanup_orphaned_vector_store_collections(timestamp: int, service: VectorStoreService) -> None:
+    """Drop vector database partitions of vector stores deleted by cascade."""
+    deleted_count = await service.delete_orphaned_collections()
+    logger.info(f"Deleted {deleted_count} orphaned vector store collections")
+
+
 @blueprint.periodic(cron="*/10 * * * *")  # pyrefly: ignore [bad-argument-type] -- bad typing in blueprint library
 @blueprint.task(queueing_lock="remove_old_jobs", queue=str(Queues.CRON_CLEANUP), pass_context=True)
 async def remove_old_jobs(context: JobContext, timestamp: int):
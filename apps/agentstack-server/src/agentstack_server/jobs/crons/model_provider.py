@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 
 from kink import inject
 from procrastinate import Blueprint
@@ -17,11 +18,17 @@ from agentstack_server.jobs.queues import Queues
 from agentstack_server.service_layer.services.configurations import ConfigurationService
 from agentstack_server.service_layer.services.model_providers import ModelProviderService
 from agentstack_server.service_layer.services.users import UserService
+from agentstack_server.utils.utils import gather_bounded, sleep_jitter
 
 logger = logging.getLogger(__name__)
 
 blueprint = Blueprint()
 
+# Periodic runs are delayed by a random jitter so that deployments sharing the same upstreams do not sync at once
+SYNC_JITTER = timedelta(seconds=30)
+REGISTRY_SYNC_CONCURRENCY = 8
+REGISTRY_SYNC_TIMEOUT = timedelta(seconds=60)
+
 
 async def update_system_configuration(
     configuration: Configuration, configuration_service: ConfigurationService, user_service: UserService
@@ -56,7 +63,10 @@ async def update_model_state_and_cache(
     configuration: Configuration,
     configuration_service: ConfigurationService,
     user_service: UserService,
+    jitter: bool = True,
 ):
+    if jitter:
+        await sleep_jitter(SYNC_JITTER)
     await model_provider_service.update_model_state_and_cache()
     await update_system_configuration(configuration, configuration_service, user_service)
 
@@ -72,9 +82,12 @@ async def check_model_provider_registry(
     model_provider_service: ModelProviderService,
     configuration_service: ConfigurationService,
     user_service: UserService,
+    jitter: bool = True,
 ):
     if not configuration.model_provider_registry.locations:
         return
+    if jitter:
+        await sleep_jitter(SYNC_JITTER)
 
     registry_by_provider_origin: dict[str, ModelProviderRegistryLocation] = {}
     desired_providers: dict[str, ModelProviderRegistryRecord] = {}
@@ -94,57 +107,61 @@ async def check_model_provider_registry(
     all_providers = await model_provider_service.list_providers()
     managed_providers = {str(provider.base_url): provider for provider in all_providers if provider.registry}
 
-    new_providers = desired_providers.keys() - managed_providers.keys()
-    old_providers = managed_providers.keys() - desired_providers.keys()
+    new_providers = list(desired_providers.keys() - managed_providers.keys())
+    old_providers = list(managed_providers.keys() - desired_providers.keys())
+    existing_providers = list(desired_providers.keys() & managed_providers.keys())
 
-    # Remove old providers
-    for provider_origin in old_providers:
+    async def _remove_provider(provider_origin: str) -> None:
         provider = managed_providers[provider_origin]
-        try:
-            await model_provider_service.delete_provider(model_provider_id=provider.id, allow_registry_update=True)
-            logger.info(f"Removed model provider {provider.base_url}")
-        except Exception as ex:
-            errors.append(RuntimeError(f"[{provider.base_url}]: Failed to remove model provider: {ex}"))
-
-    # Update existing providers
-    existing_providers = desired_providers.keys() & managed_providers.keys()
-    for provider_origin in existing_providers:
+        await model_provider_service.delete_provider(model_provider_id=provider.id, allow_registry_update=True)
+        logger.info(f"Removed model provider {provider.base_url}")
+
+    async def _update_provider(provider_origin: str) -> None:
         provider = managed_providers[provider_origin]
         provider_record = desired_providers[provider_origin]
+        await model_provider_service.patch_provider(
+            model_provider_id=provider.id,
+            name=provider_record.name,
+            description=provider_record.description,
+            type=provider_record.type,
+            base_url=provider_record.base_url,
+            api_key=provider_record.api_key,
+            watsonx_project_id=provider_record.watsonx_project_id,
+            watsonx_space_id=provider_record.watsonx_space_id,
+            allow_registry_update=True,
+            fetch_timeout=REGISTRY_SYNC_TIMEOUT,
+        )
+        logger.info(f"Updated model provider {provider.base_url}")
 
-        try:
-            await model_provider_service.patch_provider(
-                model_provider_id=provider.id,
-                name=provider_record.name,
-                description=provider_record.description,
-                type=provider_record.type,
-                base_url=provider_record.base_url,
-                api_key=provider_record.api_key,
-                watsonx_project_id=provider_record.watsonx_project_id,
-                watsonx_space_id=provider_record.watsonx_space_id,
-                allow_registry_update=True,
-            )
-            logger.info(f"Updated model provider {provider.base_url}")
-        except Exception as ex:
-            errors.append(RuntimeError(f"[{provider.base_url}]: Failed to update model provider: {ex}"))
-
-    # Add new providers
-    for provider_origin in new_providers:
+    async def _add_provider(provider_origin: str) -> None:
         provider_record = desired_providers[provider_origin]
-        try:
-            new_provider = await model_provider_service.create_provider(
-                name=provider_record.name,
-                description=provider_record.description,
-                type=provider_record.type,
-                base_url=provider_record.base_url,
-                api_key=provider_record.api_key,
-                watsonx_project_id=provider_record.watsonx_project_id,
-                watsonx_space_id=provider_record.watsonx_space_id,
-                registry=registry_by_provider_origin[provider_origin],
-            )
-            logger.info(f"Added model provider {new_provider.base_url}")
-        except Exception as ex:
-            errors.append(RuntimeError(f"[{provider_record.base_url}]: Failed to add model provider: {ex}"))
+        new_provider = await model_provider_service.create_provider(
+            name=provider_record.name,
+            description=provider_record.description,
+            type=provider_record.type,
+            base_url=provider_record.base_url,
+            api_key=provider_record.api_key,
+            watsonx_project_id=provider_record.watsonx_project_id,
+            watsonx_space_id=provider_record.watsonx_space_id,
+            registry=registry_by_provider_origin[provider_origin],
+            fetch_timeout=REGISTRY_SYNC_TIMEOUT,
+        )
+        logger.info(f"Added model provider {new_provider.base_url}")
+
+    # Remove old providers first, the base URL of a new provider may collide with a removed one.
+    # Each step loads the provider's models, so a slow provider only delays its own step.
+    for step, provider_origins, action in [
+        (_remove_provider, old_providers, "remove"),
+        (_update_provider, existing_providers, "update"),
+        (_add_provider, new_providers, "add"),
+    ]:
+        # Only loading the models is limited by the timeout, a cancelled write could leave a provider half-done
+        results = await gather_bounded(step, provider_origins, concurrency=REGISTRY_SYNC_CONCURRENCY)
+        errors.extend(
+            RuntimeError(f"[{provider_origin}]: Failed to {action} model provider: {result!r}")
+            for provider_origin, result in zip(provider_origins, results, strict=True)
+            if isinstance(result, Exception)
+        )
 
     try:
         await update_system_configuration(configuration, configuration_service, user_service)
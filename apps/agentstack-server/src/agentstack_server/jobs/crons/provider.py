@@ -2,33 +2,30 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
-import asyncio
 import logging
 from datetime import timedelta
 
-import httpx
-from a2a.types import AgentCard
-from a2a.utils import AGENT_CARD_WELL_KNOWN_PATH
-from httpx import HTTPError
 from kink import inject
 from procrastinate import Blueprint
 
 from agentstack_server import get_configuration
 from agentstack_server.configuration import Configuration
-from agentstack_server.domain.constants import SELF_REGISTRATION_EXTENSION_URI
-from agentstack_server.domain.models.provider import NetworkProviderLocation, Provider, ProviderType, UnmanagedState
 from agentstack_server.domain.models.registry import ProviderRegistryRecord, RegistryLocation
 from agentstack_server.jobs.queues import Queues
+from agentstack_server.service_layer.services.provider_health import ProviderHealthService
 from agentstack_server.service_layer.services.providers import ProviderService
 from agentstack_server.service_layer.services.users import UserService
-from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
-from agentstack_server.utils.a2a import get_extension
-from agentstack_server.utils.utils import extract_messages
+from agentstack_server.utils.utils import gather_bounded, sleep_jitter
 
 logger = logging.getLogger(__name__)
 
 blueprint = Blueprint()
 
+# Periodic runs are delayed by a random jitter so that deployments sharing the same registry do not sync at once
+SYNC_JITTER = timedelta(seconds=30)
+REGISTRY_SYNC_CONCURRENCY = 8
+REGISTRY_SYNC_TIMEOUT = timedelta(minutes=2)
+
 
 @blueprint.periodic(cron="*/1 * * * *")  # pyrefly: ignore [bad-argument-type] -- bad typing in blueprint library
 @blueprint.task(queueing_lock="scale_down_providers", queue=str(Queues.CRON_PROVIDER))
@@ -49,9 +46,12 @@ async def check_registry(
     configuration: Configuration,
     provider_service: ProviderService,
     user_service: UserService,
+    jitter: bool = True,
 ):
     if not configuration.agent_registry.locations:
         return
+    if jitter:
+        await sleep_jitter(SYNC_JITTER)
 
     user = await user_service.get_user_by_email("admin@beeai.dev")
 
@@ -77,51 +77,56 @@ async def check_registry(
         provider.origin: provider for provider in await provider_service.list_providers() if provider.registry
     }
 
-    new_providers = desired_providers.keys() - managed_providers.keys()
-    old_providers = managed_providers.keys() - desired_providers.keys()
-    existing_providers = managed_providers.keys() & desired_providers.keys()
+    new_providers = list(desired_providers.keys() - managed_providers.keys())
+    old_providers = list(managed_providers.keys() - desired_providers.keys())
+    existing_providers = list(managed_providers.keys() & desired_providers.keys())
 
-    # Remove old providers - to prevent agent name collisions
-    for provider_origin in old_providers:
+    async def _remove_provider(provider_origin: str) -> None:
         provider = managed_providers[provider_origin]
-        try:
-            await provider_service.delete_provider(provider_id=provider.id, user=user)
-            logger.info(f"Removed provider {provider.source}")
-        except Exception as ex:
-            errors.append(RuntimeError(f"[{provider.source}]: Failed to remove provider: {ex}"))
+        await provider_service.delete_provider(provider_id=provider.id, user=user)
+        logger.info(f"Removed provider {provider.source}")
 
-    for provider_origin in new_providers:
+    async def _add_provider(provider_origin: str) -> None:
         provider_record = desired_providers[provider_origin]
-        try:
-            await provider_service.create_provider(
-                user=user,
-                location=provider_record.location,
-                origin=provider_record.origin,
-                registry=registry_by_provider_origin[provider_origin],
-                auto_stop_timeout=provider_record.auto_stop_timeout,
-                variables=provider_record.variables,
-            )
-            logger.info(f"Added provider {provider_record.location}")
-        except Exception as ex:
-            errors.append(RuntimeError(f"[{provider_record.location}]: Failed to add provider: {ex}"))
-
-    for provider_origin in existing_providers:
+        await provider_service.create_provider(
+            user=user,
+            location=provider_record.location,
+            origin=provider_record.origin,
+            registry=registry_by_provider_origin[provider_origin],
+            auto_stop_timeout=provider_record.auto_stop_timeout,
+            variables=provider_record.variables,
+            fetch_timeout=REGISTRY_SYNC_TIMEOUT,
+        )
+        logger.info(f"Added provider {provider_record.location}")
+
+    async def _update_provider(provider_origin: str) -> None:
         provider_record = desired_providers[provider_origin]
-        provider = managed_providers[provider_origin]
-        try:
-            result = await provider_service.patch_provider(
-                provider_id=provider.id,
-                user=user,
-                location=provider_record.location,
-                origin=provider_record.origin,
-                auto_stop_timeout=provider_record.auto_stop_timeout,
-                variables=provider_record.variables,
-                allow_registry_update=True,
-            )
-            if managed_providers[provider_origin].source.root != result.source.root:
-                logger.info(f"Updated provider {provider_record.location}")
-        except Exception as ex:
-            errors.append(RuntimeError(f"[{provider_record.location}]: Failed to add provider: {ex}"))
+        result = await provider_service.patch_provider(
+            provider_id=managed_providers[provider_origin].id,
+            user=user,
+            location=provider_record.location,
+            origin=provider_record.origin,
+            auto_stop_timeout=provider_record.auto_stop_timeout,
+            variables=provider_record.variables,
+            allow_registry_update=True,
+            fetch_timeout=REGISTRY_SYNC_TIMEOUT,
+        )
+        if managed_providers[provider_origin].source.root != result.source.root:
+            logger.info(f"Updated provider {provider_record.location}")
+
+    # Remove old providers first - to prevent agent name collisions
+    for step, provider_origins, action in [
+        (_remove_provider, old_providers, "remove"),
+        (_add_provider, new_providers, "add"),
+        (_update_provider, existing_providers, "update"),
+    ]:
+        # Only loading from the registry is limited by the timeout, a cancelled write could leave a provider half-done
+        results = await gather_bounded(step, provider_origins, concurrency=REGISTRY_SYNC_CONCURRENCY)
+        errors.extend(
+            RuntimeError(f"[{provider_origin}]: Failed to {action} provider: {result!r}")
+            for provider_origin, result in zip(provider_origins, results, strict=True)
+            if isinstance(result, Exception)
+        )
 
     if errors:
         raise ExceptionGroup("Exceptions occurred when reloading providers", errors)
@@ -130,66 +135,5 @@ async def check_registry(
 @blueprint.periodic(cron="* * * * * */5")  # pyrefly: ignore [bad-argument-type] -- bad typing in blueprint library
 @blueprint.task(queueing_lock="check_unmanaged_providers", queue=str(Queues.CRON_PROVIDER))
 @inject
-async def refresh_unmanaged_provider_state(
-    timestamp: int, uow_f: IUnitOfWorkFactory, provider_service: ProviderService, user_service: UserService
-):
-    timeout_sec = timedelta(seconds=20).total_seconds()
-
-    async def _check_provider(provider: Provider):
-        state = UnmanagedState.OFFLINE
-        resp_card = None
-        should_update_provider = True
-
-        user = await user_service.get_user_by_email("admin@beeai.dev")
-
-        try:
-            assert isinstance(provider.source, NetworkProviderLocation)
-            async with httpx.AsyncClient(base_url=str(provider.source.a2a_url), timeout=timeout_sec) as client:
-                resp_card = AgentCard.model_validate(
-                    (await client.get(AGENT_CARD_WELL_KNOWN_PATH)).raise_for_status().json()
-                )
-
-                # For self-registered provider we need to check their self-registration ID, because their URL
-                # might overlap (more agents on the same URL, only one can be online)
-                provider_self_reg_ext = get_extension(provider.agent_card, SELF_REGISTRATION_EXTENSION_URI)
-                resp_self_reg_ext = get_extension(resp_card, SELF_REGISTRATION_EXTENSION_URI)
-                if provider_self_reg_ext is not None and resp_self_reg_ext is not None:
-                    if provider_self_reg_ext.params == resp_self_reg_ext.params:
-                        state = UnmanagedState.ONLINE
-                    else:
-                        # Different agent responding at the same URL, don't update this provider
-                        should_update_provider = False
-                else:
-                    state = UnmanagedState.ONLINE
-
-        except HTTPError as ex:
-            logger.warning(
-                f"Provider {provider.id} failed to respond to ping in {int(timeout_sec)} seconds: {extract_messages(ex)}"
-            )
-            state = UnmanagedState.OFFLINE
-        finally:
-            # Unified update: patch both agent card (if changed) and state (if changed) in a single call
-            # Only detect card changes if we got a response (resp_card is not None)
-            card_changes = resp_card is not None and provider.agent_card != resp_card
-            state_changed = state != provider.unmanaged_state
-
-            if should_update_provider and (card_changes or state_changed):
-                try:
-                    await provider_service.patch_provider(
-                        provider_id=provider.id,
-                        user=user,
-                        agent_card=resp_card if card_changes else None,
-                        unmanaged_state=state if state_changed else None,
-                        allow_registry_update=True,
-                    )
-                except Exception as ex:
-                    if isinstance(ex, asyncio.CancelledError):
-                        raise
-                    logger.error(f"Failed to update provider {provider.id}: {extract_messages(ex)}")
-
-    async with uow_f() as uow:
-        unmanaged_providers = [provider async for provider in uow.providers.list(type=ProviderType.UNMANAGED)]
-
-    async with asyncio.TaskGroup() as tg:
-        for provider in unmanaged_providers:
-            tg.create_task(_check_provider(provider))
+async def refresh_unmanaged_provider_state(timestamp: int, provider_health_service: ProviderHealthService):
+    await provider_health_service.probe_unmanaged_providers()
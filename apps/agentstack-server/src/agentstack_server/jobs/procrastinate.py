@@ -17,6 +17,7 @@ from agentstack_server.jobs.tasks.context import blueprint as context_tasks
 from agentstack_server.jobs.tasks.file import blueprint as file_tasks
 from agentstack_server.jobs.tasks.provider_build import blueprint as provider_build_tasks
 from agentstack_server.jobs.tasks.provider_discovery import blueprint as provider_discovery_tasks
+from agentstack_server.jobs.tasks.webhook import blueprint as webhook_tasks
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +60,7 @@ def create_app(configuration: Configuration) -> procrastinate.App:
     app.add_tasks_from(blueprint=context_tasks, namespace="context_tasks")
     app.add_tasks_from(blueprint=provider_build_tasks, namespace="provider_build_tasks")
     app.add_tasks_from(blueprint=provider_discovery_tasks, namespace="provider_discovery_tasks")
+    app.add_tasks_from(blueprint=webhook_tasks, namespace="webhook_tasks")
     app.add_tasks_from(blueprint=provider_crons, namespace="cron_provider")
     app.add_tasks_from(blueprint=model_provider_crons, namespace="cron_model_provider")
     app.add_tasks_from(blueprint=cleanup_crons, namespace="cron_cleanup")
@@ -18,6 +18,7 @@ class Queues(StrEnum):
     TOOLKIT_DELETION = "toolkit_deletion"
     BUILD_PROVIDER = "build_provider"
     PROVIDER_DISCOVERY = "provider_discovery"
+    WEBHOOK_DELIVERY = "webhook_delivery"
 
     @staticmethod
     def all() -> set[str]:
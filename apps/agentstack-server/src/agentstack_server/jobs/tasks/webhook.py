@@ -0,0 +1,18 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from typing import Any
+
+from procrastinate import Blueprint, RetryStrategy
+
+from agentstack_server.jobs.queues import Queues
+from agentstack_server.service_layer.webhook import deliver_deferred_events
+
+blueprint = Blueprint()
+
+
+@blueprint.task(queue=str(Queues.WEBHOOK_DELIVERY), retry=RetryStrategy(max_attempts=10, exponential_wait=2))
+async def deliver_webhook(url: str, events: list[dict[str, Any]]):
+    await deliver_deferred_events(url=url, events=events)
@@ -0,0 +1,27 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+from enum import StrEnum
+from typing import Protocol
+
+
+class ActivityKind(StrEnum):
+    PROVIDER = "provider"
+    CONTEXT = "context"
+    VECTOR_STORE = "vector_store"
+    A2A_REQUEST_TASK = "a2a_request_task"
+    A2A_REQUEST_CONTEXT = "a2a_request_context"
+
+
+class IActivityBuffer(Protocol):
+    """
+    Coalesces last-activity timestamps of entities until they are flushed to the database.
+    Only the latest timestamp of each entity is kept.
+    """
+
+    async def touch(self, kind: ActivityKind, timestamps: Mapping[str, datetime]) -> None: ...
+    async def drain(self) -> dict[ActivityKind, dict[str, datetime]]: ...
@@ -27,7 +27,10 @@ def global_provider_variables(provider_url: HttpUrl):
 
 
 class IProviderDeploymentManager(Protocol):
+    async def __aenter__(self) -> IProviderDeploymentManager: ...
+    async def __aexit__(self, exc_type, exc, tb) -> None: ...
     async def create_or_replace(self, *, provider: Provider, env: dict[str, str] | None = None) -> bool: ...
+    async def is_up_to_date(self, *, provider: Provider) -> bool: ...
     async def delete(self, *, provider_id: UUID) -> None: ...
     async def remove_orphaned_providers(self, existing_providers: list[UUID]) -> None: ...
     async def state(self, *, provider_ids: list[UUID]) -> list[ProviderDeploymentState]: ...
@@ -4,12 +4,16 @@
 from __future__ import annotations
 
 import functools
+import importlib.util
 import inspect
 import logging
+import time
 import uuid
+from collections import Counter
 from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Awaitable, Callable, Coroutine, Iterator
 from contextlib import asynccontextmanager, contextmanager
 from datetime import timedelta
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 from typing import Any, NamedTuple, cast, overload
 from urllib.parse import urljoin, urlparse
 from uuid import UUID
@@ -49,7 +53,7 @@ from structlog.contextvars import bind_contextvars, unbind_contextvars
 
 from agentstack_server.api.auth.auth import exchange_internal_jwt
 from agentstack_server.api.auth.utils import create_resource_uri
-from agentstack_server.configuration import Configuration
+from agentstack_server.configuration import A2AProxyConfiguration, Configuration
 from agentstack_server.domain.models.provider import (
     NetworkProviderLocation,
     Provider,
@@ -58,9 +62,11 @@ from agentstack_server.domain.models.provider import (
 )
 from agentstack_server.domain.models.user import User
 from agentstack_server.exceptions import EntityNotFoundError, ForbiddenUpdateError, InvalidProviderCallError
+from agentstack_server.service_layer.activity import ActivityKind
 from agentstack_server.service_layer.deployment_manager import (
     IProviderDeploymentManager,
 )
+from agentstack_server.service_layer.services.activity import ActivityService
 from agentstack_server.service_layer.services.users import UserService
 from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
 from agentstack_server.telemetry import INSTRUMENTATION_NAME
@@ -68,6 +74,7 @@ from agentstack_server.telemetry import INSTRUMENTATION_NAME
 logger = logging.getLogger(__name__)
 
 _SUPPORTED_TRANSPORTS = {TransportProtocol.http_json, TransportProtocol.jsonrpc}
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 
 def _create_deploy_a2a_url(url: str, *, deployment_base: str) -> str:
@@ -159,6 +166,66 @@ def _handle_exception[**P, T](
         return _fn
 
 
+class ProviderClientPool:
+    """Long-lived httpx clients for calling agents, each provider gets its own bounded connection pool."""
+
+    def __init__(self, configuration: A2AProxyConfiguration, transport: httpx.AsyncBaseTransport | None = None):
+        self._config = configuration
+        self._transport = transport
+        self._clients: dict[UUID, httpx.AsyncClient] = {}
+        self._last_used: dict[UUID, float] = {}
+        self._active: Counter[UUID] = Counter()
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            # The client is shared by all users, cookies set by an agent for one user must not be sent for another
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+            transport=self._transport,
+            timeout=timedelta(hours=1).total_seconds(),
+            http2=self._config.http2 and _HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=self._config.max_connections_per_provider,
+                max_keepalive_connections=self._config.max_keepalive_connections_per_provider,
+                keepalive_expiry=self._config.keepalive_expiry_sec,
+            ),
+        )
+
+    async def _evict_idle_clients(self) -> None:
+        now = time.monotonic()
+        idle_provider_ids = [
+            provider_id
+            for provider_id, last_used in self._last_used.items()
+            if not self._active[provider_id] and now - last_used > self._config.idle_client_expiry_sec
+        ]
+        for provider_id in idle_provider_ids:
+            client = self._clients.pop(provider_id)
+            del self._last_used[provider_id]
+            del self._active[provider_id]
+            await client.aclose()
+
+    @asynccontextmanager
+    async def client(self, provider_id: UUID) -> AsyncIterator[httpx.AsyncClient]:
+        await self._evict_idle_clients()
+        client = self._clients.get(provider_id)
+        if client is None:
+            client = self._clients[provider_id] = self._create_client()
+        self._active[provider_id] += 1
+        try:
+            yield client
+        finally:
+            self._active[provider_id] -= 1
+            self._last_used[provider_id] = time.monotonic()
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._last_used.clear()
+        self._active.clear()
+        for client in clients:
+            await client.aclose()
+
+
 class ProxyRequestHandler(RequestHandler):
     def __init__(
         self,
@@ -169,10 +236,14 @@ class ProxyRequestHandler(RequestHandler):
         # Calling the factory have side-effects, such as rotating the agent
         agent_card_factory: Callable[[], Awaitable[AgentCard]] | None = None,
         agent_card: AgentCard | None = None,
+        client_pool: ProviderClientPool,
+        activity: ActivityService,
         configuration: Configuration,
     ):
         if agent_card_factory is None and agent_card is None:
             raise ValueError("One of agent_card_factory or agent_card must be provided")
+        self._client_pool = client_pool
+        self._activity = activity
         self._configuration = configuration
         self._agent_card_factory = agent_card_factory
         self._agent_card = agent_card
@@ -182,13 +253,22 @@ class ProxyRequestHandler(RequestHandler):
 
     @asynccontextmanager
     async def _client_transport(self, context: ServerCallContext | None = None) -> AsyncIterator[ClientTransport]:
-        from fastapi.security.utils import get_authorization_scheme_param
-
         if self._agent_card is None:
             assert self._agent_card_factory is not None
             self._agent_card = await self._agent_card_factory()
 
-        headers: dict[str, str] = {} if not context else context.state.get("headers", {})
+        async with self._client_pool.client(self._provider_id) as httpx_client:
+            client: BaseClient = cast(
+                BaseClient,
+                ClientFactory(config=ClientConfig(httpx_client=httpx_client)).create(card=self._agent_card),
+            )
+            yield client._transport
+
+    def _forward_headers(self, context: ServerCallContext | None = None) -> dict[str, str]:
+        from fastapi.security.utils import get_authorization_scheme_param
+
+        assert self._agent_card is not None
+        headers: dict[str, str] = {} if not context else dict(context.state.get("headers", {}))
         headers.pop("host", None)
         headers.pop("content-length", None)
         if auth_header := headers.get("authorization"):
@@ -199,17 +279,7 @@ class ProxyRequestHandler(RequestHandler):
                 headers["authorization"] = f"Bearer {token}"
             except Exception:
                 headers.pop("authorization", None)  # forward header only if it's a valid context token
-
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=timedelta(hours=1).total_seconds(),
-            headers=headers,
-        ) as httpx_client:
-            client: BaseClient = cast(
-                BaseClient,
-                ClientFactory(config=ClientConfig(httpx_client=httpx_client)).create(card=self._agent_card),
-            )
-            yield client._transport
+        return headers
 
     async def _check_task(self, task_id: str):
         async with self._uow() as uow:
@@ -240,9 +310,20 @@ class ProxyRequestHandler(RequestHandler):
                 allow_task_creation=allow_task_creation,
             )
             await uow.commit()
+        if task_id:
+            await self._activity.touch(ActivityKind.A2A_REQUEST_TASK, task_id)
+        if context_id:
+            await self._activity.touch(ActivityKind.A2A_REQUEST_CONTEXT, context_id)
 
     def _forward_context(self, context: ServerCallContext | None = None) -> ClientCallContext:
-        return ClientCallContext(state={**(context.state if context else {}), "user_id": self._user.id})
+        # The pooled client is shared by all users, headers are sent with each request instead
+        return ClientCallContext(
+            state={
+                **(context.state if context else {}),
+                "user_id": self._user.id,
+                "http_kwargs": {"headers": self._forward_headers(context)},
+            }
+        )
 
     @_handle_exception
     async def on_get_task(self, params: TaskQueryParams, context: ServerCallContext | None = None) -> Task | None:
@@ -317,7 +398,7 @@ class ProxyRequestHandler(RequestHandler):
     ) -> TaskPushNotificationConfig:
         await self._check_task(params.task_id)
         async with self._client_transport(context) as transport:
-            return await transport.set_task_callback(params)
+            return await transport.set_task_callback(params, context=self._forward_context(context))
 
     @_handle_exception
     async def on_get_task_push_notification_config(
@@ -337,7 +418,7 @@ class ProxyRequestHandler(RequestHandler):
     ) -> AsyncGenerator[Event]:
         await self._check_task(params.id)
         async with self._client_transport(context) as transport:
-            async for event in transport.resubscribe(params):
+            async for event in transport.resubscribe(params, context=self._forward_context(context)):
                 yield event
 
     @_handle_exception
@@ -366,6 +447,7 @@ class A2AProxyService:
         provider_deployment_manager: IProviderDeploymentManager,
         uow: IUnitOfWorkFactory,
         user_service: UserService,
+        activity: ActivityService,
         configuration: Configuration,
     ):
         self._deploy_manager = provider_deployment_manager
@@ -373,6 +455,14 @@ class A2AProxyService:
         self._user_service = user_service
         self._config = configuration
         self._expire_requests_after = timedelta(days=configuration.a2a_proxy.requests_expire_after_days)
+        self._activity = activity
+        self._client_pool = ProviderClientPool(configuration.a2a_proxy)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client_pool.aclose()
 
     async def get_request_handler(self, *, provider: Provider, user: User) -> RequestHandler:
         async def agent_card_factory() -> AgentCard:
@@ -385,6 +475,8 @@ class A2AProxyService:
             provider_id=provider.id,
             uow=self._uow,
             user=user,
+            client_pool=self._client_pool,
+            activity=self._activity,
             configuration=self._config,
         )
 
@@ -403,8 +495,7 @@ class A2AProxyService:
 
             async with self._uow() as uow:
                 provider = await uow.providers.get(provider_id=provider_id)
-                await uow.providers.update_last_accessed(provider_id=provider_id)
-                await uow.commit()
+            await self._activity.touch(ActivityKind.PROVIDER, provider_id)
 
             if not provider.managed:
                 if provider.unmanaged_state is UnmanagedState.OFFLINE:
@@ -417,6 +508,9 @@ class A2AProxyService:
 
             provider_url = await self._deploy_manager.get_provider_url(provider_id=provider.id)
             [state] = await self._deploy_manager.state(provider_ids=[provider.id])
+            if state == ProviderDeploymentState.RUNNING and await self._deploy_manager.is_up_to_date(provider=provider):
+                return provider_url
+
             should_wait = False
             match state:
                 case ProviderDeploymentState.ERROR:
@@ -0,0 +1,108 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Final
+from uuid import UUID
+
+from kink import inject
+from opentelemetry.metrics import get_meter
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.service_layer.activity import ActivityKind, IActivityBuffer
+from agentstack_server.service_layer.unit_of_work import IUnitOfWork, IUnitOfWorkFactory
+from agentstack_server.telemetry import INSTRUMENTATION_NAME
+from agentstack_server.utils.utils import cancel_task, utc_now
+
+logger = logging.getLogger(__name__)
+
+_meter = get_meter(INSTRUMENTATION_NAME)
+_flushed_updates = _meter.create_counter(
+    "activity_updates_flushed",
+    description="Last activity timestamps written to the database by the activity tracking",
+)
+
+# Keeps the number of bind parameters of a single UPDATE ... FROM (VALUES ...) well below the postgres limit
+FLUSH_BATCH_SIZE: Final = 1000
+
+
+@inject
+class ActivityService:
+    """
+    Tracks the last activity of entities without writing to the database on every request.
+
+    Touches are coalesced in a buffer and flushed periodically, the expiry jobs reading these timestamps only need
+    minute-level precision.
+    """
+
+    def __init__(self, buffer: IActivityBuffer, uow: IUnitOfWorkFactory, configuration: Configuration):
+        self._buffer = buffer
+        self._uow = uow
+        self._flush_interval = timedelta(seconds=configuration.activity_tracking.flush_interval_sec)
+        self._flush_task: asyncio.Task | None = None
+
+    async def __aenter__(self):
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await cancel_task(self._flush_task)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to flush activity on shutdown")
+
+    async def touch(self, kind: ActivityKind, *entity_ids: UUID | str) -> None:
+        now = utc_now()
+        await self._buffer.touch(kind, {str(entity_id): now for entity_id in entity_ids})
+
+    async def flush(self) -> int:
+        activity = await self._buffer.drain()
+        if not activity:
+            return 0
+        try:
+            async with self._uow() as uow:
+                for kind, timestamps in activity.items():
+                    for batch in itertools.batched(timestamps.items(), FLUSH_BATCH_SIZE, strict=False):
+                        await self._update(uow, kind, dict(batch))
+                await uow.commit()
+        except Exception:
+            # Return the timestamps to the buffer so that they are written by the next flush
+            for kind, timestamps in activity.items():
+                await self._buffer.touch(kind, timestamps)
+            raise
+        flushed = sum(len(timestamps) for timestamps in activity.values())
+        _flushed_updates.add(flushed)
+        return flushed
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval.total_seconds())
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush activity")
+
+    async def _update(self, uow: IUnitOfWork, kind: ActivityKind, timestamps: Mapping[str, datetime]) -> None:
+        match kind:
+            case ActivityKind.PROVIDER:
+                await uow.providers.update_last_accessed(timestamps=_by_uuid(timestamps))
+            case ActivityKind.CONTEXT:
+                await uow.contexts.update_last_active(timestamps=_by_uuid(timestamps))
+            case ActivityKind.VECTOR_STORE:
+                await uow.vector_stores.update_last_accessed(timestamps=_by_uuid(timestamps))
+            case ActivityKind.A2A_REQUEST_TASK:
+                await uow.a2a_requests.update_tasks_last_accessed(timestamps=timestamps)
+            case ActivityKind.A2A_REQUEST_CONTEXT:
+                await uow.a2a_requests.update_contexts_last_accessed(timestamps=timestamps)
+
+
+def _by_uuid(timestamps: Mapping[str, datetime]) -> dict[UUID, datetime]:
+    return {UUID(entity_id): timestamp for entity_id, timestamp in timestamps.items()}
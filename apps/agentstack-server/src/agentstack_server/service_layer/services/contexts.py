@@ -3,18 +3,21 @@
 
 from __future__ import annotations
 
+import base64
 import logging
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from contextlib import suppress
 from datetime import timedelta
+from typing import Final
 from uuid import UUID
 
-from a2a.types import Artifact, DataPart, FilePart, FileWithBytes, FileWithUri, Message, Role, TextPart
+from a2a.types import Artifact, DataPart, FilePart, FileWithBytes, FileWithUri, Message, Part, Role, TextPart
 from fastapi import status
 from kink import inject
 from pydantic import TypeAdapter
 
 from agentstack_server.api.schema.common import PaginationQuery
+from agentstack_server.api.schema.contexts import ContextHistoryQuery
 from agentstack_server.api.schema.openai import ChatCompletionRequest
 from agentstack_server.configuration import Configuration
 from agentstack_server.domain.models.common import Metadata, MetadataPatch, PaginatedResult
@@ -27,6 +30,8 @@ from agentstack_server.domain.models.context import (
 from agentstack_server.domain.models.user import User
 from agentstack_server.domain.repositories.file import IObjectStorageRepository
 from agentstack_server.exceptions import EntityNotFoundError, PlatformError
+from agentstack_server.service_layer.activity import ActivityKind
+from agentstack_server.service_layer.services.activity import ActivityService
 from agentstack_server.service_layer.services.model_providers import ModelProviderService
 from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
 from agentstack_server.service_layer.webhook import dispatch_webhook_event
@@ -34,6 +39,27 @@ from agentstack_server.utils.utils import filter_dict, utc_now
 
 logger = logging.getLogger(__name__)
 
+# Inline file content (base64) larger than this is replaced by a URI when listing the history with strip_binary
+STRIP_BINARY_MIN_SIZE: Final = 4096
+
+
+def _strip_binary_parts(item: ContextHistoryItem, part_content_url: Callable[[UUID, int], str]) -> ContextHistoryItem:
+    parts = list(item.data.parts)
+    for index, part in enumerate(parts):
+        match part.root:
+            case FilePart(file=FileWithBytes(bytes=content, name=name, mime_type=mime_type)) if (
+                len(content) > STRIP_BINARY_MIN_SIZE
+            ):
+                file = FileWithUri(
+                    uri=part_content_url(item.id, index),
+                    name=name,
+                    mime_type=mime_type,
+                )
+                parts[index] = Part(root=part.root.model_copy(update={"file": file}))
+    if parts == item.data.parts:
+        return item
+    return item.model_copy(update={"data": item.data.model_copy(update={"parts": parts})})
+
 
 @inject
 class ContextService:
@@ -43,8 +69,10 @@ class ContextService:
         configuration: Configuration,
         object_storage: IObjectStorageRepository,
         model_provider_service: ModelProviderService,
+        activity: ActivityService,
     ):
         self._uow = uow
+        self._activity = activity
         self._object_storage = object_storage
         self._configuration = configuration
         self._expire_resources_after = timedelta(days=configuration.context.resources_expire_after_days)
@@ -77,6 +105,7 @@ class ContextService:
                 provider_id=provider_id,
                 limit=pagination.limit,
                 page_token=pagination.page_token,
+                total_count=pagination.total_count,
                 order=pagination.order,
                 order_by=pagination.order_by,
                 include_empty=include_empty,
@@ -185,9 +214,7 @@ class ContextService:
         return deleted_stats
 
     async def update_last_active(self, *, context_id: UUID) -> None:
-        async with self._uow() as uow:
-            await uow.contexts.update_last_active(context_id=context_id)
-            await uow.commit()
+        await self._activity.touch(ActivityKind.CONTEXT, context_id)
 
     def _extract_content_for_title(
         self, msg: Message | Artifact
@@ -207,19 +234,32 @@ class ContextService:
                     pass
         return "".join(text_parts), title_hint, files
 
-    async def add_history_item(self, *, context_id: UUID, data: ContextHistoryItemData, user: User) -> None:
+    async def add_history_item(
+        self, *, context_id: UUID, data: ContextHistoryItemData, user: User
+    ) -> ContextHistoryItem:
+        [history_item] = await self.add_history_items(context_id=context_id, data=[data], user=user)
+        return history_item
+
+    async def add_history_items(
+        self, *, context_id: UUID, data: Sequence[ContextHistoryItemData], user: User
+    ) -> list[ContextHistoryItem]:
+        """Append items to the context history in a single transaction, preserving their order"""
+        now = utc_now()
+        # Items are ordered by creation time, keep them apart so that the order within the batch is preserved
+        history_items = [
+            ContextHistoryItem(context_id=context_id, data=item, created_at=now + timedelta(microseconds=i))
+            for i, item in enumerate(data)
+        ]
         async with self._uow() as uow:
             context = await uow.contexts.get(context_id=context_id, user_id=user.id)
-            await uow.contexts.add_history_item(
-                context_id=context_id,
-                history_item=ContextHistoryItem(context_id=context_id, data=data),
-            )
+            await uow.contexts.add_history_items(context_id=context_id, history_items=history_items)
 
-            if getattr(data, "role", None) == Role.user and not (context.metadata or {}).get("title"):
+            user_message = next((item for item in data if getattr(item, "role", None) == Role.user), None)
+            if user_message is not None and not (context.metadata or {}).get("title"):
                 from agentstack_server.jobs.tasks.context import generate_conversation_title as task
 
                 # Use simple text extraction for the initial title placeholder
-                title = self._extract_content_for_title(data)[0] or "Untitled"
+                title = self._extract_content_for_title(user_message)[0] or "Untitled"
                 title = f"{title[:100]}..." if len(title) > 100 else title
 
                 should_generate_title = self._configuration.generate_conversation_title.enabled
@@ -230,12 +270,20 @@ class ContextService:
                     await task.configure(queueing_lock=str(context_id)).defer_async(context_id=str(context_id))
 
             await uow.commit()
+        return history_items
 
     async def generate_conversation_title(self, *, context_id: UUID):
         from jinja2 import Template
 
         async with self._uow() as uow:
-            msg = await uow.contexts.list_history(context_id=context_id, limit=1, order="desc", order_by="created_at")
+            msg = await uow.contexts.list_history(
+                context_id=context_id,
+                limit=1,
+                order="desc",
+                order_by="created_at",
+                kind="message",
+                roles=[Role.user.value],
+            )
             system_config = await uow.configuration.get_system_configuration()
 
         model = self._configuration.generate_conversation_title.model
@@ -291,17 +339,47 @@ class ContextService:
             raise e
 
     async def list_history(
-        self, *, context_id: UUID, user: User, pagination: PaginationQuery
+        self,
+        *,
+        context_id: UUID,
+        user: User,
+        query: ContextHistoryQuery,
+        part_content_url: Callable[[UUID, int], str],
     ) -> PaginatedResult[ContextHistoryItem]:
+        """
+        :param part_content_url: absolute URL of the content of a history item part (item id, part index), used
+            to replace stripped binary parts
+        """
         async with self._uow() as uow:
             await uow.contexts.get(context_id=context_id, user_id=user.id)
-            return await uow.contexts.list_history(
+            result = await uow.contexts.list_history(
                 context_id=context_id,
-                limit=pagination.limit,
-                page_token=pagination.page_token,
-                order=pagination.order,
-                order_by=pagination.order_by,
+                limit=query.limit,
+                page_token=query.page_token,
+                total_count=query.total_count,
+                order=query.order,
+                order_by=query.order_by,
+                kind=query.kind,
+                roles=[role.value for role in query.roles] if query.roles is not None else None,
+                since_id=query.since_id,
             )
+        if query.strip_binary:
+            result.items = [_strip_binary_parts(item, part_content_url) for item in result.items]
+        return result
+
+    async def get_history_part_content(
+        self, *, context_id: UUID, item_id: UUID, part_index: int, user: User
+    ) -> tuple[bytes, str | None]:
+        """Content and mime type of an inline file part of a history item"""
+        async with self._uow() as uow:
+            await uow.contexts.get(context_id=context_id, user_id=user.id)
+            item = await uow.contexts.get_history_item(context_id=context_id, item_id=item_id)
+        parts = item.data.parts
+        match parts[part_index].root if 0 <= part_index < len(parts) else None:
+            case FilePart(file=FileWithBytes(bytes=content, mime_type=mime_type)):
+                return base64.b64decode(content), mime_type
+            case _:
+                raise EntityNotFoundError("context_history_item_part", part_index, attribute="index")
 
     async def delete_history_from_id(self, *, context_id: UUID, from_id: UUID, user: User) -> None:
         """Delete all history items from a specific item onwards (inclusive)"""
@@ -10,6 +10,7 @@ from typing import Annotated
 from uuid import UUID
 
 from kink import inject
+from pydantic import HttpUrl
 from typing_extensions import Doc
 
 from agentstack_server.api.schema.files import FileListQuery
@@ -18,6 +19,7 @@ from agentstack_server.domain.models.common import PaginatedResult
 from agentstack_server.domain.models.file import (
     AsyncFile,
     Backend,
+    ByteRange,
     ExtractedFileInfo,
     ExtractionMetadata,
     ExtractionStatus,
@@ -88,7 +90,8 @@ class FileService:
                 await uow.files.update_extraction(extraction=extraction)
                 await uow.commit()
 
-            file_url = await self._object_storage.get_file_url(file_id=file_id)
+            # The size is set when the upload is finalized
+            file_url = await self._object_storage.get_file_url(file_id=file_id, check_exists=not file.file_size_bytes)
             error_log.append(f"file url: {file_url}")
 
             async with self._extraction_backend.extract_text(
@@ -156,7 +159,7 @@ class FileService:
                 await uow.files.create(file=db_file)
                 await uow.commit()
 
-            file.read = limit_size_wrapper(read=file.read, max_size=max_size)
+            file.read = limit_size_wrapper(read=file.read, max_size=max_size, size=file.size)
             db_file.file_size_bytes = await self._object_storage.upload_file(file_id=db_file.id, file=file)
 
             async with self._uow() as uow:
@@ -190,15 +193,26 @@ class FileService:
 
     @asynccontextmanager
     async def get_content(
-        self, *, file_id: UUID, user: User, context_id: UUID | None = None
+        self, *, file_id: UUID, user: User, context_id: UUID | None = None, byte_range: ByteRange | None = None
     ) -> AsyncIterator[AsyncFile]:
         async with self._uow() as uow:
             # check if the user owns the file
             await uow.files.get(file_id=file_id, user_id=user.id, context_id=context_id)
 
-        async with self._object_storage.get_file(file_id=file_id) as file:
+        async with self._object_storage.get_file(file_id=file_id, byte_range=byte_range) as file:
             yield file
 
+    async def get_content_url(self, *, file_id: UUID, user: User, context_id: UUID | None = None) -> HttpUrl:
+        """Presigned URL to download the file directly from the object storage."""
+        async with self._uow() as uow:
+            # check if the user owns the file
+            file = await uow.files.get(file_id=file_id, user_id=user.id, context_id=context_id)
+
+        # The size is set when the upload is finalized, until then the object may not exist yet
+        return await self._object_storage.get_file_url(
+            file_id=file_id, public=True, check_exists=not file.file_size_bytes
+        )
+
     async def get_extraction(self, *, file_id: UUID, user: User, context_id: UUID | None = None) -> TextExtraction:
         async with self._uow() as uow:
             return await uow.files.get_extraction_by_file_id(file_id=file_id, user_id=user.id, context_id=context_id)
@@ -259,7 +273,9 @@ class FileService:
     ) -> TextExtraction:
         async with self._uow() as uow:
             # Check user permissions
-            await uow.files.get(file_id=file_id, user_id=user.id, context_id=context_id, file_type=FileType.USER_UPLOAD)
+            file = await uow.files.get(
+                file_id=file_id, user_id=user.id, context_id=context_id, file_type=FileType.USER_UPLOAD
+            )
             try:
                 # Check if extraction already exists
                 extraction = await uow.files.get_extraction_by_file_id(file_id=file_id)
@@ -272,11 +288,10 @@ class FileService:
                     case _:
                         raise TypeError(f"Unknown extraction status: {extraction.status}")
             except EntityNotFoundError:
-                file_metadata = await self._object_storage.get_file_metadata(file_id=file_id)
                 extraction = TextExtraction(file_id=file_id, extraction_metadata=ExtractionMetadata(settings=settings))
 
                 # Docling doesn't support plain text nor markdown content-type, so we treat them as in-place extractions
-                in_place_extraction = file_metadata.content_type in {"text/plain", "text/markdown"}
+                in_place_extraction = file.content_type in {"text/plain", "text/markdown"}
                 if in_place_extraction:
                     extraction.set_completed(
                         extracted_files=[
@@ -334,6 +349,7 @@ class FileService:
                 user_id=user.id,
                 limit=query.limit,
                 page_token=query.page_token,
+                total_count=query.total_count,
                 order=query.order,
                 order_by=query.order_by,
                 context_id=context_id,
@@ -2,14 +2,16 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import asyncio
 import difflib
 import logging
+import time
 from collections import defaultdict
 from collections.abc import AsyncIterator
 from contextlib import suppress
 from datetime import timedelta
-from typing import Final
-from uuid import UUID
+from typing import Final, NamedTuple
+from uuid import UUID, uuid4
 
 import openai.types.chat
 from kink import inject
@@ -27,20 +29,47 @@ from agentstack_server.domain.models.model_provider import (
 )
 from agentstack_server.domain.models.registry import ModelProviderRegistryLocation
 from agentstack_server.domain.repositories.env import EnvStoreEntity
-from agentstack_server.domain.repositories.openai_proxy import IOpenAIProxy
+from agentstack_server.domain.repositories.openai_proxy import (
+    IOpenAIChatCompletionProxyAdapter,
+    IOpenAIEmbeddingProxyAdapter,
+    IOpenAIProxy,
+)
 from agentstack_server.exceptions import EntityNotFoundError, InvalidProviderCallError, ModelLoadFailedError
-from agentstack_server.infrastructure.cache.serializers import PydanticSerializer
+from agentstack_server.infrastructure.cache.serializers import JsonSerializer, PydanticSerializer
 from agentstack_server.service_layer.cache import ICache, ICacheFactory
 from agentstack_server.service_layer.unit_of_work import IUnitOfWork, IUnitOfWorkFactory
 from agentstack_server.service_layer.webhook import dispatch_webhook_event
+from agentstack_server.utils.utils import gather_bounded
 
 logger = logging.getLogger(__name__)
 
+# How often replicas check the shared version of the routing table, bounds the staleness of routes after changes made
+# on other replicas
+ROUTING_TABLE_VERSION_CHECK_INTERVAL = timedelta(seconds=5)
+ROUTING_TABLE_VERSION_KEY = "version"
+
+# Providers are refreshed concurrently, a provider that does not list its models in time is marked offline
+MODEL_REFRESH_CONCURRENCY = 16
+MODEL_REFRESH_TIMEOUT = timedelta(seconds=30)
+
 
 class Models(BaseModel):
     models: list[Model]
 
 
+class ModelRoute(NamedTuple):
+    provider: ModelProvider
+    model: Model
+    api_key: str | None
+    chat_completion_proxy: IOpenAIChatCompletionProxyAdapter | None
+    embedding_proxy: IOpenAIEmbeddingProxyAdapter | None
+
+
+class ModelRoutingTable(NamedTuple):
+    version: str
+    routes: dict[str, ModelRoute]
+
+
 @inject
 class ModelProviderService:
     def __init__(self, uow: IUnitOfWorkFactory, openai_proxy: IOpenAIProxy, cache_factory: ICacheFactory):
@@ -51,6 +80,15 @@ class ModelProviderService:
             serializer=PydanticSerializer(Models),
             ttl=timedelta(days=1),
         )
+        # Models of online providers with the decrypted API keys, rebuilt whenever the shared version changes
+        self._routing_table_version: Final[ICache[str]] = cache_factory.create(
+            namespace="model_routing_table",
+            serializer=JsonSerializer[str](),
+        )
+        self._routing_table: ModelRoutingTable | None = None
+        self._routing_table_checked_at: float = 0
+        self._routing_table_generation: int = 0
+        self._routing_table_lock: Final[asyncio.Lock] = asyncio.Lock()
 
     async def create_provider(
         self,
@@ -63,7 +101,9 @@ class ModelProviderService:
         watsonx_space_id: str | None = None,
         api_key: str,
         registry: ModelProviderRegistryLocation | None = None,
+        fetch_timeout: timedelta | None = None,
     ) -> ModelProvider:
+        """:param fetch_timeout: limits checking the models of the provider, not the creation itself"""
         model_provider = ModelProvider(
             name=name,
             description=description,
@@ -74,7 +114,8 @@ class ModelProviderService:
             registry=registry,
         )
         # Check if models are available
-        models = await self._get_provider_models(provider=model_provider, api_key=api_key)
+        async with asyncio.timeout(fetch_timeout and fetch_timeout.total_seconds()):
+            models = await self._get_provider_models(provider=model_provider, api_key=api_key)
 
         async with self._uow() as uow:
             await uow.model_providers.create(model_provider=model_provider)
@@ -91,6 +132,7 @@ class ModelProviderService:
             resource_url=f"/api/v1/model_providers/{model_provider.id}",
         )
         await self._cache.set(str(model_provider.id), Models(models=models))
+        await self._invalidate_routing_table()
         return model_provider
 
     async def update_model_state_and_cache(self) -> None:
@@ -98,29 +140,46 @@ class ModelProviderService:
             providers = [provider async for provider in uow.model_providers.list()]
             api_keys = await self._get_provider_api_keys(model_provider_ids=[p.id for p in providers], uow=uow)
 
-        for model_provider, api_key in zip(providers, api_keys.values(), strict=True):
-            try:
-                models = await self._get_provider_models(provider=model_provider, api_key=api_key)
-                await self._cache.set(str(model_provider.id), Models(models=models))
-                updated_state = ModelProviderState.ONLINE
-            except Exception as e:
-                logger.error(f"Failed to update model cache for provider {model_provider.id}: {e}")
-                updated_state = ModelProviderState.OFFLINE
+        async def _list_models(provider: ModelProvider) -> list[Model]:
+            return await self._get_provider_models(provider=provider, api_key=api_keys[provider.id])
+
+        results = await gather_bounded(
+            _list_models, providers, concurrency=MODEL_REFRESH_CONCURRENCY, call_timeout=MODEL_REFRESH_TIMEOUT
+        )
 
+        cached_models: list[tuple[str, Models]] = []
+        states: dict[UUID, ModelProviderState] = {}
+        for model_provider, result in zip(providers, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to update model cache for provider {model_provider.id}: {result!r}")
+                updated_state = ModelProviderState.OFFLINE
+            else:
+                cached_models.append((str(model_provider.id), Models(models=result)))
+                updated_state = ModelProviderState.ONLINE
+            if updated_state != model_provider.state:
+                states[model_provider.id] = updated_state
+
+        models_changed = False
+        if cached_models:
+            previous_models = await self._cache.multi_get([key for key, _ in cached_models])
+            models_changed = any(old != new for old, (_, new) in zip(previous_models, cached_models, strict=True))
+            await self._cache.multi_set(cached_models)
+        if states:
             async with self._uow() as uow:
-                await uow.model_providers.update_state(model_provider_id=model_provider.id, state=updated_state)
+                await uow.model_providers.update_states(states=states)
                 await uow.commit()
 
+        # Replicas rebuild the routing table whenever it is invalidated, a refresh without changes must not trigger it
+        if models_changed or states:
+            await self._invalidate_routing_table()
+
     async def get_provider(self, *, model_provider_id: UUID) -> ModelProvider:
         """Get a model provider by ID."""
         async with self._uow() as uow:
             return await uow.model_providers.get(model_provider_id=model_provider_id)
 
     async def get_provider_by_model_id(self, *, model_id: str) -> ModelProvider:
-        all_models = await self.get_all_models()
-        if model_id not in all_models:
-            raise EntityNotFoundError("model_provider", id=model_id)
-        return all_models[model_id][0]
+        return (await self._get_route(model_id=model_id)).provider
 
     async def list_providers(self) -> list[ModelProvider]:
         """List model providers, optionally filtered by capability."""
@@ -144,7 +203,9 @@ class ModelProviderService:
             resource_url=f"/api/v1/model_providers/{model_provider_id}",
         )
 
+        await self._openai_proxy.invalidate_clients(model_provider_id=model_provider_id)
         await self._cache.delete(str(model_provider_id))
+        await self._invalidate_routing_table()
 
     async def patch_provider(
         self,
@@ -158,8 +219,13 @@ class ModelProviderService:
         watsonx_project_id: str | None = None,
         watsonx_space_id: str | None = None,
         allow_registry_update: bool = False,
+        fetch_timeout: timedelta | None = None,
     ) -> ModelProvider:
-        """Update a model provider."""
+        """
+        Update a model provider.
+
+        :param fetch_timeout: limits checking the models of the provider, not the update itself
+        """
 
         async with self._uow() as uow:
             provider = await uow.model_providers.get(model_provider_id=model_provider_id)
@@ -184,7 +250,8 @@ class ModelProviderService:
 
         if should_update:
             # Check that provider works
-            models = await self._get_provider_models(provider=updated_provider, api_key=updated_api_key)
+            async with asyncio.timeout(fetch_timeout and fetch_timeout.total_seconds()):
+                models = await self._get_provider_models(provider=updated_provider, api_key=updated_api_key)
             updated_provider.state = ModelProviderState.ONLINE
 
             async with self._uow() as uow:
@@ -205,7 +272,9 @@ class ModelProviderService:
                 resource_url=f"/api/v1/model_providers/{model_provider_id}",
             )
 
+            await self._openai_proxy.invalidate_clients(model_provider_id=model_provider_id)
             await self._cache.set(str(model_provider_id), Models(models=models))
+            await self._invalidate_routing_table()
 
         return updated_provider
 
@@ -233,19 +302,80 @@ class ModelProviderService:
             raise ModelLoadFailedError(provider=provider, exception=ex) from ex
 
     async def get_all_models(self) -> dict[str, tuple[ModelProvider, Model]]:
+        routing_table = await self._get_routing_table()
+        return {model_id: (route.provider, route.model) for model_id, route in routing_table.routes.items()}
+
+    async def _get_route(self, *, model_id: str) -> ModelRoute:
+        routing_table = await self._get_routing_table()
+        if model_id not in routing_table.routes:
+            raise EntityNotFoundError("model_provider", id=model_id)
+        return routing_table.routes[model_id]
+
+    def _get_fresh_routing_table(self) -> ModelRoutingTable | None:
+        if time.monotonic() - self._routing_table_checked_at < ROUTING_TABLE_VERSION_CHECK_INTERVAL.total_seconds():
+            return self._routing_table
+        return None
+
+    async def _get_routing_table(self) -> ModelRoutingTable:
+        """
+        Get the in-memory routing table, so that routing a call to a model does not need any I/O
+
+        The table is rebuilt when providers change on this replica, other replicas notice the change through the
+        shared version within ROUTING_TABLE_VERSION_CHECK_INTERVAL.
+        """
+        if routing_table := self._get_fresh_routing_table():
+            return routing_table
+
+        async with self._routing_table_lock:
+            if routing_table := self._get_fresh_routing_table():
+                return routing_table
+
+            generation = self._routing_table_generation
+            version = await self._routing_table_version.get(ROUTING_TABLE_VERSION_KEY) or ""
+            routing_table = self._routing_table
+            if routing_table is None or routing_table.version != version:
+                routing_table = await self._build_routing_table(version=version)
+
+            # Do not keep the table if it was invalidated in the meantime
+            if generation == self._routing_table_generation:
+                self._routing_table = routing_table
+                self._routing_table_checked_at = time.monotonic()
+            return routing_table
+
+    async def _build_routing_table(self, *, version: str) -> ModelRoutingTable:
         async with self._uow() as uow:
             providers = [
                 provider async for provider in uow.model_providers.list() if provider.state == ModelProviderState.ONLINE
             ]
+            variables = await uow.env.get_all(
+                parent_entity=EnvStoreEntity.MODEL_PROVIDER,
+                parent_entity_ids=[provider.id for provider in providers],
+            )
 
         cached_models = await self._cache.multi_get([str(p.id) for p in providers])
-        result: dict[str, tuple[ModelProvider, Model]] = {}
+        routes: dict[str, ModelRoute] = {}
         for provider, models in zip(providers, cached_models, strict=True):
             if not models:
                 continue
+            chat_completion_proxy = embedding_proxy = None
+            with suppress(ValueError):
+                chat_completion_proxy = self._openai_proxy.get_chat_completion_proxy(provider=provider)
+            with suppress(ValueError):
+                embedding_proxy = self._openai_proxy.get_embedding_proxy(provider=provider)
             for model in models.models:
-                result[model.id] = (provider, model)
-        return result
+                routes[model.id] = ModelRoute(
+                    provider=provider,
+                    model=model,
+                    api_key=variables.get(provider.id, {}).get(MODEL_API_KEY_SECRET_NAME),
+                    chat_completion_proxy=chat_completion_proxy,
+                    embedding_proxy=embedding_proxy,
+                )
+        return ModelRoutingTable(version=version, routes=routes)
+
+    async def _invalidate_routing_table(self) -> None:
+        self._routing_table = None
+        self._routing_table_generation += 1
+        await self._routing_table_version.set(ROUTING_TABLE_VERSION_KEY, uuid4().hex)
 
     async def match_models(
         self, suggested_models: list[str] | None, capability: ModelCapability, score_cutoff: float = 0.4
@@ -307,40 +437,35 @@ class ModelProviderService:
             if score >= 0.5  # global score cutoff
         ]
 
+    @staticmethod
+    def _get_api_key(route: ModelRoute) -> str:
+        if route.api_key is None:
+            raise EntityNotFoundError("provider_variable", id=MODEL_API_KEY_SECRET_NAME)
+        return route.api_key
+
     async def create_chat_completion(self, request: ChatCompletionRequest) -> openai.types.chat.ChatCompletion:
         assert not request.stream
-        provider = await self.get_provider_by_model_id(model_id=request.model)
-        api_key = await self.get_provider_api_key(model_provider_id=provider.id)
-
-        try:
-            proxy = self._openai_proxy.get_chat_completion_proxy(provider=provider)
-        except ValueError as e:
-            raise InvalidProviderCallError("Provider does not support chat completions") from e
-
-        return await proxy.create_chat_completion(request=request, api_key=api_key)
+        route = await self._get_route(model_id=request.model)
+        if not route.chat_completion_proxy:
+            raise InvalidProviderCallError("Provider does not support chat completions")
+        return await route.chat_completion_proxy.create_chat_completion(
+            request=request, api_key=self._get_api_key(route)
+        )
 
     async def create_chat_completion_stream(
         self, request: ChatCompletionRequest
     ) -> AsyncIterator[openai.types.chat.ChatCompletionChunk]:
         assert request.stream
-        provider = await self.get_provider_by_model_id(model_id=request.model)
-        api_key = await self.get_provider_api_key(model_provider_id=provider.id)
-
-        try:
-            proxy = self._openai_proxy.get_chat_completion_proxy(provider=provider)
-        except ValueError as e:
-            raise InvalidProviderCallError("Provider does not support chat completions") from e
-
-        async for chunk in proxy.create_chat_completion_stream(request=request, api_key=api_key):
+        route = await self._get_route(model_id=request.model)
+        if not route.chat_completion_proxy:
+            raise InvalidProviderCallError("Provider does not support chat completions")
+        async for chunk in route.chat_completion_proxy.create_chat_completion_stream(
+            request=request, api_key=self._get_api_key(route)
+        ):
             yield chunk
 
     async def create_embedding(self, request: EmbeddingsRequest) -> openai.types.CreateEmbeddingResponse:
-        provider = await self.get_provider_by_model_id(model_id=request.model)
-        api_key = await self.get_provider_api_key(model_provider_id=provider.id)
-
-        try:
-            proxy = self._openai_proxy.get_embedding_proxy(provider=provider)
-        except ValueError as e:
-            raise InvalidProviderCallError("Provider does not support embeddings") from e
-
-        return await proxy.create_embedding(request=request, api_key=api_key)
+        route = await self._get_route(model_id=request.model)
+        if not route.embedding_proxy:
+            raise InvalidProviderCallError("Provider does not support embeddings")
+        return await route.embedding_proxy.create_embedding(request=request, api_key=self._get_api_key(route))
@@ -168,6 +168,7 @@ class ProviderBuildService:
                 exclude_user_id=user.id if user_owned is False and user else None,
                 limit=pagination.limit,
                 page_token=pagination.page_token,
+                total_count=pagination.total_count,
                 order=pagination.order,
                 order_by=pagination.order_by,
                 status=status,
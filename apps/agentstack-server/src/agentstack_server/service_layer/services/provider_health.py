@@ -0,0 +1,165 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Final, NamedTuple
+from uuid import UUID
+
+import httpx
+from a2a.types import AgentCard
+from a2a.utils import AGENT_CARD_WELL_KNOWN_PATH
+from httpx import HTTPError
+from kink import inject
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from agentstack_server.domain.constants import SELF_REGISTRATION_EXTENSION_URI
+from agentstack_server.domain.models.provider import NetworkProviderLocation, Provider, ProviderType, UnmanagedState
+from agentstack_server.service_layer.services.providers import ProviderService
+from agentstack_server.service_layer.services.users import UserService
+from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
+from agentstack_server.utils.a2a import get_extension
+from agentstack_server.utils.utils import extract_messages, gather_bounded
+
+logger = logging.getLogger(__name__)
+
+PROBE_CONCURRENCY: Final = 32
+PROBE_TIMEOUT: Final = timedelta(seconds=20)
+# Providers that stay offline are probed less often, the delay doubles with every failed probe up to the maximum
+OFFLINE_BACKOFF: Final = timedelta(seconds=5)
+MAX_OFFLINE_BACKOFF: Final = timedelta(minutes=5)
+
+
+@dataclass
+class _ProbeState:
+    etag: str | None = None
+    card_hash: str | None = None
+    agent_card: AgentCard | None = None
+    failures: int = 0
+    next_probe_at: float = 0
+
+
+class ProbeResult(NamedTuple):
+    state: UnmanagedState
+    # Only set when the agent card changed since the last saved card
+    agent_card: AgentCard | None = None
+    etag: str | None = None
+    card_hash: str | None = None
+
+
+@inject
+class ProviderHealthService:
+    """
+    Tracks the state of unmanaged providers by probing their agent cards.
+
+    All probes share one pooled client. Agent cards are requested conditionally and only parsed when their content
+    changes, and providers that stay offline are probed with an exponential backoff. The results of a sweep are
+    written in a single transaction.
+    """
+
+    def __init__(self, uow: IUnitOfWorkFactory, provider_service: ProviderService, user_service: UserService):
+        self._uow = uow
+        self._provider_service = provider_service
+        self._user_service = user_service
+        self._client = httpx.AsyncClient(
+            timeout=PROBE_TIMEOUT.total_seconds(),
+            limits=httpx.Limits(max_connections=PROBE_CONCURRENCY, max_keepalive_connections=PROBE_CONCURRENCY),
+        )
+        self._probe_states: dict[UUID, _ProbeState] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client.aclose()
+
+    async def probe_unmanaged_providers(self) -> None:
+        async with self._uow() as uow:
+            providers = [provider async for provider in uow.providers.list(type=ProviderType.UNMANAGED)]
+
+        for provider_id in self._probe_states.keys() - {provider.id for provider in providers}:
+            del self._probe_states[provider_id]
+
+        now = time.monotonic()
+        due_providers = [
+            provider
+            for provider in providers
+            if self._probe_states.setdefault(provider.id, _ProbeState()).next_probe_at <= now
+        ]
+        results = await gather_bounded(self._probe, due_providers, concurrency=PROBE_CONCURRENCY)
+
+        updates: list[tuple[Provider, UnmanagedState, AgentCard | None]] = []
+        for provider, result in zip(due_providers, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to probe provider {provider.id}: {extract_messages(result)}")
+            elif result and (result.agent_card or result.state != provider.unmanaged_state):
+                updates.append((provider, result.state, result.agent_card))
+
+        if updates:
+            user = await self._user_service.get_user_by_email("admin@beeai.dev")
+            await self._provider_service.update_unmanaged_providers(updates=updates, user=user)
+
+        # The card is remembered only once it is saved, a failed update is retried by the next sweep
+        for provider, result in zip(due_providers, results, strict=True):
+            if isinstance(result, ProbeResult) and result.agent_card:
+                probe_state = self._probe_states[provider.id]
+                probe_state.etag, probe_state.card_hash = result.etag, result.card_hash
+                probe_state.agent_card = result.agent_card
+
+    async def _probe(self, provider: Provider) -> ProbeResult | None:
+        assert isinstance(provider.source, NetworkProviderLocation)
+        probe_state = self._probe_states[provider.id]
+        try:
+            response = await self._client.get(
+                f"{str(provider.source.a2a_url).rstrip('/')}{AGENT_CARD_WELL_KNOWN_PATH}",
+                headers={"If-None-Match": probe_state.etag} if probe_state.etag else None,
+            )
+            etag, card_hash = probe_state.etag, probe_state.card_hash
+            if response.status_code == HTTP_304_NOT_MODIFIED and probe_state.agent_card:
+                resp_card, card_changed = probe_state.agent_card, False
+            else:
+                response.raise_for_status()
+                etag = response.headers.get("ETag")
+                card_hash = hashlib.sha256(response.content).hexdigest()
+                resp_card, card_changed = self._load_agent_card(provider, probe_state, response.content, card_hash)
+                if not card_changed:
+                    # Same as the saved card (e.g. the first probe after a restart), nothing to save before remembering
+                    probe_state.etag, probe_state.card_hash, probe_state.agent_card = etag, card_hash, resp_card
+        except (HTTPError, ValueError) as ex:
+            probe_state.failures += 1
+            backoff = min(OFFLINE_BACKOFF * 2 ** (probe_state.failures - 1), MAX_OFFLINE_BACKOFF)
+            probe_state.next_probe_at = time.monotonic() + backoff.total_seconds()
+            logger.warning(f"Provider {provider.id} failed to respond to ping: {extract_messages(ex)}")
+            return ProbeResult(state=UnmanagedState.OFFLINE)
+
+        probe_state.failures = 0
+        probe_state.next_probe_at = 0
+
+        # For self-registered provider we need to check their self-registration ID, because their URL
+        # might overlap (more agents on the same URL, only one can be online)
+        provider_self_reg_ext = get_extension(provider.agent_card, SELF_REGISTRATION_EXTENSION_URI)
+        resp_self_reg_ext = get_extension(resp_card, SELF_REGISTRATION_EXTENSION_URI)
+        if (
+            provider_self_reg_ext is not None
+            and resp_self_reg_ext is not None
+            and provider_self_reg_ext.params != resp_self_reg_ext.params
+        ):
+            # Different agent responding at the same URL, don't update this provider
+            return None
+        if not card_changed:
+            return ProbeResult(state=UnmanagedState.ONLINE)
+        return ProbeResult(state=UnmanagedState.ONLINE, agent_card=resp_card, etag=etag, card_hash=card_hash)
+
+    def _load_agent_card(
+        self, provider: Provider, probe_state: _ProbeState, content: bytes, card_hash: str
+    ) -> tuple[AgentCard, bool]:
+        """Parse the agent card unless it is the last seen one, returns the card and whether it differs from the saved"""
+        if card_hash == probe_state.card_hash and probe_state.agent_card:
+            return probe_state.agent_card, False
+        agent_card = AgentCard.model_validate_json(content)
+        return agent_card, agent_card != provider.agent_card
@@ -8,7 +8,7 @@ import asyncio
 import json
 import logging
 import uuid
-from collections.abc import AsyncIterator, Callable
+from collections.abc import AsyncIterator, Callable, Sequence
 from datetime import timedelta
 from uuid import UUID
 
@@ -23,13 +23,19 @@ from agentstack_server.domain.models.provider import (
     Provider,
     ProviderDeploymentState,
     ProviderLocation,
+    ProviderType,
     ProviderWithState,
     UnmanagedState,
 )
 from agentstack_server.domain.models.registry import RegistryLocation
 from agentstack_server.domain.models.user import User, UserRole
 from agentstack_server.domain.repositories.env import EnvStoreEntity
-from agentstack_server.exceptions import InvalidProviderUpgradeError, ManifestLoadError, MissingAgentCardLabelError
+from agentstack_server.exceptions import (
+    EntityNotFoundError,
+    InvalidProviderUpgradeError,
+    ManifestLoadError,
+    MissingAgentCardLabelError,
+)
 from agentstack_server.service_layer.deployment_manager import (
     IProviderDeploymentManager,
 )
@@ -59,12 +65,15 @@ class ProviderService:
         registry: RegistryLocation | None = None,
         agent_card: AgentCard | None = None,
         variables: dict[str, str] | None = None,
+        fetch_timeout: timedelta | None = None,
     ) -> ProviderWithState:
+        """:param fetch_timeout: limits loading the agent card and version info, not the creation itself"""
         try:
-            if not agent_card:
-                agent_card = await location.load_agent_card()
+            async with asyncio.timeout(fetch_timeout and fetch_timeout.total_seconds()):
+                if not agent_card:
+                    agent_card = await location.load_agent_card()
+                version_info = await location.get_version_info()
             agent_card = self._inject_default_agent_detail_extension(agent_card)
-            version_info = await location.get_version_info()
 
             if isinstance(origin, ResolvedGithubUrl):
                 version_info.github = origin
@@ -135,7 +144,9 @@ class ProviderService:
         allow_registry_update: bool = False,
         force: bool = False,
         unmanaged_state: UnmanagedState | None = None,
+        fetch_timeout: timedelta | None = None,
     ) -> ProviderWithState:
+        """:param fetch_timeout: limits loading the agent card and version info, not the update itself"""
         user_id = user.id if user.role != UserRole.ADMIN else None
 
         github_version_info: ResolvedGithubUrl | None = None
@@ -173,26 +184,27 @@ class ProviderService:
             # can send it without the agent actually being online
             updated_provider.unmanaged_state = UnmanagedState.ONLINE
 
-        # Some migrated docker providers may not have a docker version_info field, update during the patch
-        if (
-            isinstance(updated_provider.source, DockerImageProviderLocation)
-            and updated_provider.version_info.docker is None
-        ):
-            updated_provider.version_info = await provider.source.get_version_info()
-
-        if location is not None and location != provider.source:
-            updated_provider.version_info = await location.get_version_info()
-
-            if not agent_card:
-                try:
-                    loaded_card = await location.load_agent_card()
-                    updated_provider.agent_card = self._inject_default_agent_detail_extension(loaded_card)
-                except ValueError as ex:
-                    raise ManifestLoadError(
-                        location=location, message=str(ex), status_code=HTTP_400_BAD_REQUEST
-                    ) from ex
-                except Exception as ex:
-                    raise ManifestLoadError(location=location, message=str(ex)) from ex
+        async with asyncio.timeout(fetch_timeout and fetch_timeout.total_seconds()):
+            # Some migrated docker providers may not have a docker version_info field, update during the patch
+            if (
+                isinstance(updated_provider.source, DockerImageProviderLocation)
+                and updated_provider.version_info.docker is None
+            ):
+                updated_provider.version_info = await provider.source.get_version_info()
+
+            if location is not None and location != provider.source:
+                updated_provider.version_info = await location.get_version_info()
+
+                if not agent_card:
+                    try:
+                        loaded_card = await location.load_agent_card()
+                        updated_provider.agent_card = self._inject_default_agent_detail_extension(loaded_card)
+                    except ValueError as ex:
+                        raise ManifestLoadError(
+                            location=location, message=str(ex), status_code=HTTP_400_BAD_REQUEST
+                        ) from ex
+                    except Exception as ex:
+                        raise ManifestLoadError(location=location, message=str(ex)) from ex
 
         if github_version_info:
             updated_provider.version_info.github = github_version_info
@@ -225,6 +237,39 @@ class ProviderService:
         [provider_response] = await self._get_providers_with_state(providers=[updated_provider])
         return provider_response
 
+    async def update_unmanaged_providers(
+        self, *, updates: Sequence[tuple[Provider, UnmanagedState, AgentCard | None]], user: User
+    ) -> None:
+        """Write the probed states and agent cards of unmanaged providers in a single transaction"""
+        states: dict[UUID, UnmanagedState] = {}
+        agent_cards: dict[UUID, tuple[AgentCard, UnmanagedState]] = {}
+        for provider, state, agent_card in updates:
+            if agent_card:
+                agent_card = self._inject_default_agent_detail_extension(agent_card.model_copy(deep=True))
+            if agent_card and agent_card != provider.agent_card:
+                agent_cards[provider.id] = (agent_card, state)
+            elif state != provider.unmanaged_state:
+                states[provider.id] = state
+
+        if not states and not agent_cards:
+            return
+        async with self._uow() as uow:
+            updated_at = utc_now()
+            for provider_id, (agent_card, state) in agent_cards.items():
+                await uow.providers.update_agent_card(
+                    provider_id=provider_id, agent_card=agent_card, unmanaged_state=state, updated_at=updated_at
+                )
+            await uow.providers.update_unmanaged_states(states=states)
+            await uow.commit()
+        for provider_id in [*states, *agent_cards]:
+            dispatch_webhook_event(
+                event_type="provider.updated",
+                resource_type="provider",
+                resource_id=provider_id,
+                resource_url=f"/api/v1/providers/{provider_id}",
+                user_id=user.id,
+            )
+
     async def preview_provider(
         self, location: ProviderLocation, agent_card: AgentCard | None = None
     ) -> ProviderWithState:
@@ -247,28 +292,37 @@ class ProviderService:
             raise ManifestLoadError(location=location, message=str(ex)) from ex
 
     async def _get_providers_with_state(self, providers: list[Provider]) -> list[ProviderWithState]:
-        result_providers = []
-        provider_states = await self._deployment_manager.state(provider_ids=[provider.id for provider in providers])
+        """Enrich only the given providers, deployment states are looked up just for the managed ones"""
+        if not providers:
+            return []
+        managed_provider_ids = [provider.id for provider in providers if provider.managed]
+        deployment_states = dict(
+            zip(
+                managed_provider_ids,
+                await self._deployment_manager.state(provider_ids=managed_provider_ids) if managed_provider_ids else [],
+                strict=True,
+            )
+        )
 
         async with self._uow() as uow:
             provider_ids = [provider.id for provider in providers]
             providers_env = await uow.env.get_all(parent_entity=EnvStoreEntity.PROVIDER, parent_entity_ids=provider_ids)
 
-            for provider, state in zip(providers, provider_states, strict=False):
-                final_state = state
-                if not provider.managed:
-                    final_state = provider.unmanaged_state if provider.unmanaged_state else UnmanagedState.OFFLINE
-                result_providers.append(
-                    ProviderWithState(
-                        **provider.model_dump(),
-                        state=final_state,
-                        missing_configuration=[
-                            var
-                            for var in provider.check_env(providers_env[provider.id], raise_error=False)
-                            if var.required
-                        ],
-                    )
+        result_providers = []
+        for provider in providers:
+            if provider.managed:
+                final_state = deployment_states[provider.id]
+            else:
+                final_state = provider.unmanaged_state if provider.unmanaged_state else UnmanagedState.OFFLINE
+            result_providers.append(
+                ProviderWithState(
+                    **provider.model_dump(),
+                    state=final_state,
+                    missing_configuration=[
+                        var for var in provider.check_env(providers_env[provider.id], raise_error=False) if var.required
+                    ],
                 )
+            )
         return result_providers
 
     async def delete_provider(self, *, provider_id: UUID, user: User) -> None:
@@ -288,17 +342,25 @@ class ProviderService:
         )
 
     async def scale_down_providers(self):
-        active_providers = [
+        async with self._uow() as uow:
+            managed_providers = [provider async for provider in uow.providers.list(type=ProviderType.MANAGED)]
+        now = utc_now()
+        idle_providers = [
             provider
-            for provider in await self.list_providers()
-            if provider.managed and provider.state == ProviderDeploymentState.RUNNING
+            for provider in managed_providers
+            if provider.auto_stop_timeout and (provider.last_active_at + provider.auto_stop_timeout) < now
         ]
+        if not idle_providers:
+            return
+        states = await self._deployment_manager.state(provider_ids=[provider.id for provider in idle_providers])
+
         errors = []
-        for provider in active_providers:
+        for provider, state in zip(idle_providers, states, strict=True):
+            if state != ProviderDeploymentState.RUNNING:
+                continue
             try:
-                if provider.auto_stop_timeout and (provider.last_active_at + provider.auto_stop_timeout) < utc_now():
-                    logger.info(f"Scaling down provider: {provider.id}")
-                    await self._deployment_manager.scale_down(provider_id=provider.id)
+                logger.info(f"Scaling down provider: {provider.id}")
+                await self._deployment_manager.scale_down(provider_id=provider.id)
             except Exception as ex:
                 errors.append(ex)
         if errors:
@@ -335,14 +397,19 @@ class ProviderService:
     ) -> ProviderWithState:
         if not (bool(provider_id) ^ bool(location)):
             raise ValueError("Either provider_id or location must be provided")
-        providers = [
-            provider
-            for provider in await self.list_providers()
-            if provider.id == provider_id or provider.source == location
-        ]
-        if not providers:
-            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=f"Provider with ID: {provider_id!s} not found")
-        return providers[0]
+        try:
+            async with self._uow() as uow:
+                if provider_id:
+                    provider = await uow.providers.get(provider_id=provider_id)
+                else:
+                    assert location
+                    provider = await uow.providers.get_by_location(location=location)
+        except EntityNotFoundError as ex:
+            raise HTTPException(
+                status_code=HTTP_404_NOT_FOUND, detail=f"Provider with ID: {provider_id!s} not found"
+            ) from ex
+        [provider_response] = await self._get_providers_with_state(providers=[provider])
+        return provider_response
 
     async def stream_logs(self, provider_id: UUID, user: User) -> Callable[..., AsyncIterator[str]]:
         user_id = user.id if user.role != UserRole.ADMIN else None
@@ -393,6 +460,9 @@ class ProviderService:
                 if provider.registry and not allow_registry_update:
                     raise ValueError("Cannot update variables for a provider added from registry")
                 await uow.env.update(parent_entity=EnvStoreEntity.PROVIDER, parent_entity_id=provider_id, variables=env)
+                # Env is part of the deployment spec, the new version invalidates deployments cached as up to date
+                provider.updated_at = utc_now()
+                await uow.providers.update(provider=provider)
                 new_env = await uow.env.get_all(parent_entity=EnvStoreEntity.PROVIDER, parent_entity_ids=[provider_id])
                 new_env = new_env[provider_id]
                 await uow.commit()
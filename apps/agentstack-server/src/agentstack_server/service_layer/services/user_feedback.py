@@ -11,6 +11,7 @@ from fastapi import BackgroundTasks
 from kink import inject
 
 from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.common import PaginatedResult, TotalCount
 from agentstack_server.domain.models.user import User, UserRole
 from agentstack_server.domain.models.user_feedback import UserFeedback
 from agentstack_server.exceptions import EntityNotFoundError
@@ -93,21 +94,22 @@ class UserFeedbackService:
         user: User,
         provider_id: UUID | None = None,
         limit: int = 50,
-        after_cursor: UUID | None = None,
-    ) -> tuple[list[UserFeedback], int, bool]:
+        after_cursor: UUID | str | None = None,
+        total_count: TotalCount = TotalCount.NONE,
+    ) -> PaginatedResult[UserFeedback]:
         if user.role not in (UserRole.ADMIN, UserRole.DEVELOPER):
             raise ValueError("Listing feedback is only allowed for admins and developers")
 
         provider_created_by = user.id if user.role == UserRole.DEVELOPER else None
 
         async with self._uow() as uow:
-            feedback_list, total, has_more = await uow.user_feedback.list(
+            return await uow.user_feedback.list(
                 provider_created_by=provider_created_by,
                 provider_id=provider_id,
                 limit=limit,
                 after_cursor=after_cursor,
+                total_count=total_count,
             )
-            return feedback_list, total, has_more
 
     async def _try_send_to_phoenix(self, *, user_feedback: UserFeedback) -> None:
         if self._phoenix_client is None or user_feedback.trace_id is None:
@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
+from typing import Final
 from uuid import UUID
 
 from kink import inject
@@ -12,6 +14,8 @@ from agentstack_server.configuration import Configuration
 from agentstack_server.domain.models.user import User
 from agentstack_server.domain.repositories.env import EnvStoreEntity
 from agentstack_server.exceptions import UsageLimitExceededError
+from agentstack_server.infrastructure.cache.serializers import PydanticSerializer
+from agentstack_server.service_layer.cache import ICache, ICacheFactory
 from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
 from agentstack_server.service_layer.webhook import dispatch_webhook_event
 
@@ -20,9 +24,30 @@ logger = logging.getLogger(__name__)
 
 @inject
 class UserService:
-    def __init__(self, uow: IUnitOfWorkFactory, configuration: Configuration):
+    def __init__(self, uow: IUnitOfWorkFactory, configuration: Configuration, cache_factory: ICacheFactory):
         self._uow = uow
         self._config = configuration
+        # Users are looked up on every authenticated request, the cache is keyed both by "id:" and "email:"
+        self._users: Final[ICache[User] | None] = (
+            cache_factory.create(
+                namespace="users",
+                serializer=PydanticSerializer(User),
+                ttl=timedelta(seconds=configuration.auth.user_cache_ttl_sec),
+            )
+            if configuration.auth.user_cache_ttl_sec > 0
+            else None
+        )
+
+    async def _get_cached_user(self, key: str) -> User | None:
+        if self._users and (user := await self._users.get(key)):
+            return user.model_copy()  # callers may modify the user (e.g. role from the token)
+        return None
+
+    async def _cache_user(self, user: User) -> None:
+        if self._users:
+            await self._users.multi_set(
+                [(f"id:{user.id}", user.model_copy()), (f"email:{user.email}", user.model_copy())]
+            )
 
     async def create_user(self, *, email: str) -> User:
         async with self._uow() as uow:
@@ -39,17 +64,29 @@ class UserService:
         return user
 
     async def get_user(self, user_id: UUID) -> User:
+        if user := await self._get_cached_user(f"id:{user_id}"):
+            return user
         async with self._uow() as uow:
-            return await uow.users.get(user_id=user_id)
+            user = await uow.users.get(user_id=user_id)
+        await self._cache_user(user)
+        return user
 
     async def get_user_by_email(self, email: str) -> User:
+        if user := await self._get_cached_user(f"email:{email}"):
+            return user
         async with self._uow() as uow:
-            return await uow.users.get_by_email(email=email)
+            user = await uow.users.get_by_email(email=email)
+        await self._cache_user(user)
+        return user
 
     async def delete_user(self, user_id: UUID) -> None:
         async with self._uow() as uow:
+            user = await uow.users.get(user_id=user_id)
             await uow.users.delete(user_id=user_id)
             await uow.commit()
+        if self._users:
+            await self._users.delete(f"id:{user_id}")
+            await self._users.delete(f"email:{user.email}")
         dispatch_webhook_event(
             event_type="user.deleted",
             resource_type="user",
@@ -5,7 +5,8 @@ from __future__ import annotations
 
 import builtins
 import logging
-from collections.abc import Iterable
+from collections import defaultdict
+from collections.abc import AsyncIterable, Iterable
 from uuid import UUID
 
 from kink import inject
@@ -14,13 +15,21 @@ from agentstack_server.configuration import Configuration
 from agentstack_server.domain.models.user import User
 from agentstack_server.domain.models.vector_store import (
     DocumentType,
+    VectorDistanceMetric,
     VectorStore,
     VectorStoreDocument,
     VectorStoreItem,
+    VectorStoreSearchQuery,
     VectorStoreSearchResult,
 )
-from agentstack_server.exceptions import InvalidVectorDimensionError, StorageCapacityExceededError
-from agentstack_server.service_layer.unit_of_work import IUnitOfWorkFactory
+from agentstack_server.exceptions import (
+    EntityNotFoundError,
+    InvalidVectorDimensionError,
+    StorageCapacityExceededError,
+)
+from agentstack_server.service_layer.activity import ActivityKind
+from agentstack_server.service_layer.services.activity import ActivityService
+from agentstack_server.service_layer.unit_of_work import IUnitOfWork, IUnitOfWorkFactory
 from agentstack_server.service_layer.webhook import dispatch_webhook_event
 
 logger = logging.getLogger(__name__)
@@ -30,9 +39,12 @@ logger = logging.getLogger(__name__)
 class VectorStoreService:
     """Service for managing vector stores."""
 
-    def __init__(self, uow: IUnitOfWorkFactory, configuration: Configuration):
+    def __init__(self, uow: IUnitOfWorkFactory, configuration: Configuration, activity: ActivityService):
         self._uow = uow
+        self._activity = activity
         self._storage_limit_per_user = configuration.vector_stores.storage_limit_per_user_bytes
+        self._ingestion_batch_size = configuration.vector_stores.ingestion_batch_size
+        self._rrf_k = configuration.vector_stores.hybrid_search_rrf_k
 
     async def list(self, *, user: User) -> builtins.list[VectorStore]:
         """List all vector stores for a user."""
@@ -40,14 +52,28 @@ class VectorStoreService:
             return [document async for document in uow.vector_stores.list(user_id=user.id)]
 
     async def create(
-        self, *, name: str, dimension: int, model_id: str, user: User, context_id: UUID | None = None
+        self,
+        *,
+        name: str,
+        dimension: int,
+        model_id: str,
+        user: User,
+        context_id: UUID | None = None,
+        distance_metric: VectorDistanceMetric = VectorDistanceMetric.COSINE,
     ) -> VectorStore:
         vector_store = VectorStore(
-            name=name, dimension=dimension, created_by=user.id, model_id=model_id, context_id=context_id
+            name=name,
+            dimension=dimension,
+            distance_metric=distance_metric,
+            created_by=user.id,
+            model_id=model_id,
+            context_id=context_id,
         )
         async with self._uow() as uow:
             await uow.vector_stores.create(vector_store=vector_store)
-            await uow.vector_database.create_collection(collection_id=vector_store.id, dimension=dimension)
+            await uow.vector_database.create_collection(
+                collection_id=vector_store.id, dimension=dimension, distance_metric=distance_metric
+            )
             await uow.commit()
         dispatch_webhook_event(
             event_type="vector_store.created",
@@ -64,16 +90,37 @@ class VectorStoreService:
             vector_store = await uow.vector_stores.get(
                 vector_store_id=vector_store_id, user_id=user.id, context_id=context_id
             )
-            await uow.vector_stores.update_last_accessed(vector_store_ids={vector_store_id})
-            await uow.commit()
-            return vector_store
+        await self._activity.touch(ActivityKind.VECTOR_STORE, vector_store_id)
+        return vector_store
 
     async def delete(self, *, vector_store_id: UUID, user: User, context_id: UUID | None = None) -> None:
         """Delete a vector store by ID."""
-        async with self._uow() as uow:
-            await uow.vector_stores.delete(vector_store_id=vector_store_id, user_id=user.id, context_id=context_id)
-            # Records in vector_database are deleted automatically by CASCADE operations in postgres
-            await uow.commit()
+        detached_dimension: int | None = None
+        try:
+            async with self._uow() as uow:
+                vector_store = await uow.vector_stores.get(
+                    vector_store_id=vector_store_id, user_id=user.id, context_id=context_id
+                )
+                # Dropping the partition of the vector store is much cheaper than deleting its records by CASCADE,
+                # detaching it first keeps the drop from blocking other vector stores of the same dimension
+                await uow.vector_database.detach_collection(
+                    collection_id=vector_store_id, dimension=vector_store.dimension
+                )
+                detached_dimension = vector_store.dimension
+                await uow.vector_database.delete_collection(
+                    collection_id=vector_store_id, dimension=vector_store.dimension
+                )
+                await uow.vector_stores.delete(vector_store_id=vector_store_id, user_id=user.id, context_id=context_id)
+                await uow.commit()
+        except BaseException:
+            # The detach is committed on its own, the partition of a vector store that still exists must be
+            # attached again once the transaction (holding the lock of the dropped table) is rolled back
+            if detached_dimension is not None:
+                async with self._uow() as uow:
+                    await uow.vector_database.attach_collection(
+                        collection_id=vector_store_id, dimension=detached_dimension
+                    )
+            raise
         dispatch_webhook_event(
             event_type="vector_store.deleted",
             resource_type="vector_store",
@@ -82,6 +129,13 @@ class VectorStoreService:
             user_id=user.id,
         )
 
+    async def delete_orphaned_collections(self) -> int:
+        """Drop vector database collections of vector stores deleted together with their context or user."""
+        async with self._uow() as uow:
+            deleted_count = await uow.vector_database.delete_orphaned_collections()
+            await uow.commit()
+            return deleted_count
+
     async def list_documents(
         self, *, vector_store_id: UUID, user: User, context_id: UUID | None = None
     ) -> builtins.list[VectorStoreDocument]:
@@ -108,6 +162,40 @@ class VectorStoreService:
             user_id=user.id,
         )
 
+    async def _add_items_batch(
+        self, *, uow: IUnitOfWork, user: User, vector_store: VectorStore, items: builtins.list[VectorStoreItem]
+    ) -> None:
+        # Check dimension
+        if any(len(item.embedding) != vector_store.dimension for item in items):
+            raise InvalidVectorDimensionError(
+                f"Vector dimensions must match vector store dimension: {vector_store.dimension}"
+            )
+
+        # Check usage
+        usage_bytes_per_document_id = {d.id: d.usage_bytes for d in uow.vector_database.estimate_size(items)}
+        total_usage = await uow.vector_stores.total_usage(user_id=user.id)
+        if (
+            total_usage + sum(v for v in usage_bytes_per_document_id.values() if v is not None)
+            > self._storage_limit_per_user
+        ):
+            # We are a bit more cautious here, the storage may in fact not be exceeded because some documents
+            # or items might already be in the database - the operation below is an upsert, but for simplicity
+            # we check the usage as if all items were new.
+            raise StorageCapacityExceededError(entity="vector_store", max_size=self._storage_limit_per_user)
+
+        await uow.vector_stores.upsert_documents(
+            documents={
+                item.document_id: VectorStoreDocument(
+                    vector_store_id=vector_store.id,
+                    id=item.document_id,
+                    file_id=UUID(item.document_id) if item.document_type == DocumentType.PLATFORM_FILE else None,
+                    usage_bytes=usage_bytes_per_document_id.get(item.document_id),
+                )
+                for item in items
+            }.values()
+        )
+        await uow.vector_database.add_items(collection_id=vector_store.id, items=items)
+
     async def add_items(
         self,
         *,
@@ -121,37 +209,7 @@ class VectorStoreService:
             vector_store = await uow.vector_stores.get(
                 vector_store_id=vector_store_id, user_id=user.id, context_id=context_id
             )
-
-            # Check dimension
-            if any(len(item.embedding) != vector_store.dimension for item in items):
-                raise InvalidVectorDimensionError(
-                    f"Vector dimensions must match vector store dimension: {vector_store.dimension}"
-                )
-
-            # Check usage
-            usage_bytes_per_document_id = {d.id: d.usage_bytes for d in uow.vector_database.estimate_size(items)}
-            total_usage = await uow.vector_stores.total_usage(user_id=user.id)
-            if (
-                total_usage + sum(v for v in usage_bytes_per_document_id.values() if v is not None)
-                > self._storage_limit_per_user
-            ):
-                # We are a bit more cautious here, the storage may in fact not be exceeded because some documents
-                # or items might already be in the database - the operation below is an upsert, but for simplicity
-                # we check the usage as if all items were new.
-                raise StorageCapacityExceededError(entity="vector_store", max_size=self._storage_limit_per_user)
-
-            await uow.vector_stores.upsert_documents(
-                documents={
-                    item.document_id: VectorStoreDocument(
-                        vector_store_id=vector_store_id,
-                        id=item.document_id,
-                        file_id=UUID(item.document_id) if item.document_type == DocumentType.PLATFORM_FILE else None,
-                        usage_bytes=usage_bytes_per_document_id.get(item.document_id),
-                    )
-                    for item in items
-                }.values()
-            )
-            await uow.vector_database.add_items(collection_id=vector_store_id, items=items)
+            await self._add_items_batch(uow=uow, user=user, vector_store=vector_store, items=items)
             await uow.commit()
         dispatch_webhook_event(
             event_type="vector_store.updated",
@@ -161,21 +219,147 @@ class VectorStoreService:
             user_id=user.id,
         )
 
+    async def add_items_stream(
+        self,
+        *,
+        vector_store_id: UUID,
+        items: AsyncIterable[VectorStoreItem],
+        user: User,
+        context_id: UUID | None = None,
+    ) -> int:
+        """
+        Add items from a stream in bounded batches and return the number of added items.
+
+        Every batch is validated, accounted against the storage quota and written in its own transaction, so the
+        memory and transaction length do not grow with the size of the upload. If a batch fails, the batches before
+        it stay committed.
+        """
+        async with self._uow() as uow:
+            # Verify the user owns the vector store
+            vector_store = await uow.vector_stores.get(
+                vector_store_id=vector_store_id, user_id=user.id, context_id=context_id
+            )
+
+        added_count = 0
+        batch: builtins.list[VectorStoreItem] = []
+
+        async def add_batch() -> None:
+            nonlocal added_count, batch
+            async with self._uow() as uow:
+                await self._add_items_batch(uow=uow, user=user, vector_store=vector_store, items=batch)
+                await uow.commit()
+            added_count += len(batch)
+            batch = []
+
+        try:
+            async for item in items:
+                batch.append(item)
+                if len(batch) >= self._ingestion_batch_size:
+                    await add_batch()
+            if batch:
+                await add_batch()
+        finally:
+            if added_count:
+                dispatch_webhook_event(
+                    event_type="vector_store.updated",
+                    resource_type="vector_store",
+                    resource_id=vector_store_id,
+                    resource_url=f"/api/v1/vector_stores/{vector_store_id}",
+                    user_id=user.id,
+                )
+        return added_count
+
     async def search(
         self,
         *,
         vector_store_id: UUID,
         query_vector: builtins.list[float],
         limit: int = 10,
+        metadata_filter: dict[str, str] | None = None,
+        query_text: str | None = None,
         user: User,
         context_id: UUID | None = None,
     ) -> builtins.list[VectorStoreSearchResult]:
         """
         Search a vector store using a query vector and return results with similarity scores.
+
+        With query_text, vector and full-text rankings are fused and the score is the reciprocal rank fusion score.
         """
         async with self._uow() as uow:
-            await uow.vector_stores.get(vector_store_id=vector_store_id, user_id=user.id, context_id=context_id)
-            results = await uow.vector_database.similarity_search(
-                collection_id=vector_store_id, query_vector=query_vector, limit=limit
+            vector_store = await uow.vector_stores.get(
+                vector_store_id=vector_store_id, user_id=user.id, context_id=context_id
             )
+            if query_text:
+                results = await uow.vector_database.hybrid_search(
+                    collection_id=vector_store_id,
+                    query_vector=query_vector,
+                    query_text=query_text,
+                    limit=limit,
+                    distance_metric=vector_store.distance_metric,
+                    metadata_filter=metadata_filter,
+                )
+            else:
+                results = await uow.vector_database.similarity_search(
+                    collection_id=vector_store_id,
+                    query_vector=query_vector,
+                    limit=limit,
+                    distance_metric=vector_store.distance_metric,
+                    metadata_filter=metadata_filter,
+                )
             return list(results)
+
+    async def search_batch(
+        self,
+        *,
+        queries: builtins.list[VectorStoreSearchQuery],
+        merge: bool = False,
+        user: User,
+        context_id: UUID | None = None,
+    ) -> builtins.list[builtins.list[VectorStoreSearchResult]]:
+        """
+        Run multiple queries, possibly across several vector stores, in a single database roundtrip.
+
+        Returns the results of each query in order, or a single list of unique items when merged. Scores of stores
+        with different distance metrics are not comparable, so merged results are ranked by reciprocal rank fusion
+        and their score is the fused score.
+        """
+        async with self._uow() as uow:
+            # Check ownership of all vector stores at once
+            vector_store_ids = {query.vector_store_id for query in queries}
+            vector_stores = {
+                vector_store.id: vector_store
+                async for vector_store in uow.vector_stores.list(
+                    user_id=user.id, context_id=context_id, vector_store_ids=vector_store_ids
+                )
+            }
+            if missing_ids := vector_store_ids - vector_stores.keys():
+                raise EntityNotFoundError(entity="vector_store", id=next(iter(missing_ids)))
+
+            for query in queries:
+                if len(query.query_vector) != (dimension := vector_stores[query.vector_store_id].dimension):
+                    raise InvalidVectorDimensionError(
+                        f"Query vector dimensions must match vector store dimension: {dimension}"
+                    )
+
+            results = await uow.vector_database.similarity_search_batch(
+                queries=queries,
+                distance_metrics={
+                    vector_store.id: vector_store.distance_metric for vector_store in vector_stores.values()
+                },
+            )
+
+        if not merge:
+            return results
+        # Items matched by multiple queries accumulate the score of each rank
+        items: dict[UUID, VectorStoreSearchResult] = {}
+        scores: defaultdict[UUID, float] = defaultdict(float)
+        for query_results in results:
+            for rank, result in enumerate(query_results, start=1):
+                items.setdefault(result.item.id, result)
+                scores[result.item.id] += 1 / (self._rrf_k + rank)
+        return [
+            [
+                items[item_id].model_copy(update={"score": score})
+                for item_id, score in sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            ]
+        ]
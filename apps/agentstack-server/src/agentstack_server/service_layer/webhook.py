@@ -5,80 +5,320 @@ from __future__ import annotations
 
 import asyncio
 import fnmatch
+import itertools
 import logging
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+import re
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable, Sequence
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import Any
 from uuid import UUID
 
 import httpx
 from kink import di
+from opentelemetry.metrics import CallbackOptions, Observation, get_meter
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
 
-from agentstack_server.configuration import Configuration, WebhookEndpoint
-from agentstack_server.utils.utils import utc_now
+from agentstack_server.configuration import Configuration, WebhookConfiguration, WebhookEndpoint
+from agentstack_server.telemetry import INSTRUMENTATION_NAME
+from agentstack_server.utils.utils import cancel_task, utc_now
 
 logger = logging.getLogger(__name__)
 
-# Strong references keep fire-and-forget tasks alive until completion.
-# See: https://docs.python.org/3/library/asyncio-task.html#creating-tasks
-_background_tasks: set[asyncio.Task] = set()
+type WebhookPayload = dict[str, Any]
+type DeferDelivery = Callable[[WebhookEndpoint, list[WebhookPayload]], Awaitable[None]]
 
-_client: httpx.AsyncClient | None = None
+_meter = get_meter(INSTRUMENTATION_NAME)
+_deliveries = _meter.create_counter(
+    "webhook_events",
+    description="Webhook events by delivery outcome (delivered, deferred, failed, dropped, coalesced)",
+)
+_delivery_latency = _meter.create_histogram(
+    "webhook_delivery_latency",
+    unit="s",
+    description="Time from dispatching a webhook event to its delivery",
+)
+
+_dispatcher: WebhookDispatcher | None = None
+
+
+def _observe_queue_depth(_options: CallbackOptions) -> Iterable[Observation]:
+    if _dispatcher is not None:
+        for url, depth in _dispatcher.queue_depth().items():
+            yield Observation(depth, {"endpoint": url})
+
+
+_meter.create_observable_gauge(
+    "webhook_queue_depth", callbacks=[_observe_queue_depth], description="Webhook events waiting for delivery"
+)
 
 
 @asynccontextmanager
-async def webhook_client_lifespan() -> AsyncGenerator[None]:
-    global _client
-    async with httpx.AsyncClient(timeout=10) as client:
-        _client = client
+async def webhook_lifespan() -> AsyncGenerator[None]:
+    global _dispatcher
+    async with WebhookDispatcher(di[Configuration].webhook) as dispatcher:
+        _dispatcher = dispatcher
         try:
             yield
         finally:
-            _client = None
+            _dispatcher = None
+
+
+class _TrieNode:
+    __slots__ = ("children", "endpoints")
 
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.endpoints: set[int] = set()
 
-def _matches_event(patterns: list[str], event_type: str) -> bool:
-    """Check if event_type matches any of the patterns.
 
-    Supports: "*" (all events), "provider.*" (wildcard), "provider.created" (exact).
+class EventRouter:
+    """Resolves the endpoints subscribed to an event type.
+
+    Supports: "*" (all events), "provider.*" (wildcard), "provider.created" (exact). Exact patterns are looked up in a
+    dict and trailing wildcards in a prefix trie, other glob patterns fall back to a regular expression. The resolved
+    endpoints are memoized per event type, there are only a few dozen of them.
     """
-    return any(fnmatch.fnmatch(event_type, pattern) for pattern in patterns)
 
+    def __init__(self, patterns: Sequence[Sequence[str]]):
+        self._exact: dict[str, set[int]] = {}
+        self._prefixes = _TrieNode()
+        self._globs: list[tuple[re.Pattern[str], int]] = []
+        self._routes: dict[str, tuple[int, ...]] = {}
+        for index, endpoint_patterns in enumerate(patterns):
+            for pattern in endpoint_patterns:
+                if not _has_wildcard(pattern):
+                    self._exact.setdefault(pattern, set()).add(index)
+                elif pattern.endswith("*") and not _has_wildcard(pattern[:-1]):
+                    node = self._prefixes
+                    for char in pattern[:-1]:
+                        node = node.children.setdefault(char, _TrieNode())
+                    node.endpoints.add(index)
+                else:
+                    self._globs.append((re.compile(fnmatch.translate(pattern)), index))
+
+    def route(self, event_type: str) -> tuple[int, ...]:
+        """Indices of the endpoints subscribed to the event type, in the configured order"""
+        if (endpoints := self._routes.get(event_type)) is None:
+            endpoints = self._routes[event_type] = self._resolve(event_type)
+        return endpoints
+
+    def _resolve(self, event_type: str) -> tuple[int, ...]:
+        endpoints = set(self._exact.get(event_type, ()))
+        node: _TrieNode | None = self._prefixes
+        chars = iter(event_type)
+        while node is not None:
+            endpoints |= node.endpoints
+            node = node.children.get(next(chars, ""))
+        endpoints.update(index for glob, index in self._globs if glob.match(event_type))
+        return tuple(sorted(endpoints))
+
+
+def _has_wildcard(pattern: str) -> bool:
+    return any(char in pattern for char in "*?[")
+
+
+def _is_retryable(ex: BaseException) -> bool:
+    if isinstance(ex, httpx.HTTPStatusError):
+        return ex.response.status_code >= 500 or ex.response.status_code == httpx.codes.TOO_MANY_REQUESTS
+    return isinstance(ex, httpx.TransportError)
+
+
+def _describe_error(ex: BaseException) -> str:
+    match ex:
+        case httpx.TimeoutException():
+            return "timed out"
+        case httpx.HTTPStatusError():
+            return f"HTTP {ex.response.status_code}"
+        case httpx.ConnectError():
+            return "connection refused"
+        case _:
+            return repr(ex)
+
+
+async def _post(client: httpx.AsyncClient, endpoint: WebhookEndpoint, payloads: Sequence[WebhookPayload]) -> None:
+    response = await client.post(
+        str(endpoint.url),
+        json={"events": list(payloads)} if endpoint.batch_size > 1 else payloads[0],
+        headers={k: v.get_secret_value() for k, v in endpoint.headers.items()},
+    )
+    response.raise_for_status()
+
+
+async def deliver_deferred_events(*, url: str, events: list[WebhookPayload]) -> None:
+    """Deliver events handed over to the job queue, raises on failure so that the job is retried"""
+    endpoint = next((endpoint for endpoint in di[Configuration].webhook.endpoints if str(endpoint.url) == url), None)
+    if endpoint is None:
+        logger.warning("Dropping %s deferred webhook events, endpoint %s is no longer configured", len(events), url)
+        _deliveries.add(len(events), {"outcome": "dropped"})
+        return
+    async with httpx.AsyncClient(timeout=10) as client:
+        for batch in itertools.batched(events, endpoint.batch_size, strict=False):
+            await _post(client, endpoint, batch)
+    _deliveries.add(len(events), {"outcome": "delivered"})
+
+
+async def _defer_to_job_queue(endpoint: WebhookEndpoint, events: list[WebhookPayload]) -> None:
+    from agentstack_server.jobs.tasks.webhook import deliver_webhook
+
+    await deliver_webhook.defer_async(url=str(endpoint.url), events=events)
 
-async def _deliver(
-    endpoint: WebhookEndpoint,
-    event_type: str,
-    resource_type: str,
-    resource_id: str,
-    resource_url: str,
-    user_id: str | None,
-) -> None:
-    """POST webhook payload to endpoint. Logs errors, never raises."""
-    payload = {
-        "event": event_type,
-        "resource_type": resource_type,
-        "resource_id": resource_id,
-        "resource_url": resource_url,
-        "user_id": user_id,
-        "timestamp": utc_now().isoformat(),
-    }
-    try:
-        assert _client is not None, "webhook_client_lifespan not active"
-        response = await _client.post(
-            str(endpoint.url),
-            json=payload,
-            headers={k: v.get_secret_value() for k, v in endpoint.headers.items()},
-        )
-        response.raise_for_status()
-    except httpx.TimeoutException:
-        logger.warning("Webhook delivery to %s timed out for event %s", endpoint.url, event_type)
-    except httpx.HTTPStatusError as exc:
-        logger.warning(
-            "Webhook delivery to %s failed for event %s: HTTP %s", endpoint.url, event_type, exc.response.status_code
-        )
-    except httpx.ConnectError:
-        logger.warning("Webhook delivery to %s failed for event %s: connection refused", endpoint.url, event_type)
-    except Exception:
-        logger.warning("Failed to deliver webhook to %s for event %s", endpoint.url, event_type, exc_info=True)
+
+@dataclass
+class _PendingEvent:
+    payload: WebhookPayload
+    dispatched_at: float
+
+
+class _EndpointQueue:
+    def __init__(self, endpoint: WebhookEndpoint, maxsize: int):
+        self.endpoint = endpoint
+        self.queue: asyncio.Queue[_PendingEvent] = asyncio.Queue(maxsize=maxsize)
+        self.workers: list[asyncio.Task[None]] = []
+
+
+class WebhookDispatcher:
+    """
+    Delivers webhook events in the background.
+
+    Every endpoint has a bounded queue drained by a limited number of workers. Events that queue up while the endpoint
+    is busy are sent in one request if the endpoint accepts batches. Failed deliveries are retried with an exponential
+    backoff. Events that could not be delivered, or that are still queued on shutdown, are handed over to the job
+    queue so that a restart does not lose them. Repeated updates of the same resource are coalesced into one event.
+    """
+
+    def __init__(
+        self,
+        configuration: WebhookConfiguration,
+        *,
+        client: httpx.AsyncClient | None = None,
+        defer: DeferDelivery = _defer_to_job_queue,
+    ):
+        self._configuration = configuration
+        self._client = client or httpx.AsyncClient(timeout=10)
+        self._defer = defer
+        self._queues = [_EndpointQueue(endpoint, configuration.queue_size) for endpoint in configuration.endpoints]
+        self._router = EventRouter([endpoint.events for endpoint in configuration.endpoints])
+        self._coalesced: dict[tuple[int, str, str], tuple[_PendingEvent, asyncio.TimerHandle]] = {}
+
+    async def __aenter__(self):
+        for endpoint_queue in self._queues:
+            endpoint_queue.workers = [
+                asyncio.create_task(self._work(endpoint_queue)) for _ in range(endpoint_queue.endpoint.max_concurrency)
+            ]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        for key in list(self._coalesced):
+            self._release(key)
+        with suppress(TimeoutError):
+            async with asyncio.timeout(self._configuration.shutdown_timeout_sec):
+                await asyncio.gather(*(endpoint_queue.queue.join() for endpoint_queue in self._queues))
+        for endpoint_queue in self._queues:
+            for worker in endpoint_queue.workers:
+                await cancel_task(worker)
+            remaining = [endpoint_queue.queue.get_nowait().payload for _ in range(endpoint_queue.queue.qsize())]
+            if remaining:
+                await self._hand_over(endpoint_queue.endpoint, remaining)
+        await self._client.aclose()
+
+    def dispatch(self, payload: WebhookPayload) -> None:
+        event_type = payload["event"]
+        now = time.monotonic()
+        for index in self._router.route(event_type):
+            endpoint_queue = self._queues[index]
+            if not (event_type.endswith(".updated") and self._configuration.coalesce_window_sec > 0):
+                self._enqueue(endpoint_queue, _PendingEvent(payload=payload, dispatched_at=now))
+                continue
+            key = (index, event_type, payload["resource_id"])
+            if pending := self._coalesced.get(key):
+                # Only the latest update is delivered, the latency is measured from the first one
+                pending[0].payload = payload
+                _deliveries.add(1, {"outcome": "coalesced"})
+            else:
+                handle = asyncio.get_running_loop().call_later(
+                    self._configuration.coalesce_window_sec, self._release, key
+                )
+                self._coalesced[key] = (_PendingEvent(payload=payload, dispatched_at=now), handle)
+
+    def _release(self, key: tuple[int, str, str]) -> None:
+        event, handle = self._coalesced.pop(key)
+        handle.cancel()
+        self._enqueue(self._queues[key[0]], event)
+
+    def _enqueue(self, endpoint_queue: _EndpointQueue, event: _PendingEvent) -> None:
+        try:
+            endpoint_queue.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            _deliveries.add(1, {"outcome": "dropped"})
+            logger.warning(
+                "Webhook queue for %s is full, dropping event %s", endpoint_queue.endpoint.url, event.payload["event"]
+            )
+
+    async def _work(self, endpoint_queue: _EndpointQueue) -> None:
+        queue = endpoint_queue.queue
+        while True:
+            events = [await queue.get()]
+            while len(events) < endpoint_queue.endpoint.batch_size and not queue.empty():
+                events.append(queue.get_nowait())
+            try:
+                await self._deliver(endpoint_queue.endpoint, events)
+            except asyncio.CancelledError:
+                # Interrupted by shutdown, the events might be delivered twice
+                await self._hand_over(endpoint_queue.endpoint, [event.payload for event in events])
+                raise
+            finally:
+                for _ in events:
+                    queue.task_done()
+
+    async def _deliver(self, endpoint: WebhookEndpoint, events: list[_PendingEvent]) -> None:
+        payloads = [event.payload for event in events]
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(self._configuration.max_retries + 1),
+                wait=wait_exponential(multiplier=self._configuration.retry_backoff_sec),
+                retry=retry_if_exception(_is_retryable),
+                reraise=True,
+            ):
+                with attempt:
+                    await _post(self._client, endpoint, payloads)
+        except Exception as ex:
+            logger.warning(
+                "Webhook delivery to %s failed for events %s: %s",
+                endpoint.url,
+                _event_types(payloads),
+                _describe_error(ex),
+            )
+            if _is_retryable(ex):
+                await self._hand_over(endpoint, payloads)
+            else:
+                _deliveries.add(len(payloads), {"outcome": "failed"})
+            return
+
+        now = time.monotonic()
+        for event in events:
+            _delivery_latency.record(now - event.dispatched_at)
+        _deliveries.add(len(events), {"outcome": "delivered"})
+
+    async def _hand_over(self, endpoint: WebhookEndpoint, payloads: list[WebhookPayload]) -> None:
+        try:
+            await self._defer(endpoint, payloads)
+            _deliveries.add(len(payloads), {"outcome": "deferred"})
+        except Exception:
+            _deliveries.add(len(payloads), {"outcome": "failed"})
+            logger.warning("Failed to defer webhook delivery to %s", endpoint.url, exc_info=True)
+
+    @property
+    def has_endpoints(self) -> bool:
+        return bool(self._queues)
+
+    def queue_depth(self) -> dict[str, int]:
+        return {str(endpoint_queue.endpoint.url): endpoint_queue.queue.qsize() for endpoint_queue in self._queues}
+
+
+def _event_types(payloads: Iterable[WebhookPayload]) -> str:
+    return ", ".join(sorted({payload["event"] for payload in payloads}))
 
 
 def dispatch_webhook_event(
@@ -89,26 +329,17 @@ def dispatch_webhook_event(
     resource_url: str,
     user_id: UUID | None = None,
 ) -> None:
-    """Fire-and-forget webhook notifications to all matching configured endpoints."""
-    configuration = di[Configuration]
-    endpoints = configuration.webhook.endpoints
-    if not endpoints:
+    """Queue webhook notifications to all matching configured endpoints."""
+    if _dispatcher is None or not _dispatcher.has_endpoints:
         return
 
-    resource_id_str = str(resource_id)
-    user_id_str = str(user_id) if user_id else None
-
-    for endpoint in endpoints:
-        if _matches_event(endpoint.events, event_type):
-            task = asyncio.create_task(
-                _deliver(
-                    endpoint=endpoint,
-                    event_type=event_type,
-                    resource_type=resource_type,
-                    resource_id=resource_id_str,
-                    resource_url=resource_url,
-                    user_id=user_id_str,
-                )
-            )
-            _background_tasks.add(task)
-            task.add_done_callback(_background_tasks.discard)
+    _dispatcher.dispatch(
+        {
+            "event": event_type,
+            "resource_type": resource_type,
+            "resource_id": str(resource_id),
+            "resource_url": resource_url,
+            "user_id": str(user_id) if user_id else None,
+            "timestamp": utc_now().isoformat(),
+        }
+    )
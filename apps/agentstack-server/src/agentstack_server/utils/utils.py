@@ -6,14 +6,16 @@ from __future__ import annotations
 import asyncio
 import concurrent.futures
 import functools
+import random
 from asyncio import CancelledError
 from collections.abc import (
+    Awaitable,
     Callable,
     Coroutine,
     Iterable,
 )
 from contextlib import suppress
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any, cast, overload
 
 
@@ -99,6 +101,35 @@ def utc_now() -> datetime:
     return datetime.now(UTC)
 
 
+async def gather_bounded[T, R](
+    fn: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    *,
+    concurrency: int,
+    call_timeout: timedelta | None = None,
+) -> list[R | Exception]:
+    """
+    Call fn for each item with at most `concurrency` calls running at once and return the results in order.
+    Exceptions, including the timeout of a single call, are returned in place of the result.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _call(item: T) -> R | Exception:
+        async with semaphore:
+            try:
+                async with asyncio.timeout(call_timeout and call_timeout.total_seconds()):
+                    return await fn(item)
+            except Exception as ex:
+                return ex
+
+    return await asyncio.gather(*(_call(item) for item in items))
+
+
+async def sleep_jitter(max_delay: timedelta) -> None:
+    """Spread periodic jobs of all replicas and deployments so that they do not hit the same upstreams at once"""
+    await asyncio.sleep(random.uniform(0, max_delay.total_seconds()))
+
+
 def async_to_sync_isolated[**P, R](fn: Callable[P, Coroutine[Any, Any, R]]) -> Callable[P, R]:
     @functools.wraps(fn)
     def wrapped_fn(*args: P.args, **kwargs: P.kwargs) -> R:
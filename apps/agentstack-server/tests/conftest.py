@@ -109,7 +109,7 @@ def clean_up_fn(test_configuration):
             # Drop all vector_db tables
             vecdb = await connection.execute(text("SELECT tablename from pg_tables where schemaname = 'vector_db'"))
             for row in vecdb.fetchall():
-                await connection.execute(text(f"DROP TABLE vector_db.{row.tablename} CASCADE"))
+                await connection.execute(text(f"DROP TABLE IF EXISTS vector_db.{row.tablename} CASCADE"))
 
             await connection.commit()
         # Clean all deployments
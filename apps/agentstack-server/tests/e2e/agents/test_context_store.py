@@ -95,7 +95,7 @@ async def test_agent_history(history_agent, subtests):
             "third message",
         ]
 
-        context1_history = await Context.list_history(context1.id)
+        context1_history = await Context.list_history(context1.id, total_count="exact")
         assert context1_history.total_count == 14
 
     with subtests.test("other context id does not mix history"):
@@ -108,8 +108,8 @@ async def test_agent_history(history_agent, subtests):
         agent_messages = [msg.parts[0].root.text for msg in final_task.history]
         assert agent_messages == ["first message"]
 
-        context1_history = await Context.list_history(context1.id)
+        context1_history = await Context.list_history(context1.id, total_count="exact")
         assert context1_history.total_count == 14
 
-        context2_history = await Context.list_history(context2.id)
+        context2_history = await Context.list_history(context2.id, total_count="exact")
         assert context2_history.total_count == 2
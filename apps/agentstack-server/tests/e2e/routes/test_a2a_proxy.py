@@ -1167,12 +1167,16 @@ async def test_task_update_last_accessed_at(client: Client, handler: mock.AsyncM
     response = client.post("/", json=message_data)  # noqa: ASYNC212
     assert response.status_code == 200
 
-    # Check that timestamp was updated
-    result = await db_transaction.execute(
-        text("SELECT last_accessed_at FROM a2a_request_tasks WHERE task_id = :task_id"),
-        {"task_id": "task1"},
-    )
-    new_timestamp = result.fetchone().last_accessed_at
+    # Check that timestamp was updated, the access is written by the next flush of the activity tracking
+    for _attempt in range(20):
+        result = await db_transaction.execute(
+            text("SELECT last_accessed_at FROM a2a_request_tasks WHERE task_id = :task_id"),
+            {"task_id": "task1"},
+        )
+        new_timestamp = result.fetchone().last_accessed_at
+        if new_timestamp > initial_timestamp:
+            break
+        await asyncio.sleep(0.5)
     assert new_timestamp > initial_timestamp
 
 
@@ -24,7 +24,7 @@ async def test_context_pagination(subtests):
         context_ids = [(await Context.create()).id for _ in range(5)]
 
     with subtests.test("test default pagination (no cursor)"):
-        response = await Context.list()
+        response = await Context.list(total_count="exact")
         assert len(response.items) == 5  # All contexts should be returned
         assert response.total_count == 5
         assert response.has_more is False
@@ -34,12 +34,18 @@ async def test_context_pagination(subtests):
         assert created_ats == sorted(created_ats, reverse=True)
 
     with subtests.test("test pagination with limit"):
-        response = await Context.list(limit=2)
+        response = await Context.list(limit=2, total_count="exact")
         assert len(response.items) == 2
         assert response.total_count == 5
         assert response.has_more is True
         assert response.next_page_token is not None
 
+    with subtests.test("test total count is not computed by default"):
+        response = await Context.list(limit=2)
+        assert response.total_count is None
+        response = await Context.list(limit=2, total_count="estimate")
+        assert response.total_count is not None
+
     with subtests.test("test cursor-based pagination"):
         # Get first page with limit 2
         first_page = await Context.list(limit=2, order_by="created_at")
@@ -140,6 +146,13 @@ async def test_context_history_pagination(subtests):
         # Note: list_all_history should maintain the order from list_history (desc by default)
         # but iterate through all pages
 
+    with subtests.test("add history items in a batch"):
+        messages = [AgentMessage(text=f"Batch message {i}") for i in range(5)]
+        added = await context.add_history_items(data=messages)
+        new_items = [item async for item in Context.list_all_history(context.id, since_id=all_items[-1].id)]
+        assert [item.id for item in new_items] == [item.id for item in added]
+        assert [item.data.message_id for item in new_items] == [message.message_id for message in messages]
+
 
 @pytest.mark.usefixtures("clean_up", "setup_platform_client")
 async def test_context_empty_filtering(subtests):
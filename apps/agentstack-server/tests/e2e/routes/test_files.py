@@ -37,6 +37,10 @@ async def test_files(subtests):
         async with retrieved_file.load_content() as loaded_file:
             assert loaded_file.text == '{"hello": "world"}'
 
+    with subtests.test("get file content in parallel ranges"):
+        async with retrieved_file.load_content(range_size=5) as loaded_file:
+            assert loaded_file.text == '{"hello": "world"}'
+
     with subtests.test("delete file"):
         await File.delete(file_id)
         with pytest.raises(httpx.HTTPStatusError, match="404 Not Found"):
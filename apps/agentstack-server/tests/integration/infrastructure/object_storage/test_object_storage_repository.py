@@ -0,0 +1,85 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import AsyncIterator
+
+import pytest
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.file import AsyncFile, ByteRange
+from agentstack_server.exceptions import EntityNotFoundError
+from agentstack_server.infrastructure.object_storage.repository import S3ObjectStorageRepository
+
+pytestmark = pytest.mark.integration
+
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.fixture
+async def object_storage() -> AsyncIterator[S3ObjectStorageRepository]:
+    configuration = Configuration()
+    configuration.object_storage.multipart_part_size_bytes = PART_SIZE
+    async with S3ObjectStorageRepository(configuration) as repository:
+        yield repository
+
+
+@pytest.fixture
+async def s3_calls(object_storage: S3ObjectStorageRepository) -> list[str]:
+    """Names of the S3 operations sent by the shared client."""
+    calls: list[str] = []
+    client = await object_storage._get_shared_client()
+    client.meta.events.register("before-call.s3", lambda model, **_: calls.append(model.name))
+    return calls
+
+
+async def test_file_lifecycle_s3_round_trips(object_storage: S3ObjectStorageRepository, s3_calls: list[str]):
+    file_id = uuid.uuid4()
+    content = b"hello world"
+
+    size = await object_storage.upload_file(
+        file_id=file_id, file=AsyncFile.from_bytes(content, filename="test.txt", content_type="text/plain")
+    )
+    assert size == len(content)
+    assert s3_calls == ["PutObject"]
+
+    s3_calls.clear()
+    url = await object_storage.get_file_url(file_id=file_id)
+    assert str(file_id) in url.path
+    assert s3_calls == []
+
+    # A file whose upload is not finalized is checked first
+    s3_calls.clear()
+    await object_storage.get_file_url(file_id=file_id, check_exists=True)
+    assert s3_calls == ["HeadObject"]
+    with pytest.raises(EntityNotFoundError):
+        await object_storage.get_file_url(file_id=uuid.uuid4(), check_exists=True)
+
+    s3_calls.clear()
+    async with object_storage.get_file(file_id=file_id, byte_range=ByteRange(start=6, end=10)) as file:
+        assert file.content_type == "text/plain"
+        assert await file.read(1024) == b"world"
+    assert s3_calls == ["GetObject"]
+
+    s3_calls.clear()
+    await object_storage.delete_files(file_ids=[file_id])
+    assert s3_calls == ["DeleteObjects"]
+
+
+async def test_multipart_upload_s3_round_trips(object_storage: S3ObjectStorageRepository, s3_calls: list[str]):
+    file_id = uuid.uuid4()
+    content = b"x" * (2 * PART_SIZE + 1)
+
+    try:
+        size = await object_storage.upload_file(
+            file_id=file_id, file=AsyncFile.from_bytes(content, filename="test.bin", content_type="text/plain")
+        )
+        assert size == len(content)
+        assert s3_calls == ["CreateMultipartUpload", *["UploadPart"] * 3, "CompleteMultipartUpload"]
+
+        async with object_storage.get_file(file_id=file_id) as file:
+            assert file.size == len(content)
+    finally:
+        await object_storage.delete_files(file_ids=[file_id])
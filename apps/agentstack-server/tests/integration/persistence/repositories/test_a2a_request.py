@@ -95,7 +95,7 @@ async def test_track_new_task_with_creation_not_allowed(
 async def test_track_existing_task_owned_by_same_user(
     db_transaction: AsyncConnection, user1_id: UUID, provider_id: UUID
 ):
-    """Test accessing an existing task owned by the same user updates last_accessed_at."""
+    """Test accessing an existing task owned by the same user, last_accessed_at is updated in bulk afterwards."""
     repository = SqlAlchemyA2ARequestRepository(connection=db_transaction)
 
     # Create a task with an old timestamp
@@ -115,13 +115,14 @@ async def test_track_existing_task_owned_by_same_user(
     )
     initial_timestamp = result.fetchone().last_accessed_at
 
-    # Track the existing task (this should update last_accessed_at to NOW())
+    # Track the existing task, the access is recorded by the activity tracking
     await repository.track_request_ids_ownership(
         user_id=user1_id,
         provider_id=provider_id,
         task_id="existing-task",
         allow_task_creation=False,
     )
+    await repository.update_tasks_last_accessed(timestamps={"existing-task": utc_now()})
 
     # Verify last_accessed_at was updated
     result = await db_transaction.execute(
@@ -189,7 +190,7 @@ async def test_track_new_context(db_transaction: AsyncConnection, user1_id: UUID
 async def test_track_existing_context_owned_by_same_user(
     db_transaction: AsyncConnection, user1_id: UUID, provider_id: UUID
 ):
-    """Test accessing an existing context owned by the same user updates last_accessed_at."""
+    """Test accessing an existing context owned by the same user, last_accessed_at is updated in bulk afterwards."""
     repository = SqlAlchemyA2ARequestRepository(connection=db_transaction)
 
     # Create a context with an old timestamp
@@ -209,12 +210,13 @@ async def test_track_existing_context_owned_by_same_user(
     )
     initial_timestamp = result.fetchone().last_accessed_at
 
-    # Track the existing context (this should update last_accessed_at to NOW())
+    # Track the existing context, the access is recorded by the activity tracking
     await repository.track_request_ids_ownership(
         user_id=user1_id,
         provider_id=provider_id,
         context_id="existing-context",
     )
+    await repository.update_contexts_last_accessed(timestamps={"existing-context": utc_now()})
 
     # Verify last_accessed_at was updated
     result = await db_transaction.execute(
@@ -225,6 +227,33 @@ async def test_track_existing_context_owned_by_same_user(
     assert new_timestamp > initial_timestamp
 
 
+async def test_update_last_accessed_never_moves_backwards(
+    db_transaction: AsyncConnection, user1_id: UUID, provider_id: UUID
+):
+    """Test that bulk updates keep the newer timestamp when batches are flushed out of order."""
+    repository = SqlAlchemyA2ARequestRepository(connection=db_transaction)
+
+    now = utc_now()
+    for task_id in ("task-a", "task-b"):
+        await db_transaction.execute(
+            text(
+                "INSERT INTO a2a_request_tasks (task_id, created_by, provider_id, created_at, last_accessed_at) "
+                "VALUES (:task_id, :created_by, :provider_id, :now, :now)"
+            ),
+            {"task_id": task_id, "created_by": user1_id, "provider_id": provider_id, "now": now},
+        )
+
+    await repository.update_tasks_last_accessed(
+        timestamps={"task-a": now - timedelta(minutes=5), "task-b": now + timedelta(minutes=5)}
+    )
+
+    result = await db_transaction.execute(
+        text("SELECT task_id, last_accessed_at FROM a2a_request_tasks WHERE task_id IN ('task-a', 'task-b')")
+    )
+    timestamps = {row.task_id: row.last_accessed_at for row in result.fetchall()}
+    assert timestamps == {"task-a": now, "task-b": now + timedelta(minutes=5)}
+
+
 async def test_track_existing_context_owned_by_different_user(
     db_transaction: AsyncConnection, user1_id: UUID, user2_id: UUID, provider_id: UUID
 ):
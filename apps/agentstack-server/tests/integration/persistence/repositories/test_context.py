@@ -0,0 +1,41 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from datetime import timedelta
+from uuid import UUID
+
+import pytest
+from a2a.types import Message, Part, Role, TextPart
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from agentstack_server.domain.models.context import Context, ContextHistoryItem
+from agentstack_server.infrastructure.persistence.repositories.context import SqlAlchemyContextRepository
+from agentstack_server.utils.utils import utc_now
+
+pytestmark = pytest.mark.integration
+
+
+async def test_list_history_accepts_item_id_as_page_token(db_transaction: AsyncConnection, normal_user: UUID):
+    repository = SqlAlchemyContextRepository(connection=db_transaction)
+    context = Context(created_by=normal_user)
+    await repository.create(context=context)
+    now = utc_now()
+    message = Message(message_id="test", role=Role.user, parts=[Part(root=TextPart(text="Hello"))])
+    # Timestamps repeat to exercise the tie-breaking by ID
+    await repository.add_history_items(
+        context_id=context.id,
+        history_items=[
+            ContextHistoryItem(context_id=context.id, data=message, created_at=now - timedelta(seconds=i // 2))
+            for i in range(10)
+        ],
+    )
+
+    first_page = await repository.list_history(context_id=context.id, limit=3)
+    by_cursor = await repository.list_history(context_id=context.id, page_token=first_page.next_page_token, limit=3)
+    by_id = await repository.list_history(context_id=context.id, page_token=first_page.items[-1].id, limit=3)
+
+    assert first_page.next_page_token != first_page.items[-1].id
+    assert [item.id for item in by_id.items] == [item.id for item in by_cursor.items]
+    assert len(by_cursor.items) == 3
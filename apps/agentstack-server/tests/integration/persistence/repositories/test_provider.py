@@ -132,6 +132,17 @@ async def test_get_provider_not_found(db_transaction: AsyncConnection):
         await repository.get(provider_id=uuid.uuid4())
 
 
+async def test_get_provider_by_location(db_transaction: AsyncConnection, test_provider: Provider):
+    repository = SqlAlchemyProviderRepository(connection=db_transaction)
+    await repository.create(provider=test_provider)
+
+    provider = await repository.get_by_location(location=test_provider.source)
+
+    assert provider.id == test_provider.id
+    with pytest.raises(EntityNotFoundError):
+        await repository.get_by_location(location=NetworkProviderLocation(root="http://localhost:8001"))
+
+
 async def test_delete_provider(db_transaction: AsyncConnection, test_provider: Provider):
     # Create repository
     repository = SqlAlchemyProviderRepository(connection=db_transaction)
@@ -12,7 +12,9 @@ from agentstack_server.configuration import Configuration, VectorStoresConfigura
 from agentstack_server.domain.models.user import User
 from agentstack_server.domain.models.vector_store import DocumentType, VectorStoreItem
 from agentstack_server.exceptions import InvalidVectorDimensionError, StorageCapacityExceededError
+from agentstack_server.infrastructure.activity.memory_activity_buffer import MemoryActivityBuffer
 from agentstack_server.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWorkFactory
+from agentstack_server.service_layer.services.activity import ActivityService
 from agentstack_server.service_layer.services.vector_stores import VectorStoreService
 
 pytestmark = pytest.mark.integration
@@ -32,7 +34,8 @@ async def uow_factory(low_limit_config, clean_up):
 @pytest.fixture
 async def vector_store_service(uow_factory, low_limit_config):
     """Create a VectorStoreService with real transaction behavior."""
-    return VectorStoreService(uow_factory, low_limit_config)
+    activity = ActivityService(MemoryActivityBuffer(), uow_factory, low_limit_config)
+    return VectorStoreService(uow_factory, low_limit_config, activity)
 
 
 @pytest.fixture
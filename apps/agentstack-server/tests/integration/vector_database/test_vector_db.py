@@ -10,7 +10,13 @@ import pytest
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from agentstack_server.domain.models.vector_store import DocumentType, VectorStoreItem, VectorStoreSearchResult
+from agentstack_server.domain.models.vector_store import (
+    DocumentType,
+    VectorDistanceMetric,
+    VectorStoreItem,
+    VectorStoreSearchQuery,
+    VectorStoreSearchResult,
+)
 from agentstack_server.infrastructure.vector_database.vector_db import VectorDatabaseRepository
 
 pytestmark = pytest.mark.integration
@@ -95,6 +101,93 @@ async def test_create_collection_with_unsupported_dimension(
     assert result.fetchone() is not None
 
 
+async def test_create_collection_creates_partition_with_index(
+    vector_db_repository: VectorDatabaseRepository,
+    db_transaction: AsyncConnection,
+):
+    """Test that each collection gets its own partition with an HNSW index for the distance metric of the store."""
+    cosine_collection, inner_product_collection = uuid.uuid4(), uuid.uuid4()
+    await vector_db_repository.create_collection(cosine_collection, 128, VectorDistanceMetric.COSINE)
+    await vector_db_repository.create_collection(inner_product_collection, 128, VectorDistanceMetric.INNER_PRODUCT)
+
+    result = await db_transaction.execute(
+        text(
+            "SELECT tablename, indexdef FROM pg_indexes WHERE schemaname = 'vector_db' "
+            "AND tablename LIKE 'collections\\_dim\\_128\\_%' AND indexdef LIKE '%USING hnsw%'"
+        )
+    )
+    indexes = {row.tablename: row.indexdef for row in result.fetchall()}
+    assert set(indexes) == {
+        f"collections_dim_128_{cosine_collection.hex}",
+        f"collections_dim_128_{inner_product_collection.hex}",
+    }
+    assert "halfvec_cosine_ops" in indexes[f"collections_dim_128_{cosine_collection.hex}"]
+    assert "halfvec_ip_ops" in indexes[f"collections_dim_128_{inner_product_collection.hex}"]
+
+
+async def test_delete_collection_drops_partition(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+    db_transaction: AsyncConnection,
+):
+    """Test that deleting a collection drops its partition and keeps other collections intact."""
+    other_collection_id = uuid.uuid4()
+    await vector_db_repository.create_collection(test_collection_id, 128)
+    await vector_db_repository.create_collection(other_collection_id, 128)
+    await vector_db_repository.add_items(test_collection_id, sample_vector_items[:2])
+    await vector_db_repository.add_items(other_collection_id, sample_vector_items[2:])
+
+    await vector_db_repository.delete_collection(test_collection_id, 128)
+
+    result = await db_transaction.execute(
+        text("SELECT tablename FROM pg_tables WHERE schemaname = 'vector_db' AND tablename = :partition_name"),
+        {"partition_name": f"collections_dim_128_{test_collection_id.hex}"},
+    )
+    assert result.fetchone() is None
+    result = await db_transaction.execute(text("SELECT COUNT(*) FROM vector_db.collections_dim_128"))
+    assert result.scalar() == 1
+
+
+async def test_delete_orphaned_collections(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    db_transaction: AsyncConnection,
+):
+    """Test that partitions without a vector store are dropped."""
+    # There is no vector store with this id in the vector_stores table
+    await vector_db_repository.create_collection(test_collection_id, 128)
+
+    assert await vector_db_repository.delete_orphaned_collections() >= 1
+
+    result = await db_transaction.execute(
+        text("SELECT tablename FROM pg_tables WHERE schemaname = 'vector_db' AND tablename = :partition_name"),
+        {"partition_name": f"collections_dim_128_{test_collection_id.hex}"},
+    )
+    assert result.fetchone() is None
+
+
+async def test_delete_orphaned_collections_drops_detached_partitions(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    db_transaction: AsyncConnection,
+):
+    """Test that partitions left detached by an interrupted delete are dropped as well."""
+    await vector_db_repository.create_collection(test_collection_id, 128)
+    partition_name = f"collections_dim_128_{test_collection_id.hex}"
+    await db_transaction.execute(
+        text(f"ALTER TABLE vector_db.collections_dim_128 DETACH PARTITION vector_db.{partition_name}")
+    )
+
+    assert await vector_db_repository.delete_orphaned_collections() >= 1
+
+    result = await db_transaction.execute(
+        text("SELECT tablename FROM pg_tables WHERE schemaname = 'vector_db' AND tablename = :partition_name"),
+        {"partition_name": partition_name},
+    )
+    assert result.fetchone() is None
+
+
 async def test_add_items_to_collection(
     vector_db_repository: VectorDatabaseRepository,
     test_collection_id: UUID,
@@ -218,6 +311,152 @@ async def test_similarity_search(
     assert first_result.score >= results_list[1].score
 
 
+@pytest.mark.parametrize(
+    ("distance_metric", "operator"),
+    [
+        (VectorDistanceMetric.COSINE, "<=>"),
+        (VectorDistanceMetric.L2, "<->"),
+        (VectorDistanceMetric.INNER_PRODUCT, "<#>"),
+    ],
+)
+async def test_similarity_search_query_can_use_index(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+    db_transaction: AsyncConnection,
+    distance_metric: VectorDistanceMetric,
+    operator: str,
+):
+    """Test that the nearest-neighbour query of a store is answered by the index of its partition."""
+    await vector_db_repository.create_collection(test_collection_id, 128, distance_metric)
+    await vector_db_repository.add_items(test_collection_id, sample_vector_items)
+
+    # The table is tiny, so force the planner to show whether an index scan is possible at all
+    await db_transaction.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await db_transaction.execute(
+        text(
+            "EXPLAIN SELECT id FROM vector_db.collections_dim_128 WHERE vector_store_id = :collection_id "
+            f"ORDER BY embedding {operator} CAST(:query_vector AS halfvec(128)) LIMIT 5"
+        ),
+        {"collection_id": test_collection_id, "query_vector": str([1.0] * 128)},
+    )
+    plan = "\n".join(row[0] for row in result.fetchall())
+    assert f"collections_dim_128_{test_collection_id.hex}_hnsw" in plan
+
+
+@pytest.mark.parametrize("distance_metric", list(VectorDistanceMetric))
+async def test_similarity_search_distance_metrics(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+    distance_metric: VectorDistanceMetric,
+):
+    """Test that results are ranked from the most to the least similar for every distance metric."""
+    await vector_db_repository.create_collection(test_collection_id, 128, distance_metric)
+    await vector_db_repository.add_items(test_collection_id, sample_vector_items)
+
+    # Use a non-uniform query vector, all sample embeddings have the same direction
+    query_vector = [1.0] * 64 + [-1.0] * 64
+    results = list(
+        await vector_db_repository.similarity_search(
+            test_collection_id, query_vector, limit=3, distance_metric=distance_metric
+        )
+    )
+
+    assert len(results) == 3
+    scores = [result.score for result in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+async def test_similarity_search_with_metadata_filter(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+):
+    """Test that only items whose metadata contains the filter are returned."""
+    await vector_db_repository.create_collection(test_collection_id, 128)
+    await vector_db_repository.add_items(test_collection_id, sample_vector_items)
+
+    results = list(
+        await vector_db_repository.similarity_search(
+            test_collection_id, [1.0] * 128, limit=10, metadata_filter={"source": "test_doc_1.txt", "chapter": "2"}
+        )
+    )
+
+    assert [result.item.id for result in results] == [sample_vector_items[1].id]
+
+
+async def test_hybrid_search(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+    db_transaction: AsyncConnection,
+):
+    """Test that a full-text match is fused with the vector ranking."""
+    await vector_db_repository.create_collection(test_collection_id, 128)
+    await vector_db_repository.add_items(test_collection_id, sample_vector_items)
+
+    # All sample embeddings have the same direction, so the cosine ranking alone cannot tell them apart
+    results = list(
+        await vector_db_repository.hybrid_search(
+            test_collection_id, [1.0] * 128, query_text="similarity search", limit=3
+        )
+    )
+
+    assert len(results) == 3
+    assert results[0].item.id == sample_vector_items[2].id
+    assert results[0].score > results[1].score
+
+    # The partition inherits the full-text and metadata indexes of the partitioned table
+    result = await db_transaction.execute(
+        text("SELECT indexdef FROM pg_indexes WHERE schemaname = 'vector_db' AND tablename = :partition_name"),
+        {"partition_name": f"collections_dim_128_{test_collection_id.hex}"},
+    )
+    index_definitions = "\n".join(result.scalars())
+    assert "to_tsvector('simple'::regconfig, text)" in index_definitions
+    assert "jsonb_path_ops" in index_definitions
+
+
+async def test_similarity_search_batch(
+    vector_db_repository: VectorDatabaseRepository,
+    test_collection_id: UUID,
+    sample_vector_items: list[VectorStoreItem],
+):
+    """Test that queries across collections with different tables and metrics are answered in order."""
+    other_collection_id = uuid.uuid4()
+    await vector_db_repository.create_collection(test_collection_id, 128, VectorDistanceMetric.COSINE)
+    await vector_db_repository.create_collection(other_collection_id, 64, VectorDistanceMetric.L2)
+    await vector_db_repository.add_items(test_collection_id, sample_vector_items)
+    other_items = [
+        VectorStoreItem(document_id="doc_003", document_type=DocumentType.EXTERNAL, embedding=[value] * 64, text="")
+        for value in (1.0, 5.0)
+    ]
+    await vector_db_repository.add_items(other_collection_id, other_items)
+
+    query_vector = [1.0] * 64 + [-1.0] * 64
+    results = await vector_db_repository.similarity_search_batch(
+        queries=[
+            VectorStoreSearchQuery(vector_store_id=test_collection_id, query_vector=query_vector, limit=2),
+            VectorStoreSearchQuery(vector_store_id=other_collection_id, query_vector=[4.0] * 64, limit=1),
+            VectorStoreSearchQuery(
+                vector_store_id=test_collection_id,
+                query_vector=query_vector,
+                limit=3,
+                metadata_filter={"source": "test_doc_2.txt"},
+            ),
+        ],
+        distance_metrics={
+            test_collection_id: VectorDistanceMetric.COSINE,
+            other_collection_id: VectorDistanceMetric.L2,
+        },
+    )
+
+    assert [len(query_results) for query_results in results] == [2, 1, 1]
+    assert results[1][0].item.id == other_items[1].id
+    assert results[2][0].item.id == sample_vector_items[2].id
+    assert all(result.item.document_type == DocumentType.EXTERNAL for result in results[0])
+
+
 async def test_similarity_search_with_limit(
     vector_db_repository: VectorDatabaseRepository,
     test_collection_id: UUID,
@@ -341,7 +580,7 @@ async def test_multiple_collections_same_dimension(
     sample_vector_items: list[VectorStoreItem],
     db_transaction: AsyncConnection,
 ):
-    """Test multiple collections using the same dimension share the same table."""
+    """Test multiple collections using the same dimension share the same partitioned table."""
     dimension = 128
     collection_1 = uuid.uuid4()
     collection_2 = uuid.uuid4()
@@ -0,0 +1,60 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from authlib.jose.errors import ExpiredTokenError
+
+from agentstack_server.api.auth.auth import exchange_internal_jwt, issue_internal_jwt, verify_internal_jwt
+from agentstack_server.configuration import AuthConfiguration, Configuration
+from agentstack_server.domain.models.permissions import Permissions
+from agentstack_server.utils.utils import utc_now
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(scope="module", params=["RS256", "ES256", "EdDSA"])
+def configuration(request: pytest.FixtureRequest) -> Configuration:
+    return Configuration(auth=AuthConfiguration(jwt_algorithm=request.param))
+
+
+def _issue_token(configuration: Configuration, **kwargs) -> str:
+    token, _ = issue_internal_jwt(
+        user_id=uuid4(),
+        context_id=uuid4(),
+        global_permissions=Permissions(files={"read"}),
+        context_permissions=Permissions(files={"*"}),
+        configuration=configuration,
+        **kwargs,
+    )
+    return token
+
+
+def test_verified_token_is_cached(configuration: Configuration):
+    token = _issue_token(configuration)
+
+    parsed_token = verify_internal_jwt(token, configuration)
+
+    assert parsed_token.context_permissions == Permissions(files={"*"})
+    assert verify_internal_jwt(token, configuration) is parsed_token
+
+
+def test_exchanged_token_is_cached_per_audience(configuration: Configuration):
+    token = _issue_token(configuration)
+
+    exchanged_token, expires_at = exchange_internal_jwt(token, configuration, audience=["agent-1"])
+
+    assert exchange_internal_jwt(token, configuration, audience=["agent-1"]) == (exchanged_token, expires_at)
+    assert exchange_internal_jwt(token, configuration, audience=["agent-2"])[0] != exchanged_token
+    assert verify_internal_jwt(exchanged_token, configuration).raw["aud"] == ["agent-1", "agentstack-server"]
+
+
+def test_expired_token_is_rejected(configuration: Configuration):
+    token = _issue_token(configuration, expires_at=utc_now() - timedelta(seconds=1))
+
+    with pytest.raises(ExpiredTokenError):
+        verify_internal_jwt(token, configuration)
@@ -0,0 +1,89 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+from limits.aio.storage import MemoryStorage
+
+from agentstack_server.api.rate_limiter import RateLimit, UserRateLimiter
+from agentstack_server.configuration import (
+    Configuration,
+    RateLimitConfiguration,
+    RoleBasedRateLimitConfiguration,
+    RoleRateLimits,
+)
+from agentstack_server.domain.models.user import User
+from agentstack_server.exceptions import RateLimitExceededError
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def storage() -> MemoryStorage:
+    storage = MemoryStorage()
+    storage.incr = AsyncMock(wraps=storage.incr)
+    return storage
+
+
+@pytest.fixture
+def rate_limiter(storage: MemoryStorage) -> UserRateLimiter:
+    configuration = Configuration(
+        rate_limit=RateLimitConfiguration(
+            enabled=True,
+            strategy="fixed-window",
+            role_based_limits=RoleBasedRateLimitConfiguration(
+                user=RoleRateLimits(openai_chat_completion_tokens="1000/minute")
+            ),
+        )
+    )
+    return UserRateLimiter(user=User(email="test@example.com"), configuration=configuration, storage=storage)
+
+
+async def test_lease_accounts_locally_until_exhausted(rate_limiter: UserRateLimiter, storage: MemoryStorage):
+    lease = rate_limiter.lease(RateLimit.OPENAI_CHAT_COMPLETION_TOKENS, size=100)
+    assert storage.incr.await_count == 0
+
+    await lease.consume(10)
+    for _ in range(9):
+        await lease.consume(1)
+    assert storage.incr.await_count == 2
+    assert lease.reserved == 20
+
+    await lease.consume(100)
+    assert lease.reserved == 119
+
+    await lease.consume(1)
+    assert storage.incr.await_count == 4
+    assert lease.reserved == 219
+
+    await lease.settle(used=450)
+    assert lease.reserved == 450
+    assert storage.incr.await_count == 5
+
+
+async def test_lease_does_not_reserve_past_max_cost(rate_limiter: UserRateLimiter):
+    lease = rate_limiter.lease(RateLimit.OPENAI_CHAT_COMPLETION_TOKENS, size=100, max_cost=25)
+
+    await lease.consume(10)
+    await lease.consume(1)
+    assert lease.reserved == 20
+
+    await lease.consume(10)
+    assert lease.reserved == 25
+
+    await lease.consume(5)
+    assert lease.reserved == 26
+
+
+async def test_lease_is_limited(rate_limiter: UserRateLimiter):
+    lease = rate_limiter.lease(RateLimit.OPENAI_CHAT_COMPLETION_TOKENS, size=5000)
+    await lease.consume(600)
+
+    with pytest.raises(RateLimitExceededError):
+        await lease.consume(1)
+
+    with pytest.raises(RateLimitExceededError):
+        await rate_limiter.lease(RateLimit.OPENAI_CHAT_COMPLETION_TOKENS, size=5000).consume(1001)
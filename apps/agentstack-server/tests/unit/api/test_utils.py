@@ -0,0 +1,130 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import json
+import struct
+from collections.abc import AsyncIterator
+
+import openai.types.chat
+import pytest
+from fastapi import HTTPException
+
+from agentstack_server.api.utils import (
+    StreamedLLMCostEstimator,
+    parse_float16_vector_items,
+    parse_ndjson_vector_items,
+    parse_range_header,
+)
+
+pytestmark = pytest.mark.unit
+
+ITEMS = [
+    {"document_id": "doc_1", "document_type": "external", "text": "first", "embedding": [0.5, -1.0, 2.0]},
+    {"document_id": "doc_2", "document_type": "external", "text": "", "embedding": [0.25, 0.0, -0.125]},
+]
+
+
+async def _chunked(data: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+def _float16_frame(item: dict) -> bytes:
+    header = json.dumps({key: value for key, value in item.items() if key != "embedding"}).encode()
+    embedding = item["embedding"]
+    return (
+        struct.pack("<I", len(header))
+        + header
+        + struct.pack("<I", len(embedding))
+        + struct.pack(f"<{len(embedding)}e", *embedding)
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+async def test_parse_ndjson_vector_items(chunk_size: int):
+    body = "\n".join(json.dumps(item) for item in ITEMS).encode()
+
+    items = [item async for item in parse_ndjson_vector_items(_chunked(body, chunk_size))]
+
+    assert [item.document_id for item in items] == ["doc_1", "doc_2"]
+    assert [item.embedding for item in items] == [ITEMS[0]["embedding"], ITEMS[1]["embedding"]]
+
+
+async def test_parse_ndjson_vector_items_rejects_invalid_item():
+    body = (json.dumps(ITEMS[0]) + "\n" + json.dumps({"document_id": "doc_3"}) + "\n").encode()
+
+    with pytest.raises(HTTPException) as exc_info:
+        _ = [item async for item in parse_ndjson_vector_items(_chunked(body, 1024))]
+    assert exc_info.value.status_code == 422
+    assert "#1" in exc_info.value.detail
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1024])
+async def test_parse_float16_vector_items(chunk_size: int):
+    body = b"".join(_float16_frame(item) for item in ITEMS)
+
+    items = [item async for item in parse_float16_vector_items(_chunked(body, chunk_size))]
+
+    assert [item.text for item in items] == ["first", ""]
+    # The values are exactly representable in float16
+    assert [item.embedding for item in items] == [ITEMS[0]["embedding"], ITEMS[1]["embedding"]]
+
+
+async def test_parse_float16_vector_items_rejects_incomplete_frame():
+    body = _float16_frame(ITEMS[0]) + _float16_frame(ITEMS[1])[:-1]
+
+    with pytest.raises(HTTPException) as exc_info:
+        _ = [item async for item in parse_float16_vector_items(_chunked(body, 1024))]
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    ("range_header", "expected"),
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-2000", (0, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=0-0,10-20", None),
+        ("bytes=20-10", None),
+        ("bytes=abc-", None),
+        ("items=0-10", None),
+    ],
+)
+def test_parse_range_header(range_header: str, expected: tuple[int, int] | None):
+    byte_range = parse_range_header(range_header, size=1000)
+
+    assert (byte_range and (byte_range.start, byte_range.end)) == expected
+
+
+@pytest.mark.parametrize("range_header", ["bytes=1000-", "bytes=-0"])
+def test_parse_range_header_rejects_unsatisfiable_range(range_header: str):
+    with pytest.raises(HTTPException) as exc_info:
+        parse_range_header(range_header, size=1000)
+    assert exc_info.value.status_code == 416
+    assert exc_info.value.headers == {"Content-Range": "bytes */1000"}
+
+
+def test_streamed_llm_cost_estimator():
+    def chunk(**delta) -> openai.types.chat.ChatCompletionChunk:
+        return openai.types.chat.ChatCompletionChunk.model_validate(
+            {
+                "id": "chunk",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": "model",
+                "choices": [{"index": 0, "delta": delta}],
+            }
+        )
+
+    estimator = StreamedLLMCostEstimator()
+
+    assert estimator.add(chunk(role="assistant")) == 0
+    assert estimator.add(chunk(content="Hi")) == 1
+    assert estimator.add(chunk(content="a" * 10)) == 1
+    tool_call = {"index": 0, "function": {"name": "search", "arguments": '{"query": "weather"}'}}
+    assert estimator.add(chunk(tool_calls=[tool_call])) == 5
+    assert estimator.cost == 7
@@ -0,0 +1,46 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import base64
+import struct
+
+import pytest
+from pydantic import ValidationError
+
+from agentstack_server.domain.models.vector_store import (
+    DocumentType,
+    VectorStoreItem,
+    decode_embedding,
+    encode_embedding,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_embedding_round_trip():
+    embedding = [0.5, -1.0, 2.0, 0.0]
+    encoded = encode_embedding(embedding)
+    assert base64.b64decode(encoded) == struct.pack("<4e", *embedding)
+    assert decode_embedding(encoded) == embedding
+
+
+def test_vector_store_item_accepts_base64_embedding():
+    item = VectorStoreItem(
+        document_id="doc", document_type=DocumentType.EXTERNAL, text="text", embedding=encode_embedding([1.0, 0.25])
+    )
+    assert item.embedding == [1.0, 0.25]
+
+
+def test_vector_store_item_rejects_invalid_base64_embedding():
+    with pytest.raises(ValidationError):
+        VectorStoreItem(document_id="doc", document_type=DocumentType.EXTERNAL, text="text", embedding="AAA")
+
+
+def test_vector_store_item_serializes_embedding_as_requested():
+    item = VectorStoreItem(document_id="doc", document_type=DocumentType.EXTERNAL, text="text", embedding=[1.0, 0.25])
+    assert item.model_dump(mode="json")["embedding"] == [1.0, 0.25]
+    assert item.model_dump(mode="json", context={"embedding_encoding": "base64"})["embedding"] == encode_embedding(
+        [1.0, 0.25]
+    )
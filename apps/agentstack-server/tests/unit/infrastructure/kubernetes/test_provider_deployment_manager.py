@@ -0,0 +1,130 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from typing import Any
+from unittest import mock
+
+import kr8s
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+from kink import di
+from kink.errors import ServiceError
+from kr8s.asyncio.objects import Deployment, Secret, Service
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.provider import DockerImageProviderLocation, Provider, ProviderDeploymentState
+from agentstack_server.infrastructure.kubernetes.provider_deployment_manager import KubernetesProviderDeploymentManager
+
+pytestmark = pytest.mark.unit
+
+
+def _deployment(provider_id: uuid.UUID, available_replicas: int) -> Deployment:
+    return Deployment(
+        {
+            "metadata": {"name": f"agentstack-provider-{provider_id}-deploy", "labels": {"managedBy": "agentstack"}},
+            "spec": {"replicas": 1},
+            "status": {"replicas": 1, "availableReplicas": available_replicas},
+        }
+    )
+
+
+class FakeApi:
+    def __init__(self, deployments: list[Deployment]):
+        self.deployments = deployments
+        self.list_calls = 0
+        self.listed = asyncio.Event()
+        self.events: asyncio.Queue[tuple[str, Deployment]] = asyncio.Queue()
+
+    async def list(self, **_: Any) -> AsyncIterator[Deployment]:
+        self.list_calls += 1
+        for deployment in self.deployments:
+            yield deployment
+        self.listed.set()
+
+    async def watch(self, **_: Any) -> AsyncIterator[tuple[str, Deployment]]:
+        while True:
+            yield await self.events.get()
+            self.events.task_done()
+
+
+async def test_state_is_served_from_watched_deployments(monkeypatch: pytest.MonkeyPatch):
+    running_id, starting_id, missing_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    api = FakeApi([_deployment(running_id, available_replicas=1), _deployment(starting_id, available_replicas=0)])
+    monkeypatch.setattr(kr8s.asyncio, "get", lambda kind, label_selector, api: api.list())
+
+    async def api_factory():
+        return api
+
+    async with KubernetesProviderDeploymentManager(api_factory=api_factory) as manager:
+        await asyncio.wait_for(api.listed.wait(), timeout=1)
+        provider_ids = [running_id, starting_id, missing_id]
+        assert await manager.state(provider_ids=provider_ids) == [
+            ProviderDeploymentState.RUNNING,
+            ProviderDeploymentState.STARTING,
+            ProviderDeploymentState.MISSING,
+        ]
+
+        await api.events.put(("MODIFIED", _deployment(starting_id, available_replicas=1)))
+        await api.events.put(("DELETED", _deployment(running_id, available_replicas=1)))
+        await asyncio.wait_for(api.events.join(), timeout=1)
+
+        assert await manager.state(provider_ids=provider_ids) == [
+            ProviderDeploymentState.MISSING,
+            ProviderDeploymentState.RUNNING,
+            ProviderDeploymentState.MISSING,
+        ]
+        assert api.list_calls == 1  # the hot path does not call the Kubernetes API
+
+
+@pytest.fixture
+def configuration():
+    orig_conf = None
+    with suppress(ServiceError):
+        orig_conf = di[Configuration]
+    di[Configuration] = Configuration()
+    yield
+    if orig_conf:
+        di[Configuration] = orig_conf
+
+
+@pytest.mark.usefixtures("configuration")
+async def test_hash_is_recorded_only_after_successful_apply(monkeypatch: pytest.MonkeyPatch):
+    provider = Provider(
+        source=DockerImageProviderLocation.model_validate("ghcr.io/example/agent:1.0.0"),
+        origin="ghcr.io/example/agent",
+        created_by=uuid.uuid4(),
+        agent_card=AgentCard(
+            name="agent",
+            description="agent",
+            url="http://agent.example.com",
+            version="1.0.0",
+            capabilities=AgentCapabilities(),
+            default_input_modes=["text"],
+            default_output_modes=["text"],
+            skills=[],
+        ),
+    )
+    monkeypatch.setattr(Deployment, "get", mock.AsyncMock(side_effect=kr8s.NotFoundError))
+    for kind in (Deployment, Secret, Service):
+        monkeypatch.setattr(kind, "create", mock.AsyncMock())
+        monkeypatch.setattr(kind, "delete", mock.AsyncMock())
+    monkeypatch.setattr(Deployment, "adopt", mock.AsyncMock())
+    Deployment.create.side_effect = RuntimeError("exceeded quota")
+
+    async def api_factory():
+        return FakeApi([])
+
+    manager = KubernetesProviderDeploymentManager(api_factory=api_factory)
+    with pytest.raises(RuntimeError):
+        await manager.create_or_replace(provider=provider)
+    assert provider.id not in manager._applied_hashes
+
+    Deployment.create.side_effect = None
+    assert await manager.create_or_replace(provider=provider)
+    assert manager._applied_hashes[provider.id][0] == provider.updated_at
@@ -0,0 +1,69 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+import pytest
+from pydantic import HttpUrl
+
+from agentstack_server.configuration import ModelProviderConfiguration
+from agentstack_server.domain.models.model_provider import ModelProvider, ModelProviderType
+from agentstack_server.infrastructure.openai_proxy.adapters.openai import OpenAIOpenAIProxyAdapter
+from agentstack_server.infrastructure.openai_proxy.clients import ProviderClientCache
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def clients() -> AsyncIterator[ProviderClientCache]:
+    clients = ProviderClientCache(ModelProviderConfiguration())
+    try:
+        yield clients
+    finally:
+        await clients.aclose()
+
+
+def _provider() -> ModelProvider:
+    return ModelProvider(type=ModelProviderType.OPENAI, base_url=HttpUrl("https://api.openai.com/v1"))
+
+
+async def test_adapters_reuse_clients_per_api_key(clients: ProviderClientCache):
+    provider = _provider()
+
+    client = OpenAIOpenAIProxyAdapter(provider, clients)._get_client("api-key")
+
+    assert OpenAIOpenAIProxyAdapter(provider, clients)._get_client("api-key") is client
+    assert OpenAIOpenAIProxyAdapter(provider, clients)._get_client("other-api-key") is not client
+    assert client._client is clients.http_client(provider.id)
+
+
+async def test_providers_get_bounded_connection_pools(clients: ProviderClientCache):
+    provider, other_provider = _provider(), _provider()
+    configuration = ModelProviderConfiguration()
+
+    http_client = clients.http_client(provider.id)
+
+    assert clients.http_client(provider.id) is http_client
+    assert clients.http_client(other_provider.id) is not http_client
+    assert http_client.timeout.pool == configuration.pool_timeout_sec
+    assert (
+        OpenAIOpenAIProxyAdapter(provider, clients)._get_client("api-key").timeout.pool
+        == configuration.pool_timeout_sec
+    )
+
+
+async def test_invalidate_drops_only_provider_clients(clients: ProviderClientCache):
+    provider, other_provider = _provider(), _provider()
+    client = OpenAIOpenAIProxyAdapter(provider, clients)._get_client("api-key")
+    other_client = OpenAIOpenAIProxyAdapter(other_provider, clients)._get_client("api-key")
+
+    http_client, other_http_client = clients.http_client(provider.id), clients.http_client(other_provider.id)
+    await clients.invalidate(provider_id=provider.id)
+
+    assert http_client.is_closed and not other_http_client.is_closed
+    assert clients.http_client(provider.id) is not http_client
+
+    assert OpenAIOpenAIProxyAdapter(provider, clients)._get_client("api-key") is not client
+    assert OpenAIOpenAIProxyAdapter(other_provider, clients)._get_client("api-key") is other_client
@@ -0,0 +1,73 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from unittest import mock
+from uuid import UUID, uuid4
+
+import pytest
+from a2a.types import Message, Part, Role, TextPart
+from pydantic import BaseModel
+
+from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.context import ContextHistoryItem
+from agentstack_server.exceptions import InvalidPageTokenError
+from agentstack_server.infrastructure.persistence.repositories.context import (
+    SqlAlchemyContextRepository,
+    context_history_table,
+)
+from agentstack_server.infrastructure.persistence.repositories.utils import (
+    decode_cursor,
+    encode_cursor,
+    strip_null_characters,
+)
+from agentstack_server.utils.utils import utc_now
+
+pytestmark = pytest.mark.unit
+
+
+def test_cursor_round_trip():
+    created_at, item_id = utc_now(), uuid4()
+    cursor = encode_cursor(created_at, item_id)
+
+    assert decode_cursor(cursor, context_history_table.c.created_at) == (created_at, item_id)
+    # The cursor is used as a query parameter as is
+    assert cursor.isascii() and not {"=", "+", "/"} & set(cursor)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("yesterday", uuid4()), "WyJhIl0"])
+def test_invalid_cursor_is_rejected(cursor: str):
+    with pytest.raises(InvalidPageTokenError):
+        decode_cursor(cursor, context_history_table.c.created_at)
+
+
+class Item(BaseModel):
+    id: UUID
+
+
+def test_next_page_token_defaults_to_last_item_id():
+    items = [Item(id=uuid4()), Item(id=uuid4())]
+    result = PaginatedResult[Item](items=items)
+    assert result.next_page_token == str(items[-1].id)
+    assert result.total_count is None
+
+    assert PaginatedResult[Item](items=items, next_page_token="cursor").next_page_token == "cursor"
+
+
+def test_null_characters_are_stripped():
+    document = {"text": "a\x00b", "parts": [{"text": "\x00"}, 1, None], "key\x00": ("c\x00",)}
+    assert strip_null_characters(document) == {"text": "ab", "parts": [{"text": ""}, 1, None], "key": ["c"]}
+
+
+async def test_history_items_are_stored_without_null_characters():
+    connection = mock.AsyncMock()
+    message = Message(message_id="message", role=Role.agent, parts=[Part(root=TextPart(text="binary\x00text"))])
+    item = ContextHistoryItem(context_id=uuid4(), data=message)
+
+    await SqlAlchemyContextRepository(connection=connection).add_history_items(
+        context_id=item.context_id, history_items=[item]
+    )
+
+    [query] = connection.execute.await_args.args
+    assert query.compile().params["data_m0"]["parts"][0]["text"] == "binarytext"
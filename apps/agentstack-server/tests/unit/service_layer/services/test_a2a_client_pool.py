@@ -0,0 +1,62 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import uuid
+
+import httpx
+import pytest
+
+from agentstack_server.configuration import A2AProxyConfiguration
+from agentstack_server.service_layer.services.a2a import ProviderClientPool
+
+pytestmark = pytest.mark.unit
+
+
+async def test_client_is_reused_per_provider():
+    pool = ProviderClientPool(A2AProxyConfiguration())
+    provider_id, other_provider_id = uuid.uuid4(), uuid.uuid4()
+    try:
+        async with pool.client(provider_id) as first, pool.client(provider_id) as second:
+            assert first is second
+        async with pool.client(other_provider_id) as other:
+            assert other is not first
+    finally:
+        await pool.aclose()
+    assert first.is_closed and other.is_closed
+
+
+async def test_idle_clients_are_evicted():
+    pool = ProviderClientPool(A2AProxyConfiguration(idle_client_expiry_sec=-1))
+    idle_provider_id, active_provider_id = uuid.uuid4(), uuid.uuid4()
+    try:
+        async with pool.client(idle_provider_id) as idle_client:
+            pass
+        async with pool.client(active_provider_id) as active_client:
+            # Eviction runs on access, clients with requests in progress are kept
+            async with pool.client(active_provider_id) as same_client:
+                assert same_client is active_client
+            assert idle_client.is_closed
+            assert not active_client.is_closed
+    finally:
+        await pool.aclose()
+
+
+async def test_pooled_client_does_not_keep_cookies():
+    cookie_headers: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        cookie_headers.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "session=user-a; Path=/"})
+
+    pool = ProviderClientPool(A2AProxyConfiguration(), transport=httpx.MockTransport(handler))
+    provider_id = uuid.uuid4()
+    try:
+        async with pool.client(provider_id) as client:
+            await client.get("http://agent.example.com/")  # request on behalf of user A
+        async with pool.client(provider_id) as client:
+            await client.get("http://agent.example.com/")  # request on behalf of user B
+    finally:
+        await pool.aclose()
+    assert cookie_headers == [None, None]
@@ -0,0 +1,80 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.infrastructure.activity.memory_activity_buffer import MemoryActivityBuffer
+from agentstack_server.service_layer.activity import ActivityKind
+from agentstack_server.service_layer.services.activity import ActivityService
+from agentstack_server.utils.utils import utc_now
+
+pytestmark = pytest.mark.unit
+
+
+class FakeUnitOfWork:
+    def __init__(self, fail: bool = False):
+        self.providers = SimpleNamespace(update_last_accessed=mock.AsyncMock())
+        self.a2a_requests = SimpleNamespace(update_tasks_last_accessed=mock.AsyncMock())
+        self.committed = False
+        self._fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    async def commit(self):
+        if self._fail:
+            raise RuntimeError("database unavailable")
+        self.committed = True
+
+
+async def test_buffer_keeps_latest_timestamp():
+    buffer = MemoryActivityBuffer()
+    now = utc_now()
+
+    await buffer.touch(ActivityKind.PROVIDER, {"a": now, "b": now})
+    await buffer.touch(ActivityKind.PROVIDER, {"a": now - timedelta(minutes=1), "b": now + timedelta(minutes=1)})
+
+    assert await buffer.drain() == {ActivityKind.PROVIDER: {"a": now, "b": now + timedelta(minutes=1)}}
+    assert await buffer.drain() == {}
+
+
+async def test_flush_writes_coalesced_touches_in_one_transaction():
+    buffer = MemoryActivityBuffer()
+    uow = FakeUnitOfWork()
+    service = ActivityService(buffer, lambda: uow, Configuration())
+    provider_id = uuid.uuid4()
+
+    for _ in range(100):
+        await service.touch(ActivityKind.PROVIDER, provider_id)
+    await service.touch(ActivityKind.A2A_REQUEST_TASK, "task-1", "task-2")
+
+    assert await service.flush() == 3
+    assert uow.committed
+    [call] = uow.providers.update_last_accessed.await_args_list
+    assert list(call.kwargs["timestamps"]) == [provider_id]
+    [call] = uow.a2a_requests.update_tasks_last_accessed.await_args_list
+    assert list(call.kwargs["timestamps"]) == ["task-1", "task-2"]
+    assert await service.flush() == 0
+
+
+async def test_failed_flush_keeps_touches_for_next_flush():
+    buffer = MemoryActivityBuffer()
+    service = ActivityService(buffer, lambda: FakeUnitOfWork(fail=True), Configuration())
+    provider_id = uuid.uuid4()
+    await service.touch(ActivityKind.PROVIDER, provider_id)
+
+    with pytest.raises(RuntimeError):
+        await service.flush()
+
+    assert list((await buffer.drain())[ActivityKind.PROVIDER]) == [str(provider_id)]
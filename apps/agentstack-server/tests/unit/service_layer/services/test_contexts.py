@@ -0,0 +1,142 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import base64
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+from a2a.types import FilePart, FileWithBytes, FileWithUri, Message, Part, Role, TextPart
+
+from agentstack_server.api.schema.contexts import ContextHistoryQuery
+from agentstack_server.domain.models.common import PaginatedResult
+from agentstack_server.domain.models.context import ContextHistoryItem
+from agentstack_server.domain.models.user import User
+from agentstack_server.exceptions import EntityNotFoundError
+from agentstack_server.service_layer.services.contexts import STRIP_BINARY_MIN_SIZE, ContextService
+
+pytestmark = pytest.mark.unit
+
+LARGE_CONTENT = b"x" * STRIP_BINARY_MIN_SIZE
+SMALL_CONTENT = b"small"
+
+
+def _part_content_url(item_id, part_index: int) -> str:
+    return f"https://agentstack.example.com/items/{item_id}/parts/{part_index}"
+
+
+def _file_part(content: bytes) -> Part:
+    file = FileWithBytes(bytes=base64.b64encode(content).decode(), name="file.bin", mime_type="image/png")
+    return Part(root=FilePart(file=file))
+
+
+class FakeUnitOfWorkFactory:
+    def __init__(self, items: list[ContextHistoryItem]):
+        self.items = {item.id: item for item in items}
+        self.list_history = mock.AsyncMock(side_effect=lambda **kwargs: PaginatedResult(items=list(items)))
+        self.add_history_items = mock.AsyncMock()
+        self.commit = mock.AsyncMock()
+
+    def __call__(self):
+        return self
+
+    async def _get_history_item(self, *, context_id, item_id):
+        if item_id not in self.items:
+            raise EntityNotFoundError("context_history_item", item_id)
+        return self.items[item_id]
+
+    async def __aenter__(self):
+        return SimpleNamespace(
+            contexts=SimpleNamespace(
+                get=mock.AsyncMock(),
+                list_history=self.list_history,
+                get_history_item=self._get_history_item,
+                add_history_items=self.add_history_items,
+            ),
+            commit=self.commit,
+        )
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+def _service(items: list[ContextHistoryItem]) -> tuple[ContextService, FakeUnitOfWorkFactory]:
+    uow = FakeUnitOfWorkFactory(items)
+    configuration = SimpleNamespace(context=SimpleNamespace(resources_expire_after_days=1))
+    service = ContextService(
+        uow=uow,
+        configuration=configuration,
+        object_storage=mock.Mock(),
+        model_provider_service=mock.Mock(),
+        activity=mock.Mock(),
+    )
+    return service, uow
+
+
+async def test_large_file_parts_are_replaced_by_uri():
+    context_id = uuid4()
+    message = Message(
+        message_id="message",
+        role=Role.agent,
+        parts=[Part(root=TextPart(text="hello")), _file_part(SMALL_CONTENT), _file_part(LARGE_CONTENT)],
+    )
+    item = ContextHistoryItem(context_id=context_id, data=message)
+    service, uow = _service([item])
+    user = User(email="user@example.com")
+
+    query = ContextHistoryQuery(strip_binary=True, roles=[Role.agent], since_id=uuid4())
+    [stripped] = (
+        await service.list_history(context_id=context_id, user=user, query=query, part_content_url=_part_content_url)
+    ).items
+
+    assert uow.list_history.await_args.kwargs["roles"] == ["agent"]
+    text, small, large = stripped.data.parts
+    assert text == message.parts[0]
+    assert small == message.parts[1]
+    assert isinstance(large.root, FilePart) and isinstance(large.root.file, FileWithUri)
+    assert large.root.file.uri == _part_content_url(item.id, 2)
+    assert large.root.file.mime_type == "image/png"
+
+    # The referenced content is served from the original item
+    content, mime_type = await service.get_history_part_content(
+        context_id=context_id, item_id=item.id, part_index=2, user=user
+    )
+    assert (content, mime_type) == (LARGE_CONTENT, "image/png")
+    for part_index in (0, 3):
+        with pytest.raises(EntityNotFoundError):
+            await service.get_history_part_content(
+                context_id=context_id, item_id=item.id, part_index=part_index, user=user
+            )
+
+
+async def test_history_is_returned_unchanged_without_strip_binary():
+    context_id = uuid4()
+    message = Message(message_id="message", role=Role.user, parts=[_file_part(LARGE_CONTENT)])
+    item = ContextHistoryItem(context_id=context_id, data=message)
+    service, _ = _service([item])
+
+    result = await service.list_history(
+        context_id=context_id,
+        user=User(email="user@example.com"),
+        query=ContextHistoryQuery(),
+        part_content_url=_part_content_url,
+    )
+    assert result.items == [item]
+
+
+async def test_history_items_are_added_in_one_transaction():
+    context_id = uuid4()
+    service, uow = _service([])
+    messages = [Message(message_id=str(i), role=Role.agent, parts=[Part(root=TextPart(text=str(i)))]) for i in range(5)]
+
+    items = await service.add_history_items(context_id=context_id, data=messages, user=User(email="user@example.com"))
+
+    uow.add_history_items.assert_awaited_once_with(context_id=context_id, history_items=items)
+    uow.commit.assert_awaited_once()
+    assert [item.data for item in items] == messages
+    # The order within the batch survives ordering by creation time
+    assert sorted(items, key=lambda item: item.created_at) == items
+    assert len({item.created_at for item in items}) == len(items)
@@ -0,0 +1,174 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from pydantic import HttpUrl
+
+from agentstack_server.api.schema.openai import ChatCompletionRequest, EmbeddingsRequest
+from agentstack_server.domain.constants import MODEL_API_KEY_SECRET_NAME
+from agentstack_server.domain.models.model_provider import (
+    Model,
+    ModelProvider,
+    ModelProviderState,
+    ModelProviderType,
+)
+from agentstack_server.exceptions import EntityNotFoundError, InvalidProviderCallError
+from agentstack_server.infrastructure.cache.memory_cache import MemoryCacheFactory
+from agentstack_server.service_layer.services import model_providers
+from agentstack_server.service_layer.services.model_providers import (
+    ROUTING_TABLE_VERSION_KEY,
+    ModelProviderService,
+    Models,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class FakeUnitOfWorkFactory:
+    def __init__(self, providers: list[ModelProvider]):
+        self.providers = providers
+        self.opened = 0
+        self.update_states = mock.AsyncMock()
+
+    def __call__(self):
+        self.opened += 1
+        return self
+
+    async def __aenter__(self):
+        async def list_providers():
+            for provider in self.providers:
+                yield provider
+
+        return SimpleNamespace(
+            model_providers=SimpleNamespace(list=list_providers, update_states=self.update_states),
+            env=SimpleNamespace(
+                get_all=mock.AsyncMock(
+                    return_value={provider.id: {MODEL_API_KEY_SECRET_NAME: "api-key"} for provider in self.providers}
+                )
+            ),
+            commit=mock.AsyncMock(),
+        )
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+@pytest.fixture
+def provider() -> ModelProvider:
+    return ModelProvider(type=ModelProviderType.OPENAI, base_url=HttpUrl("https://api.openai.com/v1"))
+
+
+@pytest.fixture
+async def service(provider: ModelProvider) -> ModelProviderService:
+    openai_proxy = mock.Mock()
+    openai_proxy.get_chat_completion_proxy.return_value.create_chat_completion = mock.AsyncMock()
+    openai_proxy.get_embedding_proxy.side_effect = ValueError("Provider does not support embeddings")
+    service = ModelProviderService(
+        uow=FakeUnitOfWorkFactory([provider]), openai_proxy=openai_proxy, cache_factory=MemoryCacheFactory()
+    )
+    model = Model(id="openai:gpt-4o", provider=provider.model_provider_info)
+    await service._cache.set(str(provider.id), Models(models=[model]))
+    return service
+
+
+async def test_calls_are_routed_from_memory(service: ModelProviderService):
+    request = ChatCompletionRequest(model="openai:gpt-4o", messages=[{"role": "user", "content": "Hello"}])
+
+    for _ in range(3):
+        await service.create_chat_completion(request)
+
+    assert service._uow.opened == 1
+    adapter = service._openai_proxy.get_chat_completion_proxy.return_value
+    assert adapter.create_chat_completion.await_count == 3
+    assert adapter.create_chat_completion.await_args.kwargs["api_key"] == "api-key"
+    with pytest.raises(InvalidProviderCallError):
+        await service.create_embedding(EmbeddingsRequest(model="openai:gpt-4o", input="Hello"))
+    with pytest.raises(EntityNotFoundError):
+        await service.get_provider_by_model_id(model_id="openai:unknown")
+
+
+async def test_routing_table_is_rebuilt_when_version_changes(
+    service: ModelProviderService, provider: ModelProvider, monkeypatch: pytest.MonkeyPatch
+):
+    assert await service.get_provider_by_model_id(model_id="openai:gpt-4o") == provider
+
+    # Another replica deletes the provider, the change is noticed at the next version check
+    service._uow.providers.clear()
+    await service._routing_table_version.set(ROUTING_TABLE_VERSION_KEY, "changed")
+    assert "openai:gpt-4o" in await service.get_all_models()
+
+    monkeypatch.setattr(model_providers, "ROUTING_TABLE_VERSION_CHECK_INTERVAL", timedelta(0))
+    assert await service.get_all_models() == {}
+    assert service._uow.opened == 2
+
+    # The version did not change, the table is not rebuilt
+    await service.get_all_models()
+    assert service._uow.opened == 2
+
+
+async def test_local_changes_invalidate_routing_table(service: ModelProviderService):
+    await service.get_all_models()
+
+    service._uow.providers.clear()
+    await service._invalidate_routing_table()
+
+    assert await service.get_all_models() == {}
+    assert service._uow.opened == 2
+
+
+async def test_providers_are_refreshed_concurrently(monkeypatch: pytest.MonkeyPatch):
+    providers = [
+        ModelProvider(type=ModelProviderType.OPENAI, base_url=HttpUrl(f"https://provider-{i}.example.com/v1"))
+        for i in range(3)
+    ]
+    providers[2].state = ModelProviderState.OFFLINE
+    listing = set()
+    all_listing = asyncio.Event()
+
+    async def list_models(*, provider: ModelProvider, api_key: str) -> list[Model]:
+        listing.add(provider.id)
+        if len(listing) == len(providers):
+            all_listing.set()
+        # Completes only when all providers are listed at the same time
+        await all_listing.wait()
+        if provider is providers[0]:
+            await asyncio.Event().wait()  # never responds
+        return [Model(id=f"openai:model-{provider.id}", provider=provider.model_provider_info)]
+
+    openai_proxy = mock.Mock()
+    openai_proxy.list_models = list_models
+    uow = FakeUnitOfWorkFactory(providers)
+    service = ModelProviderService(uow=uow, openai_proxy=openai_proxy, cache_factory=MemoryCacheFactory())
+    monkeypatch.setattr(model_providers, "MODEL_REFRESH_TIMEOUT", timedelta(milliseconds=100))
+
+    await service.update_model_state_and_cache()
+
+    # Only the changed states are written, in a single update
+    uow.update_states.assert_awaited_once_with(
+        states={providers[0].id: ModelProviderState.OFFLINE, providers[2].id: ModelProviderState.ONLINE}
+    )
+    assert await service._cache.get(str(providers[0].id)) is None
+    assert await service._cache.get(str(providers[1].id)) is not None
+
+
+async def test_refresh_without_changes_keeps_routing_table(service: ModelProviderService, provider: ModelProvider):
+    models = await service._cache.get(str(provider.id))
+    service._openai_proxy.list_models = mock.AsyncMock(return_value=models.models)
+    await service.get_all_models()
+    version = await service._routing_table_version.get(ROUTING_TABLE_VERSION_KEY)
+
+    await service.update_model_state_and_cache()
+    assert await service._routing_table_version.get(ROUTING_TABLE_VERSION_KEY) == version
+    assert service._routing_table is not None
+
+    service._openai_proxy.list_models.return_value = []
+    await service.update_model_state_and_cache()
+    assert await service._routing_table_version.get(ROUTING_TABLE_VERSION_KEY) != version
+    assert await service.get_all_models() == {}
@@ -0,0 +1,160 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import json
+from contextlib import suppress
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+import httpx
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+from kink import di
+from kink.errors import ServiceError
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.provider import NetworkProviderLocation, Provider, UnmanagedState
+from agentstack_server.service_layer.services.provider_health import ProviderHealthService
+
+pytestmark = pytest.mark.unit
+
+AGENT_CARD = AgentCard(
+    name="agent",
+    description="agent",
+    url="http://agent.example.com",
+    version="1.0.0",
+    capabilities=AgentCapabilities(),
+    default_input_modes=["text"],
+    default_output_modes=["text"],
+    skills=[],
+)
+
+
+@pytest.fixture(autouse=True)
+def configuration():
+    orig_conf = None
+    with suppress(ServiceError):
+        orig_conf = di[Configuration]
+    di[Configuration] = Configuration()
+    yield
+    if orig_conf:
+        di[Configuration] = orig_conf
+
+
+class FakeUnitOfWorkFactory:
+    def __init__(self, providers: list[Provider]):
+        self.providers = providers
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        async def list_providers(**kwargs):
+            for provider in self.providers:
+                yield provider
+
+        return SimpleNamespace(providers=SimpleNamespace(list=list_providers))
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+@pytest.fixture
+def provider() -> Provider:
+    return Provider(
+        source=NetworkProviderLocation.model_validate("http://agent.example.com"),
+        origin="http://agent.example.com",
+        created_by=uuid4(),
+        agent_card=AGENT_CARD,
+        unmanaged_state=UnmanagedState.ONLINE,
+    )
+
+
+def _service(provider: Provider, handler) -> tuple[ProviderHealthService, mock.AsyncMock]:
+    provider_service = mock.Mock()
+    provider_service.update_unmanaged_providers = mock.AsyncMock()
+    service = ProviderHealthService(
+        uow=FakeUnitOfWorkFactory([provider]), provider_service=provider_service, user_service=mock.AsyncMock()
+    )
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service, provider_service.update_unmanaged_providers
+
+
+async def test_unchanged_agent_card_is_not_updated(provider: Provider):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=AGENT_CARD.model_dump(mode="json"), headers={"ETag": '"v1"'})
+
+    service, update_unmanaged_providers = _service(provider, handler)
+
+    # The first probe (e.g. after a restart) compares the card with the saved one
+    await service.probe_unmanaged_providers()
+    update_unmanaged_providers.assert_not_awaited()
+
+    await service.probe_unmanaged_providers()
+    assert requests[-1].headers["If-None-Match"] == '"v1"'
+    update_unmanaged_providers.assert_not_awaited()
+
+
+async def test_changed_agent_card_is_updated_without_etag(provider: Provider):
+    cards = [AGENT_CARD, AGENT_CARD, AGENT_CARD.model_copy(update={"version": "2.0.0"})]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=json.dumps(cards.pop(0).model_dump(mode="json")))
+
+    service, update_unmanaged_providers = _service(provider, handler)
+
+    await service.probe_unmanaged_providers()
+    await service.probe_unmanaged_providers()
+    update_unmanaged_providers.assert_not_awaited()
+
+    await service.probe_unmanaged_providers()
+    [(_, _, agent_card)] = update_unmanaged_providers.await_args.kwargs["updates"]
+    assert agent_card.version == "2.0.0"
+
+
+async def test_offline_provider_is_probed_with_backoff(provider: Provider, monkeypatch: pytest.MonkeyPatch):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    service, update_unmanaged_providers = _service(provider, handler)
+
+    await service.probe_unmanaged_providers()
+    [(_, state, agent_card)] = update_unmanaged_providers.await_args.kwargs["updates"]
+    assert (state, agent_card) == (UnmanagedState.OFFLINE, None)
+
+    # The provider is not probed again until the backoff passes
+    await service.probe_unmanaged_providers()
+    assert len(requests) == 1
+
+    service._probe_states[provider.id].next_probe_at = 0
+    await service.probe_unmanaged_providers()
+    assert len(requests) == 2
+    assert service._probe_states[provider.id].failures == 2
+
+
+async def test_agent_card_is_passed_again_after_failed_update(provider: Provider):
+    new_card = AGENT_CARD.model_copy(update={"version": "2.0.0"})
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=new_card.model_dump(mode="json"), headers={"ETag": '"v2"'})
+
+    service, update_unmanaged_providers = _service(provider, handler)
+    update_unmanaged_providers.side_effect = RuntimeError("database unavailable")
+    with pytest.raises(RuntimeError):
+        await service.probe_unmanaged_providers()
+
+    update_unmanaged_providers.side_effect = None
+    await service.probe_unmanaged_providers()
+    [(_, _, agent_card)] = update_unmanaged_providers.await_args.kwargs["updates"]
+    assert agent_card == new_card
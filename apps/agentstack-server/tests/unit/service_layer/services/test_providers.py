@@ -0,0 +1,178 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+from fastapi import HTTPException
+from kink import di
+from kink.errors import ServiceError
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.provider import (
+    DockerImageProviderLocation,
+    NetworkProviderLocation,
+    Provider,
+    ProviderDeploymentState,
+    UnmanagedState,
+)
+from agentstack_server.domain.models.user import User, UserRole
+from agentstack_server.exceptions import EntityNotFoundError
+from agentstack_server.service_layer.services.providers import ProviderService
+from agentstack_server.utils.utils import utc_now
+
+pytestmark = pytest.mark.unit
+
+AGENT_CARD = AgentCard(
+    name="agent",
+    description="agent",
+    url="http://agent.example.com",
+    version="1.0.0",
+    capabilities=AgentCapabilities(),
+    default_input_modes=["text"],
+    default_output_modes=["text"],
+    skills=[],
+)
+
+
+@pytest.fixture(autouse=True)
+def configuration():
+    orig_conf = None
+    with suppress(ServiceError):
+        orig_conf = di[Configuration]
+    di[Configuration] = Configuration()
+    yield
+    if orig_conf:
+        di[Configuration] = orig_conf
+
+
+class FakeUnitOfWorkFactory:
+    def __init__(self, providers: list[Provider]):
+        self.providers = {provider.id: provider for provider in providers}
+        self.list = mock.Mock(side_effect=self._list)
+        self.update = mock.AsyncMock()
+        self.update_agent_card = mock.AsyncMock()
+        self.update_unmanaged_states = mock.AsyncMock()
+
+    def __call__(self):
+        return self
+
+    async def _list(self, *, type=None, **kwargs):
+        for provider in self.providers.values():
+            if type is None or provider.type == type:
+                yield provider
+
+    async def _get(self, *, provider_id, **kwargs):
+        if provider_id not in self.providers:
+            raise EntityNotFoundError("provider", id=provider_id)
+        return self.providers[provider_id]
+
+    async def __aenter__(self):
+        return SimpleNamespace(
+            providers=SimpleNamespace(
+                list=self.list,
+                get=self._get,
+                update=self.update,
+                update_agent_card=self.update_agent_card,
+                update_unmanaged_states=self.update_unmanaged_states,
+            ),
+            commit=mock.AsyncMock(),
+            env=SimpleNamespace(
+                get_all=mock.AsyncMock(
+                    side_effect=lambda parent_entity_ids, **kwargs: {id: {} for id in parent_entity_ids}
+                )
+            ),
+        )
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+def _provider(source: str, **kwargs) -> Provider:
+    location = (
+        NetworkProviderLocation.model_validate(source)
+        if source.startswith("http")
+        else DockerImageProviderLocation.model_validate(source)
+    )
+    return Provider(source=location, origin=location.origin, created_by=uuid4(), agent_card=AGENT_CARD, **kwargs)
+
+
+async def test_get_provider_fetches_only_requested_provider():
+    unmanaged = _provider("http://agent.example.com", unmanaged_state=UnmanagedState.ONLINE)
+    managed = _provider("ghcr.io/example/agent:1.0.0")
+    deployment_manager = mock.Mock()
+    deployment_manager.state = mock.AsyncMock(return_value=[ProviderDeploymentState.RUNNING])
+    uow = FakeUnitOfWorkFactory([unmanaged, managed])
+    service = ProviderService(deployment_manager=deployment_manager, uow=uow)
+
+    provider = await service.get_provider(provider_id=unmanaged.id)
+    assert provider.state == UnmanagedState.ONLINE
+    # Unmanaged providers have no deployment
+    deployment_manager.state.assert_not_awaited()
+
+    provider = await service.get_provider(provider_id=managed.id)
+    assert provider.state == ProviderDeploymentState.RUNNING
+    deployment_manager.state.assert_awaited_once_with(provider_ids=[managed.id])
+
+    uow.list.assert_not_called()
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_provider(provider_id=uuid4())
+    assert exc_info.value.status_code == 404
+
+
+async def test_scale_down_checks_only_idle_providers():
+    idle = _provider("ghcr.io/example/idle:1.0.0", last_active_at=utc_now() - timedelta(hours=1))
+    active = _provider("ghcr.io/example/active:1.0.0")
+    deployment_manager = mock.Mock()
+    deployment_manager.state = mock.AsyncMock(return_value=[ProviderDeploymentState.RUNNING])
+    deployment_manager.scale_down = mock.AsyncMock()
+    service = ProviderService(deployment_manager=deployment_manager, uow=FakeUnitOfWorkFactory([idle, active]))
+
+    await service.scale_down_providers()
+
+    deployment_manager.state.assert_awaited_once_with(provider_ids=[idle.id])
+    deployment_manager.scale_down.assert_awaited_once_with(provider_id=idle.id)
+
+
+async def test_probed_agent_card_updates_only_probed_columns():
+    provider = _provider("http://agent.example.com", unmanaged_state=UnmanagedState.OFFLINE)
+    uow = FakeUnitOfWorkFactory([provider])
+    service = ProviderService(deployment_manager=mock.Mock(), uow=uow)
+    agent_card = AGENT_CARD.model_copy(update={"version": "2.0.0"})
+
+    await service.update_unmanaged_providers(
+        updates=[(provider, UnmanagedState.ONLINE, agent_card)], user=mock.Mock(id=uuid4())
+    )
+
+    uow.update.assert_not_awaited()
+    kwargs = uow.update_agent_card.await_args.kwargs
+    assert kwargs["provider_id"] == provider.id
+    assert kwargs["agent_card"].version == "2.0.0"
+    assert kwargs["unmanaged_state"] == UnmanagedState.ONLINE
+
+
+async def test_fetch_timeout_does_not_cancel_the_update():
+    provider = _provider("http://agent.example.com", unmanaged_state=UnmanagedState.ONLINE)
+    uow = FakeUnitOfWorkFactory([provider])
+    uow.update.side_effect = lambda **kwargs: asyncio.sleep(0.05)
+    deployment_manager = mock.Mock()
+    deployment_manager.state = mock.AsyncMock(return_value=[ProviderDeploymentState.RUNNING])
+    service = ProviderService(deployment_manager=deployment_manager, uow=uow)
+
+    result = await service.patch_provider(
+        provider_id=provider.id,
+        user=User(email="admin@example.com", role=UserRole.ADMIN),
+        auto_stop_timeout=timedelta(minutes=1),
+        fetch_timeout=timedelta(milliseconds=10),
+    )
+
+    assert result.auto_stop_timeout == timedelta(minutes=1)
+    uow.update.assert_awaited_once()
@@ -0,0 +1,110 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from agentstack_server.configuration import Configuration
+from agentstack_server.domain.models.user import User
+from agentstack_server.domain.models.vector_store import (
+    DocumentType,
+    VectorDistanceMetric,
+    VectorStore,
+    VectorStoreItem,
+    VectorStoreSearchQuery,
+    VectorStoreSearchResult,
+)
+from agentstack_server.service_layer.services.vector_stores import VectorStoreService
+
+pytestmark = pytest.mark.unit
+
+
+def _result(item: VectorStoreItem, score: float) -> VectorStoreSearchResult:
+    return VectorStoreSearchResult(item=item, score=score)
+
+
+class FakeUnitOfWorkFactory:
+    def __init__(self, vector_stores: list[VectorStore], results: list[list[VectorStoreSearchResult]]):
+        self.vector_stores = vector_stores
+        self.results = results
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        async def list_vector_stores(**kwargs):
+            for vector_store in self.vector_stores:
+                yield vector_store
+
+        return SimpleNamespace(
+            vector_stores=SimpleNamespace(list=list_vector_stores),
+            vector_database=SimpleNamespace(similarity_search_batch=mock.AsyncMock(return_value=self.results)),
+        )
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+
+async def test_merged_results_are_ranked_by_rank_not_raw_score():
+    user = User(email="user@example.com")
+    cosine = VectorStore(model_id="model", dimension=2, created_by=user.id)
+    inner_product = VectorStore(
+        model_id="model", dimension=2, created_by=user.id, distance_metric=VectorDistanceMetric.INNER_PRODUCT
+    )
+    shared, cosine_only, inner_product_only = (
+        VectorStoreItem(document_id=str(uuid4()), document_type=DocumentType.EXTERNAL, text=text, embedding=[1, 0])
+        for text in ("shared", "cosine", "inner product")
+    )
+    # Inner product scores are unbounded and would win every comparison of raw scores
+    results = [
+        [_result(shared, 0.9), _result(cosine_only, 0.8)],
+        [_result(inner_product_only, 40.0), _result(shared, 30.0)],
+    ]
+    service = VectorStoreService(
+        uow=FakeUnitOfWorkFactory([cosine, inner_product], results),
+        configuration=Configuration(),
+        activity=mock.Mock(),
+    )
+
+    [merged] = await service.search_batch(
+        queries=[
+            VectorStoreSearchQuery(vector_store_id=cosine.id, query_vector=[1, 0]),
+            VectorStoreSearchQuery(vector_store_id=inner_product.id, query_vector=[1, 0]),
+        ],
+        merge=True,
+        user=user,
+    )
+
+    assert [result.item.text for result in merged] == ["shared", "inner product", "cosine"]
+    assert merged[0].score == pytest.approx(1 / 61 + 1 / 62)
+
+
+async def test_partition_is_attached_again_when_delete_fails():
+    user = User(email="user@example.com")
+    vector_store = VectorStore(model_id="model", dimension=2, created_by=user.id)
+    vector_database = SimpleNamespace(
+        detach_collection=mock.AsyncMock(),
+        delete_collection=mock.AsyncMock(),
+        attach_collection=mock.AsyncMock(),
+    )
+    uow = mock.MagicMock()
+    uow.return_value.__aenter__.return_value = SimpleNamespace(
+        vector_stores=SimpleNamespace(
+            get=mock.AsyncMock(return_value=vector_store),
+            delete=mock.AsyncMock(side_effect=RuntimeError("connection lost")),
+        ),
+        vector_database=vector_database,
+        commit=mock.AsyncMock(),
+    )
+    service = VectorStoreService(uow=uow, configuration=Configuration(), activity=mock.Mock())
+
+    with pytest.raises(RuntimeError):
+        await service.delete(vector_store_id=vector_store.id, user=user)
+
+    vector_database.detach_collection.assert_awaited_once_with(collection_id=vector_store.id, dimension=2)
+    vector_database.attach_collection.assert_awaited_once_with(collection_id=vector_store.id, dimension=2)
@@ -0,0 +1,108 @@
+# Copyright 2026 © BeeAI a Series of LF Projects, LLC
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import fnmatch
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from agentstack_server.configuration import WebhookConfiguration, WebhookEndpoint
+from agentstack_server.service_layer.webhook import EventRouter, WebhookDispatcher, WebhookPayload
+
+pytestmark = pytest.mark.unit
+
+
+def _payload(event: str, resource_id: str, **kwargs) -> WebhookPayload:
+    return {"event": event, "resource_type": "vector_store", "resource_id": resource_id, **kwargs}
+
+
+def _dispatcher(handler, deferred: list[WebhookPayload], **kwargs) -> WebhookDispatcher:
+    endpoint = WebhookEndpoint.model_validate({"url": "http://hooks.example.com", **kwargs.pop("endpoint", {})})
+    configuration = WebhookConfiguration(endpoints=[endpoint], retry_backoff_sec=0, **kwargs)
+
+    async def defer(_endpoint: WebhookEndpoint, events: list[WebhookPayload]) -> None:
+        deferred.extend(events)
+
+    return WebhookDispatcher(
+        configuration, client=httpx.AsyncClient(transport=httpx.MockTransport(handler)), defer=defer
+    )
+
+
+async def test_updates_are_coalesced_and_batched():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200)
+
+    resource_id = str(uuid4())
+    deferred = []
+    async with _dispatcher(
+        handler, deferred, endpoint={"batch_size": 10, "max_concurrency": 1}, coalesce_window_sec=60
+    ) as dispatcher:
+        dispatcher.dispatch(_payload("vector_store.created", resource_id))
+        for i in range(3):
+            dispatcher.dispatch(_payload("vector_store.updated", resource_id, update=i))
+        dispatcher.dispatch(_payload("vector_store.deleted", resource_id))
+
+    # Pending updates are released on shutdown
+    [request] = requests
+    events = json.loads(request.content)["events"]
+    assert [event["event"] for event in events] == [
+        "vector_store.created",
+        "vector_store.deleted",
+        "vector_store.updated",
+    ]
+    assert events[-1]["update"] == 2
+    assert not deferred
+
+
+async def test_failed_delivery_is_retried_and_handed_over():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        status_code = 400 if json.loads(request.content)["event"] == "vector_store.deleted" else 503
+        return httpx.Response(status_code)
+
+    resource_id = str(uuid4())
+    deferred = []
+    async with _dispatcher(handler, deferred, max_retries=2, coalesce_window_sec=0) as dispatcher:
+        dispatcher.dispatch(_payload("vector_store.updated", resource_id))
+        dispatcher.dispatch(_payload("vector_store.deleted", resource_id))
+
+    assert len(requests) == 4  # a client error is not retried
+    assert [event["event"] for event in deferred] == ["vector_store.updated"]
+
+
+async def test_full_queue_drops_events():
+    deferred = []
+    dispatcher = _dispatcher(lambda request: httpx.Response(200), deferred, queue_size=1, coalesce_window_sec=0)
+    # The workers are not started, so nothing is taken from the queue
+    for _ in range(3):
+        dispatcher.dispatch(_payload("vector_store.created", str(uuid4())))
+    assert dispatcher.queue_depth() == {"http://hooks.example.com/": 1}
+
+
+def test_event_router_matches_like_fnmatch():
+    patterns = [
+        ["*"],
+        ["provider.*", "context.created"],
+        ["provider.created", "provider_build.*"],
+        ["*.updated", "file?created"],
+        [],
+    ]
+    router = EventRouter(patterns)
+    event_types = ["provider.created", "provider.updated", "provider_build.updated", "context.created", "file.created"]
+    for event_type in event_types:
+        expected = tuple(
+            index
+            for index, endpoint_patterns in enumerate(patterns)
+            if any(fnmatch.fnmatch(event_type, pattern) for pattern in endpoint_patterns)
+        )
+        assert router.route(event_type) == expected
+        assert router.route(event_type) is router.route(event_type)